@@ -3,12 +3,13 @@
 //  SPDX-License-Identifier: MIT
 
 use std::{
-    io::{self, Read, Seek},
+    io::{self, Read, Seek, Write},
     str::FromStr,
 };
 use strum::EnumString;
 
 use crate::{
+    page_map_index::{load_or_build, IndexRecord, PageMapIndex},
     page_mapper::{JsonPageMapper, ParsedJsonSection},
     page_maps::{AnnPageMap, ImgPageMap, JsonDict},
     utils::{convert_to_py_object, invalid_data, parse_serde_json_value, read_skipping_ws},
@@ -158,6 +159,28 @@ impl CocoPageMapperImpl {
     }
 }
 
+impl PageMapIndex for CocoPageMapperImpl {
+    const KIND: &'static str = "coco";
+
+    fn write_index(&self, writer: &mut impl Write) -> Result<(), io::Error> {
+        self.licenses.write_record(writer)?;
+        self.info.write_record(writer)?;
+        self.categories.write_record(writer)?;
+        self.images.write_index(writer)?;
+        self.annotations.write_index(writer)
+    }
+
+    fn read_index(reader: &mut impl Read) -> Result<Self, io::Error> {
+        Ok(CocoPageMapperImpl {
+            licenses: JsonDict::read_record(reader)?,
+            info: JsonDict::read_record(reader)?,
+            categories: JsonDict::read_record(reader)?,
+            images: ImgPageMap::read_index(reader)?,
+            annotations: AnnPageMap::read_index(reader)?,
+        })
+    }
+}
+
 #[pyclass]
 pub struct CocoPageMapper {
     reader: BufReader<File>,
@@ -167,10 +190,19 @@ pub struct CocoPageMapper {
 #[pymethods]
 impl CocoPageMapper {
     #[new]
-    fn py_new(path: String) -> PyResult<Self> {
+    #[pyo3(signature = (path, index_path=None))]
+    fn py_new(path: String, index_path: Option<String>) -> PyResult<Self> {
         let file = File::open(Path::new(&path))?;
         let mut reader = BufReader::new(file);
-        let mapper = CocoPageMapperImpl::new(&mut reader)?;
+        let mapper = match index_path {
+            Some(index_path) => load_or_build(
+                Path::new(&path),
+                Path::new(&index_path),
+                &mut reader,
+                CocoPageMapperImpl::new,
+            )?,
+            None => CocoPageMapperImpl::new(&mut reader)?,
+        };
 
         Ok(CocoPageMapper { reader, mapper })
     }
@@ -4,13 +4,14 @@
 
 use std::{
     fs::File,
-    io::{self, BufReader, Read, Seek},
+    io::{self, BufReader, Read, Seek, Write},
     path::Path,
     str::FromStr,
 };
 use strum::EnumString;
 
 use crate::{
+    page_map_index::{load_or_build, IndexRecord, PageMapIndex},
     page_mapper::{JsonPageMapper, ParsedJsonSection},
     page_maps::{ImgPageMap, JsonDict},
     utils::{convert_to_py_object, invalid_data, parse_serde_json_value, read_skipping_ws},
@@ -159,6 +160,28 @@ impl DatumPageMapperImpl {
     }
 }
 
+impl PageMapIndex for DatumPageMapperImpl {
+    const KIND: &'static str = "datum";
+
+    fn write_index(&self, writer: &mut impl Write) -> Result<(), io::Error> {
+        self.dm_format_version.write_record(writer)?;
+        self.media_type.write_record(writer)?;
+        self.infos.write_record(writer)?;
+        self.categories.write_record(writer)?;
+        self.items.write_index(writer)
+    }
+
+    fn read_index(reader: &mut impl Read) -> Result<Self, io::Error> {
+        Ok(DatumPageMapperImpl {
+            dm_format_version: Option::<String>::read_record(reader)?,
+            media_type: Option::<i64>::read_record(reader)?,
+            infos: JsonDict::read_record(reader)?,
+            categories: JsonDict::read_record(reader)?,
+            items: ImgPageMap::read_index(reader)?,
+        })
+    }
+}
+
 #[pyclass]
 pub struct DatumPageMapper {
     reader: BufReader<File>,
@@ -168,10 +191,19 @@ pub struct DatumPageMapper {
 #[pymethods]
 impl DatumPageMapper {
     #[new]
-    fn py_new(path: String) -> PyResult<Self> {
+    #[pyo3(signature = (path, index_path=None))]
+    fn py_new(path: String, index_path: Option<String>) -> PyResult<Self> {
         let file = File::open(Path::new(&path))?;
         let mut reader = BufReader::new(file);
-        let mapper = DatumPageMapperImpl::new(&mut reader)?;
+        let mapper = match index_path {
+            Some(index_path) => load_or_build(
+                Path::new(&path),
+                Path::new(&index_path),
+                &mut reader,
+                DatumPageMapperImpl::new,
+            )?,
+            None => DatumPageMapperImpl::new(&mut reader)?,
+        };
 
         Ok(DatumPageMapper { reader, mapper })
     }
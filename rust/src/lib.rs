@@ -5,6 +5,7 @@
 pub mod coco_page_mapper;
 pub mod datum_page_mapper;
 pub mod json_section_page_mapper;
+pub mod page_map_index;
 mod page_mapper;
 mod page_maps;
 mod utils;
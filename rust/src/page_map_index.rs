@@ -0,0 +1,265 @@
+//  Copyright (C) 2024 Intel Corporation
+//
+//  SPDX-License-Identifier: MIT
+
+use crate::{page_maps::JsonDict, utils::invalid_data};
+use std::{
+    fs::File,
+    io::{self, BufReader, BufWriter, Read, Seek, Write},
+    path::Path,
+    time::UNIX_EPOCH,
+};
+
+const INDEX_MAGIC: &[u8; 8] = b"DMPGMAP\0";
+const INDEX_VERSION: u32 = 1;
+const HASH_PREFIX_SIZE: u64 = 1 << 20;
+
+/// Binary encoding of the page map index records (little-endian)
+pub trait IndexRecord: Sized {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()>;
+    fn read_record(reader: &mut impl Read) -> io::Result<Self>;
+}
+
+impl IndexRecord for u32 {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        writer.write_all(&self.to_le_bytes())
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let mut buf = [0u8; 4];
+        reader.read_exact(&mut buf)?;
+        Ok(u32::from_le_bytes(buf))
+    }
+}
+
+impl IndexRecord for u64 {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        writer.write_all(&self.to_le_bytes())
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let mut buf = [0u8; 8];
+        reader.read_exact(&mut buf)?;
+        Ok(u64::from_le_bytes(buf))
+    }
+}
+
+impl IndexRecord for i64 {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        writer.write_all(&self.to_le_bytes())
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let mut buf = [0u8; 8];
+        reader.read_exact(&mut buf)?;
+        Ok(i64::from_le_bytes(buf))
+    }
+}
+
+impl IndexRecord for usize {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        // usize::MAX is used as a null pointer, keep it platform independent
+        let value = if *self == usize::MAX {
+            u64::MAX
+        } else {
+            *self as u64
+        };
+        value.write_record(writer)
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let value = u64::read_record(reader)?;
+        if value == u64::MAX {
+            return Ok(usize::MAX);
+        }
+        usize::try_from(value).map_err(|_| invalid_data("The page index is out of range."))
+    }
+}
+
+impl IndexRecord for Vec<u8> {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        (self.len() as u64).write_record(writer)?;
+        writer.write_all(self)
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let size = u64::read_record(reader)?;
+        let mut buf = Vec::new();
+        reader.take(size).read_to_end(&mut buf)?;
+        if buf.len() as u64 != size {
+            return Err(invalid_data("The page map index is truncated."));
+        }
+        Ok(buf)
+    }
+}
+
+impl IndexRecord for String {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        self.as_bytes().to_vec().write_record(writer)
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        String::from_utf8(Vec::<u8>::read_record(reader)?)
+            .map_err(|_| invalid_data("The page map index has an invalid string."))
+    }
+}
+
+impl IndexRecord for JsonDict {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        serde_json::to_vec(self)?.write_record(writer)
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        Ok(serde_json::from_slice(&Vec::<u8>::read_record(reader)?)?)
+    }
+}
+
+impl<T: IndexRecord> IndexRecord for Option<T> {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        match self {
+            Some(v) => {
+                writer.write_all(&[1u8])?;
+                v.write_record(writer)
+            }
+            None => writer.write_all(&[0u8]),
+        }
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        let mut flag = [0u8; 1];
+        reader.read_exact(&mut flag)?;
+        match flag[0] {
+            0 => Ok(None),
+            1 => Ok(Some(T::read_record(reader)?)),
+            _ => Err(invalid_data(
+                "The page map index has an invalid option flag.",
+            )),
+        }
+    }
+}
+
+/// Identifies the content of the JSON file the page map was built from
+#[derive(Debug, PartialEq, Eq)]
+pub struct FileFingerprint {
+    size: u64,
+    mtime_secs: u64,
+    mtime_nanos: u32,
+    hash_prefix: u64,
+}
+
+impl FileFingerprint {
+    pub fn from_path(path: &Path) -> io::Result<Self> {
+        let metadata = std::fs::metadata(path)?;
+        let mtime = metadata
+            .modified()?
+            .duration_since(UNIX_EPOCH)
+            .map_err(|_| invalid_data("The file modification time is before the epoch."))?;
+
+        // FNV-1a is used to keep the hash stable across the builds
+        let mut hash_prefix: u64 = 0xcbf29ce484222325;
+        let mut buf = Vec::new();
+        File::open(path)?
+            .take(HASH_PREFIX_SIZE)
+            .read_to_end(&mut buf)?;
+        for byte in buf {
+            hash_prefix ^= byte as u64;
+            hash_prefix = hash_prefix.wrapping_mul(0x100000001b3);
+        }
+
+        Ok(FileFingerprint {
+            size: metadata.len(),
+            mtime_secs: mtime.as_secs(),
+            mtime_nanos: mtime.subsec_nanos(),
+            hash_prefix,
+        })
+    }
+}
+
+impl IndexRecord for FileFingerprint {
+    fn write_record(&self, writer: &mut impl Write) -> io::Result<()> {
+        self.size.write_record(writer)?;
+        self.mtime_secs.write_record(writer)?;
+        self.mtime_nanos.write_record(writer)?;
+        self.hash_prefix.write_record(writer)
+    }
+    fn read_record(reader: &mut impl Read) -> io::Result<Self> {
+        Ok(FileFingerprint {
+            size: u64::read_record(reader)?,
+            mtime_secs: u64::read_record(reader)?,
+            mtime_nanos: u32::read_record(reader)?,
+            hash_prefix: u64::read_record(reader)?,
+        })
+    }
+}
+
+/// A page mapper, which can be saved to and restored from the sidecar index file
+pub trait PageMapIndex: Sized {
+    /// Distinguishes the index files of different page mappers
+    const KIND: &'static str;
+
+    fn write_index(&self, writer: &mut impl Write) -> io::Result<()>;
+    fn read_index(reader: &mut impl Read) -> io::Result<Self>;
+}
+
+fn read_index_file<M: PageMapIndex>(
+    index_path: &Path,
+    fingerprint: &FileFingerprint,
+) -> io::Result<M> {
+    let mut reader = BufReader::new(File::open(index_path)?);
+
+    let mut magic = [0u8; 8];
+    reader.read_exact(&mut magic)?;
+    if &magic != INDEX_MAGIC
+        || u32::read_record(&mut reader)? != INDEX_VERSION
+        || String::read_record(&mut reader)? != M::KIND
+    {
+        return Err(invalid_data("The page map index has an unknown format."));
+    }
+    if FileFingerprint::read_record(&mut reader)? != *fingerprint {
+        return Err(invalid_data("The page map index is outdated."));
+    }
+
+    M::read_index(&mut reader)
+}
+
+fn write_index_file<M: PageMapIndex>(
+    mapper: &M,
+    index_path: &Path,
+    fingerprint: &FileFingerprint,
+) -> io::Result<()> {
+    let index_dir = index_path.parent().ok_or(invalid_data(
+        "The page map index path has no parent directory.",
+    ))?;
+
+    // Write to a temporary file first, so that the concurrent readers
+    // never observe a partially written index
+    let mut file = tempfile::NamedTempFile::new_in(index_dir)?;
+    {
+        let mut writer = BufWriter::new(file.as_file_mut());
+        writer.write_all(INDEX_MAGIC)?;
+        INDEX_VERSION.write_record(&mut writer)?;
+        M::KIND.to_string().write_record(&mut writer)?;
+        fingerprint.write_record(&mut writer)?;
+        mapper.write_index(&mut writer)?;
+        writer.flush()?;
+    }
+    file.persist(index_path)?;
+    Ok(())
+}
+
+/// Loads the page mapper from the index file, if it is valid for the given JSON file.
+/// Otherwise, builds the page mapper from the JSON file and saves the index.
+/// Failing to save the index, e.g. in a read-only location, is not an error.
+pub fn load_or_build<M, R, F>(path: &Path, index_path: &Path, reader: R, build: F) -> io::Result<M>
+where
+    M: PageMapIndex,
+    R: Read + Seek,
+    F: FnOnce(R) -> io::Result<M>,
+{
+    let fingerprint = FileFingerprint::from_path(path)?;
+
+    if let Ok(mapper) = read_index_file::<M>(index_path, &fingerprint) {
+        return Ok(mapper);
+    }
+
+    let mapper = build(reader)?;
+
+    // Don't save the index, if the file was changed while it was parsed
+    if FileFingerprint::from_path(path)? == fingerprint {
+        let _ = write_index_file(&mapper, index_path, &fingerprint);
+    }
+
+    Ok(mapper)
+}
@@ -2,8 +2,9 @@
 //
 //  SPDX-License-Identifier: MIT
 
-use crate::utils::{
-    invalid_data, parse_serde_json_value_from_page, read_skipping_ws, stream_error,
+use crate::{
+    page_map_index::IndexRecord,
+    utils::{invalid_data, parse_serde_json_value_from_page, read_skipping_ws, stream_error},
 };
 use std::{
     collections::HashMap,
@@ -35,7 +36,7 @@ pub struct ImgPage {
 }
 
 pub trait ItemPageMapKeyTrait:
-    std::cmp::Eq + std::hash::Hash + std::clone::Clone + std::fmt::Display
+    std::cmp::Eq + std::hash::Hash + std::clone::Clone + std::fmt::Display + IndexRecord
 {
     fn get_id(parsed_map: HashMap<String, JsonDict>, offset: u64) -> Result<Self, io::Error>
     where
@@ -134,6 +135,32 @@ where
     pub fn ids(&self) -> &Vec<T> {
         return &self.ids;
     }
+
+    pub fn write_index(&self, writer: &mut impl io::Write) -> Result<(), io::Error> {
+        (self.ids.len() as u64).write_record(writer)?;
+        for id in self.ids.iter() {
+            let page = self
+                .pages
+                .get(id)
+                .ok_or(invalid_data("Image id is not on the page map"))?;
+            id.write_record(writer)?;
+            page.offset.write_record(writer)?;
+            page.size.write_record(writer)?;
+        }
+        Ok(())
+    }
+
+    pub fn read_index(reader: &mut impl io::Read) -> Result<ImgPageMap<T>, io::Error> {
+        let mut page_map = ImgPageMap::default();
+        let n_pages = u64::read_record(reader)?;
+        for _ in 0..n_pages {
+            let id = T::read_record(reader)?;
+            let offset = u64::read_record(reader)?;
+            let size = u32::read_record(reader)?;
+            page_map.push(id, ImgPage { offset, size });
+        }
+        Ok(page_map)
+    }
 }
 
 impl<T> IntoIterator for ImgPageMap<T>
@@ -283,6 +310,59 @@ impl AnnPageMap {
     }
 }
 
+impl AnnPageMap {
+    pub fn write_index(&self, writer: &mut impl io::Write) -> Result<(), io::Error> {
+        (self.pages.len() as u64).write_record(writer)?;
+        for page in self.pages.iter() {
+            page.id.write_record(writer)?;
+            page.offset.write_record(writer)?;
+            page.size.write_record(writer)?;
+            page.ptr.write_record(writer)?;
+        }
+
+        (self.head_pointers.len() as u64).write_record(writer)?;
+        for (img_id, head) in self.head_pointers.iter() {
+            img_id.write_record(writer)?;
+            head.write_record(writer)?;
+        }
+        Ok(())
+    }
+
+    pub fn read_index(reader: &mut impl io::Read) -> Result<AnnPageMap, io::Error> {
+        let mut page_map = AnnPageMap::default();
+
+        let n_pages = u64::read_record(reader)?;
+        for _ in 0..n_pages {
+            page_map.pages.push(AnnPage {
+                id: i64::read_record(reader)?,
+                offset: u64::read_record(reader)?,
+                size: u32::read_record(reader)?,
+                ptr: usize::read_record(reader)?,
+            });
+        }
+
+        let n_heads = u64::read_record(reader)?;
+        for _ in 0..n_heads {
+            let img_id = i64::read_record(reader)?;
+            let head = usize::read_record(reader)?;
+            page_map.head_pointers.insert(img_id, head);
+        }
+
+        let n_pages = page_map.pages.len();
+        let is_valid_ptr = |ptr: usize| ptr == usize::MAX || ptr < n_pages;
+        if !page_map.pages.iter().all(|page| is_valid_ptr(page.ptr))
+            || !page_map
+                .head_pointers
+                .values()
+                .all(|head| is_valid_ptr(*head))
+        {
+            return Err(invalid_data("The annotation page map index is corrupted."));
+        }
+
+        Ok(page_map)
+    }
+}
+
 impl Default for AnnPageMap {
     fn default() -> Self {
         Self {
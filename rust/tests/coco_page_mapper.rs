@@ -4,7 +4,9 @@
 
 mod test_helpers;
 
-use datumaro_rust_api::coco_page_mapper::CocoPageMapperImpl;
+use datumaro_rust_api::{coco_page_mapper::CocoPageMapperImpl, page_map_index::load_or_build};
+use std::{fs::File, io, io::BufReader};
+use tempfile::tempdir;
 use test_helpers::prepare_reader;
 
 #[test]
@@ -75,3 +77,55 @@ fn test_panoptic_has_no_ann_id() {
 
     println!("{:?}", coco_page_mapper);
 }
+
+#[test]
+fn test_page_map_index() {
+    const EXAMPLE: &str = r#"
+    {"licenses":[{"name":"","id":0,"url":""}],"info":{"contributor":"","date_created":"","description":"","url":"","version":"","year":""},"categories":[{"id":1,"name":"a","supercategory":""}],"images":[{"id":5,"width":10,"height":5,"file_name":"a.jpg"},{"id":6,"width":10,"height":5,"file_name":"b.jpg"}],"annotations":[{"id":1,"image_id":5,"category_id":1,"bbox":[2.0,2.0,3.0,1.0]},{"id":2,"image_id":6,"category_id":1,"bbox":[2.0,2.0,3.0,1.0]},{"id":3,"image_id":5,"category_id":1,"bbox":[2.0,2.0,3.0,1.0]}]}
+    "#;
+
+    let (tempfile, mut reader) = prepare_reader(EXAMPLE);
+    let index_dir = tempdir().unwrap();
+    let index_path = index_dir.path().join("instances.pagemap");
+
+    let built = load_or_build(
+        tempfile.path(),
+        &index_path,
+        &mut reader,
+        CocoPageMapperImpl::new,
+    )
+    .unwrap();
+    assert!(index_path.exists());
+
+    let loaded = load_or_build(tempfile.path(), &index_path, &mut reader, |_| {
+        Err::<CocoPageMapperImpl, _>(io::Error::new(io::ErrorKind::Other, "Must be loaded"))
+    })
+    .unwrap();
+
+    assert_eq!(built.get_img_ids(), loaded.get_img_ids());
+    assert_eq!(built.categories(), loaded.categories());
+    for img_id in [5, 6] {
+        assert_eq!(
+            built.get_item_dict(&img_id, &mut reader).unwrap(),
+            loaded.get_item_dict(&img_id, &mut reader).unwrap()
+        );
+        assert_eq!(
+            built.get_anns_dict(img_id, &mut reader).unwrap(),
+            loaded.get_anns_dict(img_id, &mut reader).unwrap()
+        );
+    }
+
+    // The outdated index must be rebuilt
+    std::fs::write(tempfile.path(), EXAMPLE.replace("a.jpg", "c.jpg")).unwrap();
+    let mut reader = BufReader::new(File::open(tempfile.path()).unwrap());
+    let rebuilt = load_or_build(
+        tempfile.path(),
+        &index_path,
+        &mut reader,
+        CocoPageMapperImpl::new,
+    )
+    .unwrap();
+
+    let item = rebuilt.get_item_dict(&5, &mut reader).unwrap();
+    assert_eq!(item["file_name"].as_str(), Some("c.jpg"));
+}
@@ -3,7 +3,9 @@
 //  SPDX-License-Identifier: MIT
 mod test_helpers;
 
-use datumaro_rust_api::datum_page_mapper::DatumPageMapperImpl;
+use datumaro_rust_api::{datum_page_mapper::DatumPageMapperImpl, page_map_index::load_or_build};
+use std::io;
+use tempfile::tempdir;
 use test_helpers::prepare_reader;
 
 #[test]
@@ -28,3 +30,39 @@ fn test_instance() {
         println!("{:?}", item);
     }
 }
+
+#[test]
+fn test_page_map_index() {
+    const EXAMPLE: &str = r#"{"dm_format_version": "1.0", "media_type": 2, "infos": {"string": "test"}, "categories": {"label": {"labels": [{"name": "cat0", "parent": "", "attributes": []}], "label_groups": [], "attributes": []}}, "items": [{"id": "42", "annotations": [], "image": {"path": "42.jpg", "size": [10, 6]}}, {"id": "43", "annotations": [], "image": {"path": "43.qq", "size": [2, 4]}}]}
+    "#;
+
+    let (tempfile, mut reader) = prepare_reader(EXAMPLE);
+    let index_dir = tempdir().unwrap();
+    let index_path = index_dir.path().join("default.pagemap");
+
+    let built = load_or_build(
+        tempfile.path(),
+        &index_path,
+        &mut reader,
+        DatumPageMapperImpl::new,
+    )
+    .unwrap();
+    assert!(index_path.exists());
+
+    let loaded = load_or_build(tempfile.path(), &index_path, &mut reader, |_| {
+        Err::<DatumPageMapperImpl, _>(io::Error::new(io::ErrorKind::Other, "Must be loaded"))
+    })
+    .unwrap();
+
+    assert_eq!(built.dm_format_version(), loaded.dm_format_version());
+    assert_eq!(built.media_type(), loaded.media_type());
+    assert_eq!(built.infos(), loaded.infos());
+    assert_eq!(built.categories(), loaded.categories());
+    assert_eq!(built.get_img_ids(), loaded.get_img_ids());
+    for img_id in loaded.get_img_ids() {
+        assert_eq!(
+            built.get_item_dict(img_id, &mut reader).unwrap(),
+            loaded.get_item_dict(img_id, &mut reader).unwrap()
+        );
+    }
+}
@@ -26,10 +26,15 @@
 // of the authors and should not be interpreted as representing official policies,
 // either expressed or implied, of the FreeBSD Project.
 
+#include <algorithm>
+#include <cmath>
 #include <cstdint>
 #include <memory>
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+#include <stdexcept>
+#include <string>
 #include <vector>
 
 namespace py = pybind11;
@@ -100,10 +105,394 @@ py::dict pyRleEncode(py::array_t<std::uint8_t, py::array::f_style | py::array::f
     return dict;
 }
 
+// The RLE operations below work on the run lengths directly, without decoding masks.
+// The runs are stored in the column-major order, and they start from a run of zeros.
+typedef std::vector<uint> Counts;
+
+struct RleData
+{
+    siz h, w;
+    Counts cnts;
+};
+
+// Merges adjacent runs of the same value and skips empty runs
+struct RleBuilder
+{
+    RleBuilder() : cnts(1, 0), v(0) {}
+
+    void push(siz n, byte value)
+    {
+        if (!n)
+            return;
+        if (value == v)
+            cnts.back() += n;
+        else
+        {
+            cnts.push_back(n);
+            v = value;
+        }
+    }
+
+    Counts cnts;
+    byte v;
+};
+
+// Reads the runs sequentially, the positions can only grow between the calls
+struct RleCursor
+{
+    explicit RleCursor(const Counts &cnts) : cnts(cnts), i(0), pos(0) {}
+
+    // Calls f(length, value) for the runs in the [p; q) range
+    template <typename F>
+    void scan(siz p, siz q, F f)
+    {
+        while (i < cnts.size() && pos + cnts[i] <= p)
+            pos += cnts[i++];
+        while (p < q)
+        {
+            if (i >= cnts.size())
+            {
+                // The missing runs are zeros
+                f(q - p, 0);
+                return;
+            }
+            const siz end = pos + cnts[i];
+            const siz e = std::min(end, q);
+            f(e - p, (byte)(i % 2));
+            p = e;
+            if (p == end)
+                pos += cnts[i++];
+        }
+    }
+
+    const Counts &cnts;
+    siz i, pos;
+};
+
+// Decodes compressed RLE counts, ported from pycocotools
+void rleFrString(const std::string &s, Counts &cnts)
+{
+    const siz n = s.size();
+    siz p = 0;
+    cnts.clear();
+    while (p < n && s[p])
+    {
+        long x = 0;
+        siz k = 0;
+        int more = 1;
+        while (more && p < n)
+        {
+            const long c = (long)s[p] - 48;
+            x |= (c & 0x1f) << 5 * k;
+            more = c & 0x20;
+            p++;
+            k++;
+            if (!more && (c & 0x10))
+                x |= ~((1L << 5 * k) - 1);
+        }
+        const siz m = cnts.size();
+        if (m > 2)
+            x += (long)cnts[m - 2];
+        cnts.push_back((uint)x);
+    }
+}
+
+// Encodes RLE counts to the compressed string, ported from pycocotools
+std::string rleToString(const Counts &cnts)
+{
+    std::string s;
+    s.reserve(cnts.size() * 6);
+    for (siz i = 0; i < cnts.size(); i++)
+    {
+        long x = (long)cnts[i];
+        if (i > 2)
+            x -= (long)cnts[i - 2];
+        int more = 1;
+        while (more)
+        {
+            char c = x & 0x1f;
+            x >>= 5;
+            more = (c & 0x10) ? x != -1 : x != 0;
+            if (more)
+                c |= 0x20;
+            c += 48;
+            s.push_back(c);
+        }
+    }
+    return s;
+}
+
+RleData rleFromPy(const py::dict &rle)
+{
+    const auto size = rle["size"].cast<std::vector<long>>();
+    if (size.size() != 2 || size[0] < 0 || size[1] < 0)
+        throw std::invalid_argument("RLE size should be a pair of non-negative integers.");
+
+    RleData data;
+    data.h = size[0];
+    data.w = size[1];
+
+    const py::object counts = rle["counts"];
+    if (py::isinstance<py::bytes>(counts) || py::isinstance<py::str>(counts))
+        rleFrString(counts.cast<std::string>(), data.cnts);
+    else
+    {
+        const auto arr = py::array_t<uint, py::array::c_style | py::array::forcecast>::ensure(counts);
+        if (!arr || arr.ndim() != 1)
+            throw std::invalid_argument("RLE counts should be a string or a 1d sequence.");
+        data.cnts.assign(arr.data(), arr.data() + arr.size());
+    }
+    return data;
+}
+
+py::dict rleToPy(siz h, siz w, const Counts &cnts)
+{
+    py::list size(2);
+    size[0] = h;
+    size[1] = w;
+
+    py::dict dict;
+    dict["size"] = size;
+    dict["counts"] = py::bytes(rleToString(cnts));
+    return dict;
+}
+
+siz rleArea(const Counts &cnts)
+{
+    siz a = 0;
+    for (siz i = 1; i < cnts.size(); i += 2)
+        a += cnts[i];
+    return a;
+}
+
+// Computes the [x, y, w, h] bounding box, in the same way as pycocotools does
+std::vector<siz> rleBbox(const RleData &rle)
+{
+    const siz h = rle.h;
+    siz m = (rle.cnts.size() / 2) * 2;
+    if (!m || !h)
+        return {0, 0, 0, 0};
+
+    siz xs = rle.w, ys = h, xe = 0, ye = 0, cc = 0, xp = 0;
+    bool empty = true;
+    for (siz j = 0; j < m; j++)
+    {
+        cc += rle.cnts[j];
+        if (j % 2 && !rle.cnts[j])
+            continue;
+        if (j % 2 == 0 && !rle.cnts[j + 1])
+            continue;
+        const siz t = cc - j % 2;
+        const siz y = t % h, x = (t - y) / h;
+        if (j % 2 == 0)
+            xp = x;
+        else if (xp < x)
+        {
+            // The run crosses a column border
+            ys = 0;
+            ye = h - 1;
+        }
+        xs = std::min(xs, x);
+        xe = std::max(xe, x);
+        ys = std::min(ys, y);
+        ye = std::max(ye, y);
+        empty = false;
+    }
+    if (empty)
+        return {0, 0, 0, 0};
+    return {xs, ys, xe - xs + 1, ye - ys + 1};
+}
+
+enum class RleOp
+{
+    Union,
+    Intersect,
+    Subtract,
+};
+
+Counts rleCombine(const RleData &a, const RleData &b, RleOp op)
+{
+    if (a.h != b.h || a.w != b.w)
+        throw std::invalid_argument("RLE masks should have the same size.");
+
+    // Splits the runs of the first mask by the runs of the second one
+    RleBuilder builder;
+    RleCursor cursor(a.cnts);
+    siz p = 0;
+    const siz n = a.h * a.w;
+    for (siz i = 0; i < b.cnts.size() && p < n; i++)
+    {
+        const siz q = std::min(p + b.cnts[i], n);
+        const byte vb = i % 2;
+        cursor.scan(p, q, [&](siz len, byte va) {
+            byte v;
+            switch (op)
+            {
+            case RleOp::Union:
+                v = va | vb;
+                break;
+            case RleOp::Intersect:
+                v = va & vb;
+                break;
+            default:
+                v = va & !vb;
+                break;
+            }
+            builder.push(len, v);
+        });
+        p = q;
+    }
+    if (p < n)
+        cursor.scan(p, n, [&](siz len, byte va) { builder.push(len, op == RleOp::Intersect ? 0 : va); });
+    return std::move(builder.cnts);
+}
+
+py::int_ pyArea(const py::dict &rle)
+{
+    return py::int_(rleArea(rleFromPy(rle).cnts));
+}
+
+py::tuple pyBbox(const py::dict &rle)
+{
+    const auto bbox = rleBbox(rleFromPy(rle));
+    return py::make_tuple(bbox[0], bbox[1], bbox[2], bbox[3]);
+}
+
+py::dict pyMerge(const py::list &rles, bool intersect)
+{
+    if (rles.empty())
+        throw std::invalid_argument("At least one RLE mask is required.");
+
+    RleData merged = rleFromPy(rles[0].cast<py::dict>());
+    for (siz i = 1; i < rles.size(); i++)
+        merged.cnts = rleCombine(merged, rleFromPy(rles[i].cast<py::dict>()),
+                                 intersect ? RleOp::Intersect : RleOp::Union);
+    if (rles.size() == 1)
+    {
+        // Normalizes the runs
+        RleBuilder builder;
+        RleCursor(merged.cnts).scan(0, merged.h * merged.w, [&](siz len, byte v) { builder.push(len, v); });
+        merged.cnts = std::move(builder.cnts);
+    }
+    return rleToPy(merged.h, merged.w, merged.cnts);
+}
+
+py::dict pySubtract(const py::dict &rle, const py::dict &other)
+{
+    const RleData a = rleFromPy(rle);
+    return rleToPy(a.h, a.w, rleCombine(a, rleFromPy(other), RleOp::Subtract));
+}
+
+py::dict pyCrop(const py::dict &rle, long x, long y, long w, long h)
+{
+    if (w < 0 || h < 0)
+        throw std::invalid_argument("Crop size should be non-negative.");
+
+    const RleData src = rleFromPy(rle);
+    const long sh = src.h, sw = src.w;
+
+    // The parts out of the mask are filled with zeros
+    const long y0 = std::min(std::max(y, 0L), sh), y1 = std::min(std::max(y + h, 0L), sh);
+    const siz top = (siz)(std::max(y0 - y, 0L)), rows = (siz)(std::max(y1 - y0, 0L));
+    const siz bottom = (siz)h - top - rows;
+
+    RleBuilder builder;
+    RleCursor cursor(src.cnts);
+    auto push = [&](siz len, byte v) { builder.push(len, v); };
+    for (long cx = 0; cx < w; cx++)
+    {
+        const long sx = x + cx;
+        if (sx < 0 || sx >= sw || !rows)
+        {
+            builder.push(h, 0);
+            continue;
+        }
+        builder.push(top, 0);
+        const siz begin = (siz)sx * sh + y0;
+        cursor.scan(begin, begin + rows, push);
+        builder.push(bottom, 0);
+    }
+    return rleToPy(h, w, builder.cnts);
+}
+
+// Scales the mask with the nearest neighbor interpolation, like cv2.INTER_NEAREST does
+py::dict pyResize(const py::dict &rle, long h, long w)
+{
+    if (w < 0 || h < 0)
+        throw std::invalid_argument("The new size should be non-negative.");
+
+    const RleData src = rleFromPy(rle);
+    const siz sh = src.h, sw = src.w, dh = h, dw = w;
+
+    RleBuilder builder;
+    if (!sh || !sw)
+    {
+        builder.push(dh * dw, 0);
+        return rleToPy(dh, dw, builder.cnts);
+    }
+
+    const double ifx = 1. / ((double)dw / sw), ify = 1. / ((double)dh / sh);
+    std::vector<siz> rowMap(dh);
+    for (siz y = 0; y < dh; y++)
+        rowMap[y] = std::min((siz)std::floor(y * ify), sh - 1);
+
+    RleCursor cursor(src.cnts);
+    std::vector<std::pair<siz, byte>> column;
+    siz prevSx = sw;
+    for (siz x = 0; x < dw; x++)
+    {
+        const siz sx = std::min((siz)std::floor(x * ifx), sw - 1);
+        if (sx != prevSx)
+        {
+            // Maps the source column runs to the destination rows
+            column.clear();
+            siz sy = 0, dy = 0;
+            cursor.scan(sx * sh, (sx + 1) * sh, [&](siz len, byte v) {
+                sy += len;
+                const siz end = std::lower_bound(rowMap.begin() + dy, rowMap.end(), sy) - rowMap.begin();
+                if (end > dy)
+                    column.emplace_back(end - dy, v);
+                dy = end;
+            });
+            prevSx = sx;
+        }
+        for (const auto &run : column)
+            builder.push(run.first, run.second);
+    }
+    return rleToPy(dh, dw, builder.cnts);
+}
+
 PYBIND11_MODULE(_capi, m)
 {
     m.def("encode",
           &pyRleEncode,
           "A function to encode 2D binary mask with uncompressed run-length encoding (RLE).",
           py::arg("mask"));
+    m.def("area", &pyArea, "Computes the area of an RLE mask.", py::arg("rle"));
+    m.def("bbox", &pyBbox, "Computes the (x, y, w, h) bounding box of an RLE mask.", py::arg("rle"));
+    m.def("merge",
+          &pyMerge,
+          "Computes the union or the intersection of RLE masks of the same size.",
+          py::arg("rles"),
+          py::arg("intersect") = false);
+    m.def("subtract",
+          &pySubtract,
+          "Removes the pixels of the other RLE mask from the RLE mask.",
+          py::arg("rle"),
+          py::arg("other"));
+    m.def("crop",
+          &pyCrop,
+          "Crops an RLE mask to the (x, y, w, h) box. The box can go out of the mask, "
+          "the outer parts are filled with zeros.",
+          py::arg("rle"),
+          py::arg("x"),
+          py::arg("y"),
+          py::arg("w"),
+          py::arg("h"));
+    m.def("resize",
+          &pyResize,
+          "Scales an RLE mask to the (h, w) size with the nearest neighbor interpolation.",
+          py::arg("rle"),
+          py::arg("h"),
+          py::arg("w"));
 }
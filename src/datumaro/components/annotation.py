@@ -486,19 +486,27 @@ class RleMask(Mask):
         return mask_utils.decode(rle)
 
     def get_area(self) -> int:
-        from pycocotools import mask as mask_utils
+        from datumaro.util.mask_tools import rle_area
 
-        return mask_utils.area(self.rle)
+        return rle_area(self.rle)
 
     def get_bbox(self) -> Tuple[int, int, int, int]:
-        from pycocotools import mask as mask_utils
+        from datumaro.util.mask_tools import rle_bbox
 
-        return mask_utils.toBbox(self.rle)
+        return rle_bbox(self.rle)
+
+    @staticmethod
+    def _normalize_rle(rle):
+        # The compressed counts can be given as str (e.g. when read from JSON) or as bytes
+        counts = rle["counts"]
+        if isinstance(counts, str):
+            counts = counts.encode()
+        return {"counts": counts, "size": list(rle["size"])}
 
     def __eq__(self, other):
         if not isinstance(other, __class__):
             return super().__eq__(other)
-        return self.rle == other.rle
+        return self._normalize_rle(self.rle) == self._normalize_rle(other.rle)
 
 
 CompiledMaskImage = np.ndarray  # 2d of integers (of different precision)
@@ -527,7 +535,7 @@ class CompiledMask:
                 mask. By default, mask labels are used.
         """
 
-        from datumaro.util.mask_tools import make_index_mask
+        from datumaro.util.mask_tools import paint_segments
 
         instance_ids = instance_ids or []
         instance_labels = instance_labels or []
@@ -550,24 +558,23 @@ class CompiledMask:
         #
         # Basically, a mask can be quite large (e.g. 10k x 10k @ int32 etc.),
         # so we can only afford having just few copies in
-        # memory simultaneously.
-
-        it = iter(masks)
+        # memory simultaneously. RLE masks are decoded and painted
+        # in their bounding boxes only.
 
         instance_map = [0]
         class_map = [0]
+        index_mask = None
 
-        m, idx, instance_id, class_id = next(it)
-        if not class_id:
-            idx = 0
-        index_mask = make_index_mask(m.image, idx, dtype=index_dtype)
-        instance_map.append(instance_id)
-        class_map.append(class_id)
-
-        for m, idx, instance_id, class_id in it:
+        for m, idx, instance_id, class_id in masks:
             if not class_id:
                 idx = 0
-            index_mask = np.where(m.image, idx, index_mask)
+
+            segment = m.rle if isinstance(m, RleMask) else np.asarray(m.image)
+            if index_mask is None:
+                shape = segment["size"] if isinstance(segment, dict) else segment.shape
+                index_mask = np.zeros(shape, dtype=index_dtype)
+            paint_segments(index_mask, [(segment, idx)])
+
             instance_map.append(instance_id)
             class_map.append(class_id)
 
@@ -19,12 +19,15 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
     overload,
 )
 
+import numpy as np
+
 from datumaro.components.annotation import Annotation, AnnotationType, LabelCategories
 from datumaro.components.config_model import Source
 from datumaro.components.dataset_base import (
@@ -35,11 +38,13 @@ from datumaro.components.dataset_base import (
     DatasetItem,
     IDataset,
 )
-from datumaro.components.dataset_item_storage import DatasetItemStorageDatasetView
+from datumaro.components.dataset_item_storage import DatasetItemIndex, DatasetItemStorageDatasetView
 from datumaro.components.dataset_storage import DatasetPatch, DatasetStorage, StreamDatasetStorage
 from datumaro.components.environment import DEFAULT_ENVIRONMENT, Environment
 from datumaro.components.errors import (
     DatasetImportError,
+    MediaShapeError,
+    MediaTypeError,
     MultipleFormatsMatchError,
     NoMatchingFormatsError,
     StreamedItemError,
@@ -59,6 +64,7 @@ from datumaro.components.merge import DEFAULT_MERGE_POLICY
 from datumaro.components.progress_reporting import NullProgressReporter, ProgressReporter
 from datumaro.components.task import TaskType
 from datumaro.components.transformer import ItemTransform, ModelTransform, Transform
+from datumaro.util.fs_snapshot import fs_snapshot
 from datumaro.util.log_utils import logging_disabled
 from datumaro.util.meta_file_util import load_hash_key
 from datumaro.util.os_util import rmtree
@@ -348,6 +354,23 @@ class Dataset(IDataset):
             path = osp.join(self._source_path, path)
         return self._data.get_datasetitem_by_path(path)
 
+    @property
+    def index(self) -> DatasetItemIndex:
+        """
+        Returns the index of the dataset items by the labels, the types and
+        the attributes of their annotations. The index is built on the first
+        request, and it is updated with the dataset items put and removed.
+        It is not available for stream datasets.
+
+        Example:
+            - Get the items with the "car" label annotations::
+
+                label_id, _ = dataset.categories()[AnnotationType.label].find("car")
+                for item_id, subset in dataset.index.items_with_label(label_id):
+                    item = dataset.get(item_id, subset)
+        """
+        return self._data.index
+
     def get_label_cat_names(self):
         return [
             label.name
@@ -818,24 +841,26 @@ class Dataset(IDataset):
         if env is None:
             env = DEFAULT_ENVIRONMENT
 
-        if not format:
-            format = cls.detect(path, env=env)
-
-        extractor_merger = None
-        # TODO: remove importers, put this logic into extractors
-        if format in env.importers:
-            importer = env.make_importer(format)
-            with logging_disabled(log.INFO):
-                detected_sources = (
-                    importer(path, stream=cls._stream, **kwargs)
-                    if importer.can_stream
-                    else importer(path, **kwargs)
-                )
-            extractor_merger = importer.get_extractor_merger()
-        elif format in env.extractors:
-            detected_sources = [{"url": path, "format": format, "options": kwargs}]
-        else:
-            raise UnknownFormatError(format)
+        # The format detection and the source search share the directory listings
+        with fs_snapshot(path):
+            if not format:
+                format = cls.detect(path, env=env)
+
+            extractor_merger = None
+            # TODO: remove importers, put this logic into extractors
+            if format in env.importers:
+                importer = env.make_importer(format)
+                with logging_disabled(log.INFO):
+                    detected_sources = (
+                        importer(path, stream=cls._stream, **kwargs)
+                        if importer.can_stream
+                        else importer(path, **kwargs)
+                    )
+                extractor_merger = importer.get_extractor_merger()
+            elif format in env.extractors:
+                detected_sources = [{"url": path, "format": format, "options": kwargs}]
+            else:
+                raise UnknownFormatError(format)
 
         # TODO: probably, should not be available in lazy mode, because it
         # becomes unreliable and error-prone. For progress reporting it
@@ -950,6 +975,40 @@ class Dataset(IDataset):
             return self._data[idx]
         raise StreamedItemError()
 
+    def as_numpy_batch(self, indices: Sequence[int]) -> np.ndarray:
+        """
+        Stacks the images of the items at the given positions into a single array.
+
+        The images loaded from array-native formats (e.g. MNIST, CIFAR) are
+        views into the source arrays, so no per-item decoding is done for them.
+
+        Args:
+            indices: Positions of the items in the dataset
+
+        Returns:
+            An array of the (N, H, W) or (N, H, W, C) shape
+        """
+        if self.is_stream:
+            raise StreamedItemError()
+
+        images = []
+        for idx in indices:
+            item = self._data[idx]
+            if not isinstance(item.media, Image) or not item.media.has_data:
+                raise MediaTypeError(f"Item '{item.id}' at position {idx} has no image data")
+
+            image = item.media.data
+            if images and image.shape != images[0].shape:
+                raise MediaShapeError(
+                    f"Item '{item.id}' at position {idx} has an image of the {image.shape} "
+                    f"shape, but {images[0].shape} is expected"
+                )
+            images.append(image)
+
+        if not images:
+            return np.empty((0, 0, 0), dtype=np.uint8)
+        return np.stack(images)
+
 
 class StreamDataset(Dataset):
     _stream = True
@@ -2,17 +2,25 @@
 #
 # SPDX-License-Identifier: MIT
 
+from collections import defaultdict
 from copy import copy
 from enum import Enum, auto
-from typing import Any, Iterator, Optional, Tuple, Type, Union
+from typing import Any, Dict, FrozenSet, Hashable, Iterator, Optional, Set, Tuple, Type, Union
 
 from datumaro.components.annotation import AnnotationType
 from datumaro.components.dataset_base import CategoriesInfo, DatasetInfo, DatasetItem, IDataset
 from datumaro.components.media import MediaElement
 from datumaro.components.task import TaskType
+from datumaro.util import NOTSET
 from datumaro.util.definitions import DEFAULT_SUBSET_NAME
 
-__all__ = ["ItemStatus", "DatasetItemStorage", "DatasetItemStorageDatasetView"]
+__all__ = [
+    "ItemStatus",
+    "DatasetItemIndex",
+    "DatasetItemStorage",
+    "DatasetItemStorageDatasetView",
+    "find_item_index",
+]
 
 
 class ItemStatus(Enum):
@@ -21,11 +29,96 @@ class ItemStatus(Enum):
     removed = auto()
 
 
+class DatasetItemIndex:
+    """
+    An inverted index of dataset items by the labels, the types and
+    the attributes of their annotations.
+
+    The index is kept by the item storage, and it is updated
+    with the items put and removed. The queries return the (id, subset)
+    pairs of the matching items.
+    """
+
+    def __init__(self):
+        self._items: Dict[Hashable, Set[Tuple[str, str]]] = defaultdict(set)  # key -> item ids
+        self._item_keys: Dict[Tuple[str, str], Set[Hashable]] = {}  # item id -> keys
+
+    @staticmethod
+    def _get_keys(item: DatasetItem) -> Set[Hashable]:
+        keys = set()
+        for ann in item.annotations:
+            keys.add(("type", ann.type))
+
+            label = getattr(ann, "label", None)
+            if label is not None:
+                keys.add(("label", label))
+
+            for name, value in ann.attributes.items():
+                keys.add(("attr", name))
+                try:
+                    # The type is a part of the key, because the equal values
+                    # of different types have the same hash, e.g. True and 1
+                    keys.add(("attr", name, type(value), value))
+                except TypeError:
+                    pass  # unhashable values are only indexed by the name
+        return keys
+
+    def add(self, item: DatasetItem) -> None:
+        item_id = (item.id, item.subset)
+        self.remove(item_id)
+
+        keys = self._get_keys(item)
+        for key in keys:
+            self._items[key].add(item_id)
+        self._item_keys[item_id] = keys
+
+    def remove(self, item_id: Tuple[str, str]) -> None:
+        for key in self._item_keys.pop(item_id, ()):
+            item_ids = self._items[key]
+            item_ids.discard(item_id)
+            if not item_ids:
+                del self._items[key]
+
+    def _find(self, key: Hashable) -> FrozenSet[Tuple[str, str]]:
+        return frozenset(self._items.get(key, ()))
+
+    def items_with_label(self, label: int) -> FrozenSet[Tuple[str, str]]:
+        """Returns the items having annotations with the label id"""
+        return self._find(("label", label))
+
+    def items_with_ann_type(self, ann_type: AnnotationType) -> FrozenSet[Tuple[str, str]]:
+        """Returns the items having annotations of the type"""
+        return self._find(("type", ann_type))
+
+    def items_with_attribute(self, name: str, value: Any = NOTSET) -> FrozenSet[Tuple[str, str]]:
+        """
+        Returns the items having annotations with the attribute.
+        If the value is specified, the attribute value must be equal to it
+        and have the same type.
+        """
+        if value is NOTSET:
+            return self._find(("attr", name))
+        return self._find(("attr", name, type(value), value))
+
+    def __len__(self) -> int:
+        return len(self._item_keys)
+
+
 class DatasetItemStorage:
     def __init__(self):
         self.data = {}  # { subset_name: { id: DatasetItem } }
         self._traversal_order = {}  # maintain the order of elements
         self._order = []  # allow indexing
+        self._index = None  # built on the first request
+
+    @property
+    def index(self) -> DatasetItemIndex:
+        if self._index is None:
+            index = DatasetItemIndex()
+            for item in self._traversal_order.values():
+                index.add(item)
+            self._index = index
+        return self._index
 
     def __iter__(self) -> Iterator[DatasetItem]:
         for item in self._traversal_order.values():
@@ -45,6 +138,8 @@ class DatasetItemStorage:
         if is_new:
             self._order.append((item.id, item.subset))
         subset[item.id] = item
+        if self._index is not None:
+            self._index.add(item)
         return is_new
 
     def get(
@@ -72,6 +167,8 @@ class DatasetItemStorage:
             # TODO : investigate why "del subset_data[id]" cannot replace "subset_data[id] = None".
             self._traversal_order.pop((id, subset))
             self._order.remove((id, subset))
+            if self._index is not None:
+                self._index.remove((id, subset))
         return is_removed
 
     def __contains__(self, x: Union[DatasetItem, Tuple[str, str]]) -> bool:
@@ -193,6 +290,10 @@ class DatasetItemStorageDatasetView(IDataset):
     def __len__(self):
         return len(self._parent)
 
+    @property
+    def index(self) -> DatasetItemIndex:
+        return self._parent.index
+
     def infos(self):
         return self._infos
 
@@ -216,3 +317,15 @@ class DatasetItemStorageDatasetView(IDataset):
 
     def task_type(self):
         return self._task_type
+
+
+def find_item_index(dataset: IDataset) -> Optional[DatasetItemIndex]:
+    """
+    Returns the item index of the dataset, if the dataset is a view of
+    the in-memory items (e.g. the source of the dataset transforms).
+    Otherwise, returns None.
+    """
+
+    if isinstance(dataset, DatasetItemStorageDatasetView):
+        return dataset.index
+    return None
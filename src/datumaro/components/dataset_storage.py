@@ -15,6 +15,7 @@ from datumaro.components.dataset_base import (
     IDataset,
 )
 from datumaro.components.dataset_item_storage import (
+    DatasetItemIndex,
     DatasetItemStorage,
     DatasetItemStorageDatasetView,
     ItemStatus,
@@ -522,6 +523,14 @@ class DatasetStorage(IDataset):
     def get_datasetitem_by_path(self, path: str) -> Optional[DatasetItem]:
         return self._storage.get_datasetitem_by_path(path)
 
+    @property
+    def index(self) -> DatasetItemIndex:
+        # The index is built over the cached items, and it is kept up to date
+        # by put() and remove(). Transforms replace the cache, so the index
+        # is rebuilt on the next request.
+        self.init_cache()
+        return self._storage.index
+
     def transform(self, method: Type[Transform], *args, **kwargs) -> None:
         # Flush accumulated changes
         if not self._storage.is_empty():
@@ -753,6 +762,10 @@ class StreamDatasetStorage(DatasetStorage):
     def get_datasetitem_by_path(self, path: str) -> Optional[DatasetItem]:
         raise NotAvailableError("Get dataset item by path is not allowed in streaming.")
 
+    @property
+    def index(self) -> DatasetItemIndex:
+        raise NotAvailableError("The item index is not available in streaming.")
+
     def get_patch(self):
         raise NotAvailableError("Get patch is not allowed in streaming.")
 
@@ -27,6 +27,7 @@ from datumaro.components.registry import (
     TransformRegistry,
     ValidatorRegistry,
 )
+from datumaro.util.fs_snapshot import fs_snapshot, iglob
 from datumaro.util.os_util import get_all_file_extensions, import_foreign_module, split_path
 
 
@@ -232,27 +233,32 @@ class Environment:
         ignore_dirs = {"__MSOSX", "__MACOSX"}
         all_matched_formats: Set[DetectedFormat] = set()
 
-        extensions = get_all_file_extensions(path, ignore_dirs) or [""]
-
-        importers = {
-            (name, importer.get_plugin_cls() if self._use_lazy_import else importer)
-            for extension in extensions
-            for name, importer in self.importers.extension_groups.get(extension, [])
-        }
-        for _ in range(depth + 1):
-            detected_formats = detect_dataset_format(
-                ((format_name, importer.detect) for format_name, importer in importers),
-                path,
-                rejection_callback=rejection_callback,
-            )
-
-            if detected_formats:
-                all_matched_formats |= set(detected_formats)
-
-            paths = glob.glob(osp.join(path, "*"))
-            path = "" if len(paths) != 1 else paths[0]
-            if not osp.isdir(path) or osp.basename(path) in ignore_dirs:
-                break
+        # All the detectors share the directory listings
+        with fs_snapshot(path):
+            extensions = get_all_file_extensions(path, ignore_dirs) or [""]
+
+            importers = {
+                (name, importer.get_plugin_cls() if self._use_lazy_import else importer)
+                for extension in extensions
+                for name, importer in self.importers.extension_groups.get(extension, [])
+            }
+            for _ in range(depth + 1):
+                detected_formats = detect_dataset_format(
+                    (
+                        (format_name, importer.detect, importer.get_max_detect_confidence())
+                        for format_name, importer in importers
+                    ),
+                    path,
+                    rejection_callback=rejection_callback,
+                )
+
+                if detected_formats:
+                    all_matched_formats |= set(detected_formats)
+
+                paths = list(iglob(osp.join(path, "*")))
+                path = "" if len(paths) != 1 else paths[0]
+                if not osp.isdir(path) or osp.basename(path) in ignore_dirs:
+                    break
 
         max_conf = (
             max(all_matched_formats).confidence
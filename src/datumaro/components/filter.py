@@ -4,7 +4,8 @@
 from __future__ import annotations
 
 import logging as log
-from typing import TYPE_CHECKING, Callable, Optional
+import re
+from typing import TYPE_CHECKING, Callable, FrozenSet, Optional, Tuple
 
 # Disable B410: import_lxml - the library is used for writing
 from lxml import etree as ET  # nosec
@@ -22,6 +23,8 @@ from datumaro.components.annotation import (
     Polygon,
     PolyLine,
 )
+from datumaro.components.dataset_item_storage import find_item_index
+from datumaro.components.filter_compiler import compile_xpath
 from datumaro.components.media import Image
 from datumaro.components.transformer import ItemTransform
 
@@ -268,10 +271,56 @@ class DatasetItemEncoder:
         return ET.tostring(encoded_item, encoding="unicode", pretty_print=True)
 
 
+# The expressions that select items or annotations by a single label or
+# annotation type. They can be answered from the item index of the dataset.
+_INDEXED_VALUE = (
+    r"\s*(?P<field>label|type)\s*=\s*(?P<quote>['\"])(?P<value>(?:(?!(?P=quote)).)*)(?P=quote)\s*"
+)
+_INDEXED_ITEM_XPATH = re.compile(r"\s*/item\s*\[\s*annotation\s*/" + _INDEXED_VALUE + r"\]\s*")
+_INDEXED_ANNOTATION_XPATH = re.compile(
+    r"\s*/item\s*/\s*annotation\s*\[" + _INDEXED_VALUE + r"\]\s*"
+)
+
+
+def _find_indexed_candidates(
+    extractor: IDataset, match: Optional[re.Match]
+) -> Optional[FrozenSet[Tuple[str, str]]]:
+    """
+    Returns the ids of the items, which can match the expression, using
+    the item index of the dataset. Returns None, if the index can't be used.
+    """
+
+    if match is None:
+        return None
+
+    field, value = match.group("field"), match.group("value")
+    if not value:
+        # Unlabeled annotations are encoded with an empty label
+        return None
+
+    index = find_item_index(extractor)
+    if index is None:
+        return None
+
+    # Annotation attributes are encoded in the same way as the fields
+    candidates = index.items_with_attribute(field)
+    if field == "label":
+        label_cat = extractor.categories().get(AnnotationType.label)
+        for label_id, label in enumerate(label_cat or []):
+            if label.name == value:
+                candidates |= index.items_with_label(label_id)
+    elif value in AnnotationType.__members__:
+        candidates |= index.items_with_ann_type(AnnotationType[value])
+    return candidates
+
+
 class XPathDatasetFilter(ItemTransform):
     def __init__(self, extractor: IDataset, xpath: str) -> None:
         super().__init__(extractor)
 
+        self._indexed_match = _INDEXED_ITEM_XPATH.fullmatch(xpath)
+        self._candidates = None
+
         try:
             xpath_eval = ET.XPath(xpath)
         except Exception:
@@ -279,11 +328,22 @@ class XPathDatasetFilter(ItemTransform):
             raise
 
         # Return true -> filter out an item
-        self._f = lambda item: bool(
-            xpath_eval(DatasetItemEncoder.encode(item, extractor.categories()))
-        )
+        compiled = compile_xpath(xpath)
+        if compiled is not None:
+            self._f = lambda item: compiled.matches(item, extractor.categories())
+        else:
+            log.debug("The expression '%s' is evaluated on the encoded items", xpath)
+            self._f = lambda item: bool(
+                xpath_eval(DatasetItemEncoder.encode(item, extractor.categories()))
+            )
 
     def transform_item(self, item: DatasetItem) -> Optional[DatasetItem]:
+        if self._indexed_match is not None:
+            self._candidates = _find_indexed_candidates(self._extractor, self._indexed_match)
+            self._indexed_match = None
+        if self._candidates is not None and (item.id, item.subset) not in self._candidates:
+            return None
+
         if not self._f(item):
             return None
         return item
@@ -301,18 +361,39 @@ class XPathAnnotationsFilter(ItemTransform):
 
         self._filter = xpath_eval
 
+        self._compiled = compile_xpath(xpath)
+        if self._compiled is not None and not self._compiled.returns_nodes:
+            self._compiled = None
+        if self._compiled is None:
+            log.debug("The expression '%s' is evaluated on the encoded items", xpath)
+
         self._remove_empty = remove_empty
 
+        self._indexed_match = _INDEXED_ANNOTATION_XPATH.fullmatch(xpath)
+        self._candidates = None
+
     def transform_item(self, item: DatasetItem) -> Optional[DatasetItem]:
         if self._filter is None:
             return item
 
-        encoded = DatasetItemEncoder.encode(item, self._extractor.categories())
-        filtered = self._filter(encoded)
-        filtered = [elem for elem in filtered if elem.tag == "annotation"]
+        if self._indexed_match is not None:
+            self._candidates = _find_indexed_candidates(self._extractor, self._indexed_match)
+            self._indexed_match = None
+        if self._candidates is not None and (item.id, item.subset) not in self._candidates:
+            # None of the item annotations can match
+            if self._remove_empty:
+                return None
+            return self.wrap_item(item, annotations=[])
+
+        if self._compiled is not None:
+            annotations = self._compiled.select_annotations(item, self._extractor.categories())
+        else:
+            encoded = DatasetItemEncoder.encode(item, self._extractor.categories())
+            filtered = self._filter(encoded)
+            filtered = [elem for elem in filtered if elem.tag == "annotation"]
 
-        encoded = encoded.findall("annotation")
-        annotations = [item.annotations[encoded.index(e)] for e in filtered]
+            encoded = encoded.findall("annotation")
+            annotations = [item.annotations[encoded.index(e)] for e in filtered]
 
         if self._remove_empty and len(annotations) == 0:
             return None
@@ -0,0 +1,730 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+"""
+A compiler of the XPath filter expressions into Python predicates.
+
+The predicates are evaluated on the dataset items directly, without encoding
+the items into XML trees. Only the item fields referenced in an expression
+are computed. The values are the same as the texts written by
+DatasetItemEncoder, so the results match the results of lxml.
+
+The supported subset of XPath 1.0 is:
+
+- absolute and relative location paths with the child axis, name tests,
+  "." steps and predicates (e.g. `/item/annotation[label="cat"]/point/x`)
+- "or", "and", "=", "!=", "<", "<=", ">", ">=" and the unary minus
+- string and number literals, parentheses
+- the not(), true(), false(), boolean(), count(), contains() and
+  starts-with() functions
+
+Other expressions (e.g. arithmetic, positional predicates, other axes and
+functions) are not compiled, and they can be evaluated with lxml.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from datumaro.components.annotation import (
+    Annotation,
+    AnnotationType,
+    Bbox,
+    Caption,
+    Ellipse,
+    HashKey,
+    Label,
+    Mask,
+    Points,
+    Polygon,
+    PolyLine,
+)
+from datumaro.components.media import Image
+
+if TYPE_CHECKING:
+    from datumaro.components.dataset_base import CategoriesInfo, DatasetItem
+
+__all__ = ["CompiledXPath", "compile_xpath"]
+
+_NODESET = "nodeset"
+_STRING = "string"
+_NUMBER = "number"
+_BOOLEAN = "boolean"
+
+
+class _Unsupported(Exception):
+    pass
+
+
+# Item nodes
+#
+# The nodes reproduce the structure of the elements written by DatasetItemEncoder.
+# The text nodes are represented by str values. The child elements are computed
+# on request, and the requested values are cached in the nodes.
+
+
+class _Node:
+    __slots__ = ()
+
+    def children(self, name: str) -> List[Any]:
+        raise NotImplementedError()
+
+    def all_children(self) -> List[Any]:
+        raise NotImplementedError()
+
+
+def _string_value(node: Any) -> str:
+    if isinstance(node, str):
+        return node
+    return "".join(_string_value(child) for child in node.all_children())
+
+
+class _FieldsNode(_Node):
+    # A node with a fixed list of the named children
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields: List[Tuple[str, Any]]):
+        self._fields = fields
+
+    def children(self, name):
+        return [value for field, value in self._fields if field == name]
+
+    def all_children(self):
+        return [value for _, value in self._fields]
+
+
+class _ImageNode(_Node):
+    __slots__ = ("_image", "_size")
+
+    _NAMES = ("height", "width", "has_data", "path")
+
+    def __init__(self, image: Image):
+        self._image = image
+        self._size = None
+
+    def _get_size(self) -> Tuple[str, str]:
+        if self._size is None:
+            size = self._image.size
+            if size is not None:
+                self._size = (str(size[0]), str(size[1]))
+            else:
+                self._size = ("unknown", "unknown")
+        return self._size
+
+    def children(self, name):
+        if name == "height":
+            return [self._get_size()[0]]
+        if name == "width":
+            return [self._get_size()[1]]
+        if name == "has_data":
+            return ["%d" % int(self._image.has_data)]
+        if name == "path" and hasattr(self._image, "path"):
+            return [self._image.path or ""]
+        return []
+
+    def all_children(self):
+        return [child for name in self._NAMES for child in self.children(name)]
+
+
+def _get_label_name(label_id: Optional[int], categories: Optional[CategoriesInfo]) -> str:
+    label = ""
+    if label_id is None:
+        return ""
+    if categories is not None:
+        label_cat = categories.get(AnnotationType.label)
+        if label_cat is not None:
+            label = label_cat.items[label_id].name
+    return label
+
+
+def _get_shape_bbox(ann: Annotation, categories) -> List[Any]:
+    x, y, w, h = ann.get_bbox()
+    return [
+        _FieldsNode(
+            [("x", str(x)), ("y", str(y)), ("w", str(w)), ("h", str(h)), ("area", str(w * h))]
+        )
+    ]
+
+
+def _get_points(ann: Points, categories) -> List[Any]:
+    points = ann.points
+    return [
+        _FieldsNode(
+            [
+                ("x", str(points[i])),
+                ("y", str(points[i + 1])),
+                ("visible", str(ann.visibility[i // 2].name)),
+            ]
+        )
+        for i in range(0, len(points), 2)
+    ]
+
+
+def _get_shape_points(ann: Annotation, categories) -> List[Any]:
+    points = ann.points
+    return [
+        _FieldsNode([("x", str(points[i])), ("y", str(points[i + 1]))])
+        for i in range(0, len(points), 2)
+    ]
+
+
+def _get_field(name: str) -> Callable[[Annotation, Any], List[Any]]:
+    getter = operator.attrgetter(name)
+    return lambda ann, categories: [str(getter(ann))]
+
+
+_LABEL_FIELDS = {
+    "label": lambda ann, categories: [str(_get_label_name(ann.label, categories))],
+    "label_id": _get_field("label"),
+}
+
+# The type-specific fields of the annotations, in the order of DatasetItemEncoder
+_ANNOTATION_FIELDS: List[Tuple[type, Dict[str, Callable[[Annotation, Any], List[Any]]]]] = [
+    (Label, _LABEL_FIELDS),
+    (Mask, _LABEL_FIELDS),
+    (
+        Bbox,
+        {
+            **_LABEL_FIELDS,
+            "x": _get_field("x"),
+            "y": _get_field("y"),
+            "w": _get_field("w"),
+            "h": _get_field("h"),
+            "area": lambda ann, categories: [str(ann.get_area())],
+        },
+    ),
+    (Points, {**_LABEL_FIELDS, "bbox": _get_shape_bbox, "point": _get_points}),
+    (PolyLine, {**_LABEL_FIELDS, "bbox": _get_shape_bbox, "point": _get_shape_points}),
+    (Polygon, {**_LABEL_FIELDS, "bbox": _get_shape_bbox, "point": _get_shape_points}),
+    (Caption, {"caption": _get_field("caption")}),
+    (
+        Ellipse,
+        {
+            **_LABEL_FIELDS,
+            "x1": _get_field("x1"),
+            "y1": _get_field("y1"),
+            "x2": _get_field("x2"),
+            "y2": _get_field("y2"),
+            "area": lambda ann, categories: [str(ann.get_area())],
+        },
+    ),
+    (HashKey, {}),
+]
+
+
+def _get_annotation_fields(ann: Annotation) -> Dict[str, Callable]:
+    for ann_cls, fields in _ANNOTATION_FIELDS:
+        if isinstance(ann, ann_cls):
+            return fields
+    raise NotImplementedError("Unexpected annotation object passed: %s" % ann)
+
+
+def _get_attribute_element_name(name: str) -> str:
+    if name.isdigit():
+        name = "_" + name
+    return name.replace(" ", "-")
+
+
+class _AnnotationNode(_Node):
+    __slots__ = ("annotation", "_categories", "_fields", "_cache")
+
+    def __init__(self, annotation: Annotation, categories: Optional[CategoriesInfo]):
+        self.annotation = annotation
+        self._categories = categories
+        self._fields = _get_annotation_fields(annotation)
+        self._cache = {}
+
+    def children(self, name):
+        children = self._cache.get(name)
+        if children is not None:
+            return children
+
+        ann = self.annotation
+        children = []
+        if name == "id":
+            children.append(str(ann.id))
+        elif name == "type":
+            children.append(str(ann.type.name))
+
+        for attr_name, attr_value in ann.attributes.items():
+            if _get_attribute_element_name(attr_name) == name:
+                children.append(str(attr_value))
+
+        if name == "group":
+            children.append(str(ann.group))
+
+        field = self._fields.get(name)
+        if field is not None:
+            children.extend(field(ann, self._categories))
+
+        self._cache[name] = children
+        return children
+
+    def all_children(self):
+        names = ["id", "type"]
+        names.extend(_get_attribute_element_name(name) for name in self.annotation.attributes)
+        names.append("group")
+        names.extend(self._fields)
+
+        # Each name is only listed once, because children() returns all the elements
+        return [child for name in dict.fromkeys(names) for child in self.children(name)]
+
+
+class _ItemNode(_Node):
+    __slots__ = ("_item", "_categories", "_annotations")
+
+    def __init__(self, item: DatasetItem, categories: Optional[CategoriesInfo]):
+        self._item = item
+        self._categories = categories
+        self._annotations = None
+
+    @property
+    def annotations(self) -> List[_AnnotationNode]:
+        if self._annotations is None:
+            self._annotations = [
+                _AnnotationNode(ann, self._categories) for ann in self._item.annotations
+            ]
+        return self._annotations
+
+    def children(self, name):
+        if name == "id":
+            return [str(self._item.id)]
+        if name == "subset":
+            return [str(self._item.subset)]
+        if name == "image":
+            if isinstance(self._item.media, Image):
+                return [_ImageNode(self._item.media)]
+            return []
+        if name == "annotation":
+            return self.annotations
+        return []
+
+    def all_children(self):
+        return [
+            child
+            for name in ("id", "subset", "image", "annotation")
+            for child in self.children(name)
+        ]
+
+
+class _DocumentNode(_FieldsNode):
+    __slots__ = ()
+
+    def __init__(self, item_node: _ItemNode):
+        super().__init__([("item", item_node)])
+
+
+# Type conversions
+
+
+# Matches the numbers accepted by libxml2, which is used by lxml
+_NUMBER_PATTERN = re.compile(
+    r"[ \t\r\n]*(?P<mantissa>-?(?:\d+\.?\d*|\.\d+))(?:[eE](?P<exponent>[+-]?\d*))?[ \t\r\n]*"
+)
+
+
+def _parse_number(s: str) -> float:
+    match = _NUMBER_PATTERN.fullmatch(s)
+    if not match:
+        return math.nan
+
+    exponent = match.group("exponent")
+    if exponent and exponent not in "+-":
+        return float(match.group("mantissa") + "e" + exponent)
+    return float(match.group("mantissa"))
+
+
+def _to_boolean(value_type: str, fn: Callable) -> Callable:
+    if value_type == _BOOLEAN:
+        return fn
+    if value_type == _NUMBER:
+
+        def _number_to_boolean(ctx, root):
+            value = fn(ctx, root)
+            return not (value == 0 or math.isnan(value))
+
+        return _number_to_boolean
+    # nodeset and string
+    return lambda ctx, root: bool(fn(ctx, root))
+
+
+def _to_number(value_type: str, fn: Callable) -> Callable:
+    if value_type == _NUMBER:
+        return fn
+    if value_type == _BOOLEAN:
+        return lambda ctx, root: 1.0 if fn(ctx, root) else 0.0
+    if value_type == _STRING:
+        return lambda ctx, root: _parse_number(fn(ctx, root))
+    return lambda ctx, root: _parse_number(_first_string(fn(ctx, root)))
+
+
+def _to_string(value_type: str, fn: Callable) -> Callable:
+    if value_type == _STRING:
+        return fn
+    if value_type == _BOOLEAN:
+        return lambda ctx, root: "true" if fn(ctx, root) else "false"
+    if value_type == _NODESET:
+        return lambda ctx, root: _first_string(fn(ctx, root))
+
+    # Number formatting rules of XPath differ from Python
+    raise _Unsupported("number to string conversion")
+
+
+def _first_string(nodes: List[Any]) -> str:
+    return _string_value(nodes[0]) if nodes else ""
+
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _compile_comparison(
+    op: str, left: Tuple[str, Callable], right: Tuple[str, Callable]
+) -> Callable:
+    # Implements the comparison rules of XPath 1.0
+    cmp = _COMPARISONS[op]
+    is_equality = op in ("=", "!=")
+    (ltype, lfn), (rtype, rfn) = left, right
+
+    if ltype == _NODESET and rtype == _NODESET:
+        if is_equality:
+            values = _string_value
+        else:
+            values = lambda node: _parse_number(_string_value(node))
+
+        def _compare_nodesets(ctx, root):
+            rvalues = [values(node) for node in rfn(ctx, root)]
+            return any(cmp(values(lnode), rvalue) for lnode in lfn(ctx, root) for rvalue in rvalues)
+
+        return _compare_nodesets
+
+    if ltype == _NODESET or rtype == _NODESET:
+        other_type = rtype if ltype == _NODESET else ltype
+
+        if other_type == _BOOLEAN:
+            lfn, rfn = _to_boolean(ltype, lfn), _to_boolean(rtype, rfn)
+            if not is_equality:
+                lfn, rfn = _to_number(_BOOLEAN, lfn), _to_number(_BOOLEAN, rfn)
+            return lambda ctx, root: cmp(lfn(ctx, root), rfn(ctx, root))
+
+        if other_type == _STRING and is_equality:
+            values = _string_value
+        else:
+            values = lambda node: _parse_number(_string_value(node))
+            if other_type == _STRING:
+                if ltype == _NODESET:
+                    rfn = _to_number(rtype, rfn)
+                else:
+                    lfn = _to_number(ltype, lfn)
+
+        if ltype == _NODESET:
+
+            def _compare_left_nodeset(ctx, root):
+                other = rfn(ctx, root)
+                return any(cmp(values(node), other) for node in lfn(ctx, root))
+
+            return _compare_left_nodeset
+        else:
+
+            def _compare_right_nodeset(ctx, root):
+                other = lfn(ctx, root)
+                return any(cmp(other, values(node)) for node in rfn(ctx, root))
+
+            return _compare_right_nodeset
+
+    if is_equality and _BOOLEAN in (ltype, rtype):
+        lfn, rfn = _to_boolean(ltype, lfn), _to_boolean(rtype, rfn)
+    elif not is_equality or _NUMBER in (ltype, rtype):
+        lfn, rfn = _to_number(ltype, lfn), _to_number(rtype, rfn)
+    return lambda ctx, root: cmp(lfn(ctx, root), rfn(ctx, root))
+
+
+# Parsing
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+    (?P<number>\d+(?:\.\d*)?|\.\d+)
+    |(?P<literal>"[^"]*"|'[^']*')
+    |(?P<op>!=|<=|>=|//|::|\.\.|[()\[\]/=<>|@,*+\-.$])
+    |(?P<name>[^\W\d][\w.\-]*)
+    )""",
+    re.VERBOSE,
+)
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        match = _TOKEN_PATTERN.match(expr, pos)
+        if not match or match.end() == pos:
+            raise _Unsupported("unexpected character at %s" % pos)
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    _FUNCTIONS = {"not", "true", "false", "boolean", "count", "contains", "starts-with"}
+
+    def __init__(self, expr: str):
+        self._tokens = _tokenize(expr)
+        self._pos = 0
+
+    def _peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        pos = self._pos + offset
+        if pos < len(self._tokens):
+            return self._tokens[pos]
+        return (None, None)
+
+    def _next(self) -> Tuple[Optional[str], Optional[str]]:
+        token = self._peek()
+        self._pos += 1
+        return token
+
+    def _expect(self, value: str):
+        if self._next() != ("op", value):
+            raise _Unsupported("expected '%s'" % value)
+
+    def parse(self) -> Tuple[str, Callable]:
+        result = self._parse_or()
+        if self._pos != len(self._tokens):
+            raise _Unsupported("unexpected token '%s'" % self._peek()[1])
+        return result
+
+    def _parse_or(self):
+        left_type, left = self._parse_and()
+        while self._peek() == ("name", "or"):
+            self._next()
+            right_type, right = self._parse_and()
+            left_type, left = _BOOLEAN, self._make_or(
+                _to_boolean(left_type, left), _to_boolean(right_type, right)
+            )
+        return left_type, left
+
+    @staticmethod
+    def _make_or(left, right):
+        return lambda ctx, root: left(ctx, root) or right(ctx, root)
+
+    def _parse_and(self):
+        left_type, left = self._parse_equality()
+        while self._peek() == ("name", "and"):
+            self._next()
+            right_type, right = self._parse_equality()
+            left_type, left = _BOOLEAN, self._make_and(
+                _to_boolean(left_type, left), _to_boolean(right_type, right)
+            )
+        return left_type, left
+
+    @staticmethod
+    def _make_and(left, right):
+        return lambda ctx, root: left(ctx, root) and right(ctx, root)
+
+    def _parse_equality(self):
+        left = self._parse_relational()
+        while self._peek() in (("op", "="), ("op", "!=")):
+            op = self._next()[1]
+            right = self._parse_relational()
+            left = (_BOOLEAN, _compile_comparison(op, left, right))
+        return left
+
+    def _parse_relational(self):
+        left = self._parse_unary()
+        while self._peek() in (("op", "<"), ("op", "<="), ("op", ">"), ("op", ">=")):
+            op = self._next()[1]
+            right = self._parse_unary()
+            left = (_BOOLEAN, _compile_comparison(op, left, right))
+        return left
+
+    def _parse_unary(self):
+        if self._peek() == ("op", "-"):
+            self._next()
+            value = _to_number(*self._parse_unary())
+            return _NUMBER, lambda ctx, root: -value(ctx, root)
+        return self._parse_primary()
+
+    def _parse_primary(self):
+        kind, value = self._peek()
+
+        if kind == "number":
+            self._next()
+            number = float(value)
+            return _NUMBER, lambda ctx, root: number
+
+        if kind == "literal":
+            self._next()
+            string = value[1:-1]
+            return _STRING, lambda ctx, root: string
+
+        if (kind, value) == ("op", "("):
+            self._next()
+            result = self._parse_or()
+            self._expect(")")
+            return result
+
+        if kind == "name" and self._peek(1) == ("op", "("):
+            return self._parse_function()
+
+        return _NODESET, self._parse_path()
+
+    def _parse_function(self):
+        name = self._next()[1]
+        if name not in self._FUNCTIONS:
+            raise _Unsupported("function '%s'" % name)
+        self._expect("(")
+
+        args = []
+        if self._peek() != ("op", ")"):
+            args.append(self._parse_or())
+            while self._peek() == ("op", ","):
+                self._next()
+                args.append(self._parse_or())
+        self._expect(")")
+
+        if name in ("true", "false") and not args:
+            value = name == "true"
+            return _BOOLEAN, lambda ctx, root: value
+        if name == "not" and len(args) == 1:
+            arg = _to_boolean(*args[0])
+            return _BOOLEAN, lambda ctx, root: not arg(ctx, root)
+        if name == "boolean" and len(args) == 1:
+            return _BOOLEAN, _to_boolean(*args[0])
+        if name == "count" and len(args) == 1 and args[0][0] == _NODESET:
+            arg = args[0][1]
+            return _NUMBER, lambda ctx, root: float(len(arg(ctx, root)))
+        if name in ("contains", "starts-with") and len(args) == 2:
+            string, pattern = _to_string(*args[0]), _to_string(*args[1])
+            if name == "contains":
+                return _BOOLEAN, lambda ctx, root: pattern(ctx, root) in string(ctx, root)
+            return _BOOLEAN, lambda ctx, root: string(ctx, root).startswith(pattern(ctx, root))
+        raise _Unsupported("arguments of '%s'" % name)
+
+    def _parse_path(self) -> Callable:
+        steps = []
+        is_absolute = False
+        if self._peek() == ("op", "/"):
+            self._next()
+            is_absolute = True
+            if not self._is_step_start():
+                # lxml doesn't return the document node
+                raise _Unsupported("root node selection")
+
+        steps.append(self._parse_step())
+        while self._peek() == ("op", "/"):
+            self._next()
+            steps.append(self._parse_step())
+
+        def _eval_path(ctx, root):
+            nodes = [root if is_absolute else ctx]
+            for step in steps:
+                nodes = step(nodes, root)
+            return nodes
+
+        return _eval_path
+
+    def _is_step_start(self) -> bool:
+        kind, value = self._peek()
+        return (kind == "name" and self._peek(1) not in (("op", "("), ("op", "::"))) or (
+            kind,
+            value,
+        ) == ("op", ".")
+
+    def _parse_step(self) -> Callable:
+        if not self._is_step_start():
+            raise _Unsupported("location step '%s'" % self._peek()[1])
+
+        kind, name = self._next()
+        if kind == "op":  # "."
+            select = lambda nodes: nodes
+        else:
+            select = lambda nodes: [
+                child
+                for node in nodes
+                if not isinstance(node, str)
+                for child in node.children(name)
+            ]
+
+        predicates = []
+        while self._peek() == ("op", "[") and kind == "name":
+            self._next()
+            predicate_type, predicate = self._parse_or()
+            if predicate_type == _NUMBER:
+                raise _Unsupported("positional predicate")
+            predicates.append(_to_boolean(predicate_type, predicate))
+            self._expect("]")
+
+        if not predicates:
+            return lambda nodes, root: select(nodes)
+
+        def _eval_step(nodes, root):
+            nodes = select(nodes)
+            for predicate in predicates:
+                nodes = [node for node in nodes if predicate(node, root)]
+            return nodes
+
+        return _eval_step
+
+
+class CompiledXPath:
+    """
+    An XPath filter expression compiled into a Python function.
+    The expression is evaluated in the context of an encoded dataset item.
+    """
+
+    def __init__(self, result_type: str, fn: Callable):
+        self._result_type = result_type
+        self._fn = fn
+
+    @property
+    def returns_nodes(self) -> bool:
+        return self._result_type == _NODESET
+
+    def _evaluate(self, item: DatasetItem, categories: Optional[CategoriesInfo]):
+        item_node = _ItemNode(item, categories)
+        return self._fn(item_node, _DocumentNode(item_node))
+
+    def matches(self, item: DatasetItem, categories: Optional[CategoriesInfo] = None) -> bool:
+        """
+        Checks if the expression result is not empty, like bool() of the result
+        of lxml.
+        """
+        return bool(self._evaluate(item, categories))
+
+    def select_annotations(
+        self, item: DatasetItem, categories: Optional[CategoriesInfo] = None
+    ) -> List[Annotation]:
+        """
+        Returns the annotations of the item selected by the expression,
+        in the order of the item annotations.
+        """
+        assert self.returns_nodes
+        return [
+            node.annotation
+            for node in self._evaluate(item, categories)
+            if isinstance(node, _AnnotationNode)
+        ]
+
+
+def compile_xpath(expr: str) -> Optional[CompiledXPath]:
+    """
+    Compiles an XPath filter expression. Returns None, if the expression
+    is not supported by the compiler.
+    """
+
+    try:
+        return CompiledXPath(*_Parser(expr).parse())
+    except _Unsupported:
+        return None
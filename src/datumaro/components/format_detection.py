@@ -3,10 +3,12 @@
 # SPDX-License-Identifier: MIT
 
 import contextlib
+import contextvars
 import fnmatch
-import glob
+import io
 import logging as log
 import os.path as osp
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum, auto
 from io import BufferedReader
@@ -14,6 +16,7 @@ from typing import (
     Any,
     Callable,
     Collection,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -27,6 +30,8 @@ from typing import (
 
 from typing_extensions import Protocol
 
+from datumaro.util.fs_snapshot import FileSystemSnapshot, fs_snapshot, get_fs_snapshot
+
 
 class FormatDetectionConfidence(IntEnum):
     """
@@ -171,6 +176,9 @@ class FormatDetectionContext:
         self._root_path = root_path
         self._one_or_more_context = None
 
+        # The directory listings are shared with the other detectors, if possible
+        self._fs_snapshot = get_fs_snapshot(root_path) or FileSystemSnapshot(root_path)
+
     @property
     def root_path(self) -> str:
         """
@@ -298,10 +306,10 @@ class FormatDetectionContext:
         if not self._is_path_within_root(pattern):
             self.fail(requirement_desc)
 
-        pattern_abs = osp.join(glob.escape(self._root_path), pattern)
         none_found = True
-        for path in glob.iglob(pattern_abs, recursive=True):
-            if osp.isfile(path):
+        for path in self._fs_snapshot.iglob(pattern, root_dir=self._root_path, recursive=True):
+            path = osp.join(self._root_path, path)
+            if self._fs_snapshot.isfile(path):
                 # Ideally, we should provide a way to filter out whole paths,
                 # not just file names. However, there is no easy way to match an
                 # entire path with a pattern (fnmatch is unsuitable, because
@@ -352,12 +360,13 @@ class FormatDetectionContext:
             self.fail(requirement_desc_full)
 
         try:
-            if is_binary_file:
-                with open(osp.join(self._root_path, path), "rb") as f:
-                    yield f
-            else:
-                with open(osp.join(self._root_path, path), encoding="utf-8") as f:
-                    yield f
+            # The beginning of the file is shared with the other detectors
+            full_path = osp.join(self._root_path, path)
+            f = self._fs_snapshot.open_file(full_path)
+            if not is_binary_file:
+                f = io.TextIOWrapper(f, encoding="utf-8")
+            with f:
+                yield f
         except _FormatRejected:
             raise
         except Exception:
@@ -487,11 +496,85 @@ class RejectionCallback(Protocol):
         ...
 
 
+class _SkippedDetector:
+    """
+    The result of a detector, which was not run, because it couldn't reach
+    the confidence of an already detected format.
+    """
+
+
+def _run_detectors(
+    formats: Sequence[Tuple[str, FormatDetector, FormatDetectionConfidence]],
+    path: str,
+    num_workers: Optional[int],
+) -> List[Union[FormatDetectionConfidence, _FormatRejected, _SkippedDetector]]:
+    """
+    Applies the detectors and returns their results in the order of the formats.
+
+    The detectors are applied in tiers of the same maximum confidence,
+    from the highest to the lowest one. The detectors of a tier are applied
+    concurrently. Once a tier matches a format with at least the MEDIUM
+    confidence, the next tiers, which can't reach this confidence,
+    are skipped. So, the skipped detectors don't depend on the thread scheduling.
+    """
+
+    def _apply(detector: FormatDetector):
+        try:
+            return apply_format_detector(path, detector)
+        except _FormatRejected as ex:
+            return ex
+
+    tiers: Dict[FormatDetectionConfidence, List[int]] = {}
+    for idx, (_, _, max_confidence) in enumerate(formats):
+        tiers.setdefault(max_confidence, []).append(idx)
+
+    results: List[Union[FormatDetectionConfidence, _FormatRejected, _SkippedDetector]] = [
+        None
+    ] * len(formats)
+    found_confidence = FormatDetectionConfidence.NONE
+
+    with contextlib.ExitStack() as es:
+        if num_workers == 0:
+            map_fn = map
+        else:
+            map_fn = es.enter_context(ThreadPoolExecutor(max_workers=num_workers)).map
+
+        for max_confidence in sorted(tiers, reverse=True):
+            indices = tiers[max_confidence]
+
+            if FormatDetectionConfidence.MEDIUM <= found_confidence and (
+                max_confidence < found_confidence
+            ):
+                for idx in indices:
+                    results[idx] = _SkippedDetector()
+                continue
+
+            # The detectors use the file system snapshot of the calling thread
+            contexts = [contextvars.copy_context() for _ in indices]
+            detectors = [formats[idx][1] for idx in indices]
+            tier_results = map_fn(
+                lambda ctx, detector: ctx.run(_apply, detector), contexts, detectors
+            )
+
+            for idx, result in zip(indices, tier_results):
+                results[idx] = result
+                if not isinstance(result, _FormatRejected):
+                    found_confidence = max(found_confidence, result)
+
+    return results
+
+
 def detect_dataset_format(
-    formats: Iterable[Tuple[str, FormatDetector]],
+    formats: Iterable[
+        Union[
+            Tuple[str, FormatDetector],
+            Tuple[str, FormatDetector, FormatDetectionConfidence],
+        ]
+    ],
     path: str,
     *,
     rejection_callback: Optional[RejectionCallback] = None,
+    num_workers: Optional[int] = None,
 ) -> Sequence[DetectedFormat]:
     """
     Determines which format(s) the dataset at the specified path belongs to.
@@ -501,22 +584,37 @@ def detect_dataset_format(
     rejected if the detector fails or if it succeeds with less confidence than
     another detector (other rejection reasons might be added in the future).
 
+    The detectors are applied concurrently, in the order of their maximum
+    confidence. Once a format is matched with at least the MEDIUM confidence,
+    the detectors which can't reach this confidence are not applied anymore,
+    and their formats are rejected for the insufficient confidence.
+    The results don't depend on the number of workers.
+
     Args:
         `formats`: The formats to be considered. Each element of the
             iterable must be a tuple of a format name and a `FormatDetector`
-            instance.
+            instance. The tuple can also include the maximum confidence,
+            which the detector can return. If it is not specified, the detector
+            can return any confidence.
 
         `path`: the filesystem path to the dataset to be analyzed.
 
         `rejection_callback`: Unless `None`, called for every rejected format
             to report the reason it was rejected.
 
+        `num_workers`: The number of threads to apply the detectors.
+            If `None`, it is chosen automatically. If 0, the detectors are
+            applied sequentially in the calling thread.
+
     Returns: a sequence of detected format names.
     """
 
     if not osp.exists(path):
         raise FileNotFoundError(f"Path {path} doesn't exist")
 
+    if num_workers is not None and num_workers < 0:
+        raise ValueError(f"num_workers should be a non negative integer, but it is {num_workers}.")
+
     def report_insufficient_confidence(
         format_name: str,
         format_with_more_confidence: str,
@@ -529,32 +627,45 @@ def detect_dataset_format(
                 "was matched with more confidence",
             )
 
+    formats = [
+        (desc[0], desc[1], desc[2] if len(desc) == 3 else max(FormatDetectionConfidence))
+        for desc in formats
+    ]
+
     max_confidence = 0
     matches: List[DetectedFormat] = []
-
-    for format_name, detector in formats:
-        log.debug("Checking '%s' format...", format_name)
-        try:
-            new_confidence = apply_format_detector(path, detector)
-        except _FormatRejected as ex:
-            human_message = str(ex)
-            if rejection_callback:
-                rejection_callback(format_name, ex.reason, human_message)
-            log.debug(human_message)
-        else:
-            log.debug("Format matched with confidence %d", new_confidence)
-
-            # keep only matches with the highest confidence
-            if new_confidence > max_confidence:
-                for match in matches:
-                    report_insufficient_confidence(match.name, format_name)
-
-                matches = [DetectedFormat(new_confidence, format_name)]
-                max_confidence = new_confidence
-            elif new_confidence == max_confidence:
-                matches.append(DetectedFormat(new_confidence, format_name))
-            else:  # new confidence is less than max
-                report_insufficient_confidence(format_name, matches[0].name)
+    skipped_formats: List[str] = []
+
+    with fs_snapshot(path):
+        for (format_name, _, _), result in zip(formats, _run_detectors(formats, path, num_workers)):
+            log.debug("Checking '%s' format...", format_name)
+            if isinstance(result, _SkippedDetector):
+                log.debug("Format can't be matched with enough confidence")
+                skipped_formats.append(format_name)
+            elif isinstance(result, _FormatRejected):
+                human_message = str(result)
+                if rejection_callback:
+                    rejection_callback(format_name, result.reason, human_message)
+                log.debug(human_message)
+            else:
+                new_confidence = result
+                log.debug("Format matched with confidence %d", new_confidence)
+
+                # keep only matches with the highest confidence
+                if new_confidence > max_confidence:
+                    for match in matches:
+                        report_insufficient_confidence(match.name, format_name)
+
+                    matches = [DetectedFormat(new_confidence, format_name)]
+                    max_confidence = new_confidence
+                elif new_confidence == max_confidence:
+                    matches.append(DetectedFormat(new_confidence, format_name))
+                else:  # new confidence is less than max
+                    report_insufficient_confidence(format_name, matches[0].name)
+
+    # The skipped formats are reported, when the best match is known
+    for format_name in skipped_formats:
+        report_insufficient_confidence(format_name, matches[0].name)
 
     # TODO: This should be controlled by our priority logic.
     # However, some datasets' detect() are currently broken,
@@ -6,10 +6,10 @@ from __future__ import annotations
 
 import os
 import os.path as osp
+from concurrent.futures import Future
 from contextlib import contextmanager
 from functools import wraps
-from glob import iglob
-from typing import Callable, Dict, List, Optional, Type, TypeVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar
 
 from datumaro.components.cli_plugin import CliPlugin
 from datumaro.components.contexts.importer import (
@@ -22,7 +22,10 @@ from datumaro.components.contexts.importer import (
 from datumaro.components.errors import DatasetImportError, DatasetNotFoundError
 from datumaro.components.format_detection import FormatDetectionConfidence, FormatDetectionContext
 from datumaro.components.merge.extractor_merger import ExtractorMerger
+from datumaro.components.progress_reporting import ProgressReporter
+from datumaro.util import fs_snapshot
 from datumaro.util.definitions import SUBSET_NAME_BLACKLIST
+from datumaro.util.multi_procs_util import ordered_thread_map
 
 T = TypeVar("T")
 
@@ -34,12 +37,17 @@ __all__ = [
     "with_subset_dirs",
     "ImportErrorPolicy",
     "FailingImportErrorPolicy",
+    "read_item_files",
 ]
 
 
 class Importer(CliPlugin):
     DETECT_CONFIDENCE = FormatDetectionConfidence.LOW
 
+    # The highest confidence, which can be returned by detect().
+    # The importers overriding detect() should set it, if the confidence is limited.
+    MAX_DETECT_CONFIDENCE: Optional[FormatDetectionConfidence] = None
+
     @classmethod
     def detect(
         cls,
@@ -50,6 +58,19 @@ class Importer(CliPlugin):
 
         return cls.DETECT_CONFIDENCE
 
+    @classmethod
+    def get_max_detect_confidence(cls) -> FormatDetectionConfidence:
+        """
+        Returns the highest confidence, which can be returned by `detect()`.
+        It allows to skip the detection of this format, if another format
+        is already detected with a higher confidence.
+        """
+        if cls.MAX_DETECT_CONFIDENCE is not None:
+            return cls.MAX_DETECT_CONFIDENCE
+        if cls.detect.__func__ is Importer.detect.__func__:
+            return cls.DETECT_CONFIDENCE
+        return max(FormatDetectionConfidence)
+
     @classmethod
     def get_file_extensions(cls) -> List[str]:
         raise NotImplementedError()
@@ -126,10 +147,10 @@ class Importer(CliPlugin):
                 ext = "." + ext
             ext = ext.lower()
 
-        if (path.lower().endswith(ext) and osp.isfile(path)) or (
+        if (path.lower().endswith(ext) and fs_snapshot.isfile(path)) or (
             not ext
             and dirname
-            and osp.isdir(path)
+            and fs_snapshot.isdir(path)
             and os.sep + osp.normpath(dirname.lower()) + os.sep
             in osp.abspath(path.lower()) + os.sep
         ):
@@ -139,7 +160,7 @@ class Importer(CliPlugin):
             for d in range(max_depth + 1):
                 sources.extend(
                     {"url": p, "format": extractor_name}
-                    for p in iglob(
+                    for p in fs_snapshot.iglob(
                         osp.join(path, *("*" * d), dirname, filename + ext), recursive=recursive
                     )
                     if (callable(file_filter) and file_filter(p)) or (not callable(file_filter))
@@ -238,3 +259,49 @@ def with_subset_dirs(input_cls: Importer):
             return (input_cls.__class__, ())
 
     return WrappedImporter
+
+
+def read_item_files(
+    reader: Callable[[T], object],
+    inputs: Sequence[T],
+    *,
+    ctx: ImportContext,
+    desc: Optional[str] = None,
+    num_workers: int = 0,
+    prefetch: Optional[int] = None,
+    progress_reporter: Optional[ProgressReporter] = None,
+) -> Iterator[Tuple[T, Future]]:
+    """
+    Reads the per-item annotation files of a dataset in a thread pool.
+
+    The files are read and parsed by the reader in the worker threads, while
+    the results are returned in the order of inputs, and the progress is reported
+    to the import context. The reader should only read the files and must not
+    modify the extractor state, e.g. the categories. The reader exceptions
+    are raised by `Future.result()`, so that the extractor can report them
+    through the context error policy, exactly as in the sequential import.
+
+    Parameters:
+        reader: A function, which reads the files of a single item
+        inputs: The reader inputs, e.g. the item ids or the annotation file paths
+        ctx: The import context
+        desc: The progress description
+        num_workers: The number of reading threads. If num_workers = 0,
+            the files are read sequentially in the calling thread.
+        prefetch: The maximum number of items read ahead of the extractor.
+            By default, it is twice the number of workers.
+        progress_reporter: The progress reporter to be used instead of
+            the import context one, e.g. a part of the context reporter
+
+    Returns:
+        Iterator: (input, future) pairs in the order of inputs
+    """
+
+    if progress_reporter is None:
+        progress_reporter = ctx.progress_reporter
+
+    return progress_reporter.iter(
+        ordered_thread_map(reader, inputs, num_workers=num_workers, prefetch=prefetch),
+        desc=desc,
+        total=len(inputs),
+    )
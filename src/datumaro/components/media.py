@@ -33,12 +33,18 @@ import numpy as np
 
 from datumaro.components.crypter import NULL_CRYPTER, Crypter
 from datumaro.components.errors import DatumaroError, MediaShapeError
+from datumaro.util.csv_util import DEFAULT_CHUNK_SIZE, DEFAULT_SAMPLE_SIZE, read_csv, sniff_csv_sep
 from datumaro.util.definitions import BboxIntCoords
 from datumaro.util.image import (
+    SharedImageLoader,
     _image_loading_errors,
     copyto_image,
     decode_image,
+    decode_reduced_image,
+    get_jpeg_size,
+    get_reduction_factor,
     lazy_image,
+    resize_image,
     save_image,
 )
 
@@ -52,6 +58,17 @@ else:
 
 AnyData = TypeVar("AnyData", bytes, np.ndarray)
 
+_JPEG_EXTENSIONS = {".jpg", ".jpeg", ".jpe"}
+
+
+def _decode_reduced_file(path: str, factor: int, crypter: Crypter) -> Optional[np.ndarray]:
+    if factor == 1 or osp.splitext(path)[1].lower() not in _JPEG_EXTENSIONS:
+        return None
+
+    with open(path, "rb") as f:
+        image_bytes = crypter.decrypt(f.read())
+    return decode_reduced_image(image_bytes, factor)
+
 
 class MediaType(IntEnum):
     NONE = 0
@@ -291,6 +308,18 @@ class Image(MediaElement[np.ndarray]):
             ext = ext if ext else self._DEFAULT_EXT
         return ext
 
+    def get_resized_data(self, size: Tuple[int, int]) -> Optional[np.ndarray]:
+        """
+        Returns the image data resized to the (H, W) size, in the same format as
+        the image data. When a JPEG image is downscaled 2x or more, it is decoded
+        at a reduced resolution, instead of decoding the full resolution image.
+        """
+
+        data = self.data
+        if data is None:
+            return None
+        return resize_image(data, size)
+
     def __eq__(self, other):
         # Do not compare `_type`
         # sicne Image is subclass of RoIImage and MosaicImage
@@ -363,6 +392,14 @@ class ImageFromFile(FromFileMixin, Image):
         else:
             raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), cur_path)
 
+    def get_resized_data(self, size: Tuple[int, int]) -> Optional[np.ndarray]:
+        if self.has_data and not self.__data.is_cached and self.size:
+            factor = get_reduction_factor(self.size, size)
+            data = _decode_reduced_file(self.path, factor, self._crypter)
+            if data is not None:
+                return resize_image(data, size)
+        return super().get_resized_data(size)
+
     def set_crypter(self, crypter: Crypter):
         super().set_crypter(crypter)
         if isinstance(self.__data, lazy_image):
@@ -453,6 +490,19 @@ class ImageFromBytes(ImageFromData):
             self._size = tuple(map(int, data.shape[:2]))
         return data
 
+    def get_resized_data(self, size: Tuple[int, int]) -> Optional[np.ndarray]:
+        image_bytes = self.bytes
+        if image_bytes is None:
+            return super().get_resized_data(size)
+
+        data = None
+        image_size = self._size or get_jpeg_size(image_bytes)
+        if image_size:
+            data = decode_reduced_image(image_bytes, get_reduction_factor(image_size, size))
+        if data is None:
+            data = decode_image(image_bytes, dtype=np.uint8)
+        return resize_image(data, size)
+
 
 class VideoFrame(ImageFromNumpy):
     _type = MediaType.VIDEO_FRAME
@@ -966,6 +1016,50 @@ class RoIImage(Image):
             return RoIImageFromBytes(data=data._data, roi=roi, ext=data._ext, *args, **kwargs)
         raise NotImplementedError
 
+    @classmethod
+    def from_image_rois(
+        cls, data: Image, rois: List[BboxIntCoords], *args, **kwargs
+    ) -> List[RoIImage]:
+        """
+        Creates several crops of an image. The crops share the decoded image:
+        it is decoded once, when the data of a crop is requested for the first time,
+        and it is released, when the data of each crop has been requested.
+        The crop data are views of the decoded image.
+        """
+
+        if not isinstance(data, Image):
+            raise TypeError(f"type(image)={type(data)} should be Image.")
+
+        if isinstance(data, ImageFromFile):
+            shared = SharedImageLoader(lazy_image(data.path, crypter=data._crypter, cache=False))
+            return [
+                RoIImageFromFile(
+                    path=data.path,
+                    roi=roi,
+                    ext=data._ext,
+                    loader=shared.make_reader(),
+                    *args,
+                    **kwargs,
+                )
+                for roi in rois
+            ]
+
+        if isinstance(data, ImageFromBytes) or (
+            isinstance(data, ImageFromNumpy) and callable(data._data)
+        ):
+            if isinstance(data, ImageFromBytes):
+                shared = SharedImageLoader(lambda: data.data)
+            else:
+                shared = SharedImageLoader(data._data)
+            return [
+                RoIImageFromNumpy(
+                    data=shared.make_reader(), roi=roi, ext=data._ext, *args, **kwargs
+                )
+                for roi in rois
+            ]
+
+        return [cls.from_image(data, roi, *args, **kwargs) for roi in rois]
+
     @classmethod
     def from_numpy(cls, *args, **kwargs):
         raise DatumaroError(f"Please use a factory function '{cls.__name__}.from_image'.")
@@ -982,6 +1076,29 @@ class RoIImage(Image):
         x, y, w, h = self._roi
         return data[y : y + h, x : x + w]
 
+    def _decode_reduced(self, factor: int) -> Optional[np.ndarray]:
+        """
+        Decodes the whole source image at the 1/factor resolution,
+        if the image format allows this. Returns None otherwise.
+        """
+        return None
+
+    def get_resized_data(self, size: Tuple[int, int]) -> Optional[np.ndarray]:
+        x, y, w, h = self._roi
+
+        # The ROI should start at a pixel of the reduced image
+        factor = get_reduction_factor((h, w), size)
+        while 1 < factor and (x % factor or y % factor):
+            factor //= 2
+
+        data = self._decode_reduced(factor) if 1 < factor else None
+        if data is None:
+            return super().get_resized_data(size)
+
+        # The ROI is cropped from the reduced image and resized at once
+        data = data[y // factor : -(-(y + h) // factor), x // factor : -(-(x + w) // factor)]
+        return resize_image(data, size)
+
     def save(
         self,
         fp: Union[str, io.IOBase],
@@ -1007,10 +1124,17 @@ class RoIImageFromFile(FromFileMixin, RoIImage):
         path: str,
         roi: BboxIntCoords,
         *args,
+        loader: Optional[Callable[[], np.ndarray]] = None,
         **kwargs,
     ) -> None:
+        """
+        Args:
+            loader: A function returning the whole image data. If not set,
+                the image is loaded from the file, using the global image cache.
+        """
+
         super().__init__(path, roi, *args, **kwargs)
-        self.__data = lazy_image(self.path, crypter=self._crypter)
+        self.__data = loader or lazy_image(self.path, crypter=self._crypter)
 
     @property
     def data(self) -> Optional[np.ndarray]:
@@ -1020,6 +1144,18 @@ class RoIImageFromFile(FromFileMixin, RoIImage):
         data = self.__data()
         return self._get_roi_data(data)
 
+    def _decode_reduced(self, factor: int) -> Optional[np.ndarray]:
+        if not self.has_data or getattr(self.__data, "is_cached", True):
+            return None
+
+        try:
+            return _decode_reduced_file(self.path, factor, self._crypter)
+        finally:
+            # The shared full resolution image is not needed by this crop anymore
+            release = getattr(self.__data, "release", None)
+            if release:
+                release()
+
 
 class RoIImageFromData(FromDataMixin, RoIImage):
     pass
@@ -1045,6 +1181,12 @@ class RoIImageFromBytes(RoIImageFromData):
             data = decode_image(data)
         return self._get_roi_data(data)
 
+    def _decode_reduced(self, factor: int) -> Optional[np.ndarray]:
+        image_bytes = self.bytes
+        if image_bytes is None:
+            return None
+        return decode_reduced_image(image_bytes, factor)
+
 
 class RoIImageFromNumpy(RoIImageFromData):
     def __init__(
@@ -1122,12 +1264,20 @@ class MosaicImageFromData(FromDataMixin, MosaicImage):
 class MosaicImageFromImageRoIPairs(MosaicImageFromData):
     def __init__(self, data: List[ImageWithRoI], size: Tuple[int, int]) -> None:
         def _get_mosaic_img() -> np.ndarray:
-            h, w = self.size
-            mosaic_img = np.zeros(shape=(h, w, 3), dtype=np.uint8)
+            # The canvas is allocated once, when the first tile is loaded,
+            # so it keeps the type and the channels of the tiles. The tiles
+            # are loaded one by one, so the tiles sharing a decoded image
+            # release it as soon as the last of them is pasted.
+            mosaic_img = None
             for img, roi in data:
                 assert isinstance(img, Image), "MosaicImage can only take a list of Images."
+                tile = img.data
+                if mosaic_img is None:
+                    mosaic_img = np.zeros(self.size + tile.shape[2:], dtype=tile.dtype)
                 x, y, w, h = roi
-                mosaic_img[y : y + h, x : x + w] = img.data
+                mosaic_img[y : y + h, x : x + w] = tile
+            if mosaic_img is None:
+                mosaic_img = np.zeros(self.size + (3,), dtype=np.uint8)
             return mosaic_img
 
         super().__init__(data=_get_mosaic_img, size=size)
@@ -1234,10 +1384,11 @@ class Table:
     def dtype(self, column: str) -> Optional[Type[TableDtype]]:
         """Returns native python type for a given column"""
         numpy_type = self.data.dtypes[column]
-        if numpy_type == object and self.data[column].nunique() / self.shape[0] < 0.1:  # TODO
+        is_text = numpy_type == object or isinstance(numpy_type, pd.StringDtype)
+        if is_text and self.data[column].nunique() / self.shape[0] < 0.1:  # TODO
             # Convert to CategoricalDtype for efficient storage and categorical analysis
             return pd.api.types.CategoricalDtype()
-        if numpy_type == object:
+        if is_text:
             return str
         else:
             return type(np.zeros(1, numpy_type).tolist()[0])
@@ -1272,22 +1423,45 @@ class TableFromCSV(FromFileMixin, Table):
         sep: Optional[str] = None,
         encoding: Optional[str] = None,
         *args,
+        usecols: Optional[List[str]] = None,
+        string_storage: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sample_size: Optional[int] = DEFAULT_SAMPLE_SIZE,
         **kwargs,
     ) -> None:
         """
         Read a '.csv' file and compose a Table instance.
+        The file is read chunk by chunk with the column types inferred on a sample of rows.
 
         Args:
             path (str) : Path to csv file.
             dtype (optional, dict(str,str)) : Dictionay of column name -> type str ('str', 'int', or 'float').
-            sep (optional, str) : Delimiter to use.
+            sep (optional, str) : Delimiter to use. If not specified, it is detected by the 1st row.
             encoding (optional, str) : Encoding to use for UTF when reading/writing (ex. 'utf-8').
+            usecols (optional, list(str)) : Columns to read. By default, all the columns are read.
+            string_storage (optional, str) : If specified, text columns are stored in
+                pandas string arrays with this storage ('python' or 'pyarrow')
+                instead of arrays of Python objects.
+            chunk_size (int) : The number of rows read at once.
+            sample_size (optional, int) : The number of rows to infer the column types on.
+                If None, the types are inferred on the whole file.
         """
         super().__init__(path, *args, **kwargs)
 
+        if sep is None:
+            sep = sniff_csv_sep(path, encoding=encoding)
+
         # assumes that the 1st row is a header.
-        data: pd.DataFrame = pd.read_csv(
-            path, dtype=dtype, sep=sep, engine="python", encoding=encoding, index_col=False
+        data: pd.DataFrame = read_csv(
+            path,
+            dtype=dtype,
+            sample_size=sample_size,
+            string_storage=string_storage,
+            chunk_size=chunk_size,
+            sep=sep,
+            encoding=encoding,
+            index_col=False,
+            usecols=usecols,
         )
         if data is None:
             raise ValueError(f"Can't read csv File from {path}")
@@ -1355,6 +1529,12 @@ class TableFromListOfDict(TableFromDataFrame):
         super().__init__(data=pd.DataFrame(data), *args, **kwargs)
 
 
+def _to_native_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
 class TableRow(MediaElement):
     _type = MediaType.TABLE_ROW
 
@@ -1392,10 +1572,18 @@ class TableRow(MediaElement):
                 the values corresponding to target colums will be returned.
                 Otherwise, whole row data will be returned.
         """
-        row = self.table.data.iloc[self.index]
-        if targets:
-            row = row[targets]
-        return row.to_dict()
+        # Read the values from the columns, the row is not built as a whole
+        data = self.table.data
+        return {
+            column: _to_native_value(data[column].iat[self._index])
+            for column in (targets or data.columns)
+        }
+
+    def from_self(self, **kwargs):
+        # The table is shared, not copied
+        attrs = {"table": self._table, "index": self._index}
+        attrs.update(kwargs)
+        return self.__class__(**attrs)
 
     def __repr__(self):
         return f"TableRow(row_idx:{self.index}, data:{self.data()})"
@@ -28,10 +28,12 @@ from datumaro.components.annotation import (
     Points,
     Polygon,
     PolyLine,
+    RleMask,
     SuperResolutionAnnotation,
 )
 from datumaro.components.dataset_base import DatasetItem, IDataset
 from datumaro.components.media import Image
+from datumaro.util import mask_tools
 
 if TYPE_CHECKING:
     from matplotlib.axes import Axes
@@ -513,14 +515,24 @@ class Visualizer:
         ax: Axes,
         context: List,
     ) -> None:
-        h, w = ann.image.shape
-        source = ann.image
-        if source.dtype != bool:
-            warnings.warn(
-                f"Mask should has dtype == bool, but its dtype == {source.dtype}. "
-                "Try to change it to bool dtype."
-            )
-            source = source.astype(bool)
+        if isinstance(ann, RleMask):
+            # RLE masks are decoded in their bounding boxes only
+            source = ann.rle
+            h, w = source["size"]
+        else:
+            source = ann.image
+            if source.dtype != bool:
+                warnings.warn(
+                    f"Mask should has dtype == bool, but its dtype == {source.dtype}. "
+                    "Try to change it to bool dtype."
+                )
+                source = source.astype(bool)
+            h, w = source.shape
+
+        roi, source = mask_tools.decode_segment_roi(source, h, w)
+        if roi is None:
+            return
+        x, y, w, h = roi
 
         mask_map = np.zeros((h, w, 4), dtype=np.uint8)
         color = self._get_color(ann)
@@ -528,7 +540,11 @@ class Visualizer:
         mask_map[source] = rgba_color
         mask_map[source, 3] = int(255 * self.alpha)
 
-        ax.imshow(mask_map)
+        # Draw the mask in its box, keeping the view limits of the image
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+        ax.imshow(mask_map, extent=(x - 0.5, x + w - 0.5, y + h - 0.5, y - 0.5))
+        ax.set_xlim(xlim, auto=None)
+        ax.set_ylim(ylim, auto=None)
 
     def _draw_points(
         self,
@@ -70,7 +70,8 @@ class BratsNumpyBase(SubsetBase):
             image_path = osp.join(self._root_dir, item_id + BratsNumpyPath.DATA_SUFFIX + ".npy")
             media = None
             if osp.isfile(image_path):
-                data = np.load(image_path)[0].transpose()
+                # The arrays are memory-mapped, the frames are views into the file
+                data = np.load(image_path, mmap_mode="r")[0].transpose()
                 images = [0] * data.shape[2]
                 for j in range(data.shape[2]):
                     images[j] = data[:, :, j]
@@ -80,7 +81,7 @@ class BratsNumpyBase(SubsetBase):
             anno = []
             mask_path = osp.join(self._root_dir, item_id + BratsNumpyPath.LABEL_SUFFIX + ".npy")
             if osp.isfile(mask_path):
-                mask = np.load(mask_path)[0].transpose()
+                mask = np.load(mask_path, mmap_mode="r")[0].transpose()
                 for j in range(mask.shape[2]):
                     classes = np.unique(mask[:, :, j])
                     for class_id in classes:
@@ -138,6 +138,19 @@ class CifarBase(SubsetBase):
                 "The sizes of the arrays 'data', " "'filenames', 'labels' don't match."
             )
 
+        if (
+            size is None
+            and isinstance(images_data, np.ndarray)
+            and images_data.ndim == 2
+            and images_data.dtype != object
+        ):
+            # The items keep views into the batch array, no per-item copies are made
+            images_data = (
+                images_data.astype(np.uint8, copy=False)
+                .reshape(-1, 3, CifarPath.IMAGE_SIZE, CifarPath.IMAGE_SIZE)
+                .transpose(0, 2, 3, 1)
+            )
+
         max_num_annotations = 0
         for i, (filename, label) in enumerate(zip(filenames, labels)):
             item_id = osp.splitext(filename)[0]
@@ -154,13 +167,9 @@ class CifarBase(SubsetBase):
             image = None
             if 0 < len(images_data):
                 image = images_data[i]
-                if size is not None and image is not None:
-                    image = image.astype(np.uint8).reshape(3, size[i][0], size[i][1])
-                    image = np.transpose(image, (1, 2, 0))
-                elif image is not None:
-                    image = image.astype(np.uint8).reshape(
-                        3, CifarPath.IMAGE_SIZE, CifarPath.IMAGE_SIZE
-                    )
+                if image is not None and image.ndim == 1:
+                    h, w = size[i] if size is not None else (CifarPath.IMAGE_SIZE,) * 2
+                    image = image.astype(np.uint8, copy=False).reshape(3, h, w)
                     image = np.transpose(image, (1, 2, 0))
 
             if image is not None:
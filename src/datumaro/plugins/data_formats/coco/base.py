@@ -5,9 +5,12 @@
 import errno
 import logging as log
 import os.path as osp
+from copy import copy
 from inspect import isclass
+from multiprocessing.pool import Pool
 from typing import Any, Dict, Iterator, Optional, Tuple, Type, TypeVar, Union, overload
 
+import numpy as np
 import pycocotools.mask as mask_utils
 from attrs import define
 
@@ -32,7 +35,7 @@ from datumaro.components.errors import (
     MissingFieldError,
     UndeclaredLabelError,
 )
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, NullImportContext
 from datumaro.components.media import Image
 from datumaro.components.task import TaskAnnotationMapping, TaskType
 from datumaro.util import NOTSET, parse_json_file, take_by
@@ -45,6 +48,18 @@ from .page_mapper import COCOPageMapper
 
 T = TypeVar("T")
 
+# The annotation parser of a pool worker process
+_ann_worker_parser: Optional["_CocoBase"] = None
+
+
+def _init_ann_worker(parser: "_CocoBase"):
+    global _ann_worker_parser
+    _ann_worker_parser = parser
+
+
+def _parse_ann_chunk_in_worker(args):
+    return _ann_worker_parser._parse_ann_chunk(*args)
+
 
 class DirPathExtracter:
     @staticmethod
@@ -112,8 +127,20 @@ class _CocoBase(SubsetBase):
     """
     Parses COCO annotations written in the following format:
     https://cocodataset.org/#format-data
+
+    Args:
+        num_workers: The number of multi-processing workers for import.
+            If num_workers = 0, do not use multiprocessing.
+            It is not used for the stream import and for the small annotation files.
     """
 
+    # The number of annotations sent to a pool worker at once
+    _ANN_CHUNK_SIZE = 1000
+
+    # The minimum number of annotations, for which the pool is used. Starting the workers
+    # takes 35-100 ms, and the pool saves about 10-15 us per annotation in the main process.
+    _MIN_POOL_ANN_COUNT = 10000
+
     def __init__(
         self,
         path,
@@ -124,6 +151,7 @@ class _CocoBase(SubsetBase):
         coco_importer_type: CocoImporterType = CocoImporterType.default,
         subset: Optional[str] = None,
         stream: bool = False,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ):
         if not osp.isfile(path):
@@ -151,6 +179,12 @@ class _CocoBase(SubsetBase):
 
         self._merge_instance_polygons = merge_instance_polygons
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
         self._label_map = {}  # coco_id -> dm_id
         if self._task == CocoTask.panoptic:
             self._mask_dir = osp.splitext(path)[0]
@@ -355,29 +389,168 @@ class _CocoBase(SubsetBase):
             img_infos[img_id] = img_info
 
         ann_lists = self._parse_field(json_data, "annotations", list)
-        for ann_info in pbar.iter(
-            _gen_ann(ann_lists),
-            desc=f"Importing '{self._subset}'",
-            total=len(ann_lists),
+        if (
+            0 < self._num_workers
+            and self._MIN_POOL_ANN_COUNT <= len(ann_lists)
+            and self._task is not CocoTask.panoptic
         ):
+            self._load_anns_in_pool(ann_lists, items, img_infos)
+        else:
+            for ann_info in pbar.iter(
+                _gen_ann(ann_lists),
+                desc=f"Importing '{self._subset}'",
+                total=len(ann_lists),
+            ):
+                self._load_ann(ann_info, items, img_infos)
+
+        # Annotation types are collected once per item, after all the annotations are parsed
+        for item in items.values():
+            for ann in item.annotations:
+                self._ann_types.add(ann.type)
+
+        return items
+
+    def _load_ann(self, ann_info, items, img_infos):
+        try:
+            img_id = self._parse_field(ann_info, "image_id", int)
+            if img_id not in img_infos:
+                log.warn(f"Unknown image id '{img_id}'")
+                return
+
+            # Retrieve item (DatasetItem) and img_info (Dict) from the integer key dictionary
+            item = items[img_id]
+            img_info = img_infos[img_id]
+            self._parse_anns(img_info, ann_info, item)
+        except Exception as e:
+            self._ctx.error_policy.report_annotation_error(
+                e, item_id=(ann_info.get("id", None), self._subset)
+            )
+
+    def _load_anns_in_pool(self, ann_lists, items, img_infos):
+        pbar = self._ctx.progress_reporter
+
+        # Keep the order, in which the annotations are parsed without the pool
+        ann_lists.reverse()
+        chunks = [
+            ann_lists[start : start + self._ANN_CHUNK_SIZE]
+            for start in range(0, len(ann_lists), self._ANN_CHUNK_SIZE)
+        ]
+        ann_lists.clear()
+
+        # The import context and the parsed items are not needed in the workers
+        parser = copy(self)
+        parser._ctx = NullImportContext()
+
+        with Pool(
+            processes=self._num_workers, initializer=_init_ann_worker, initargs=(parser,)
+        ) as pool:
+            results = pool.imap(
+                _parse_ann_chunk_in_worker,
+                ((chunk, self._get_chunk_img_infos(chunk, img_infos)) for chunk in chunks),
+            )
+
+            for chunk, result in pbar.iter(
+                zip(chunks, results),
+                desc=f"Importing '{self._subset}'",
+                total=len(chunks),
+            ):
+                for ann_info, compact_anns in zip(chunk, result):
+                    if compact_anns is None:
+                        # Unknown images and errors are reported in the same way,
+                        # as without the pool
+                        self._load_ann(ann_info, items, img_infos)
+                    else:
+                        items[ann_info["image_id"]].annotations.extend(
+                            self._restore_annotations(ann_info["id"], *compact_anns)
+                        )
+
+    @staticmethod
+    def _get_chunk_img_infos(chunk, img_infos):
+        chunk_img_infos = {}
+        for ann_info in chunk:
+            img_id = ann_info.get("image_id")
+            if isinstance(img_id, int) and img_id in img_infos:
+                chunk_img_infos[img_id] = img_infos[img_id]
+        return chunk_img_infos
+
+    def _parse_ann_chunk(self, ann_infos, img_infos):
+        """
+        Parses a chunk of annotations in a worker process.
+        Returns the compact representation of the parsed annotations for each
+        annotation info, or None, if it has to be parsed again to report a problem.
+        """
+        results = []
+        for ann_info in ann_infos:
             try:
                 img_id = self._parse_field(ann_info, "image_id", int)
-                if img_id not in img_infos:
-                    log.warn(f"Unknown image id '{img_id}'")
-                    continue
+                anns = self._load_annotations(ann_info, img_infos[img_id])
+                compact_anns = self._compact_annotations(anns)
+            except Exception:
+                compact_anns = None
+            results.append(compact_anns)
+        return results
 
-                # Retrieve item (DatasetItem) and img_info (Dict) from the integer key dictionary
-                item = items[img_id]
-                img_info = img_infos[img_id]
-                self._parse_anns(img_info, ann_info, item)
-                for ann in item.annotations:
-                    self._ann_types.add(ann.type)
-            except Exception as e:
-                self._ctx.error_policy.report_annotation_error(
-                    e, item_id=(ann_info.get("id", None), self._subset)
+    @staticmethod
+    def _compact_annotations(anns):
+        """
+        Converts the annotations parsed from one annotation info into primitive data:
+        (label, attributes, [(annotation type, data), ...]). The id and the group of
+        the annotations are restored from the annotation info.
+        """
+        shapes = []
+        for ann in anns:
+            if isinstance(ann, RleMask):
+                # Send the encoded RLE masks instead of the polygons
+                data = ann.rle
+            elif isinstance(ann, Points):
+                data = (
+                    np.array(ann.points, dtype=np.float32),
+                    np.array(ann.visibility, dtype=np.int8),
                 )
-
-        return items
+            elif isinstance(ann, (Bbox, Polygon)):
+                data = np.array(ann.points, dtype=np.float32)
+            elif isinstance(ann, Caption):
+                data = ann.caption
+            else:
+                data = None
+            shapes.append((ann.type, data))
+
+        label = getattr(anns[0], "label", None) if anns else None
+        attributes = anns[0].attributes if anns else {}
+        return label, attributes, shapes
+
+    # The worker has already validated and converted the shape coordinates,
+    # so the shapes are restored from these states and filled in,
+    # instead of running the field converters again
+    _SHAPE_STATES = {
+        ann.type: (type(ann), ann.__getstate__())
+        for ann in [Bbox(0, 0, 0, 0), Polygon([0, 0, 0, 0, 0, 0]), Points([0, 0])]
+    }
+
+    @classmethod
+    def _restore_annotations(cls, ann_id, label, attributes, shapes):
+        anns = []
+        for ann_type, data in shapes:
+            if ann_type in cls._SHAPE_STATES:
+                ann_cls, state = cls._SHAPE_STATES[ann_type]
+                ann = ann_cls.__new__(ann_cls)
+                ann.__setstate__(state)
+                ann.id = ann_id
+                ann.group = ann_id
+                ann.attributes = attributes
+                ann.label = label
+                if ann_type == AnnotationType.points:
+                    data, visibility = data
+                    ann.visibility = [Points.Visibility(v) for v in visibility.tolist()]
+                ann.points = data.tolist()
+            elif ann_type == AnnotationType.mask:
+                ann = RleMask(rle=data, label=label, id=ann_id, attributes=attributes, group=ann_id)
+            elif ann_type == AnnotationType.caption:
+                ann = Caption(data, id=ann_id, attributes=attributes, group=ann_id)
+            else:
+                ann = Label(label=label, id=ann_id, attributes=attributes, group=ann_id)
+            anns.append(ann)
+        return anns
 
     def _parse_item(self, img_info: Dict[str, Any]) -> Optional[Tuple[int, DatasetItem]]:
         try:
@@ -23,6 +23,7 @@ from datumaro.components.annotation import (
     Ellipse,
     Points,
     Polygon,
+    RleMask,
 )
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.dataset_item_storage import ItemStatus
@@ -381,17 +382,28 @@ class _InstancesExporter(_TaskExporter):
             )
 
         if use_masks:
-            if polygons and img_width > 0 and img_height > 0:
-                mask = mask_tools.rles_to_mask(polygons, img_width, img_height)
+            if not polygons and masks and all(isinstance(m, RleMask) for m in masks):
+                # The RLE masks are exported as is, without decoding
+                mask_rles = [m.rle for m in masks]
+                if all(
+                    mask_tools.is_compressed_rle(rle)
+                    and list(rle["size"]) == [img_height, img_width]
+                    for rle in mask_rles
+                ):
+                    mask = mask_tools.merge_rles(mask_rles)
+
+            if mask is None:
+                if polygons and img_width > 0 and img_height > 0:
+                    mask = mask_tools.rles_to_mask(polygons, img_width, img_height)
+
+                if masks:
+                    masks = (m.image for m in masks)
+                    if mask is not None:
+                        masks = chain(masks, [mask])
+                    mask = mask_tools.merge_masks(masks)
 
-            if masks:
-                masks = (m.image for m in masks)
                 if mask is not None:
-                    masks = chain(masks, [mask])
-                mask = mask_tools.merge_masks(masks)
-
-            if mask is not None:
-                mask = mask_tools.mask_to_rle(mask)
+                    mask = mask_tools.mask_to_rle(mask)
             polygons = []
         else:
             if masks:
@@ -442,7 +454,13 @@ class _InstancesExporter(_TaskExporter):
         ann, polygons, mask, bbox = instance
 
         is_crowd = mask is not None
-        if is_crowd:
+        if is_crowd and mask_tools.is_compressed_rle(mask):
+            counts = mask["counts"]
+            segmentation = {
+                "counts": counts.decode() if isinstance(counts, bytes) else counts,
+                "size": list(int(c) for c in mask["size"]),
+            }
+        elif is_crowd:
             segmentation = {
                 "counts": list(int(c) for c in mask["counts"]),
                 "size": list(int(c) for c in mask["size"]),
@@ -451,7 +469,9 @@ class _InstancesExporter(_TaskExporter):
             segmentation = [list(map(float, p)) for p in polygons]
 
         area = 0
-        if segmentation:
+        if is_crowd and mask_tools.is_compressed_rle(mask):
+            area = mask_utils.area(mask)
+        elif segmentation:
             if item.media and item.media.size:
                 h, w = item.media.size
             else:
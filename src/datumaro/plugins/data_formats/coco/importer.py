@@ -49,6 +49,13 @@ class CocoImporter(Importer):
             "correspond to the category IDs in the original annotation "
             "file",
         )
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of multi-processing workers for import. "
+            "If num_workers = 0, do not use multiprocessing (default: %(default)s).",
+        )
         return parser
 
     @classmethod
@@ -175,6 +182,7 @@ class CocoImporter(Importer):
 class CocoImageInfoImporter(CocoImporter):
     _TASK = CocoTask.image_info
     _TASKS = {_TASK: CocoImporter._TASKS[_TASK]}
+    MAX_DETECT_CONFIDENCE = FormatDetectionConfidence.LOW
 
     @classmethod
     def detect(
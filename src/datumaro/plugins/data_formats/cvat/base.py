@@ -5,7 +5,7 @@
 import os.path as osp
 from collections import OrderedDict
 from copy import deepcopy
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Type
 
 import numpy as np
 from defusedxml import ElementTree
@@ -25,7 +25,8 @@ from datumaro.components.errors import DatasetImportError
 from datumaro.components.format_detection import FormatDetectionContext
 from datumaro.components.importer import ImportContext, Importer
 from datumaro.components.media import Image
-from datumaro.components.task import TaskAnnotationMapping
+from datumaro.components.merge.extractor_merger import ExtractorMerger
+from datumaro.components.task import TaskAnnotationMapping, TaskType
 from datumaro.util import mask_tools
 
 from .format import CvatPath
@@ -50,11 +51,20 @@ def _find_meta_root(path: str):
 
 
 class CvatBase(SubsetBase):
+    """
+    Args:
+        stream: If True, the items are parsed from the XML file on each iteration,
+            instead of being kept in memory. The image annotations are yielded as soon
+            as they are parsed, while the track annotations are kept until the end
+            of the file, because a track can refer to any frame.
+    """
+
     def __init__(
         self,
         path: str,
         *,
         subset: Optional[str] = None,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
         assert osp.isfile(path), path
@@ -69,17 +79,79 @@ class CvatBase(SubsetBase):
             subset = osp.splitext(osp.basename(path))[0]
         super().__init__(subset=subset, ctx=ctx)
 
-        items, categories = self._parse(path)
-        self._categories = categories
-        self._items = list(self._load_items(items).values())
+        self._stream = stream
+        if not stream:
+            items, categories = self._parse(path)
+            self._categories = categories
+            self._items = list(self._load_items(items).values())
+            self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
+        else:
+            meta_root, _ = _find_meta_root(path)
+            self._categories, _, _ = self._parse_meta(meta_root)
+            self._length = None
+            self._task_type = TaskType.mixed
+
+    def __len__(self) -> int:
+        if self.is_stream:
+            if self._length is None:
+                self._length = self._count_frames()
+            return self._length
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        if not self.is_stream:
+            yield from self._items
+            return
+
+        meta_root, context = _find_meta_root(self._path)
+        categories, frame_size, attribute_types = self._parse_meta(meta_root)
+
+        length = 0
+        for frame_id, item_desc in self._ctx.progress_reporter.iter(
+            self._parse_frames(context, categories, frame_size, attribute_types),
+            desc=f"Importing '{self._subset}'",
+        ):
+            item = self._load_item(frame_id, item_desc)
+            for ann in item.annotations:
+                self._ann_types.add(ann.type)
+
+            yield item
+            length += 1
+
+        self._length = length
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
+
     def _parse(self, path):
         meta_root, context = _find_meta_root(path)
 
         categories, frame_size, attribute_types = self._parse_meta(meta_root)
 
+        items = OrderedDict(self._parse_frames(context, categories, frame_size, attribute_types))
+
+        return items, categories
+
+    def _parse_frames(
+        self, context, categories, frame_size, attribute_types
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yields the frame descriptions in the order of their first appearance.
+        In the stream mode, the image frames are yielded at the end of their elements.
+        """
+
         items = OrderedDict()
+        streamed_frames = set()
+
+        def _get_frame_desc(frame_id):
+            if frame_id in streamed_frames:
+                raise DatasetImportError(
+                    f"Frame {frame_id} is annotated after its image element. "
+                    "Such a file cannot be imported in the stream mode."
+                )
+            return items.get(frame_id, {"annotations": []})
 
         track = None
         shape = None
@@ -174,7 +246,7 @@ class CvatBase(SubsetBase):
                             shape["points"].extend(map(float, pair.split(",")))
 
                     if subset is None or subset == self._subset:
-                        frame_desc = items.get(shape["frame"], {"annotations": []})
+                        frame_desc = _get_frame_desc(shape["frame"])
                         frame_desc["annotations"].append(
                             self._parse_shape_ann(shape, categories, image)
                         )
@@ -184,7 +256,7 @@ class CvatBase(SubsetBase):
 
                 elif el.tag == "tag":
                     if subset is None or subset == self._subset:
-                        frame_desc = items.get(tag["frame"], {"annotations": []})
+                        frame_desc = _get_frame_desc(tag["frame"])
                         frame_desc["annotations"].append(self._parse_tag_ann(tag, categories))
                         items[tag["frame"]] = frame_desc
                     tag = None
@@ -192,7 +264,7 @@ class CvatBase(SubsetBase):
                     track = None
                 elif el.tag == "image":
                     if subset is None or subset == self._subset:
-                        frame_desc = items.get(image["frame"], {"annotations": []})
+                        frame_desc = _get_frame_desc(image["frame"])
                         frame_desc.update(
                             {
                                 "name": image.get("name"),
@@ -201,10 +273,37 @@ class CvatBase(SubsetBase):
                             }
                         )
                         items[image["frame"]] = frame_desc
+
+                        if self._stream:
+                            streamed_frames.add(image["frame"])
+                            yield image["frame"], items.pop(image["frame"])
                     image = None
                 el.clear()
 
-        return items, categories
+        yield from items.items()
+
+    def _count_frames(self) -> int:
+        _, context = _find_meta_root(self._path)
+
+        frames = set()
+        subset = None
+        track = False
+        for ev, el in context:
+            if ev == "start":
+                if el.tag in ["track", "image"]:
+                    subset = el.attrib.get("subset")
+                    track = el.tag == "track"
+            elif ev == "end":
+                if subset is None or subset == self._subset:
+                    if el.tag == "image":
+                        frames.add(el.attrib["id"])
+                    elif track and el.tag in CvatPath.SUPPORTED_IMPORT_SHAPES:
+                        frames.add(el.attrib["frame"])
+                if el.tag == "track":
+                    track = False
+                el.clear()
+
+        return len(frames)
 
     @staticmethod
     def _parse_meta(meta_root):
@@ -361,41 +460,44 @@ class CvatBase(SubsetBase):
 
     def _load_items(self, parsed):
         for frame_id, item_desc in parsed.items():
-            name = item_desc.get("name", "frame_%06d.png" % int(frame_id))
-
-            image_path_opt_1 = osp.join(self._images_dir, name)
-            image_path_opt_2 = (
-                osp.join(self._images_dir, self._subset, name) if self._subset is not None else None
-            )
-            if osp.exists(image_path_opt_1):
-                image = image_path_opt_1
-            elif image_path_opt_2 and osp.exists(image_path_opt_2):
-                image = image_path_opt_2
-            elif "name" not in item_desc:
-                # If --use-track flag is on
-                # TODO: Revisit all the CVAT import/export parts.
-                image = image_path_opt_1
-            else:
-                raise DatasetImportError(f"Cannot find an image which has name={name}.")
-
-            image_size = (item_desc.get("height"), item_desc.get("width"))
-            if all(image_size):
-                image = Image.from_file(path=image, size=tuple(map(int, image_size)))
-            else:
-                image = Image.from_file(path=image)
-
-            parsed[frame_id] = DatasetItem(
-                id=osp.splitext(name)[0],
-                subset=self._subset,
-                media=image,
-                annotations=item_desc.get("annotations"),
-                attributes={"frame": int(frame_id)},
-            )
+            parsed[frame_id] = self._load_item(frame_id, item_desc)
             for ann in item_desc.get("annotations"):
                 self._ann_types.add(ann.type)
 
         return parsed
 
+    def _load_item(self, frame_id, item_desc) -> DatasetItem:
+        name = item_desc.get("name", "frame_%06d.png" % int(frame_id))
+
+        image_path_opt_1 = osp.join(self._images_dir, name)
+        image_path_opt_2 = (
+            osp.join(self._images_dir, self._subset, name) if self._subset is not None else None
+        )
+        if osp.exists(image_path_opt_1):
+            image = image_path_opt_1
+        elif image_path_opt_2 and osp.exists(image_path_opt_2):
+            image = image_path_opt_2
+        elif "name" not in item_desc:
+            # If --use-track flag is on
+            # TODO: Revisit all the CVAT import/export parts.
+            image = image_path_opt_1
+        else:
+            raise DatasetImportError(f"Cannot find an image which has name={name}.")
+
+        image_size = (item_desc.get("height"), item_desc.get("width"))
+        if all(image_size):
+            image = Image.from_file(path=image, size=tuple(map(int, image_size)))
+        else:
+            image = Image.from_file(path=image)
+
+        return DatasetItem(
+            id=osp.splitext(name)[0],
+            subset=self._subset,
+            media=image,
+            annotations=item_desc.get("annotations"),
+            attributes={"frame": int(frame_id)},
+        )
+
 
 class CvatImporter(Importer):
     _ANNO_EXT = ".xml"
@@ -442,6 +544,13 @@ class CvatImporter(Importer):
 
         return sources
 
+    @property
+    def can_stream(self) -> bool:
+        return True
+
+    def get_extractor_merger(self) -> Optional[Type[ExtractorMerger]]:
+        return ExtractorMerger
+
     @classmethod
     def get_file_extensions(cls) -> List[str]:
         return [cls._ANNO_EXT]
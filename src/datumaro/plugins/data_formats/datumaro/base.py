@@ -4,10 +4,11 @@
 
 import os.path as osp
 import re
-from typing import Dict, List, Optional, Type
+from typing import Dict, Iterable, List, Optional, Type
 
 from datumaro.components.annotation import (
     NO_OBJECT_ID,
+    Annotation,
     AnnotationType,
     Bbox,
     Caption,
@@ -37,6 +38,152 @@ from .format import DATUMARO_FORMAT_VERSION, DatumaroPath
 __all__ = ["DatumaroBase"]
 
 
+def load_annotations(
+    ann_descs: Iterable[Dict], *, subset: Optional[str], ctx: ImportContext
+) -> List[Annotation]:
+    """
+    Restores the annotations from their descriptions in the Datumaro format.
+    The annotations, which can't be restored, are reported to the import context.
+    """
+
+    loaded = []
+
+    for ann in ann_descs:
+        try:
+            ann_id = ann.get("id")
+            ann_type = AnnotationType[ann["type"]]
+            attributes = ann.get("attributes")
+            group = ann.get("group")
+            object_id = ann.get("object_id", NO_OBJECT_ID)
+
+            label_id = ann.get("label_id")
+            z_order = ann.get("z_order")
+            points = ann.get("points")
+
+            if ann_type == AnnotationType.label:
+                loaded.append(
+                    Label(
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                    )
+                )
+
+            elif ann_type == AnnotationType.mask:
+                rle = ann["rle"]
+                rle["counts"] = rle["counts"].encode("ascii")
+                loaded.append(
+                    RleMask(
+                        rle=rle,
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.polyline:
+                loaded.append(
+                    PolyLine(
+                        points,
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.polygon:
+                loaded.append(
+                    Polygon(
+                        points,
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.bbox:
+                x, y, w, h = ann["bbox"]
+                loaded.append(
+                    Bbox(
+                        x,
+                        y,
+                        w,
+                        h,
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.points:
+                loaded.append(
+                    Points(
+                        points,
+                        ann.get("visibility"),
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.caption:
+                caption = ann.get("caption")
+                loaded.append(Caption(caption, id=ann_id, attributes=attributes, group=group))
+
+            elif ann_type == AnnotationType.cuboid_3d:
+                loaded.append(
+                    Cuboid3d(
+                        ann.get("position"),
+                        ann.get("rotation"),
+                        ann.get("scale"),
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                    )
+                )
+
+            elif ann_type == AnnotationType.ellipse:
+                loaded.append(
+                    Ellipse(
+                        *points,
+                        label=label_id,
+                        id=ann_id,
+                        attributes=attributes,
+                        group=group,
+                        object_id=object_id,
+                        z_order=z_order,
+                    )
+                )
+
+            elif ann_type == AnnotationType.hash_key:
+                continue
+            else:
+                raise NotImplementedError()
+        except Exception as e:
+            ctx.error_policy.report_annotation_error(e, item_id=(ann.get("id", None), subset))
+
+    return loaded
+
+
 class JsonReader:
     def __init__(
         self,
@@ -221,143 +368,7 @@ class JsonReader:
         )
 
     def _load_annotations(self, item: Dict):
-        loaded = []
-
-        for ann in item.get("annotations", []):
-            try:
-                ann_id = ann.get("id")
-                ann_type = AnnotationType[ann["type"]]
-                attributes = ann.get("attributes")
-                group = ann.get("group")
-                object_id = ann.get("object_id", NO_OBJECT_ID)
-
-                label_id = ann.get("label_id")
-                z_order = ann.get("z_order")
-                points = ann.get("points")
-
-                if ann_type == AnnotationType.label:
-                    loaded.append(
-                        Label(
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.mask:
-                    rle = ann["rle"]
-                    rle["counts"] = rle["counts"].encode("ascii")
-                    loaded.append(
-                        RleMask(
-                            rle=rle,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.polyline:
-                    loaded.append(
-                        PolyLine(
-                            points,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.polygon:
-                    loaded.append(
-                        Polygon(
-                            points,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.bbox:
-                    x, y, w, h = ann["bbox"]
-                    loaded.append(
-                        Bbox(
-                            x,
-                            y,
-                            w,
-                            h,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.points:
-                    loaded.append(
-                        Points(
-                            points,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.caption:
-                    caption = ann.get("caption")
-                    loaded.append(Caption(caption, id=ann_id, attributes=attributes, group=group))
-
-                elif ann_type == AnnotationType.cuboid_3d:
-                    loaded.append(
-                        Cuboid3d(
-                            ann.get("position"),
-                            ann.get("rotation"),
-                            ann.get("scale"),
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.ellipse:
-                    loaded.append(
-                        Ellipse(
-                            *points,
-                            label=label_id,
-                            id=ann_id,
-                            attributes=attributes,
-                            group=group,
-                            object_id=object_id,
-                            z_order=z_order,
-                        )
-                    )
-
-                elif ann_type == AnnotationType.hash_key:
-                    continue
-                else:
-                    raise NotImplementedError()
-            except Exception as e:
-                self._ctx.error_policy.report_annotation_error(
-                    e, item_id=(ann.get("id", None), self._subset)
-                )
-
-        return loaded
+        return load_annotations(item.get("annotations", []), subset=self._subset, ctx=self._ctx)
 
     def __len__(self):
         return len(self.items)
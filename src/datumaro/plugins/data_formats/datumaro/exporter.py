@@ -125,6 +125,156 @@ class JsonWriter:
 
         return dict_cat
 
+    @classmethod
+    def write_annotation(cls, ann: Annotation) -> Optional[Dict]:
+        """
+        Returns the description of the annotation in the Datumaro format,
+        or None, if the annotation is not stored in this format.
+        """
+
+        if isinstance(ann, Label):
+            return cls._convert_label_object(ann)
+        elif isinstance(ann, Mask):
+            return cls._convert_mask_object(ann)
+        elif isinstance(ann, Points):
+            return cls._convert_points_object(ann)
+        elif isinstance(ann, PolyLine):
+            return cls._convert_polyline_object(ann)
+        elif isinstance(ann, Polygon):
+            return cls._convert_polygon_object(ann)
+        elif isinstance(ann, Bbox):
+            return cls._convert_bbox_object(ann)
+        elif isinstance(ann, Caption):
+            return cls._convert_caption_object(ann)
+        elif isinstance(ann, Cuboid3d):
+            return cls._convert_cuboid_3d_object(ann)
+        elif isinstance(ann, Ellipse):
+            return cls._convert_ellipse_object(ann)
+        elif isinstance(ann, HashKey):
+            return None
+        else:
+            raise NotImplementedError()
+
+    @classmethod
+    def _convert_annotation(cls, obj):
+        assert isinstance(obj, Annotation)
+
+        ann_json = {
+            "id": cast(obj.id, int),
+            "type": cast(obj.type.name, str),
+            "attributes": obj.attributes,
+            "group": cast(obj.group, int, 0),
+        }
+        if obj.object_id >= 0:
+            ann_json["object_id"] = cast(obj.object_id, int)
+        return ann_json
+
+    @classmethod
+    def _convert_label_object(cls, obj):
+        converted = cls._convert_annotation(obj)
+
+        converted.update(
+            {
+                "label_id": cast(obj.label, int),
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_mask_object(cls, obj):
+        converted = cls._convert_annotation(obj)
+
+        if isinstance(obj, RleMask):
+            rle = obj.rle
+        else:
+            rle = mask_utils.encode(np.require(obj.image, dtype=np.uint8, requirements="F"))
+
+        if isinstance(rle["counts"], str):
+            counts = rle["counts"]
+        else:
+            counts = rle["counts"].decode("ascii")
+
+        converted.update(
+            {
+                "label_id": cast(obj.label, int),
+                "rle": {
+                    # serialize as compressed COCO mask
+                    "counts": counts,
+                    "size": list(int(c) for c in rle["size"]),
+                },
+                "z_order": obj.z_order,
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_shape_object(cls, obj):
+        assert isinstance(obj, _Shape)
+        converted = cls._convert_annotation(obj)
+
+        converted.update(
+            {
+                "label_id": cast(obj.label, int),
+                "points": [float(p) for p in obj.points],
+                "z_order": obj.z_order,
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_polyline_object(cls, obj):
+        return cls._convert_shape_object(obj)
+
+    @classmethod
+    def _convert_polygon_object(cls, obj):
+        return cls._convert_shape_object(obj)
+
+    @classmethod
+    def _convert_bbox_object(cls, obj):
+        converted = cls._convert_shape_object(obj)
+        converted.pop("points", None)
+        converted["bbox"] = [float(p) for p in obj.get_bbox()]
+        return converted
+
+    @classmethod
+    def _convert_points_object(cls, obj):
+        converted = cls._convert_shape_object(obj)
+
+        converted.update(
+            {
+                "visibility": [int(v.value) for v in obj.visibility],
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_caption_object(cls, obj):
+        converted = cls._convert_annotation(obj)
+
+        converted.update(
+            {
+                "caption": cast(obj.caption, str),
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_cuboid_3d_object(cls, obj):
+        converted = cls._convert_annotation(obj)
+        converted.update(
+            {
+                "label_id": cast(obj.label, int),
+                "position": [float(p) for p in obj.position],
+                "rotation": [float(p) for p in obj.rotation],
+                "scale": [float(p) for p in obj.scale],
+            }
+        )
+        return converted
+
+    @classmethod
+    def _convert_ellipse_object(cls, obj: Ellipse):
+        return cls._convert_shape_object(obj)
+
 
 class _SubsetWriter:
     def __init__(
@@ -137,9 +287,11 @@ class _SubsetWriter:
         self._context = context
         self._subset = subset
 
+        # The datasets without media are saved as image datasets
+        media_type = context._extractor.media_type() or Image
         self._data = {
             "dm_format_version": DATUMARO_FORMAT_VERSION,
-            "media_type": context._extractor.media_type()._type,
+            "media_type": media_type._type,
             "infos": {},
             "categories": {},
             "items": [],
@@ -268,29 +420,9 @@ class _SubsetWriter:
                 item_desc["media"] = {"path": getattr(item.media, "path", None)}
 
         for ann in item.annotations:
-            if isinstance(ann, Label):
-                converted_ann = self._convert_label_object(ann)
-            elif isinstance(ann, Mask):
-                converted_ann = self._convert_mask_object(ann)
-            elif isinstance(ann, Points):
-                converted_ann = self._convert_points_object(ann)
-            elif isinstance(ann, PolyLine):
-                converted_ann = self._convert_polyline_object(ann)
-            elif isinstance(ann, Polygon):
-                converted_ann = self._convert_polygon_object(ann)
-            elif isinstance(ann, Bbox):
-                converted_ann = self._convert_bbox_object(ann)
-            elif isinstance(ann, Caption):
-                converted_ann = self._convert_caption_object(ann)
-            elif isinstance(ann, Cuboid3d):
-                converted_ann = self._convert_cuboid_3d_object(ann)
-            elif isinstance(ann, Ellipse):
-                converted_ann = self._convert_ellipse_object(ann)
-            elif isinstance(ann, HashKey):
-                continue
-            else:
-                raise NotImplementedError()
-            annotations.append(converted_ann)
+            converted_ann = JsonWriter.write_annotation(ann)
+            if converted_ann is not None:
+                annotations.append(converted_ann)
 
         return item_desc
 
@@ -303,115 +435,6 @@ class _SubsetWriter:
     def write(self, *args, **kwargs):
         dump_json_file(self.ann_file, self._data)
 
-    def _convert_annotation(self, obj):
-        assert isinstance(obj, Annotation)
-
-        ann_json = {
-            "id": cast(obj.id, int),
-            "type": cast(obj.type.name, str),
-            "attributes": obj.attributes,
-            "group": cast(obj.group, int, 0),
-        }
-        if obj.object_id >= 0:
-            ann_json["object_id"] = cast(obj.object_id, int)
-        return ann_json
-
-    def _convert_label_object(self, obj):
-        converted = self._convert_annotation(obj)
-
-        converted.update(
-            {
-                "label_id": cast(obj.label, int),
-            }
-        )
-        return converted
-
-    def _convert_mask_object(self, obj):
-        converted = self._convert_annotation(obj)
-
-        if isinstance(obj, RleMask):
-            rle = obj.rle
-        else:
-            rle = mask_utils.encode(np.require(obj.image, dtype=np.uint8, requirements="F"))
-
-        if isinstance(rle["counts"], str):
-            counts = rle["counts"]
-        else:
-            counts = rle["counts"].decode("ascii")
-
-        converted.update(
-            {
-                "label_id": cast(obj.label, int),
-                "rle": {
-                    # serialize as compressed COCO mask
-                    "counts": counts,
-                    "size": list(int(c) for c in rle["size"]),
-                },
-                "z_order": obj.z_order,
-            }
-        )
-        return converted
-
-    def _convert_shape_object(self, obj):
-        assert isinstance(obj, _Shape)
-        converted = self._convert_annotation(obj)
-
-        converted.update(
-            {
-                "label_id": cast(obj.label, int),
-                "points": [float(p) for p in obj.points],
-                "z_order": obj.z_order,
-            }
-        )
-        return converted
-
-    def _convert_polyline_object(self, obj):
-        return self._convert_shape_object(obj)
-
-    def _convert_polygon_object(self, obj):
-        return self._convert_shape_object(obj)
-
-    def _convert_bbox_object(self, obj):
-        converted = self._convert_shape_object(obj)
-        converted.pop("points", None)
-        converted["bbox"] = [float(p) for p in obj.get_bbox()]
-        return converted
-
-    def _convert_points_object(self, obj):
-        converted = self._convert_shape_object(obj)
-
-        converted.update(
-            {
-                "visibility": [int(v.value) for v in obj.visibility],
-            }
-        )
-        return converted
-
-    def _convert_caption_object(self, obj):
-        converted = self._convert_annotation(obj)
-
-        converted.update(
-            {
-                "caption": cast(obj.caption, str),
-            }
-        )
-        return converted
-
-    def _convert_cuboid_3d_object(self, obj):
-        converted = self._convert_annotation(obj)
-        converted.update(
-            {
-                "label_id": cast(obj.label, int),
-                "position": [float(p) for p in obj.position],
-                "rotation": [float(p) for p in obj.rotation],
-                "scale": [float(p) for p in obj.scale],
-            }
-        )
-        return converted
-
-    def _convert_ellipse_object(self, obj: Ellipse):
-        return self._convert_shape_object(obj)
-
 
 class _StreamSubsetWriter(_SubsetWriter):
     def __init__(
@@ -8,6 +8,11 @@ from typing import Any, Dict, Iterator, Optional
 from datumaro.components.media import MediaType
 from datumaro.components.task import TaskType
 from datumaro.rust_api import DatumPageMapper as DatumPageMapperImpl
+from datumaro.util.definitions import (
+    can_use_page_map_index,
+    get_page_map_index_path,
+    is_page_map_index_enabled,
+)
 
 __all__ = ["DatumPageMapper"]
 
@@ -18,11 +23,24 @@ class DatumPageMapper:
 
     It also provides __iter__() to produce item and annotation dictionaries
     in stream manner after constructing the page map.
+
+    If use_index is True, the page map is saved to the index file in DATUMARO_CACHE_DIR
+    and restored from it on the next construction, unless the JSON file is changed.
+    By default, the index is used unless DATUMARO_PAGE_MAP_INDEX environment variable
+    is set to "0", "false" or "no", or the Rust extension is built without the index support.
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, use_index: Optional[bool] = None) -> None:
         self._path = path
-        self._impl = DatumPageMapperImpl(path)
+        self._use_index = use_index
+
+        if use_index is None:
+            use_index = is_page_map_index_enabled() and can_use_page_map_index(DatumPageMapperImpl)
+        index_path = get_page_map_index_path(path) if use_index else None
+        if index_path:
+            self._impl = DatumPageMapperImpl(path, index_path)
+        else:
+            self._impl = DatumPageMapperImpl(path)
 
     def __iter__(self) -> Iterator[Dict]:
         for item_key in self.iter_item_ids():
@@ -77,4 +95,4 @@ class DatumPageMapper:
         return self._impl.categories()
 
     def __reduce__(self):
-        return (self.__class__, (self._path,))
+        return (self.__class__, (self._path, self._use_index))
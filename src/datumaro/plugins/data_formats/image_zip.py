@@ -2,12 +2,32 @@
 #
 # SPDX-License-Identifier: MIT
 
+import bz2
 import logging as log
+import mmap
 import os
 import os.path as osp
+import struct
+import sys
+import threading
+import time
+import zlib
+from contextlib import suppress
 from enum import Enum
-from typing import List, Optional
-from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile
+from functools import partial
+from multiprocessing.pool import ThreadPool
+from typing import Iterator, List, Optional, Tuple
+from zipfile import (
+    ZIP64_LIMIT,
+    ZIP_BZIP2,
+    ZIP_DEFLATED,
+    ZIP_LZMA,
+    ZIP_STORED,
+    BadZipFile,
+    LZMACompressor,
+    ZipFile,
+    ZipInfo,
+)
 
 from datumaro.components.dataset_base import DatasetItem, SubsetBase
 from datumaro.components.exporter import Exporter
@@ -16,6 +36,7 @@ from datumaro.components.media import Image
 from datumaro.components.task import TaskType
 from datumaro.util import parse_str_enum_value
 from datumaro.util.image import IMAGE_EXTENSIONS, encode_image
+from datumaro.util.multi_procs_util import consumer_generator
 
 
 class Compression(Enum):
@@ -30,7 +51,26 @@ class ImageZipPath:
     DEFAULT_COMPRESSION = Compression.ZIP_STORED
 
 
+# Local file header layout, see the APPNOTE.TXT section 4.3.7
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_NAME_LENGTHS = struct.Struct("<HH")
+_LOCAL_HEADER_NAME_LENGTHS_OFFSET = 26
+
+_MASK_ENCRYPTED = 0x1
+_MASK_COMPRESS_OPTION_1 = 0x2
+
+# The Python versions, in which the compressed members can be appended to ZipFile
+_APPEND_COMPRESSED_PYTHON_VERSIONS = ((3, 9), (3, 13))
+
+
 class ImageZipBase(SubsetBase):
+    """
+    Keeps only the central directory of the archive, the images are read on demand.
+    Uncompressed members are sliced directly from a memory-mapped archive,
+    other members are read with a per-thread ZipFile handle.
+    """
+
     def __init__(
         self,
         url: str,
@@ -42,16 +82,81 @@ class ImageZipBase(SubsetBase):
 
         assert url.endswith(".zip"), url
 
+        self._path = url
+        self._local = threading.local()
+        self._zipfiles: List[ZipFile] = []  # the per-thread handles, to close them
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
         with ZipFile(url, "r") as zf:
-            for path in zf.filelist:
-                item_id, extension = osp.splitext(path.filename)
+            for info in zf.infolist():
+                item_id, extension = osp.splitext(info.filename)
                 if extension.lower() not in IMAGE_EXTENSIONS:
                     continue
-                image = Image.from_bytes(data=zf.read(path.filename))
+                image = Image.from_bytes(data=partial(self._read_member, info), ext=extension)
                 self._items.append(DatasetItem(id=item_id, media=image, subset=self._subset))
 
         self._task_type = TaskType.unlabeled
 
+    def _read_member(self, info: ZipInfo) -> bytes:
+        if info.compress_type == ZIP_STORED and not info.flag_bits & _MASK_ENCRYPTED:
+            return self._read_stored_member(info)
+
+        zf = getattr(self._local, "zipfile", None)
+        if zf is None:
+            zf = ZipFile(self._path, "r")
+            with self._lock:
+                self._zipfiles.append(zf)
+            self._local.zipfile = zf
+        return zf.read(info)
+
+    def close(self):
+        """
+        Closes the archive handles. The images can still be read after closing,
+        the archive is reopened on demand.
+        """
+
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+            for zf in self._zipfiles:
+                zf.close()
+            self._zipfiles.clear()
+            self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        with suppress(Exception):
+            self.close()
+
+    def _get_mmap(self) -> mmap.mmap:
+        with self._lock:
+            if self._mmap is None:
+                with open(self._path, "rb") as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+    def _read_stored_member(self, info: ZipInfo) -> bytes:
+        buffer = self._get_mmap()
+
+        offset = info.header_offset
+        if buffer[offset : offset + len(_LOCAL_HEADER_SIGNATURE)] != _LOCAL_HEADER_SIGNATURE:
+            raise BadZipFile(f"Bad magic number for the file header of '{info.filename}'")
+
+        # The local extra field can differ from the one in the central directory
+        name_length, extra_length = _LOCAL_HEADER_NAME_LENGTHS.unpack_from(
+            buffer, offset + _LOCAL_HEADER_NAME_LENGTHS_OFFSET
+        )
+        start = offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+        return buffer[start : start + info.file_size]
+
 
 class ImageZipImporter(Importer):
     _FORMAT_EXT = ".zip"
@@ -96,9 +201,19 @@ class ImageZipExporter(Exporter):
             "(default: %(default)s)".format(", ".join(e.name for e in Compression)),
         )
 
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of worker threads to encode and compress the archive members. "
+            "If num_workers = 0, do not use a worker pool. (default: %(default)s)",
+        )
+
         return parser
 
-    def __init__(self, extractor, save_dir, name=None, compression=None, **kwargs):
+    def __init__(
+        self, extractor, save_dir, name=None, compression=None, num_workers: int = 0, **kwargs
+    ):
         super().__init__(extractor, save_dir, **kwargs)
 
         if name is None:
@@ -108,8 +223,15 @@ class ImageZipExporter(Exporter):
             compression, Compression, default=ImageZipPath.DEFAULT_COMPRESSION
         )
 
+        if not (isinstance(num_workers, int) and num_workers >= 0):
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}"
+            )
+
         self._archive_name = name
         self._compression = compression.value
+        self._num_workers = num_workers
+        self._precompress = False
 
     def _apply_impl(self):
         os.makedirs(self._save_dir, exist_ok=True)
@@ -123,16 +245,109 @@ class ImageZipExporter(Exporter):
             )
 
         with ZipFile(archive_path, "w", self._compression) as zf:
-            for item in self._extractor:
-                if item.media:
-                    self._archive_image(zf, item)
+            # The members can be compressed in the worker threads only if they can be
+            # appended already compressed. Otherwise, ZipFile compresses them.
+            self._precompress = self._compression != ZIP_STORED and self._can_append_compressed(zf)
+
+            for member in self._iter_members():
+                if member is None:
+                    continue
+
+                if self._precompress:
+                    self._append_compressed_member(zf, *member)
                 else:
-                    log.debug("Item '%s' has no image info", item.id)
+                    zf.writestr(*member)
+
+    def _iter_members(self) -> Iterator[Optional[Tuple[ZipInfo, bytes]]]:
+        if self._num_workers == 0:
+            for item in self._extractor:
+                yield self._make_member(item)
+            return
+
+        # Members are prepared concurrently, but appended in the dataset order
+        with ThreadPool(processes=self._num_workers) as pool:
+
+            def _producer_gen():
+                for item in self._extractor:
+                    yield pool.apply_async(func=self._make_member, args=(item,))
+
+            with consumer_generator(producer_generator=_producer_gen()) as consumer_gen:
+                for future in consumer_gen:
+                    yield future.get()
+
+    def _make_member(self, item: DatasetItem) -> Optional[Tuple[ZipInfo, bytes]]:
+        if not item.media:
+            log.debug("Item '%s' has no image info", item.id)
+            return None
 
-    def _archive_image(self, zipfile, item):
         image_name = self._make_image_filename(item)
         path = getattr(item.media, "path", None)
         if path is not None and osp.isfile(path):
-            zipfile.write(item.media.path, arcname=image_name)
+            zinfo = ZipInfo.from_file(path, arcname=image_name)
+            with open(path, "rb") as f:
+                data = f.read()
         elif item.media.has_data:
-            zipfile.writestr(image_name, encode_image(item.media.data, osp.splitext(image_name)[1]))
+            zinfo = ZipInfo(image_name, date_time=time.localtime(time.time())[:6])
+            zinfo.external_attr = 0o600 << 16  # ?rw-------
+            data = encode_image(item.media.data, osp.splitext(image_name)[1])
+        else:
+            return None
+
+        zinfo.compress_type = self._compression
+        if not self._precompress:
+            return zinfo, data
+
+        if self._compression == ZIP_LZMA:
+            # Compressed data includes an end-of-stream (EOS) marker
+            zinfo.flag_bits |= _MASK_COMPRESS_OPTION_1
+        zinfo.file_size = len(data)
+        zinfo.CRC = zlib.crc32(data)
+
+        data = self._compress(data)
+        zinfo.compress_size = len(data)
+
+        return zinfo, data
+
+    def _compress(self, data: bytes) -> bytes:
+        # Produces the same streams as the compressors of ZipFile.writestr()
+        if self._compression == ZIP_DEFLATED:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        elif self._compression == ZIP_BZIP2:
+            compressor = bz2.BZ2Compressor()
+        elif self._compression == ZIP_LZMA:
+            compressor = LZMACompressor()
+        else:
+            return data
+
+        return compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def _can_append_compressed(zf: ZipFile) -> bool:
+        """
+        Checks that the ZipFile internals used to append the compressed members are available.
+        They are the same in the checked Python versions.
+        """
+
+        return (
+            _APPEND_COMPRESSED_PYTHON_VERSIONS[0] <= sys.version_info[:2]
+            and sys.version_info[:2] <= _APPEND_COMPRESSED_PYTHON_VERSIONS[1]
+            and all(hasattr(zf, name) for name in ("fp", "start_dir", "filelist", "NameToInfo"))
+            and hasattr(ZipInfo, "FileHeader")
+        )
+
+    @staticmethod
+    def _append_compressed_member(zf: ZipFile, zinfo: ZipInfo, data: bytes) -> None:
+        """
+        Appends an already compressed member, the archive is written sequentially.
+        ZipFile has no public API for this, so its internals are used.
+        """
+
+        zip64 = max(zinfo.file_size, zinfo.compress_size) > ZIP64_LIMIT
+
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(data)
+        zf.start_dir = zf.fp.tell()
+
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
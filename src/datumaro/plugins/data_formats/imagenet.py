@@ -111,6 +111,8 @@ class ImagenetImporter(Importer):
 
     """
 
+    MAX_DETECT_CONFIDENCE = FormatDetectionConfidence.LOW
+
     @classmethod
     def detect(cls, context: FormatDetectionContext) -> FormatDetectionConfidence:
         # Images must not be under a directory whose name is blacklisted.
@@ -6,13 +6,14 @@ import os
 import os.path as osp
 import re
 import warnings
-from typing import Dict, Optional, Type, TypeVar, Union
+from typing import Dict, Iterator, Optional, Set, Tuple, Type, TypeVar, Union
 
 import numpy as np
 import pandas as pd
 from defusedxml import ElementTree
 
 from datumaro.components.annotation import (
+    Annotation,
     AnnotationType,
     Bbox,
     Label,
@@ -30,12 +31,21 @@ from datumaro.plugins.data_formats.coco.base import CocoInstancesBase
 from datumaro.plugins.data_formats.coco.format import CocoTask
 from datumaro.plugins.data_formats.coco.page_mapper import COCOPageMapper
 from datumaro.util import parse_json_file
+from datumaro.util.csv_util import read_csv_chunks
 from datumaro.util.image import IMAGE_EXTENSIONS, load_image
 
 T = TypeVar("T")
 
 
 class KaggleImageCsvBase(DatasetBase):
+    """
+    Args:
+        stream: If True, the annotation file is read on each iteration, instead of
+            keeping the items in memory. The rows of an item are expected to be adjacent,
+            the items with scattered rows are collected until the end of the file,
+            and they are yielded after the others.
+    """
+
     def __init__(
         self,
         path: str,
@@ -43,6 +53,7 @@ class KaggleImageCsvBase(DatasetBase):
         columns: Dict[str, str],
         *,
         subset: Optional[str] = DEFAULT_SUBSET_NAME,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
         super().__init__(ctx=ctx)
@@ -53,8 +64,15 @@ class KaggleImageCsvBase(DatasetBase):
         if "media" not in columns:
             raise MissingFieldError("media")
 
+        self._ann_file = ann_file
+        self._columns = columns
+        self._stream = stream
+
         self._label_cat = LabelCategories()
-        self._items = self._load_items(ann_file, columns)
+        if stream:
+            self._length, self._scattered_ids = self._scan_items()
+        else:
+            self._items = self._load_items(ann_file, columns)
         self._categories = {AnnotationType.label: self._label_cat}
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
@@ -120,9 +138,16 @@ class KaggleImageCsvBase(DatasetBase):
                     h=float(datas[indices["y2"]]) - float(datas[indices["y1"]]),
                 )
 
-    def _load_items(self, ann_file: str, columns: Dict[str, Union[str, list]]):
-        df = pd.read_csv(ann_file, header=None, on_bad_lines="skip")
-        df_fields = list(df.iloc[0])
+    def _iter_annotations(
+        self, ann_file: str, columns: Dict[str, Union[str, list]], *, warn: bool = True
+    ) -> Iterator[Tuple[str, str, Annotation]]:
+        """
+        Yields (item id, media path, annotation) for each row of the annotation file.
+        If `warn` is False, the problems of the file are not reported, which is
+        used to avoid repeating the warnings on each pass over the file.
+        """
+
+        df_fields = list(pd.read_csv(ann_file, header=None, nrows=1, dtype=str).iloc[0])
 
         indices = {"media": df_fields.index(columns["media"])}
         if "label" in columns:
@@ -147,25 +172,45 @@ class KaggleImageCsvBase(DatasetBase):
                 {"x1", "x2", "y1", "y2"} <= bbox_indices
                 or {"x1", "y1", "width", "height"} <= bbox_indices
             ):
-                warnings.warn("Insufficient box coordinate is given for importing bounding boxes.")
+                if warn:
+                    warnings.warn(
+                        "Insufficient box coordinate is given for importing bounding boxes."
+                    )
                 bbox_flag = False
 
-        items = dict()
-        for _, row in df.iloc[1:].iterrows():  # Skip header row
-            data_info = list(row)
+        # Only the required columns are read, all the values are kept as strings
+        usecols = sorted(set(indices.values()))
+        indices = {key: usecols.index(index) for key, index in indices.items()}
+
+        media_name = None
+        media_path = None
+        for chunk in read_csv_chunks(
+            ann_file,
+            header=None,
+            skiprows=1,  # Skip header row
+            usecols=usecols,
+            dtype=str,
+            on_bad_lines="skip",
+        ):
+            for data_info in chunk.itertuples(index=False, name=None):
+                if data_info[indices["media"]] != media_name:
+                    media_name = data_info[indices["media"]]
+                    media_path = self._get_media_path(media_name)
+                item_id = osp.splitext(media_name)[0]
 
-            media_name = data_info[indices["media"]]
-            item_id = osp.splitext(media_name)[0]
+                if not media_path:
+                    if warn:
+                        warnings.warn(
+                            f"'{osp.join(self._path, media_name)}' is not existed in the directory, "
+                            f"so we skip to create an dataset item according to {data_info}."
+                        )
+                    continue
 
-            media_path = self._get_media_path(media_name)
-            if not osp.exists(media_path):
-                warnings.warn(
-                    f"'{media_path}' is not existed in the directory, "
-                    f"so we skip to create an dataset item according to {row}."
-                )
-                continue
+                yield item_id, media_path, self._load_annotations(data_info, indices, bbox_flag)
 
-            ann = self._load_annotations(data_info, indices, bbox_flag)
+    def _load_items(self, ann_file: str, columns: Dict[str, Union[str, list]]):
+        items = dict()
+        for item_id, media_path, ann in self._iter_annotations(ann_file, columns):
             self._ann_types.add(ann.type)
             if item_id in items:
                 items[item_id].annotations.append(ann)
@@ -178,11 +223,68 @@ class KaggleImageCsvBase(DatasetBase):
                 )
         return items.values()
 
+    def _scan_items(self) -> Tuple[int, Set[str]]:
+        item_ids = set()
+        scattered_ids = set()
+        last_id = None
+        for item_id, _, ann in self._iter_annotations(self._ann_file, self._columns):
+            self._ann_types.add(ann.type)
+            if item_id != last_id:
+                if item_id in item_ids:
+                    scattered_ids.add(item_id)
+                item_ids.add(item_id)
+                last_id = item_id
+        return len(item_ids), scattered_ids
+
     def categories(self):
         return self._categories
 
+    def __len__(self) -> int:
+        if self._stream:
+            return self._length
+        return super().__len__()
+
     def __iter__(self):
-        yield from self._items
+        if not self._stream:
+            yield from self._items
+            return
+
+        scattered_items = {}
+        item_id = None
+        item = None
+        # The problems are already reported by the scan on initialization
+        for row_item_id, media_path, ann in self._iter_annotations(
+            self._ann_file, self._columns, warn=False
+        ):
+            if item is not None and row_item_id == item_id:
+                item.annotations.append(ann)
+                continue
+
+            if item is not None and item_id not in self._scattered_ids:
+                yield item
+
+            item_id = row_item_id
+            if item_id in scattered_items:
+                item = scattered_items[item_id]
+                item.annotations.append(ann)
+                continue
+
+            item = DatasetItem(
+                id=item_id,
+                subset=self._subset,
+                media=Image.from_file(path=media_path),
+                annotations=[ann],
+            )
+            if item_id in self._scattered_ids:
+                scattered_items[item_id] = item
+
+        if item is not None and item_id not in self._scattered_ids:
+            yield item
+        yield from scattered_items.values()
+
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
 
 
 class KaggleImageTxtBase(KaggleImageCsvBase):
@@ -193,11 +295,18 @@ class KaggleImageTxtBase(KaggleImageCsvBase):
         columns: Dict[str, int],
         *,
         subset: Optional[str] = DEFAULT_SUBSET_NAME,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
-        super().__init__(path=path, ann_file=ann_file, columns=columns, subset=subset, ctx=ctx)
+        super().__init__(
+            path=path, ann_file=ann_file, columns=columns, subset=subset, stream=stream, ctx=ctx
+        )
+
+    def _iter_annotations(
+        self, ann_file: str, columns: Dict[str, Union[int, Dict]], *, warn: bool = True
+    ) -> Iterator[Tuple[str, str, Annotation]]:
+        columns = dict(columns)
 
-    def _load_items(self, ann_file: str, columns: Dict[str, Union[int, Dict]]):
         bbox_flag = False
         if "bbox" in columns:
             bbox_flag = True
@@ -207,13 +316,13 @@ class KaggleImageTxtBase(KaggleImageCsvBase):
                     all(item in bbox_columns for item in ["x1", "x2", "y1", "y2"])
                     or all(item in bbox_columns for item in ["x1", "y1", "width", "height"])
                 ):
-                    warnings.warn(
-                        "Insufficient box coordinate is given for importing bounding boxes."
-                    )
+                    if warn:
+                        warnings.warn(
+                            "Insufficient box coordinate is given for importing bounding boxes."
+                        )
                     bbox_flag = False
                 columns.update(bbox_columns)
 
-        items = dict()
         with open(ann_file, "r", encoding="utf-8") as f:
             for line in f:
                 line = re.split(r"\s|,", line)
@@ -222,26 +331,15 @@ class KaggleImageTxtBase(KaggleImageCsvBase):
                 item_id = osp.splitext(media_name)[0]
 
                 media_path = self._get_media_path(media_name)
-                if not osp.exists(media_path):
-                    warnings.warn(
-                        f"'{media_path}' is not existed in the directory, "
-                        f"so we skip to create an dataset item according to {line}."
-                    )
+                if not media_path:
+                    if warn:
+                        warnings.warn(
+                            f"'{osp.join(self._path, media_name)}' is not existed in the directory, "
+                            f"so we skip to create an dataset item according to {line}."
+                        )
                     continue
 
-                ann = self._load_annotations(line, columns, bbox_flag)
-                self._ann_types.add(ann.type)
-                if item_id in items:
-                    items[item_id].annotations.append(ann)
-                else:
-                    items[item_id] = DatasetItem(
-                        id=item_id,
-                        subset=self._subset,
-                        media=Image.from_file(path=media_path),
-                        annotations=[ann],
-                    )
-
-        return items.values()
+                yield item_id, media_path, self._load_annotations(line, columns, bbox_flag)
 
 
 class KaggleImageMaskBase(DatasetBase):
@@ -495,6 +593,7 @@ class KaggleCocoBase(CocoInstancesBase, SubsetBase):
         subset: Optional[str] = None,
         ctx: Optional[ImportContext] = None,
         stream: bool = False,
+        num_workers: int = 0,
     ):
         SubsetBase.__init__(self, subset=subset, ctx=ctx)
 
@@ -503,6 +602,7 @@ class KaggleCocoBase(CocoInstancesBase, SubsetBase):
         self._path = ann_file
         self._task = CocoTask.instances
         self._merge_instance_polygons = False
+        self._num_workers = num_workers
 
         keep_original_category_ids = False
 
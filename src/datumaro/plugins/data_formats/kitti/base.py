@@ -10,7 +10,7 @@ import numpy as np
 
 from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories, Mask
 from datumaro.components.dataset_base import DatasetItem, SubsetBase
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, read_item_files
 from datumaro.components.media import Image
 from datumaro.components.task import TaskType
 from datumaro.util.image import find_images, load_image
@@ -20,18 +20,31 @@ from .format import KittiLabelMap, KittiPath, KittiTask, make_kitti_categories,
 
 
 class _KittiBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+    """
+
     def __init__(
         self,
         path: str,
         task: KittiTask,
         *,
         subset: Optional[str] = None,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ):
         assert osp.isdir(path), path
         self._path = path
         self._task = task
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
         if not subset:
             subset = osp.splitext(osp.basename(path))[0]
         super().__init__(subset=subset, ctx=ctx)
@@ -78,12 +91,17 @@ class _KittiBase(SubsetBase):
 
         segm_dir = osp.join(self._path, KittiPath.INSTANCES_DIR)
         if self._task == KittiTask.segmentation:
-            for instances_path in find_images(segm_dir, exts=KittiPath.MASK_EXT, recursive=True):
+            for instances_path, future in read_item_files(
+                self._read_instances_mask,
+                list(find_images(segm_dir, exts=KittiPath.MASK_EXT, recursive=True)),
+                ctx=self._ctx,
+                desc=f"Importing '{self._subset}'",
+                num_workers=self._num_workers,
+            ):
                 item_id = osp.splitext(osp.relpath(instances_path, segm_dir))[0]
                 anns = []
 
-                instances_mask = load_image(instances_path, dtype=np.int32)
-                segm_ids = np.unique(instances_mask)
+                instances_mask, segm_ids = future.result()
                 for segm_id in segm_ids:
                     semantic_id = segm_id >> 8
                     ann_id = int(segm_id % 256)
@@ -109,13 +127,17 @@ class _KittiBase(SubsetBase):
 
         det_dir = osp.join(self._path, KittiPath.LABELS_DIR)
         if self._task == KittiTask.detection:
-            for labels_path in sorted(glob.glob(osp.join(det_dir, "**", "*.txt"), recursive=True)):
+            for labels_path, future in read_item_files(
+                self._read_labels,
+                sorted(glob.glob(osp.join(det_dir, "**", "*.txt"), recursive=True)),
+                ctx=self._ctx,
+                desc=f"Importing '{self._subset}'",
+                num_workers=self._num_workers,
+            ):
                 item_id = osp.splitext(osp.relpath(labels_path, det_dir))[0]
                 anns = []
 
-                with open(labels_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-
+                lines = future.result()
                 for line_idx, line in enumerate(lines):
                     line = line.split()
                     assert len(line) == 15 or len(line) == 16
@@ -166,6 +188,16 @@ class _KittiBase(SubsetBase):
 
         return items
 
+    @staticmethod
+    def _read_instances_mask(path):
+        instances_mask = load_image(path, dtype=np.int32)
+        return instances_mask, np.unique(instances_mask)
+
+    @staticmethod
+    def _read_labels(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.readlines()
+
     @staticmethod
     def _lazy_extract_mask(mask, c):
         return lambda: mask == c
@@ -7,10 +7,13 @@ import os
 import os.path as osp
 from collections import OrderedDict
 from enum import Enum, auto
+from typing import List
 
 import numpy as np
 
 from datumaro.components.annotation import AnnotationType, CompiledMask, LabelCategories
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.dataset_item_storage import ItemStatus
 from datumaro.components.errors import InvalidAnnotationError, MediaTypeError
 from datumaro.components.exporter import Exporter
 from datumaro.components.media import Image
@@ -132,18 +135,12 @@ class KittiExporter(Exporter):
                     compiled_class_mask = CompiledMask.from_instance_masks(
                         masks, instance_labels=[self._label_id_mapping(m.label) for m in masks]
                     )
-                    color_mask_path = osp.join(
-                        subset_name, KittiPath.SEMANTIC_RGB_DIR, item.id + KittiPath.MASK_EXT
+                    color_mask_path, labelids_mask_path, inst_path = self._make_mask_paths(
+                        subset_name, item.id
                     )
+                    self.save_mask(color_mask_path, compiled_class_mask.class_mask)
                     self.save_mask(
-                        osp.join(self._save_dir, color_mask_path), compiled_class_mask.class_mask
-                    )
-
-                    labelids_mask_path = osp.join(
-                        subset_name, KittiPath.SEMANTIC_DIR, item.id + KittiPath.MASK_EXT
-                    )
-                    self.save_mask(
-                        osp.join(self._save_dir, labelids_mask_path),
+                        labelids_mask_path,
                         compiled_class_mask.class_mask,
                         apply_colormap=False,
                         dtype=np.int32,
@@ -156,21 +153,18 @@ class KittiExporter(Exporter):
                             (self._label_id_mapping(m.label) << 8) + m.id for m in masks
                         ],
                     )
-                    inst_path = osp.join(
-                        subset_name, KittiPath.INSTANCES_DIR, item.id + KittiPath.MASK_EXT
-                    )
                     self.save_mask(
-                        osp.join(self._save_dir, inst_path),
+                        inst_path,
                         compiled_instance_mask.class_mask,
                         apply_colormap=False,
                         dtype=np.int32,
                     )
+                elif not masks and self._patch:
+                    self._remove_files(self._make_mask_paths(subset_name, item.id))
 
                 bboxes = [a for a in item.annotations if a.type == AnnotationType.bbox]
                 if bboxes and KittiTask.detection in self._tasks:
-                    labels_file = osp.join(
-                        self._save_dir, subset_name, KittiPath.LABELS_DIR, "%s.txt" % item.id
-                    )
+                    labels_file = self._make_labels_path(subset_name, item.id)
                     os.makedirs(osp.dirname(labels_file), exist_ok=True)
                     with open(labels_file, "w", encoding="utf-8") as f:
                         for bbox in bboxes:
@@ -191,10 +185,31 @@ class KittiExporter(Exporter):
 
                             label_line = " ".join(str(v) for v in label_line)
                             f.write("%s\n" % label_line)
+                elif not bboxes and self._patch:
+                    self._remove_files([self._make_labels_path(subset_name, item.id)])
 
         if KittiTask.segmentation in self._tasks:
             self.save_label_map()
 
+    def _make_mask_paths(self, subset_name: str, item_id: str) -> List[str]:
+        return [
+            osp.join(self._save_dir, subset_name, mask_dir, item_id + KittiPath.MASK_EXT)
+            for mask_dir in [
+                KittiPath.SEMANTIC_RGB_DIR,
+                KittiPath.SEMANTIC_DIR,
+                KittiPath.INSTANCES_DIR,
+            ]
+        ]
+
+    def _make_labels_path(self, subset_name: str, item_id: str) -> str:
+        return osp.join(self._save_dir, subset_name, KittiPath.LABELS_DIR, item_id + ".txt")
+
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        for path in paths:
+            if osp.isfile(path):
+                os.remove(path)
+
     def get_label(self, label_id):
         return self._extractor.categories()[AnnotationType.label].items[label_id].name
 
@@ -288,6 +303,30 @@ class KittiExporter(Exporter):
             mask = paint_mask(mask, colormap)
         save_image(path, mask, create_dir=True, dtype=dtype)
 
+    @classmethod
+    def patch(cls, dataset, patch, save_dir, **kwargs):
+        conv = cls(patch.as_dataset(dataset), save_dir=save_dir, **kwargs)
+        conv._patch = patch
+        conv.apply()
+
+        for (item_id, subset), status in patch.updated_items.items():
+            if status != ItemStatus.removed:
+                item = patch.data.get(item_id, subset)
+            else:
+                item = DatasetItem(item_id, subset=subset)
+
+                conv._remove_files(conv._make_mask_paths(subset, item_id))
+                conv._remove_files([conv._make_labels_path(subset, item_id)])
+
+            if not (status == ItemStatus.removed or not item.media):
+                continue
+
+            image_path = osp.join(
+                save_dir, subset, KittiPath.IMAGES_DIR, conv._make_image_filename(item)
+            )
+            if osp.isfile(image_path):
+                os.unlink(image_path)
+
 
 class KittiSegmentationExporter(KittiExporter):
     def __init__(self, *args, **kwargs):
@@ -22,6 +22,18 @@ class KittiImporter(Importer):
         KittiTask.detection: ("kitti_detection", KittiPath.LABELS_DIR),
     }
 
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the annotation files. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
+        return parser
+
     def __call__(self, path, **extra_params):
         subsets = self.find_sources(path)
 
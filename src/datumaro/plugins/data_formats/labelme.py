@@ -6,6 +6,7 @@ import errno
 import logging as log
 import os
 import os.path as osp
+import re
 from collections import defaultdict
 from glob import glob, iglob
 from typing import List, Optional
@@ -15,10 +16,11 @@ from defusedxml import ElementTree
 
 from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories, Mask, Polygon
 from datumaro.components.dataset_base import DatasetBase, DatasetItem
+from datumaro.components.dataset_item_storage import ItemStatus
 from datumaro.components.errors import MediaTypeError
 from datumaro.components.exporter import Exporter
 from datumaro.components.format_detection import FormatDetectionContext
-from datumaro.components.importer import ImportContext, Importer
+from datumaro.components.importer import ImportContext, Importer, read_item_files
 from datumaro.components.media import Image
 from datumaro.components.task import TaskAnnotationMapping
 from datumaro.util import cast, escape, unescape
@@ -48,32 +50,102 @@ class LabelMePath:
 
 
 class LabelMeBase(DatasetBase):
-    def __init__(self, path: str, *, ctx: Optional[ImportContext] = None):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+        stream: If True, the items are parsed from the annotation files on each
+            iteration, instead of keeping them in memory. The labels, the subsets
+            and the number of items are collected by a preliminary pass over the files.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        num_workers: int = 0,
+        stream: bool = False,
+        ctx: Optional[ImportContext] = None,
+    ):
         assert osp.isdir(path), path
         super().__init__(ctx=ctx)
 
-        self._items, self._categories, self._subsets = self._parse(path)
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+        self._path = path
+        self._stream = stream
+        self._ann_files = sorted(glob(osp.join(path, "**", "*.xml"), recursive=True))
+        self._categories = self._load_categories(path)
+
+        if stream:
+            self._items = None
+            self._subsets = self._scan_annotations()
+            self._length = len(self._ann_files)
+        else:
+            self._items = list(self._load_items())
+            self._subsets = {item.subset for item in self._items}
+            self._length = len(self._items)
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
-        self._length = len(self._items)
-
-    def _parse(self, path):
-        items = []
-        subsets = set()
 
+    @staticmethod
+    def _load_categories(path):
         if has_meta_file(path):
-            categories = {
+            return {
                 AnnotationType.label: LabelCategories(
                     attributes={"occluded", "username"}
                 ).from_iterable(parse_meta_file(path).keys())
             }
-        else:
-            categories = {
-                AnnotationType.label: LabelCategories(attributes={"occluded", "username"})
-            }
 
-        for xml_path in sorted(glob(osp.join(path, "**", "*.xml"), recursive=True)):
-            root = ElementTree.parse(xml_path)
+        return {AnnotationType.label: LabelCategories(attributes={"occluded", "username"})}
+
+    def _read_ann_files(self, desc):
+        for _, future in read_item_files(
+            ElementTree.parse,
+            self._ann_files,
+            ctx=self._ctx,
+            desc=desc,
+            num_workers=self._num_workers,
+        ):
+            yield future.result()
+
+    def _scan_annotations(self):
+        # Collects everything that has to be known before the iteration:
+        # the subsets, the annotation types and the labels, which are
+        # added in the same order as the item parsing would do.
+        subsets = set()
+        label_cat = self._categories[AnnotationType.label]
+
+        for root in self._read_ann_files(desc=f"Scanning data in {osp.basename(self._path)}"):
+            subsets.add(root.find("folder").text or "")
 
+            for obj_elem in root.iter("object"):
+                label = obj_elem.find("name").text
+                if label and label_cat.find(label)[0] is None:
+                    label_cat.add(label)
+
+                deleted_elem = obj_elem.find("deleted")
+                if deleted_elem is not None and deleted_elem.text and int(deleted_elem.text):
+                    continue
+
+                poly_elem = obj_elem.find("polygon")
+                type_elem = obj_elem.find("type")
+                if poly_elem is not None:
+                    if type_elem is not None and type_elem.text == "bounding_box":
+                        self._ann_types.add(AnnotationType.bbox)
+                    else:
+                        self._ann_types.add(AnnotationType.polygon)
+                elif obj_elem.find("segm") is not None:
+                    self._ann_types.add(AnnotationType.mask)
+
+        return subsets
+
+    def _load_items(self):
+        path = self._path
+
+        for root in self._read_ann_files(desc=f"Parsing data in {osp.basename(path)}"):
             subset = root.find("folder").text or ""
             item_id = osp.splitext(root.find("filename").text)[0]
             image_path = osp.join(path, "Images", subset, root.find("filename").text)
@@ -89,16 +161,12 @@ class LabelMeBase(DatasetBase):
 
             image = Image.from_file(path=image_path, size=image_size)
 
-            annotations = self._parse_annotations(root, path, subset, categories)
+            annotations = self._parse_annotations(root, path, subset, self._categories)
 
             for ann in annotations:
                 self._ann_types.add(ann.type)
 
-            items.append(
-                DatasetItem(id=item_id, subset=subset, media=image, annotations=annotations)
-            )
-            subsets.add(items[-1].subset)
-        return items, categories, subsets
+            yield DatasetItem(id=item_id, subset=subset, media=image, annotations=annotations)
 
     @staticmethod
     def _escape(s):
@@ -296,12 +364,31 @@ class LabelMeBase(DatasetBase):
         return self._categories
 
     def __iter__(self):
-        yield from self._items
+        if self._stream:
+            yield from self._load_items()
+        else:
+            yield from self._items
+
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
 
 
 class LabelMeImporter(Importer):
     _ANNO_EXT = ".xml"
 
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the annotation files. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
+        return parser
+
     @classmethod
     def detect(cls, context: FormatDetectionContext) -> None:
         annot_paths = context.require_files(f"**/*{cls._ANNO_EXT}")
@@ -359,6 +446,10 @@ class LabelMeImporter(Importer):
             pass
         return subsets
 
+    @property
+    def can_stream(self) -> bool:
+        return True
+
     @classmethod
     def get_file_extensions(cls) -> List[str]:
         return [cls._ANNO_EXT]
@@ -395,6 +486,9 @@ class LabelMeExporter(Exporter):
 
         log.debug("Converting item '%s'", item.id)
 
+        if self._patch:
+            self._remove_item_masks(item.id, subset_dir)
+
         image_filename = self._make_image_filename(item)
         if self._save_media:
             if item.media and item.media.has_data:
@@ -516,7 +610,7 @@ class LabelMeExporter(Exporter):
         ann_path = osp.join(self._save_dir, LabelMePath.ANNOTATIONS_DIR, subset_dir)
         os.makedirs(osp.join(ann_path, osp.dirname(image_filename)), exist_ok=True)
         xml_path = osp.join(ann_path, osp.splitext(image_filename)[0] + ".xml")
-        if osp.exists(xml_path):
+        if osp.exists(xml_path) and not self._patch:
             xml_path = osp.join(ann_path, image_filename + ".xml")
         with open(xml_path, "w", encoding="utf-8") as f:
             xml_data = ET.tostring(root_elem, encoding="unicode", pretty_print=True)
@@ -526,3 +620,40 @@ class LabelMeExporter(Exporter):
     def _paint_mask(mask):
         # TODO: check if mask colors are random
         return np.array([[0, 0, 0, 0], [255, 203, 0, 153]], dtype=np.uint8)[mask.astype(np.uint8)]
+
+    def _remove_item_masks(self, item_id: str, subset_dir: str):
+        mask_dir = osp.join(self._save_dir, LabelMePath.MASKS_DIR, subset_dir, osp.dirname(item_id))
+        if not osp.isdir(mask_dir):
+            return
+
+        mask_name_pattern = re.compile(re.escape(osp.basename(item_id)) + r"_mask_\d+\.png")
+        for mask_filename in os.listdir(mask_dir):
+            if mask_name_pattern.fullmatch(mask_filename):
+                os.remove(osp.join(mask_dir, mask_filename))
+
+    @classmethod
+    def patch(cls, dataset, patch, save_dir, **kwargs):
+        conv = cls(patch.as_dataset(dataset), save_dir=save_dir, **kwargs)
+        conv._patch = patch
+        conv.apply()
+
+        for (item_id, subset), status in patch.updated_items.items():
+            if status != ItemStatus.removed:
+                item = patch.data.get(item_id, subset)
+            else:
+                item = DatasetItem(item_id, subset=subset)
+
+                ann_path = osp.join(save_dir, LabelMePath.ANNOTATIONS_DIR, subset, item_id + ".xml")
+                if osp.isfile(ann_path):
+                    os.remove(ann_path)
+
+                conv._remove_item_masks(item_id, subset)
+
+            if not (status == ItemStatus.removed or not item.media):
+                continue
+
+            image_path = osp.join(
+                save_dir, LabelMePath.IMAGES_DIR, subset, conv._make_image_filename(item)
+            )
+            if osp.isfile(image_path):
+                os.unlink(image_path)
@@ -20,7 +20,7 @@ from datumaro.components.annotation import (
 )
 from datumaro.components.dataset_base import DatasetItem, SubsetBase
 from datumaro.components.errors import DatasetImportError
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, read_item_files
 from datumaro.components.media import Image
 from datumaro.components.task import TaskAnnotationMapping
 from datumaro.util import parse_json_file
@@ -38,6 +38,12 @@ from .format import (
 
 
 class _MapillaryVistasBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+    """
+
     def __init__(
         self,
         path: str,
@@ -48,6 +54,7 @@ class _MapillaryVistasBase(SubsetBase):
         format_version: str = "v2.0",
         parse_polygon: bool = False,
         subset: Optional[str] = None,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ):
         if format_version == "v1.2" and parse_polygon is True:
@@ -55,6 +62,11 @@ class _MapillaryVistasBase(SubsetBase):
                 f"Format version {format_version} is not available for polygons. "
                 "Please try with v2.0 for parsing polygons."
             )
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
 
         assert osp.isdir(path), path
         self._path = path
@@ -151,8 +163,18 @@ class _MapillaryVistasBase(SubsetBase):
             for img in config["images"]
         }
 
-        polygon_dir = osp.join(self._annotations_dir, MapillaryVistasPath.POLYGON_DIR)
-        for item_ann in config["annotations"]:
+        def _read_item_files(item_ann):
+            if self._parse_polygon:
+                return self._read_polygons(item_ann["image_id"])
+            return None
+
+        for item_ann, future in read_item_files(
+            _read_item_files,
+            config["annotations"],
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset}'",
+            num_workers=self._num_workers,
+        ):
             item_id = item_ann["image_id"]
             image = None
             if images_info.get(item_id):
@@ -183,18 +205,7 @@ class _MapillaryVistasBase(SubsetBase):
                 )
 
             if self._parse_polygon:
-                polygon_path = osp.join(polygon_dir, item_id + ".json")
-                item_info = parse_json_file(polygon_path)
-
-                polygons = item_info["objects"]
-                for polygon in polygons:
-                    label = polygon["label"]
-                    label_id = self._categories[AnnotationType.label].find(label)[0]
-                    if label_id is None:
-                        label_id = self._categories[AnnotationType.label].add(label)
-
-                    points = [int(coord) for point in polygon["polygon"] for coord in point]
-                    annotations.append(Polygon(label=label_id, points=points))
+                annotations.extend(self._parse_polygons(future.result()))
 
             items[item_id] = DatasetItem(
                 id=item_id, subset=self._subset, annotations=annotations, media=image
@@ -221,34 +232,39 @@ class _MapillaryVistasBase(SubsetBase):
         items = {}
 
         instance_dir = osp.join(self._annotations_dir, MapillaryVistasPath.INSTANCES_DIR)
-        polygon_dir = osp.join(self._annotations_dir, MapillaryVistasPath.POLYGON_DIR)
-        for image_path in find_images(self._images_dir, recursive=True):
-            item_id = osp.splitext(osp.relpath(image_path, self._images_dir))[0]
-            image = Image.from_file(path=image_path)
 
+        def _read_item_files(image_path):
+            item_id = osp.splitext(osp.relpath(image_path, self._images_dir))[0]
             instance_path = osp.join(instance_dir, item_id + MapillaryVistasPath.MASK_EXT)
             mask = load_image(instance_path, dtype=np.uint32)
 
+            polygons = None
+            if self._parse_polygon:
+                polygons = self._read_polygons(item_id)
+
+            return mask, np.unique(mask), polygons
+
+        for image_path, future in read_item_files(
+            _read_item_files,
+            list(find_images(self._images_dir, recursive=True)),
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset}'",
+            num_workers=self._num_workers,
+        ):
+            item_id = osp.splitext(osp.relpath(image_path, self._images_dir))[0]
+            image = Image.from_file(path=image_path)
+
+            mask, uvals, polygons = future.result()
+
             annotations = []
-            for uval in np.unique(mask):
+            for uval in uvals:
                 label_id, instance_id = uval >> 8, uval & 255
                 annotations.append(
                     Mask(image=self._lazy_extract_mask(mask, uval), label=label_id, id=instance_id)
                 )
 
             if self._parse_polygon:
-                polygon_path = osp.join(polygon_dir, item_id + ".json")
-                item_info = parse_json_file(polygon_path)
-
-                polygons = item_info["objects"]
-                for polygon in polygons:
-                    label = polygon["label"]
-                    label_id = self._categories[AnnotationType.label].find(label)[0]
-                    if label_id is None:
-                        label_id = self._categories[AnnotationType.label].add(label)
-
-                    points = [int(coord) for point in polygon["polygon"] for coord in point]
-                    annotations.append(Polygon(label=label_id, points=points))
+                annotations.extend(self._parse_polygons(polygons))
 
             for ann in annotations:
                 self._ann_types.add(ann.type)
@@ -259,6 +275,25 @@ class _MapillaryVistasBase(SubsetBase):
 
         return items.values()
 
+    def _read_polygons(self, item_id):
+        polygon_dir = osp.join(self._annotations_dir, MapillaryVistasPath.POLYGON_DIR)
+        return parse_json_file(osp.join(polygon_dir, item_id + ".json"))
+
+    def _parse_polygons(self, item_info):
+        annotations = []
+
+        polygons = item_info["objects"]
+        for polygon in polygons:
+            label = polygon["label"]
+            label_id = self._categories[AnnotationType.label].find(label)[0]
+            if label_id is None:
+                label_id = self._categories[AnnotationType.label].add(label)
+
+            points = [int(coord) for point in polygon["polygon"] for coord in point]
+            annotations.append(Polygon(label=label_id, points=points))
+
+        return annotations
+
     @staticmethod
     def _get_image_size(image_info):
         image_size = image_info.get("height"), image_info.get("width")
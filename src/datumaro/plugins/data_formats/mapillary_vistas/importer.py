@@ -48,6 +48,13 @@ class MapillaryVistasImporter(Importer):
             "correspond to the category IDs in the original annotation "
             "file",
         )
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the annotation files. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
         return parser
 
     def __call__(self, path, **extra_params):
@@ -67,6 +67,7 @@ class MmdetCocoBase(_CocoBase):
         *,
         subset: Optional[str] = None,
         stream: bool = False,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ):
         super().__init__(
@@ -75,5 +76,6 @@ class MmdetCocoBase(_CocoBase):
             coco_importer_type=CocoImporterType.mmdet,
             subset=subset,
             stream=stream,
+            num_workers=num_workers,
             ctx=ctx,
         )
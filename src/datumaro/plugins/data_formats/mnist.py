@@ -167,7 +167,7 @@ class MnistExporter(Exporter):
 
         for subset_name, subset in self._extractor.subsets().items():
             labels = []
-            images = np.array([])
+            images = []
             item_ids = {}
             image_sizes = {}
             for item in subset:
@@ -183,7 +183,7 @@ class MnistExporter(Exporter):
                 if item.media and self._save_media:
                     image = item.media
                     if not image.has_data:
-                        image_sizes[len(images) - 1] = [0, 0]
+                        image_sizes[len(labels) - 1] = [0, 0]
                     else:
                         image = image.data
                         if (
@@ -191,7 +191,7 @@ class MnistExporter(Exporter):
                             or image.shape[1] != MnistPath.IMAGE_SIZE
                         ):
                             image_sizes[len(labels) - 1] = [image.shape[0], image.shape[1]]
-                        images = np.append(images, image.reshape(-1).astype(np.uint8))
+                        images.append(image.reshape(-1).astype(np.uint8, copy=False))
 
             if subset_name == "test":
                 labels_file = osp.join(self._save_dir, MnistPath.TEST_LABELS_FILE)
@@ -204,7 +204,7 @@ class MnistExporter(Exporter):
                     images_file = osp.join(self._save_dir, MnistPath.TEST_IMAGES_FILE)
                 else:
                     images_file = osp.join(self._save_dir, subset_name + MnistPath.IMAGES_FILE)
-                self.save_images(images_file, images)
+                self.save_images(images_file, np.concatenate(images))
 
             # it is't in the original format,
             # this is for storng other names and sizes of images
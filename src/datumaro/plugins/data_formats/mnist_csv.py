@@ -82,9 +82,17 @@ class MnistCsvBase(SubsetBase):
             with open(metafile, "r", encoding="utf-8") as f:
                 meta = f.readlines()
 
+        # The images are parsed into one contiguous array and the items keep views into it
+        table = self._parse_table(annotation_table)
+        if table is not None:
+            rows = table[:, :1]
+            images = table[:, 1:].astype(np.uint8) if 1 < table.shape[1] else None
+        else:
+            rows = (data.split(",") for data in annotation_table)
+            images = None
+
         max_num_annotations = 0
-        for i, data in enumerate(annotation_table):
-            data = data.split(",")
+        for i, data in enumerate(rows):
             item_anno = []
             try:
                 label = int(data[0])
@@ -98,15 +106,16 @@ class MnistCsvBase(SubsetBase):
 
             # support for single-channel image only
             image = None
-            if 1 < len(data):
-                if 0 < len(meta) and 1 < len(meta[i]):
-                    image = np.array([int(pix) for pix in data[1:]], dtype="uint8").reshape(
-                        int(meta[i][-2]), int(meta[i][-1])
-                    )
-                else:
-                    image = np.array([int(pix) for pix in data[1:]], dtype="uint8").reshape(28, 28)
+            if images is not None:
+                image = images[i]
+            elif 1 < len(data):
+                image = np.array([int(pix) for pix in data[1:]], dtype="uint8")
 
             if image is not None:
+                if 0 < len(meta) and 1 < len(meta[i]):
+                    image = image.reshape(int(meta[i][-2]), int(meta[i][-1]))
+                else:
+                    image = image.reshape(MnistCsvPath.IMAGE_SIZE, MnistCsvPath.IMAGE_SIZE)
                 image = Image.from_numpy(data=image)
 
             if 0 < len(meta) and len(meta[i]) in [1, 3]:
@@ -124,6 +133,22 @@ class MnistCsvBase(SubsetBase):
 
         return items
 
+    @staticmethod
+    def _parse_table(lines: List[str]) -> Optional[np.ndarray]:
+        """
+        Parses the rows into a single array. Returns None if the rows can't be
+        represented as an array, e.g. if they have different lengths or a header.
+        """
+
+        if not lines:
+            return None
+
+        try:
+            # The labels are in the [-1; 255] range, the pixels - in [0; 255]
+            return np.loadtxt(lines, delimiter=",", dtype=np.int16, ndmin=2)
+        except ValueError:
+            return None
+
 
 class MnistCsvImporter(Importer):
     DETECT_CONFIDENCE = FormatDetectionConfidence.MEDIUM
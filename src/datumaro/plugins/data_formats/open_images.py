@@ -8,6 +8,7 @@ import errno
 import fnmatch
 import functools
 import glob
+import io
 import itertools
 import json
 import logging as log
@@ -15,10 +16,12 @@ import os
 import os.path as osp
 import re
 import types
-from typing import List, Optional, Union
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from attr import attrs
 
 from datumaro.components.annotation import AnnotationType, Bbox, Label, LabelCategories, Mask
@@ -171,11 +174,21 @@ class OpenImagesPath:
 
 
 class OpenImagesBase(DatasetBase):
+    """
+    Args:
+        image_meta: The image sizes, or a path to the image meta file
+        stream: If True, the items are loaded from the annotation files on each
+            iteration, instead of keeping them in memory. The annotation files
+            are indexed first: for each image, the byte ranges of its rows are
+            recorded, so that only the rows of the current image are parsed.
+    """
+
     def __init__(
         self,
         path: str,
         *,
         image_meta: Optional[Union[dict, str]] = None,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
         if not osp.isdir(path):
@@ -184,6 +197,7 @@ class OpenImagesBase(DatasetBase):
         super().__init__(ctx=ctx)
 
         self._dataset_dir = path
+        self._stream = stream
 
         self._annotation_dir = osp.join(path, OpenImagesPath.ANNOTATIONS_DIR)
         if not osp.exists(self._annotation_dir):
@@ -216,11 +230,18 @@ class OpenImagesBase(DatasetBase):
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
     def __iter__(self):
-        yield from self._items
+        if self._stream:
+            yield from self._iter_items()
+        else:
+            yield from self._items
 
     def categories(self):
         return self._categories
 
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
+
     @contextlib.contextmanager
     def _open_csv_annotation(self, file_name):
         absolute_path = osp.join(self._annotation_dir, file_name)
@@ -315,43 +336,208 @@ class OpenImagesBase(DatasetBase):
             if 1 < len(path_parts)
         }
 
+        if self._stream:
+            self._index_items()
+            return
+
         items_by_id = {}
+        for image_id, subset in self._iter_image_descriptions():
+            if image_id in items_by_id:
+                raise RepeatedItemError(item_id=image_id)
+
+            items_by_id[image_id] = self._add_item(image_id, subset)
+
+        self._load_labels(items_by_id)
+        normalized_coords = self._load_bboxes(items_by_id)
+        self._load_masks(items_by_id, normalized_coords)
+
+    def _iter_image_descriptions(self) -> Iterator[Tuple[str, str]]:
+        # It's preferable to load the combined image description file,
+        # because it contains descriptions for training images without human-annotated labels
+        # (the file specific to the training set doesn't).
+        # However, if it's missing, we'll try loading subset-specific files instead, so that
+        # this extractor can be used on individual subsets of the dataset.
+        if OpenImagesPath.FULL_IMAGE_DESCRIPTION_FILE_NAME in self._annotation_files:
+            description_files = [OpenImagesPath.FULL_IMAGE_DESCRIPTION_FILE_NAME]
+        else:
+            description_files = [
+                path
+                for pattern in OpenImagesPath.SUBSET_IMAGE_DESCRIPTION_FILE_PATTERNS
+                for path in self._glob_annotations(pattern)
+            ]
 
-        def load_from(annotation_name):
+        for annotation_name in description_files:
             with self._open_csv_annotation(annotation_name) as image_reader:
                 for image_description in image_reader:
                     image_id = image_description["ImageID"]
-                    if image_id in items_by_id:
-                        raise RepeatedItemError(item_id=image_id)
-
                     subset = image_description["Subset"]
 
                     if _RE_INVALID_PATH_COMPONENT.fullmatch(subset):
                         raise UnsupportedSubsetNameError(item_id=image_id, subset=subset)
 
-                    if image_id in items_by_id:
-                        log.warning("Item %s is repeated" % image_id)
+                    yield image_id, subset
+
+    def _index_items(self):
+        # Only the subsets of the items and the row positions in the annotation files
+        # are kept in memory. The annotations are parsed during the iteration.
+        item_subsets: Dict[str, str] = {}
+        for image_id, subset in self._iter_image_descriptions():
+            if image_id in item_subsets:
+                raise RepeatedItemError(item_id=image_id)
+
+            item_subsets[image_id] = subset
+
+        self._annotation_indices = []
+        for ann_type, suffix in [
+            (AnnotationType.label, OpenImagesPath.LABEL_DESCRIPTION_FILE_SUFFIX),
+            (AnnotationType.bbox, OpenImagesPath.BBOX_DESCRIPTION_FILE_SUFFIX),
+            (AnnotationType.mask, OpenImagesPath.MASK_DESCRIPTION_FILE_SUFFIX),
+        ]:
+            indices = []
+            for annotation_name in self._glob_annotations("*" + suffix):
+                fieldnames, spans = self._index_csv_annotation(annotation_name)
+                indices.append((annotation_name, fieldnames, spans))
+
+                for image_id, image_spans in spans.items():
+                    if image_id in item_subsets:
                         continue
 
-                    items_by_id[image_id] = self._add_item(image_id, subset)
+                    if ann_type == AnnotationType.mask:
+                        # Follows the non-stream loading, where the subset name
+                        # is taken from the mask path
+                        with open(osp.join(self._annotation_dir, annotation_name), "rb") as f:
+                            mask_description = next(
+                                self._read_csv_rows(f, fieldnames, image_spans[:1])
+                            )
+                        subset = self._get_subset_name(mask_description["MaskPath"])
+                    else:
+                        subset = self._get_subset_name(annotation_name)
+                    item_subsets[image_id] = subset
+
+            if indices:
+                # The actual annotation types are known only after the iteration
+                self._ann_types.add(ann_type)
+            self._annotation_indices.append((ann_type, indices))
+
+        self._item_subsets = item_subsets
+        self._subsets = set(item_subsets.values())
+        self._length = len(item_subsets)
+
+    def _index_csv_annotation(
+        self, file_name: str
+    ) -> Tuple[List[str], Dict[str, List[Tuple[int, int]]]]:
+        """
+        Finds the byte ranges of the rows of each image in the annotation file.
+        The files are usually sorted by the image ids, so an image typically
+        has a single range.
+        """
+
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        fieldnames = None
+        image_id_idx = None
+
+        with open(osp.join(self._annotation_dir, file_name), "rb") as f:
+            for start, record in self._iter_csv_records(f):
+                end = start + len(record)
+                if not record.strip():
+                    continue
+
+                if b'"' in record:
+                    row = next(csv.reader(io.StringIO(record.decode("utf-8"), newline="")))
+                else:
+                    row = record.rstrip(b"\r\n").decode("utf-8").split(",")
+
+                if fieldnames is None:
+                    fieldnames = row
+                    image_id_idx = fieldnames.index("ImageID")
+                    continue
+
+                image_spans = spans.setdefault(row[image_id_idx], [])
+                if image_spans and image_spans[-1][1] == start:
+                    image_spans[-1] = (image_spans[-1][0], end)
+                else:
+                    image_spans.append((start, end))
+
+        return fieldnames or [], spans
 
-        # It's preferable to load the combined image description file,
-        # because it contains descriptions for training images without human-annotated labels
-        # (the file specific to the training set doesn't).
-        # However, if it's missing, we'll try loading subset-specific files instead, so that
-        # this extractor can be used on individual subsets of the dataset.
-        try:
-            load_from(OpenImagesPath.FULL_IMAGE_DESCRIPTION_FILE_NAME)
-        except FileNotFoundError:
-            for pattern in OpenImagesPath.SUBSET_IMAGE_DESCRIPTION_FILE_PATTERNS:
-                for path in self._glob_annotations(pattern):
-                    load_from(path)
+    @staticmethod
+    def _iter_csv_records(f: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+        # A quoted field can contain line breaks, so a record continues
+        # until the number of quotes in it is even
+        pos = 0
+        record = b""
+        record_start = 0
+        for line in f:
+            if not record:
+                record_start = pos
+            record += line
+            pos += len(line)
+
+            if record.count(b'"') % 2 == 0:
+                yield record_start, record
+                record = b""
+
+        if record:
+            yield record_start, record
 
-        self._load_labels(items_by_id)
-        normalized_coords = self._load_bboxes(items_by_id)
-        self._load_masks(items_by_id, normalized_coords)
+    @staticmethod
+    def _read_csv_rows(
+        f: BinaryIO, fieldnames: List[str], spans: Sequence[Tuple[int, int]]
+    ) -> Iterator[Dict[str, str]]:
+        for start, end in spans:
+            f.seek(start)
+            data = f.read(end - start).decode("utf-8")
+            yield from csv.DictReader(io.StringIO(data, newline=""), fieldnames=fieldnames)
+
+    def _iter_items(self) -> Iterator[DatasetItem]:
+        parsers = {
+            AnnotationType.label: self._parse_label,
+            AnnotationType.bbox: self._parse_bbox,
+            AnnotationType.mask: self._parse_mask,
+        }
+
+        self._ann_types = set()
+        with contextlib.ExitStack() as stack:
+            annotation_files = {
+                annotation_name: stack.enter_context(
+                    open(osp.join(self._annotation_dir, annotation_name), "rb")
+                )
+                for _, indices in self._annotation_indices
+                for annotation_name, _, _ in indices
+            }
+
+            for item_id, subset in self._item_subsets.items():
+                item = self._make_item(item_id, subset)
+
+                normalized_coords = {}
+                for ann_type, indices in self._annotation_indices:
+                    for annotation_name, fieldnames, spans in indices:
+                        image_spans = spans.get(item_id)
+                        if not image_spans:
+                            continue
+
+                        for description in self._read_csv_rows(
+                            annotation_files[annotation_name], fieldnames, image_spans
+                        ):
+                            if ann_type == AnnotationType.mask:
+                                mask_path = description["MaskPath"]
+                                if _RE_INVALID_PATH_COMPONENT.fullmatch(mask_path):
+                                    raise UnsupportedMaskPathError(
+                                        item_id=item_id, mask_path=mask_path
+                                    )
+
+                            parsers[ann_type](item, description, normalized_coords)
+
+                yield item
+
+        self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
     def _add_item(self, item_id, subset):
+        item = self._make_item(item_id, subset)
+        self._items.append(item)
+        return item
+
+    def _make_item(self, item_id, subset):
         image_path = self._image_paths_by_id.get(item_id)
         image = None
         if image_path is None:
@@ -362,50 +548,139 @@ class OpenImagesBase(DatasetBase):
         else:
             image = Image.from_file(path=image_path, size=self._image_meta.get(item_id))
 
-        item = DatasetItem(id=item_id, media=image, subset=subset)
-        self._items.append(item)
-        return item
+        return DatasetItem(id=item_id, media=image, subset=subset)
 
     def _get_subset_name(self, filename):
         parts = filename.split("-")
         return parts[1] if parts[0] == "oidv6" else parts[0]
 
-    def _load_labels(self, items_by_id):
+    def _read_csv_columns(
+        self, file_name: str, column_types: Dict[str, pa.DataType], nullable: Sequence[str] = ()
+    ) -> Optional[pa.Table]:
+        """
+        Reads the columns of the annotation file with the multithreaded CSV reader
+        of pyarrow. Returns None, if the file can't be read this way. Such files
+        are parsed row by row, so that the errors are reported as usual.
+        """
+        try:
+            table = pa_csv.read_csv(
+                osp.join(self._annotation_dir, file_name),
+                read_options=pa_csv.ReadOptions(use_threads=True),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=column_types,
+                    include_columns=list(column_types),
+                    # Only the empty values are missing, as in the row by row parsing
+                    null_values=[""],
+                    strings_can_be_null=False,
+                ),
+            )
+        except pa.ArrowException as e:
+            log.debug("Can't read '%s' with pyarrow, parsing it row by row: %s", file_name, e)
+            return None
+
+        for column_name in column_types:
+            if column_name not in nullable and table.column(column_name).null_count:
+                return None
+
+        return table
+
+    @staticmethod
+    def _group_rows_by_image(table: pa.Table) -> Iterator[Tuple[str, np.ndarray]]:
+        # The images are enumerated in the order of their first rows,
+        # and the rows of each image keep the file order
+        image_ids = table.column("ImageID").combine_chunks().dictionary_encode()
+        codes = image_ids.indices.to_numpy()
+        rows = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(image_ids.dictionary)))[:-1]
+        return zip(image_ids.dictionary.to_pylist(), np.split(rows, bounds))
+
+    def _find_label_indices(self, table: pa.Table) -> np.ndarray:
+        # The label names are looked up once for each distinct name
         label_categories = self._categories[AnnotationType.label]
 
+        label_names = table.column("LabelName").combine_chunks().dictionary_encode()
+        label_indices = [
+            label_categories.find(name)[0] for name in label_names.dictionary.to_pylist()
+        ]
+        label_indices = np.array([-1 if i is None else i for i in label_indices], dtype=int)
+        return label_indices[label_names.indices.to_numpy()]
+
+    def _check_label_indices(self, items_by_id, table, label_indices, get_subset):
+        undefined_rows = np.flatnonzero(label_indices < 0)
+        if len(undefined_rows):
+            row = int(undefined_rows[0])
+            image_id = table.column("ImageID")[row].as_py()
+            item = items_by_id.get(image_id)
+            raise UndefinedLabel(
+                item_id=image_id,
+                subset=item.subset if item is not None else get_subset(row),
+                label_name=table.column("LabelName")[row].as_py(),
+                severity=Severity.error,
+            )
+
+    def _find_label(self, item, label_name):
+        label_index, _ = self._categories[AnnotationType.label].find(label_name)
+        if label_index is None:
+            raise UndefinedLabel(
+                item_id=item.id,
+                subset=item.subset,
+                label_name=label_name,
+                severity=Severity.error,
+            )
+        return label_index
+
+    def _get_or_add_item(self, items_by_id, image_id, subset):
+        item = items_by_id.get(image_id)
+        if item is None:
+            item = items_by_id.setdefault(image_id, self._add_item(image_id, subset))
+        return item
+
+    def _load_labels(self, items_by_id):
         # TODO: implement reading of machine-annotated labels
 
         for label_path in self._glob_annotations(
             "*" + OpenImagesPath.LABEL_DESCRIPTION_FILE_SUFFIX
         ):
-            with self._open_csv_annotation(label_path) as label_reader:
-                for label_description in label_reader:
-                    image_id = label_description["ImageID"]
-                    item = items_by_id.get(image_id)
-                    if item is None:
-                        item = items_by_id.setdefault(
-                            image_id, self._add_item(image_id, self._get_subset_name(label_path))
-                        )
+            table = self._read_csv_columns(
+                label_path,
+                {"ImageID": pa.string(), "LabelName": pa.string(), "Confidence": pa.float64()},
+            )
+            if table is None:
+                self._load_labels_by_rows(items_by_id, label_path)
+                continue
 
-                    confidence = float(label_description["Confidence"])
+            subset = self._get_subset_name(label_path)
+            label_indices = self._find_label_indices(table)
+            self._check_label_indices(items_by_id, table, label_indices, lambda row: subset)
+            confidences = table.column("Confidence").to_numpy()
+
+            for image_id, rows in self._group_rows_by_image(table):
+                item = self._get_or_add_item(items_by_id, image_id, subset)
+                self._add_labels(item, label_indices[rows].tolist(), confidences[rows].tolist())
+
+    def _load_labels_by_rows(self, items_by_id, label_path):
+        with self._open_csv_annotation(label_path) as label_reader:
+            for label_description in label_reader:
+                image_id = label_description["ImageID"]
+                item = self._get_or_add_item(
+                    items_by_id, image_id, self._get_subset_name(label_path)
+                )
 
-                    label_name = label_description["LabelName"]
-                    label_index, _ = label_categories.find(label_name)
-                    if label_index is None:
-                        raise UndefinedLabel(
-                            item_id=item.id,
-                            subset=item.subset,
-                            label_name=label_name,
-                            severity=Severity.error,
-                        )
-                    item.annotations.append(
-                        Label(label=label_index, attributes={"score": confidence})
-                    )
-                    self._ann_types.add(AnnotationType.label)
+                self._parse_label(item, label_description)
 
-    def _load_bboxes(self, items_by_id):
-        label_categories = self._categories[AnnotationType.label]
+    def _parse_label(self, item, label_description, normalized_coords=None):
+        confidence = float(label_description["Confidence"])
+        label_index = self._find_label(item, label_description["LabelName"])
+        self._add_labels(item, [label_index], [confidence])
 
+    def _add_labels(self, item, label_indices, confidences):
+        item.annotations.extend(
+            Label(label=label_index, attributes={"score": confidence})
+            for label_index, confidence in zip(label_indices, confidences)
+        )
+        self._ann_types.add(AnnotationType.label)
+
+    def _load_bboxes(self, items_by_id):
         # OID specifies box coordinates in the normalized form, which we have to
         # convert to the unnormalized form to fit the Datumaro data model.
         # However, we need to temporarily preserve the normalized form as well,
@@ -413,181 +688,324 @@ class OpenImagesBase(DatasetBase):
         # So we store each box's normalized coordinates in this dictionary.
         normalized_coords = {}
 
+        coord_fields = ["XMin", "XMax", "YMin", "YMax"]
+        flag_fields = [bool_attr.oid_name for bool_attr in OpenImagesPath.BBOX_BOOLEAN_ATTRIBUTES]
+
         for bbox_path in self._glob_annotations("*" + OpenImagesPath.BBOX_DESCRIPTION_FILE_SUFFIX):
-            with self._open_csv_annotation(bbox_path) as bbox_reader:
-                for bbox_description in bbox_reader:
-                    image_id = bbox_description["ImageID"]
-                    item = items_by_id.get(image_id)
-                    if item is None:
-                        item = items_by_id.setdefault(
-                            image_id, self._add_item(image_id, self._get_subset_name(bbox_path))
-                        )
+            table = self._read_csv_columns(
+                bbox_path,
+                {
+                    "ImageID": pa.string(),
+                    "LabelName": pa.string(),
+                    "Confidence": pa.float64(),
+                    **{field: pa.float64() for field in coord_fields},
+                    **{field: pa.int64() for field in flag_fields},
+                },
+            )
+            if table is None:
+                self._load_bboxes_by_rows(items_by_id, bbox_path, normalized_coords)
+                continue
 
-                    label_name = bbox_description["LabelName"]
-                    label_index, _ = label_categories.find(label_name)
-                    if label_index is None:
-                        raise UndefinedLabel(
-                            item_id=item.id,
-                            subset=item.subset,
-                            label_name=label_name,
-                            severity=Severity.error,
-                        )
+            subset = self._get_subset_name(bbox_path)
+            label_indices = self._find_label_indices(table)
+            self._check_label_indices(items_by_id, table, label_indices, lambda row: subset)
+            confidences = table.column("Confidence").to_numpy()
+            coords = np.stack([table.column(field).to_numpy() for field in coord_fields], axis=1)
+            flags = np.stack([table.column(field).to_numpy() for field in flag_fields], axis=1)
 
-                    if item.media and item.media.size is not None:
-                        height, width = item.media.size
-                    elif self._image_meta.get(item.id):
-                        height, width = self._image_meta[item.id]
-                    else:
+            for image_id, rows in self._group_rows_by_image(table):
+                item = self._get_or_add_item(items_by_id, image_id, subset)
+
+                image_size = self._get_bbox_image_size(item)
+                if image_size is None:
+                    for _ in rows:
                         log.warning(
                             "Can't decode box for item '%s' due to missing image file", item.id
                         )
-                        continue
+                    continue
+
+                self._add_bboxes(
+                    item,
+                    image_size,
+                    label_indices[rows].tolist(),
+                    coords[rows],
+                    confidences[rows].tolist(),
+                    flags[rows].tolist(),
+                    normalized_coords,
+                )
 
-                    x_min_norm, x_max_norm, y_min_norm, y_max_norm = [
-                        float(bbox_description[field]) for field in ["XMin", "XMax", "YMin", "YMax"]
-                    ]
+        return normalized_coords
 
-                    x_min = x_min_norm * width
-                    x_max = x_max_norm * width
-                    y_min = y_min_norm * height
-                    y_max = y_max_norm * height
+    def _load_bboxes_by_rows(self, items_by_id, bbox_path, normalized_coords):
+        with self._open_csv_annotation(bbox_path) as bbox_reader:
+            for bbox_description in bbox_reader:
+                image_id = bbox_description["ImageID"]
+                item = self._get_or_add_item(
+                    items_by_id, image_id, self._get_subset_name(bbox_path)
+                )
 
-                    attributes = {
-                        "score": float(bbox_description["Confidence"]),
-                    }
+                self._parse_bbox(item, bbox_description, normalized_coords)
 
-                    for bool_attr in OpenImagesPath.BBOX_BOOLEAN_ATTRIBUTES:
-                        int_value = int(bbox_description[bool_attr.oid_name])
-                        if int_value >= 0:
-                            attributes[bool_attr.datumaro_name] = bool(int_value)
+    def _get_bbox_image_size(self, item):
+        if item.media and item.media.size is not None:
+            return item.media.size
+        elif self._image_meta.get(item.id):
+            return self._image_meta[item.id]
+        return None
 
-                    # Give each box within an item a distinct group ID,
-                    # so that we can later group them together with the corresponding masks.
-                    if item.annotations and item.annotations[-1].type is AnnotationType.bbox:
-                        group = item.annotations[-1].group + 1
-                    else:
-                        group = 1
-
-                    item.annotations.append(
-                        Bbox(
-                            label=label_index,
-                            x=x_min,
-                            y=y_min,
-                            w=x_max - x_min,
-                            h=y_max - y_min,
-                            attributes=attributes,
-                            group=group,
-                        )
-                    )
-                    self._ann_types.add(AnnotationType.bbox)
+    def _parse_bbox(self, item, bbox_description, normalized_coords):
+        label_index = self._find_label(item, bbox_description["LabelName"])
 
-                    normalized_coords[id(item.annotations[-1])] = np.array(
-                        [x_min_norm, x_max_norm, y_min_norm, y_max_norm]
-                    )
+        image_size = self._get_bbox_image_size(item)
+        if image_size is None:
+            log.warning("Can't decode box for item '%s' due to missing image file", item.id)
+            return
 
-        return normalized_coords
+        coords = np.array(
+            [[float(bbox_description[field]) for field in ["XMin", "XMax", "YMin", "YMax"]]]
+        )
+        confidence = float(bbox_description["Confidence"])
+        flags = [
+            int(bbox_description[bool_attr.oid_name])
+            for bool_attr in OpenImagesPath.BBOX_BOOLEAN_ATTRIBUTES
+        ]
+
+        self._add_bboxes(
+            item, image_size, [label_index], coords, [confidence], [flags], normalized_coords
+        )
+
+    def _add_bboxes(
+        self, item, image_size, label_indices, coords, confidences, flags, normalized_coords
+    ):
+        height, width = image_size
+
+        # Give each box within an item a distinct group ID,
+        # so that we can later group them together with the corresponding masks.
+        if item.annotations and item.annotations[-1].type is AnnotationType.bbox:
+            group = item.annotations[-1].group
+        else:
+            group = 0
+
+        for label_index, coords_norm, coords_abs, confidence, row_flags in zip(
+            label_indices,
+            coords,
+            (coords * [width, width, height, height]).tolist(),
+            confidences,
+            flags,
+        ):
+            x_min, x_max, y_min, y_max = coords_abs
+
+            attributes = {
+                "score": confidence,
+            }
+
+            for bool_attr, int_value in zip(OpenImagesPath.BBOX_BOOLEAN_ATTRIBUTES, row_flags):
+                if int_value >= 0:
+                    attributes[bool_attr.datumaro_name] = bool(int_value)
+
+            group += 1
+            bbox = Bbox(
+                label=label_index,
+                x=x_min,
+                y=y_min,
+                w=x_max - x_min,
+                h=y_max - y_min,
+                attributes=attributes,
+                group=group,
+            )
+            item.annotations.append(bbox)
+
+            normalized_coords[id(bbox)] = coords_norm
+
+        self._ann_types.add(AnnotationType.bbox)
 
     def _load_masks(self, items_by_id, normalized_coords):
-        label_categories = self._categories[AnnotationType.label]
+        box_coord_fields = ["BoxXMin", "BoxXMax", "BoxYMin", "BoxYMax"]
 
         for mask_path in self._glob_annotations("*" + OpenImagesPath.MASK_DESCRIPTION_FILE_SUFFIX):
-            with self._open_csv_annotation(mask_path) as mask_reader:
-                for mask_description in mask_reader:
-                    mask_path = mask_description["MaskPath"]
-                    image_id = mask_description["ImageID"]
-
-                    if _RE_INVALID_PATH_COMPONENT.fullmatch(mask_path):
-                        raise UnsupportedMaskPathError(item_id=image_id, mask_path=mask_path)
-
-                    item = items_by_id.get(image_id)
-                    if item is None:
-                        item = items_by_id.setdefault(
-                            image_id, self._add_item(image_id, self._get_subset_name(mask_path))
-                        )
+            table = self._read_csv_columns(
+                mask_path,
+                {
+                    "MaskPath": pa.string(),
+                    "ImageID": pa.string(),
+                    "LabelName": pa.string(),
+                    "BoxID": pa.string(),
+                    **{field: pa.float64() for field in box_coord_fields},
+                    "PredictedIoU": pa.float64(),
+                },
+                nullable=box_coord_fields + ["PredictedIoU"],
+            )
+            if table is None:
+                self._load_masks_by_rows(items_by_id, mask_path, normalized_coords)
+                continue
 
-                    label_name = mask_description["LabelName"]
-                    label_index, _ = label_categories.find(label_name)
-                    if label_index is None:
-                        raise UndefinedLabel(
-                            item_id=item.id,
-                            subset=item.subset,
-                            label_name=label_name,
-                            severity=Severity.error,
-                        )
+            mask_paths = table.column("MaskPath").to_pylist()
+            for image_id, item_mask_path in zip(table.column("ImageID").to_pylist(), mask_paths):
+                if _RE_INVALID_PATH_COMPONENT.fullmatch(item_mask_path):
+                    raise UnsupportedMaskPathError(item_id=image_id, mask_path=item_mask_path)
+
+            label_indices = self._find_label_indices(table)
+            self._check_label_indices(
+                items_by_id,
+                table,
+                label_indices,
+                lambda row: self._get_subset_name(mask_paths[row]),
+            )
+            box_ids = table.column("BoxID").to_pylist()
 
-                    if item.media and item.media.has_size:
-                        image_size = item.media.size
-                    elif self._image_meta.get(item.id):
-                        image_size = self._image_meta.get(item.id)
-                    else:
+            # The original OID has box coordinates for all masks, but
+            # a dataset converted from another dataset might not.
+            box_coords = np.stack(
+                [table.column(field).to_numpy(zero_copy_only=False) for field in box_coord_fields],
+                axis=1,
+            )
+            has_box_coords = np.all(
+                [table.column(field).is_valid().to_numpy() for field in box_coord_fields], axis=0
+            )
+            predicted_ious = table.column("PredictedIoU").to_pylist()
+
+            for image_id, rows in self._group_rows_by_image(table):
+                item = self._get_or_add_item(
+                    items_by_id, image_id, self._get_subset_name(mask_paths[rows[0]])
+                )
+
+                image_size = self._get_mask_image_size(item)
+                if image_size is None:
+                    for _ in rows:
                         log.warning(
                             "Can't decode mask for item '%s' due to missing image file", item.id
                         )
-                        continue
+                    continue
+
+                self._add_masks(
+                    item,
+                    image_size,
+                    label_indices[rows].tolist(),
+                    [mask_paths[row] for row in rows],
+                    [box_ids[row] for row in rows],
+                    [box_coords[row] if has_box_coords[row] else None for row in rows],
+                    [predicted_ious[row] for row in rows],
+                    normalized_coords,
+                )
 
-                    attributes = {}
-
-                    # The box IDs are rather useless, because the _box_ annotations
-                    # don't include them, so they cannot be used to match masks to boxes.
-                    # However, it is still desirable to record them, because they are
-                    # included in the mask file names, so in order to save each mask to the
-                    # file it was loaded from when saving in-places, we need to know
-                    # the original box ID.
-                    box_id = mask_description["BoxID"]
-                    if _RE_INVALID_PATH_COMPONENT.fullmatch(box_id):
-                        raise UnsupportedBoxIdError(item_id=item.id, box_id=box_id)
-                    attributes["box_id"] = box_id
-
-                    group = 0
-
-                    box_coord_fields = ("BoxXMin", "BoxXMax", "BoxYMin", "BoxYMax")
-
-                    # The original OID has box coordinates for all masks, but
-                    # a dataset converted from another dataset might not.
-                    if all(mask_description[f] for f in box_coord_fields):
-                        # Try to find the box annotation corresponding to the
-                        # current mask.
-                        mask_box_coords = np.array(
-                            [float(mask_description[field]) for field in box_coord_fields]
-                        )
+    def _load_masks_by_rows(self, items_by_id, mask_path, normalized_coords):
+        with self._open_csv_annotation(mask_path) as mask_reader:
+            for mask_description in mask_reader:
+                mask_path = mask_description["MaskPath"]
+                image_id = mask_description["ImageID"]
 
-                        for annotation in item.annotations:
-                            if (
-                                annotation.type is AnnotationType.bbox
-                                and annotation.label == label_index
-                            ):
-                                # In the original OID, mask box coordinates are stored
-                                # with 6 digit precision, hence the tolerance.
-                                if np.allclose(
-                                    mask_box_coords,
-                                    normalized_coords[id(annotation)],
-                                    rtol=0,
-                                    atol=1e-6,
-                                ):
-                                    group = annotation.group
-
-                    if mask_description["PredictedIoU"]:
-                        attributes["predicted_iou"] = float(mask_description["PredictedIoU"])
-
-                    item.annotations.append(
-                        Mask(
-                            image=lazy_image(
-                                osp.join(
-                                    self._dataset_dir,
-                                    OpenImagesPath.MASKS_DIR,
-                                    item.subset,
-                                    mask_path,
-                                ),
-                                loader=functools.partial(
-                                    self._load_and_resize_mask, size=image_size
-                                ),
-                            ),
-                            label=label_index,
-                            attributes=attributes,
-                            group=group,
-                        )
-                    )
-                    self._ann_types.add(AnnotationType.mask)
+                if _RE_INVALID_PATH_COMPONENT.fullmatch(mask_path):
+                    raise UnsupportedMaskPathError(item_id=image_id, mask_path=mask_path)
+
+                item = self._get_or_add_item(
+                    items_by_id, image_id, self._get_subset_name(mask_path)
+                )
+
+                self._parse_mask(item, mask_description, normalized_coords)
+
+    def _get_mask_image_size(self, item):
+        if item.media and item.media.has_size:
+            return item.media.size
+        elif self._image_meta.get(item.id):
+            return self._image_meta.get(item.id)
+        return None
+
+    def _parse_mask(self, item, mask_description, normalized_coords):
+        label_index = self._find_label(item, mask_description["LabelName"])
+
+        image_size = self._get_mask_image_size(item)
+        if image_size is None:
+            log.warning("Can't decode mask for item '%s' due to missing image file", item.id)
+            return
+
+        box_coord_fields = ("BoxXMin", "BoxXMax", "BoxYMin", "BoxYMax")
+
+        # The original OID has box coordinates for all masks, but
+        # a dataset converted from another dataset might not.
+        mask_box_coords = None
+        if all(mask_description[f] for f in box_coord_fields):
+            mask_box_coords = np.array(
+                [float(mask_description[field]) for field in box_coord_fields]
+            )
+
+        predicted_iou = None
+        if mask_description["PredictedIoU"]:
+            predicted_iou = float(mask_description["PredictedIoU"])
+
+        self._add_masks(
+            item,
+            image_size,
+            [label_index],
+            [mask_description["MaskPath"]],
+            [mask_description["BoxID"]],
+            [mask_box_coords],
+            [predicted_iou],
+            normalized_coords,
+        )
+
+    def _add_masks(
+        self,
+        item,
+        image_size,
+        label_indices,
+        mask_paths,
+        box_ids,
+        box_coords,
+        predicted_ious,
+        normalized_coords,
+    ):
+        for label_index, mask_path, box_id, mask_box_coords, predicted_iou in zip(
+            label_indices, mask_paths, box_ids, box_coords, predicted_ious
+        ):
+            attributes = {}
+
+            # The box IDs are rather useless, because the _box_ annotations
+            # don't include them, so they cannot be used to match masks to boxes.
+            # However, it is still desirable to record them, because they are
+            # included in the mask file names, so in order to save each mask to the
+            # file it was loaded from when saving in-places, we need to know
+            # the original box ID.
+            if _RE_INVALID_PATH_COMPONENT.fullmatch(box_id):
+                raise UnsupportedBoxIdError(item_id=item.id, box_id=box_id)
+            attributes["box_id"] = box_id
+
+            group = 0
+
+            if mask_box_coords is not None:
+                # Try to find the box annotation corresponding to the
+                # current mask.
+                for annotation in item.annotations:
+                    if annotation.type is AnnotationType.bbox and annotation.label == label_index:
+                        # In the original OID, mask box coordinates are stored
+                        # with 6 digit precision, hence the tolerance.
+                        if np.allclose(
+                            mask_box_coords,
+                            normalized_coords[id(annotation)],
+                            rtol=0,
+                            atol=1e-6,
+                        ):
+                            group = annotation.group
+
+            if predicted_iou is not None:
+                attributes["predicted_iou"] = predicted_iou
+
+            item.annotations.append(
+                Mask(
+                    image=lazy_image(
+                        osp.join(
+                            self._dataset_dir,
+                            OpenImagesPath.MASKS_DIR,
+                            item.subset,
+                            mask_path,
+                        ),
+                        loader=functools.partial(self._load_and_resize_mask, size=image_size),
+                    ),
+                    label=label_index,
+                    attributes=attributes,
+                    group=group,
+                )
+            )
+            self._ann_types.add(AnnotationType.mask)
 
     @staticmethod
     def _load_and_resize_mask(path, size):
@@ -623,6 +1041,10 @@ class OpenImagesImporter(Importer):
                 return [{"url": path, "format": OpenImagesBase.NAME}]
         return []
 
+    @property
+    def can_stream(self) -> bool:
+        return True
+
     @classmethod
     def get_file_extensions(cls) -> List[str]:
         return list({osp.splitext(p)[1] for p in cls.POSSIBLE_ANNOTATION_PATTERNS})
@@ -0,0 +1,9 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from .base import ParquetBase
+from .exporter import ParquetExporter
+from .importer import ParquetImporter
+
+__all__ = ["ParquetBase", "ParquetExporter", "ParquetImporter"]
@@ -0,0 +1,259 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os.path as osp
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from datumaro.components.annotation import Annotation, AnnotationType
+from datumaro.components.dataset_base import CategoriesInfo, DatasetBase, DatasetInfo, DatasetItem
+from datumaro.components.importer import ImportContext, NullImportContext
+from datumaro.components.media import Image, MediaElement, MediaType
+from datumaro.components.task import TaskAnnotationMapping
+from datumaro.plugins.data_formats.arrow.base import ArrowSubsetBase
+from datumaro.plugins.data_formats.datumaro.base import JsonReader, load_annotations
+from datumaro.util import parse_json, parse_json_file
+from datumaro.util.definitions import DEFAULT_SUBSET_NAME
+
+from .format import DatumaroParquet
+
+__all__ = ["ParquetBase"]
+
+AnnotationFilter = Union[pc.Expression, List[Any]]
+
+
+class _AnnotationReader:
+    """Restores annotations from the flattened columns of the annotation table"""
+
+    def __init__(self, ctx: ImportContext) -> None:
+        self._ctx = ctx
+
+    def parse_rows(self, subset: str, rows: Iterable[Dict[str, Any]]) -> List[Annotation]:
+        return load_annotations(
+            [self._make_desc(row) for row in rows], subset=subset, ctx=self._ctx
+        )
+
+    @staticmethod
+    def _make_desc(row: Dict[str, Any]) -> Dict[str, Any]:
+        desc = {key: value for key, value in row.items() if value is not None}
+        desc["attributes"] = parse_json(row["attributes"]) if row.get("attributes") else {}
+
+        if row["type"] == AnnotationType.bbox.name:
+            desc["bbox"] = [row["bbox_x"], row["bbox_y"], row["bbox_w"], row["bbox_h"]]
+        elif row["type"] == AnnotationType.mask.name:
+            desc["rle"] = {
+                "counts": row["rle_counts"],
+                "size": [row["rle_height"], row["rle_width"]],
+            }
+
+        return desc
+
+
+class ParquetBase(DatasetBase):
+    """
+    Reads a dataset from the partitioned parquet tables.
+
+    Only the columns required for the requested annotation types are read,
+    and the subset, annotation type and user-given predicates are pushed down
+    to the parquet reader, so the skipped row groups are never decoded.
+
+    Args:
+        path: Path to the meta file of the dataset
+        subsets: Subsets to load. All the subsets are loaded, if not specified.
+        ann_types: Annotation types to load. All the types are loaded, if not specified.
+        ann_filter: A predicate on the annotation table columns to select
+            the loaded annotations. It can be a pyarrow compute expression or
+            a filter in the disjunctive normal form, e.g. [("label", "=", "cat")].
+        drop_empty_items: Skip the items without the loaded annotations
+        load_media: Read the embedded image bytes. Otherwise, only the image paths are used.
+        ctx: Import context
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        subsets: Optional[Sequence[str]] = None,
+        ann_types: Optional[Sequence[Union[AnnotationType, str]]] = None,
+        ann_filter: Optional[AnnotationFilter] = None,
+        drop_empty_items: bool = False,
+        load_media: bool = True,
+        ctx: Optional[ImportContext] = None,
+    ):
+        assert osp.isfile(path), path
+
+        meta = parse_json_file(path)
+        DatumaroParquet.check_signature(meta.get("signature"))
+        DatumaroParquet.check_version(meta.get("version"))
+
+        self._root_dir = osp.dirname(path)
+        self._infos = JsonReader._load_infos(meta)
+        self._categories = JsonReader._load_categories(meta)
+
+        if ann_types is not None:
+            ann_types = [
+                AnnotationType[ann_type] if isinstance(ann_type, str) else ann_type
+                for ann_type in ann_types
+            ]
+        if isinstance(ann_filter, list):
+            ann_filter = pq.filters_to_expression(ann_filter)
+
+        items = self._load_items(subsets, load_media)
+        annotations = self._load_annotations(subsets, ann_types, ann_filter)
+
+        lookup: Dict[str, Dict[str, DatasetItem]] = {}
+        ann_reader = _AnnotationReader(ctx=ctx or NullImportContext())
+        ann_type_set = set()
+        for subset, subset_items in items.items():
+            subset_lookup = lookup.setdefault(subset, {})
+            subset_anns = annotations.get(subset, {})
+            for item_id, item_kwargs in subset_items.items():
+                anns = ann_reader.parse_rows(subset, subset_anns.get(item_id, []))
+                if drop_empty_items and not anns:
+                    continue
+                for ann in anns:
+                    ann_type_set.add(ann.type)
+
+                subset_lookup[item_id] = DatasetItem(
+                    id=item_id, subset=subset, annotations=anns, **item_kwargs
+                )
+
+        super().__init__(
+            length=sum(len(subset_lookup) for subset_lookup in lookup.values()),
+            subsets=list(lookup),
+            media_type=MediaType(meta.get("media_type", MediaType.IMAGE)).media,
+            task_type=TaskAnnotationMapping().get_task(ann_type_set),
+            ctx=ctx,
+        )
+
+        self._lookup = lookup
+        self._subsets = {
+            subset: ArrowSubsetBase(
+                lookup=subset_lookup,
+                infos=self._infos,
+                categories=self._categories,
+                subset=subset,
+                media_type=self._media_type,
+                task_type=self._task_type,
+            )
+            for subset, subset_lookup in lookup.items()
+        }
+
+    def _open_table(self, dirname: str, schema: pa.Schema) -> ds.Dataset:
+        partition_schema = pa.schema([pa.field(DatumaroParquet.SUBSET_FIELD, pa.string())])
+        return ds.dataset(
+            osp.join(self._root_dir, dirname),
+            schema=pa.unify_schemas([schema, partition_schema]),
+            format="parquet",
+            partitioning=ds.partitioning(partition_schema, flavor="hive"),
+        )
+
+    @staticmethod
+    def _subset_filter(subsets: Optional[Sequence[str]]) -> Optional[pc.Expression]:
+        if subsets is None:
+            return None
+        return pc.field(DatumaroParquet.SUBSET_FIELD).isin(list(subsets))
+
+    def _load_items(
+        self, subsets: Optional[Sequence[str]], load_media: bool
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        columns = [name for name in DatumaroParquet.ITEM_SCHEMA.names if name != "image_bytes"]
+        columns.append(DatumaroParquet.SUBSET_FIELD)
+        if load_media:
+            columns.append("image_bytes")
+
+        table = self._open_table(DatumaroParquet.ITEMS_DIR, DatumaroParquet.ITEM_SCHEMA).to_table(
+            columns=columns, filter=self._subset_filter(subsets)
+        )
+
+        items: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        image_bytes = table.column("image_bytes") if load_media else None
+        rows = table.drop(["image_bytes"]) if load_media else table
+        for idx, row in enumerate(rows.to_pylist()):
+            media = self._make_media(row, image_bytes, idx)
+            items.setdefault(row[DatumaroParquet.SUBSET_FIELD], {})[row["id"]] = {
+                "media": media,
+                "attributes": parse_json(row["attributes"]) if row["attributes"] else None,
+            }
+
+        return items
+
+    @staticmethod
+    def _make_media(
+        row: Dict[str, Any], image_bytes: Optional[pa.ChunkedArray], idx: int
+    ) -> Optional[MediaElement]:
+        path = row["image_path"]
+        size = None
+        if row["image_height"] is not None and row["image_width"] is not None:
+            size = (row["image_height"], row["image_width"])
+
+        # The bytes are kept in the arrow buffers until the image is accessed
+        if image_bytes is not None and image_bytes[idx].is_valid:
+            return Image.from_bytes(
+                data=lambda: image_bytes[idx].as_py(),
+                ext=osp.splitext(path)[1] if path else None,
+                size=size,
+            )
+        if path:
+            return Image.from_file(path=path, size=size)
+        return None
+
+    def _load_annotations(
+        self,
+        subsets: Optional[Sequence[str]],
+        ann_types: Optional[Sequence[AnnotationType]],
+        ann_filter: Optional[pc.Expression],
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        if ann_types is None:
+            ann_types = list(DatumaroParquet.ANNOTATION_TYPE_COLUMNS)
+
+        columns = list(DatumaroParquet.COMMON_ANNOTATION_COLUMNS)
+        for ann_type in ann_types:
+            for column in DatumaroParquet.ANNOTATION_TYPE_COLUMNS.get(ann_type, []):
+                if column not in columns:
+                    columns.append(column)
+
+        expr = pc.field("type").isin([ann_type.name for ann_type in ann_types])
+        for extra_filter in [self._subset_filter(subsets), ann_filter]:
+            if extra_filter is not None:
+                expr = expr & extra_filter
+
+        table = self._open_table(
+            DatumaroParquet.ANNOTATIONS_DIR, DatumaroParquet.ANNOTATION_SCHEMA
+        ).to_table(columns=columns, filter=expr)
+
+        annotations: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for row in table.to_pylist():
+            subset = row.pop(DatumaroParquet.SUBSET_FIELD)
+            annotations.setdefault(subset, {}).setdefault(row.pop("item_id"), []).append(row)
+
+        return annotations
+
+    def infos(self) -> DatasetInfo:
+        return self._infos
+
+    def categories(self) -> CategoriesInfo:
+        return self._categories
+
+    def __iter__(self):
+        for lookup in self._lookup.values():
+            yield from lookup.values()
+
+    def get(self, item_id: str, subset: Optional[str] = None) -> Optional[DatasetItem]:
+        subset = subset or DEFAULT_SUBSET_NAME
+
+        try:
+            return self._lookup[subset][item_id]
+        except KeyError:
+            return None
+
+    def subsets(self):
+        return self._subsets
+
+    def get_subset(self, name: str):
+        return self._subsets[name]
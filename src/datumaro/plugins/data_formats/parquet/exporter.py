@@ -0,0 +1,274 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import os.path as osp
+from typing import Any, Dict, List, Tuple
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from datumaro.components.annotation import AnnotationType
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.errors import MediaTypeError
+from datumaro.components.exporter import Exporter
+from datumaro.components.media import Image, MediaElement
+from datumaro.plugins.data_formats.arrow.mapper.media import ImageMapper
+from datumaro.plugins.data_formats.datumaro.exporter import JsonWriter
+from datumaro.util import dump_json, dump_json_file
+
+from .format import DatumaroParquet
+
+__all__ = ["ParquetExporter"]
+
+
+class _PartitionWriter:
+    """Writes the rows of each subset into a separate hive-style partition"""
+
+    def __init__(self, root_dir: str, schema: pa.Schema, row_group_size: int, compression: str):
+        self._root_dir = root_dir
+        self._schema = schema
+        self._row_group_size = row_group_size
+        self._compression = compression
+
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._writers: Dict[str, pq.ParquetWriter] = {}
+
+    def add(self, subset: str, rows: List[Dict[str, Any]]) -> None:
+        buffer = self._buffers.setdefault(subset, [])
+        buffer.extend(rows)
+        if self._row_group_size <= len(buffer):
+            self._flush(subset)
+
+    def _flush(self, subset: str) -> None:
+        buffer = self._buffers[subset]
+        if not buffer:
+            return
+
+        writer = self._writers.get(subset)
+        if writer is None:
+            partition_dir = osp.join(
+                self._root_dir, f"{DatumaroParquet.SUBSET_FIELD}={quote(subset, safe='')}"
+            )
+            os.makedirs(partition_dir, exist_ok=True)
+            writer = pq.ParquetWriter(
+                osp.join(partition_dir, DatumaroParquet.PART_FILE),
+                self._schema,
+                compression=self._compression,
+            )
+            self._writers[subset] = writer
+
+        writer.write_table(
+            pa.Table.from_pylist(buffer, schema=self._schema), row_group_size=self._row_group_size
+        )
+        buffer.clear()
+
+    def close(self) -> None:
+        for subset in self._buffers:
+            self._flush(subset)
+        for writer in self._writers.values():
+            writer.close()
+
+
+class ParquetExporter(Exporter):
+    AVAILABLE_IMAGE_EXTS = ImageMapper.AVAILABLE_SCHEMES
+    DEFAULT_IMAGE_EXT = ImageMapper.AVAILABLE_SCHEMES[0]
+
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+
+        # '--image-ext' would be used in a different way for parquet format
+        _actions = []
+        for action in parser._actions:
+            if action.dest != "image_ext":
+                _actions.append(action)
+        parser._actions = _actions
+        parser._option_string_actions.pop("--image-ext")
+
+        parser.add_argument(
+            "--image-ext",
+            default=None,
+            help=f"Image encoding scheme. (default: {cls.DEFAULT_IMAGE_EXT})",
+            choices=cls.AVAILABLE_IMAGE_EXTS,
+        )
+
+        parser.add_argument(
+            "--row-group-size",
+            type=int,
+            default=DatumaroParquet.DEFAULT_ROW_GROUP_SIZE,
+            help="The maximum number of rows in a row group of the parquet files. "
+            "(default: %(default)s)",
+        )
+
+        parser.add_argument(
+            "--compression",
+            default=DatumaroParquet.DEFAULT_COMPRESSION,
+            choices=DatumaroParquet.AVAILABLE_COMPRESSIONS,
+            help="Compression codec of the parquet files. (default: %(default)s)",
+        )
+
+        return parser
+
+    def __init__(
+        self,
+        extractor,
+        save_dir,
+        *,
+        row_group_size: int = DatumaroParquet.DEFAULT_ROW_GROUP_SIZE,
+        compression: str = DatumaroParquet.DEFAULT_COMPRESSION,
+        **kwargs,
+    ):
+        super().__init__(extractor, save_dir, **kwargs)
+
+        if row_group_size <= 0:
+            raise ValueError(
+                f"row_group_size should be positive but row_group_size={row_group_size}."
+            )
+        if compression not in DatumaroParquet.AVAILABLE_COMPRESSIONS:
+            raise ValueError(
+                f"{compression} is unknown compression. "
+                f"Available compressions are {DatumaroParquet.AVAILABLE_COMPRESSIONS}"
+            )
+
+        self._row_group_size = row_group_size
+        self._compression = compression
+
+        if self._save_media:
+            self._image_ext = (
+                self._image_ext if self._image_ext is not None else self._default_image_ext
+            )
+        else:
+            self._image_ext = "NONE"
+
+        assert (
+            self._image_ext in self.AVAILABLE_IMAGE_EXTS
+        ), f"{self._image_ext} is unkonwn ext. Available exts are {self.AVAILABLE_IMAGE_EXTS}"
+
+    def _apply_impl(self):
+        media_type = self._extractor.media_type()
+        if media_type and not issubclass(media_type, Image) and media_type is not MediaElement:
+            raise MediaTypeError("Media type is not an image")
+
+        # The datasets without media are saved as image datasets
+        media_type = media_type or Image
+
+        for dirname in [DatumaroParquet.ITEMS_DIR, DatumaroParquet.ANNOTATIONS_DIR]:
+            os.makedirs(osp.join(self._save_dir, dirname), exist_ok=True)
+
+        categories = self._extractor.categories()
+        dump_json_file(
+            osp.join(self._save_dir, DatumaroParquet.META_FILE),
+            {
+                "signature": DatumaroParquet.SIGNATURE,
+                "version": DatumaroParquet.VERSION,
+                "media_type": media_type._type,
+                "infos": self._extractor.infos(),
+                "categories": JsonWriter.write_categories(categories),
+            },
+        )
+
+        label_categories = categories.get(AnnotationType.label)
+        self._label_names = [label.name for label in label_categories] if label_categories else []
+
+        items_writer = _PartitionWriter(
+            osp.join(self._save_dir, DatumaroParquet.ITEMS_DIR),
+            DatumaroParquet.ITEM_SCHEMA,
+            row_group_size=self._row_group_size,
+            compression=self._compression,
+        )
+        anns_writer = _PartitionWriter(
+            osp.join(self._save_dir, DatumaroParquet.ANNOTATIONS_DIR),
+            DatumaroParquet.ANNOTATION_SCHEMA,
+            row_group_size=self._row_group_size,
+            compression=self._compression,
+        )
+
+        pbar = self._ctx.progress_reporter
+        try:
+            for subset_name, subset in self._extractor.subsets().items():
+                for item in pbar.iter(subset, desc=f"Exporting '{subset_name}'"):
+                    try:
+                        item_row, ann_rows = self._make_rows(item)
+                    except Exception as e:
+                        self._ctx.error_policy.report_item_error(e, item_id=(item.id, item.subset))
+                        continue
+
+                    items_writer.add(subset_name, [item_row])
+                    anns_writer.add(subset_name, ann_rows)
+        finally:
+            items_writer.close()
+            anns_writer.close()
+
+        if self._save_dataset_meta:
+            self._save_meta_file(self._save_dir)
+
+    def _make_rows(self, item: DatasetItem) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        item_row = {
+            "id": item.id,
+            "attributes": dump_json(item.attributes).decode() if item.attributes else None,
+        }
+
+        if isinstance(item.media, Image):
+            image = item.media_as(Image)
+            item_row["image_path"] = getattr(image, "path", None)
+            item_row["image_bytes"] = ImageMapper.encode(image, scheme=self._image_ext)
+            if image.has_size:
+                item_row["image_height"], item_row["image_width"] = image.size
+        elif isinstance(item.media, MediaElement):
+            item_row["image_path"] = getattr(item.media, "path", None)
+
+        ann_rows = []
+        for ann in item.annotations:
+            ann_desc = JsonWriter.write_annotation(ann)
+            if ann_desc is not None:
+                ann_rows.append(self._make_annotation_row(item.id, ann, ann_desc))
+
+        return item_row, ann_rows
+
+    def _make_annotation_row(self, item_id: str, ann, ann_desc: Dict[str, Any]) -> Dict[str, Any]:
+        """Flattens the Datumaro annotation description into typed columns"""
+
+        row = {
+            "item_id": item_id,
+            "id": ann_desc["id"],
+            "type": ann_desc["type"],
+            "label_id": ann_desc.get("label_id"),
+            "group": ann_desc["group"],
+            "object_id": ann_desc.get("object_id"),
+            "z_order": ann_desc.get("z_order"),
+            "points": ann_desc.get("points"),
+            "visibility": ann_desc.get("visibility"),
+            "caption": ann_desc.get("caption"),
+            "position": ann_desc.get("position"),
+            "rotation": ann_desc.get("rotation"),
+            "scale": ann_desc.get("scale"),
+            "attributes": dump_json(ann_desc["attributes"]).decode()
+            if ann_desc["attributes"]
+            else None,
+        }
+
+        label_id = row["label_id"]
+        if label_id is not None and 0 <= label_id < len(self._label_names):
+            row["label"] = self._label_names[label_id]
+
+        rle = ann_desc.get("rle")
+        if rle is not None:
+            row["rle_counts"] = rle["counts"]
+            row["rle_height"], row["rle_width"] = rle["size"]
+
+        # Keep the geometry statistics for any shape to make queries uniform
+        if hasattr(ann, "get_bbox"):
+            bbox = ann_desc.get("bbox") or ann.get_bbox()
+            if bbox is not None:
+                row["bbox_x"], row["bbox_y"], row["bbox_w"], row["bbox_h"] = map(float, bbox)
+        if hasattr(ann, "get_area"):
+            row["area"] = float(ann.get_area())
+
+        return row
+
+    @property
+    def can_stream(self) -> bool:
+        return True
@@ -0,0 +1,106 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from typing import Dict, List
+
+import pyarrow as pa
+
+from datumaro.components.annotation import AnnotationType
+from datumaro.errors import DatasetImportError
+
+
+class DatumaroParquet:
+    SIGNATURE = "signature:datumaro_parquet"
+    VERSION = "1.0"
+
+    META_FILE = "meta.json"
+    ITEMS_DIR = "items"
+    ANNOTATIONS_DIR = "annotations"
+    PART_FILE = "part-0.parquet"
+
+    # Subsets are stored as hive-style partitions, i.e. "<dir>/subset=<name>/*.parquet"
+    SUBSET_FIELD = "subset"
+
+    DEFAULT_ROW_GROUP_SIZE = 65536
+    DEFAULT_COMPRESSION = "zstd"
+    AVAILABLE_COMPRESSIONS = ("none", "snappy", "gzip", "brotli", "lz4", "zstd")
+
+    ITEM_SCHEMA = pa.schema(
+        [
+            pa.field("id", pa.string()),
+            pa.field("image_path", pa.string()),
+            pa.field("image_bytes", pa.binary()),
+            pa.field("image_height", pa.int32()),
+            pa.field("image_width", pa.int32()),
+            pa.field("attributes", pa.string()),
+        ]
+    )
+
+    ANNOTATION_SCHEMA = pa.schema(
+        [
+            pa.field("item_id", pa.string()),
+            pa.field("id", pa.int64()),
+            pa.field("type", pa.string()),
+            pa.field("label_id", pa.int32()),
+            pa.field("label", pa.string()),
+            pa.field("group", pa.int64()),
+            pa.field("object_id", pa.int64()),
+            pa.field("z_order", pa.int32()),
+            pa.field("area", pa.float64()),
+            pa.field("bbox_x", pa.float64()),
+            pa.field("bbox_y", pa.float64()),
+            pa.field("bbox_w", pa.float64()),
+            pa.field("bbox_h", pa.float64()),
+            pa.field("points", pa.list_(pa.float64())),
+            pa.field("visibility", pa.list_(pa.uint8())),
+            pa.field("rle_counts", pa.string()),
+            pa.field("rle_height", pa.int32()),
+            pa.field("rle_width", pa.int32()),
+            pa.field("caption", pa.string()),
+            pa.field("position", pa.list_(pa.float64())),
+            pa.field("rotation", pa.list_(pa.float64())),
+            pa.field("scale", pa.list_(pa.float64())),
+            pa.field("attributes", pa.string()),
+        ]
+    )
+
+    # Columns required to restore an annotation of any type
+    COMMON_ANNOTATION_COLUMNS = [
+        "item_id",
+        SUBSET_FIELD,
+        "id",
+        "type",
+        "label_id",
+        "group",
+        "object_id",
+        "z_order",
+        "attributes",
+    ]
+
+    # Columns required to restore an annotation of the specific type
+    ANNOTATION_TYPE_COLUMNS: Dict[AnnotationType, List[str]] = {
+        AnnotationType.label: [],
+        AnnotationType.mask: ["rle_counts", "rle_height", "rle_width"],
+        AnnotationType.points: ["points", "visibility"],
+        AnnotationType.polygon: ["points"],
+        AnnotationType.polyline: ["points"],
+        AnnotationType.bbox: ["bbox_x", "bbox_y", "bbox_w", "bbox_h"],
+        AnnotationType.caption: ["caption"],
+        AnnotationType.cuboid_3d: ["position", "rotation", "scale"],
+        AnnotationType.ellipse: ["points"],
+    }
+
+    @classmethod
+    def check_signature(cls, signature: str):
+        if signature != cls.SIGNATURE:
+            raise DatasetImportError(
+                f"Input signature={signature} is not aligned with the ground truth signature={cls.SIGNATURE}"
+            )
+
+    @classmethod
+    def check_version(cls, version: str):
+        if version != cls.VERSION:
+            raise DatasetImportError(
+                f"Input version={version} is not aligned with the current data format version={cls.VERSION}"
+            )
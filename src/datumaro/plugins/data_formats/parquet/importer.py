@@ -0,0 +1,79 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os.path as osp
+from typing import Dict, List, Optional
+
+from datumaro.components.format_detection import FormatDetectionConfidence, FormatDetectionContext
+from datumaro.components.importer import Importer
+from datumaro.util import parse_json, parse_json_file
+
+from .format import DatumaroParquet
+
+__all__ = ["ParquetImporter"]
+
+
+class ParquetImporter(Importer):
+    NAME = "parquet"
+
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--subsets",
+            type=lambda x: x.split(","),
+            help="Comma-separated list of the subsets to load (default: all)",
+        )
+        parser.add_argument(
+            "--ann-types",
+            type=lambda x: x.split(","),
+            help="Comma-separated list of the annotation types to load, "
+            "e.g. 'bbox,label'. Only the columns of these types are read (default: all)",
+        )
+        parser.add_argument(
+            "--drop-empty-items",
+            action="store_true",
+            help="Skip the items without the loaded annotations",
+        )
+        parser.add_argument(
+            "--no-media",
+            dest="load_media",
+            action="store_false",
+            help="Don't read the embedded image bytes, use the image paths only",
+        )
+        return parser
+
+    @classmethod
+    def detect(
+        cls,
+        context: FormatDetectionContext,
+    ) -> Optional[FormatDetectionConfidence]:
+        meta_file = context.require_file(DatumaroParquet.META_FILE)
+
+        with context.probe_text_file(
+            meta_file, f"must have the '{DatumaroParquet.SIGNATURE}' signature"
+        ) as f:
+            DatumaroParquet.check_signature(parse_json(f.read()).get("signature"))
+
+    @classmethod
+    def find_sources(cls, path: str) -> List[Dict]:
+        def _filter(path: str) -> bool:
+            try:
+                DatumaroParquet.check_signature(parse_json_file(path).get("signature"))
+                return True
+            except Exception:
+                return False
+
+        return cls._find_sources_recursive(
+            path,
+            osp.splitext(DatumaroParquet.META_FILE)[1],
+            cls.NAME,
+            filename=osp.splitext(DatumaroParquet.META_FILE)[0],
+            file_filter=_filter,
+            max_depth=1,
+        )
+
+    @classmethod
+    def get_file_extensions(cls) -> List[str]:
+        return [".parquet"]
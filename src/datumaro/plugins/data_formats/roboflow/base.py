@@ -46,6 +46,7 @@ class RoboflowCocoBase(_CocoBase):
         *,
         subset: Optional[str] = None,
         stream: bool = False,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ):
         super().__init__(
@@ -54,6 +55,7 @@ class RoboflowCocoBase(_CocoBase):
             coco_importer_type=CocoImporterType.roboflow,
             subset=subset,
             stream=stream,
+            num_workers=num_workers,
             ctx=ctx,
         )
 
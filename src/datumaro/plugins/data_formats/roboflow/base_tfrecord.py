@@ -7,16 +7,13 @@ import re
 from typing import List, Optional
 
 from datumaro.components.importer import ImportContext, Importer
-from datumaro.components.lazy_plugin import extra_deps
-from datumaro.plugins.data_formats.tf_detection_api.base import TfDetectionApiBase
+from datumaro.plugins.data_formats.tf_detection_api.base import (
+    TfDetectionApiBase,
+    read_first_example,
+)
 from datumaro.plugins.data_formats.tf_detection_api.format import TfrecordImporterType
-from datumaro.util.tf_util import has_feature
-from datumaro.util.tf_util import import_tf as _import_tf
 
-tf = _import_tf()
 
-
-@extra_deps("tensorflow")
 class RoboflowTfrecordImporter(Importer):
     _ANNO_EXT = ".tfrecord"
 
@@ -30,13 +27,10 @@ class RoboflowTfrecordImporter(Importer):
         if len(sources) == 0:
             return []
 
-        undesired_feature = {
-            "image/source_id": tf.io.FixedLenFeature([], tf.string),
-        }
-
         subsets = {}
         for source in sources:
-            if has_feature(path=source["url"], feature=undesired_feature):
+            first_example = read_first_example(source["url"])
+            if first_example is not None and "image/source_id" in first_example:
                 continue
             subset_name = os.path.dirname(source["url"]).split(os.sep)[-1]
             subsets[subset_name] = source["url"]
@@ -5,7 +5,7 @@
 import os.path as osp
 from glob import glob
 from inspect import isclass
-from typing import Any, Dict, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Dict, Iterator, Optional, Tuple, Type, TypeVar, Union
 
 from datumaro.components.annotation import Bbox, RleMask
 from datumaro.components.dataset_base import DatasetItem, SubsetBase
@@ -15,9 +15,9 @@ from datumaro.components.errors import (
     InvalidFieldTypeError,
     MissingFieldError,
 )
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, read_item_files
 from datumaro.components.media import Image
-from datumaro.components.task import TaskAnnotationMapping
+from datumaro.components.task import TaskAnnotationMapping, TaskType
 from datumaro.util import NOTSET, parse_json_file
 
 T = TypeVar("T")
@@ -43,27 +43,77 @@ def parse_field(
 
 
 class SegmentAnythingBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+        stream: If True, the items are parsed from the annotation files on each
+            iteration, instead of keeping them in memory.
+    """
+
     def __init__(
         self,
         path: str,
         *,
         subset: Optional[str] = None,
+        num_workers: int = 0,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
         if not osp.isdir(path):
             raise DatasetImportError(f"path {path} must be directory.")
         self._path = path
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+        self._stream = stream
+
         super().__init__(subset=subset, ctx=ctx)
-        self._items = self._load_items()
+        self._ann_files = glob(osp.join(self._path, "*.json"))
+
+        if stream:
+            # The actual task type is known only after the iteration
+            self._length = None
+            self._task_type = TaskType.segmentation_instance
+        else:
+            self._items = list(self._load_items())
+            self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
+
+    def __len__(self) -> int:
+        if self._stream:
+            # The number of the annotation files is an estimate until the first
+            # iteration, because the broken items can be skipped
+            return self._length if self._length is not None else len(self._ann_files)
+        return super().__len__()
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        if not self._stream:
+            yield from super().__iter__()
+            return
+
+        self._ann_types = set()
+        length = 0
+        for item in self._load_items():
+            length += 1
+            yield item
+
+        self._length = length
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
-    def _load_items(self):
-        pbar = self._ctx.progress_reporter
-        items = []
-        for annotation_file in pbar.iter(
-            glob(osp.join(self._path, "*.json")),
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
+
+    def _load_items(self) -> Iterator[DatasetItem]:
+        for annotation_file, future in read_item_files(
+            parse_json_file,
+            self._ann_files,
+            ctx=self._ctx,
             desc=f"Parsing data in {osp.basename(self._path)}",
+            num_workers=self._num_workers,
         ):
             image_id = None
             annotations = []
@@ -76,7 +126,7 @@ class SegmentAnythingBase(SubsetBase):
             }
 
             try:
-                contents = parse_json_file(annotation_file)
+                contents = future.result()
                 image_info = contents["image"]
                 annotations = contents["annotations"]
 
@@ -140,7 +190,7 @@ class SegmentAnythingBase(SubsetBase):
 
                     bbox = parse_field(annotation, "bbox", list, None)
                     if bbox is None:
-                        bbox = item_kwargs["annotations"][-1].get_bbox().tolist()
+                        bbox = list(item_kwargs["annotations"][-1].get_bbox())
 
                     if len(bbox) > 0:
                         if len(bbox) != 4:
@@ -164,10 +214,11 @@ class SegmentAnythingBase(SubsetBase):
                 self._ctx.error_policy.report_annotation_error(e, item_id=(image_id, self._subset))
 
             try:
-                items.append(DatasetItem(**item_kwargs))
+                item = DatasetItem(**item_kwargs)
                 for ann in item_kwargs["annotations"]:
                     self._ann_types.add(ann.type)
             except Exception as e:
                 self._ctx.error_policy.report_item_error(e, item_id=(image_id, self._subset))
+                continue
 
-        return items
+            yield item
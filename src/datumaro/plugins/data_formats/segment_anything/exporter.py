@@ -11,7 +11,7 @@ from typing import List, Union
 
 from pycocotools import mask as mask_utils
 
-from datumaro.components.annotation import AnnotationType, Ellipse, Polygon
+from datumaro.components.annotation import AnnotationType, Ellipse, Polygon, RleMask
 from datumaro.components.errors import MediaTypeError
 from datumaro.components.exporter import Exporter
 from datumaro.components.media import Image
@@ -61,26 +61,41 @@ class SegmentAnythingExporter(Exporter):
             bbox = anno_tools.max_bbox(anns)
         polygons = [p.as_polygon() for p in polygons]
 
-        mask = None
-        if polygons:
-            mask = mask_tools.rles_to_mask(polygons, img_width, img_height)
-        if masks:
-            masks = (m.image for m in masks)
-            if mask is not None:
-                masks = chain(masks, [mask])
-            mask = mask_tools.merge_masks(masks)
-        if mask is None:
-            return None
-        mask = mask_tools.mask_to_rle(mask)
-
-        segmentation = {
-            "counts": list(int(c) for c in mask["counts"]),
-            "size": list(int(c) for c in mask["size"]),
-        }
-        rles = mask_utils.frPyObjects(segmentation, img_height, img_width)
-        if isinstance(rles["counts"], bytes):
-            rles["counts"] = rles["counts"].decode()
+        rles = None
+        if not polygons and masks and all(isinstance(m, RleMask) for m in masks):
+            # The RLE masks are exported as is, without decoding
+            mask_rles = [m.rle for m in masks]
+            if all(
+                mask_tools.is_compressed_rle(rle) and list(rle["size"]) == [img_height, img_width]
+                for rle in mask_rles
+            ):
+                rles = mask_tools.merge_rles(mask_rles)
+
+        if rles is None:
+            mask = None
+            if polygons:
+                mask = mask_tools.rles_to_mask(polygons, img_width, img_height)
+            if masks:
+                masks = (m.image for m in masks)
+                if mask is not None:
+                    masks = chain(masks, [mask])
+                mask = mask_tools.merge_masks(masks)
+            if mask is None:
+                return None
+            mask = mask_tools.mask_to_rle(mask)
+
+            segmentation = {
+                "counts": list(int(c) for c in mask["counts"]),
+                "size": list(int(c) for c in mask["size"]),
+            }
+            rles = mask_utils.frPyObjects(segmentation, img_height, img_width)
+
         area = mask_utils.area(rles)
+        counts = rles["counts"]
+        rles = {
+            "size": list(int(c) for c in rles["size"]),
+            "counts": counts.decode() if isinstance(counts, bytes) else counts,
+        }
 
         annotation_data = {
             "id": leader.group,
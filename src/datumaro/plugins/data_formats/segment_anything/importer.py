@@ -17,6 +17,18 @@ class SegmentAnythingImporter(Importer):
     _MAX_ANNOTATION_SECTION_BYTES = 100 * 1024 * 1024  # 100 MiB
     _ANNO_EXT = ".json"
 
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the annotation files. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
+        return parser
+
     @classmethod
     def detect(
         cls,
@@ -69,6 +81,10 @@ class SegmentAnythingImporter(Importer):
             return []
         return [{"url": path, "format": cls.NAME}]
 
+    @property
+    def can_stream(self) -> bool:
+        return True
+
     @classmethod
     def get_file_extensions(cls) -> List[str]:
         return [cls._ANNO_EXT]
@@ -5,7 +5,7 @@
 import errno
 import os
 import os.path as osp
-from typing import Dict, List, Optional, Tuple, Type, Union
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Type, Union
 
 import pandas as pd
 
@@ -15,6 +15,7 @@ from datumaro.components.errors import MediaTypeError
 from datumaro.components.exporter import Exporter
 from datumaro.components.importer import ImportContext, Importer
 from datumaro.components.media import Table, TableDtype, TableRow
+from datumaro.util.csv_util import infer_csv_dtypes, read_csv_chunks, sniff_csv_sep
 from datumaro.util.os_util import find_files
 
 # Only supports '.csv' extention.
@@ -23,6 +24,16 @@ TABULAR_EXTENSIONS = [
 ]
 
 
+class _TabularSource(NamedTuple):
+    path: str
+    subset: str
+    sep: str
+    dtypes: Dict[str, Type[TableDtype]]
+    targets: List[str]
+    targets_ann: List[str]
+    length: int
+
+
 class TabularDataBase(DatasetBase):
     NAME = "tabular"
 
@@ -32,6 +43,8 @@ class TabularDataBase(DatasetBase):
         *,
         target: Optional[Union[str, List[str]]] = None,
         dtype: Optional[Dict[str, Type[TableDtype]]] = None,
+        string_storage: Optional[str] = None,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ) -> None:
         """
@@ -45,6 +58,13 @@ class TabularDataBase(DatasetBase):
                 In case of a dataset with no targets, give an empty list as a parameter.
             dtype (optional, dict(str,str)) : Dictionay of column name -> type str ('str', 'int', or 'float').
                 This can be used when automatic type inferencing is failed.
+            string_storage (optional, str) : If specified, text columns are stored in
+                pandas string arrays with this storage ('python' or 'pyarrow')
+                instead of arrays of Python objects.
+            stream (bool) : If True, the files are read chunk by chunk on each iteration,
+                instead of keeping the tables in memory. Only the target output columns are
+                kept to compute the categories. In this mode, the row index of
+                a table row media is relative to the chunk it was read in.
         """
         paths: List[str] = []
         if osp.isfile(path):
@@ -58,8 +78,71 @@ class TabularDataBase(DatasetBase):
 
         super().__init__(media_type=TableRow, ctx=ctx)
 
+        if target is not None:
+            if "input" not in target or "output" not in target:
+                raise TypeError('Target should have both "input" and "output"')
+
         self._infos = {"path": path}
-        self._items, self._categories = self._parse(paths, target, dtype)
+        self._string_storage = string_storage
+        self._stream = stream
+        if stream:
+            self._sources, self._categories = self._scan(paths, target, dtype)
+        else:
+            self._items, self._categories = self._parse(paths, target, dtype)
+
+    @staticmethod
+    def _get_targets(
+        columns: List[str], target: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[List[str], List[str]]:
+        targets: List[str] = []
+        targets_ann: List[str] = []
+        if target is None:
+            targets.extend(columns)  # add all columns
+        else:
+            # add valid targeted output column name only
+            if isinstance(target.get("input"), str) and target["input"] in columns:
+                targets.append(target["input"])
+            elif isinstance(target.get("input"), list):
+                targets.extend(col for col in target["input"] if col in columns)
+            if isinstance(target.get("output"), str) and target["output"] in columns:
+                targets_ann.append(target["output"])
+            elif isinstance(target.get("output"), list):
+                targets_ann.extend(col for col in target["output"] if col in columns)
+        return targets + targets_ann, targets_ann
+
+    @staticmethod
+    def _update_categories(
+        categories: TabularCategories, table: Table, targets_ann: List[str]
+    ) -> None:
+        for target_ in targets_ann:
+            _, category = categories.find(target_)
+            target_dtype = table.dtype(target_)
+            if target_dtype in [int, float, pd.api.types.CategoricalDtype()]:
+                # 'int' can be categorical, but we don't know this unless user gives information.
+                labels = set(table.features(target_, unique=True))
+                if category is None:
+                    categories.add(target_, target_dtype, labels)
+                else:  # update labels if they are different.
+                    category.labels.union(labels)
+            elif target_dtype is str:
+                if category is None:
+                    categories.add(target_, target_dtype)
+            else:
+                raise TypeError(f"Unsupported type '{target_dtype}' for target column '{target_}'.")
+
+    def _make_items(
+        self, table: Table, subset: str, targets_ann: List[str], start: int = 0
+    ) -> Iterator[DatasetItem]:
+        row: TableRow
+        for row in table:  # type: TableRow
+            id = f"{start + row.index}@{subset}"
+            ann = [Tabular(values=row.data(targets_ann))] if targets_ann else None
+            yield DatasetItem(
+                id=id,
+                subset=subset,
+                media=row,
+                annotations=ann,
+            )
 
     def _parse(
         self,
@@ -86,70 +169,90 @@ class TabularDataBase(DatasetBase):
         items: List[DatasetItem] = []
         categories: TabularCategories = TabularCategories()
 
-        if target is not None:
-            if "input" not in target or "output" not in target:
-                raise TypeError('Target should have both "input" and "output"')
-
         for path in paths:
-            table = Table.from_csv(path, dtype=dtype)
-
-            targets: List[str] = []
-            targets_ann: List[str] = []
-            if target is None:
-                targets.extend(table.columns)  # add all columns
-            else:
-                # add valid targeted output column name only
-                if isinstance(target.get("input"), str) and target["input"] in table.columns:
-                    targets.append(target["input"])
-                elif isinstance(target.get("input"), list):
-                    targets.extend(col for col in target["input"] if col in table.columns)
-                if isinstance(target.get("output"), str) and target["output"] in table.columns:
-                    targets_ann.append(target["output"])
-                elif isinstance(target.get("output"), list):
-                    targets_ann.extend(col for col in target["output"] if col in table.columns)
-            targets = targets + targets_ann
+            table = Table.from_csv(path, dtype=dtype, string_storage=self._string_storage)
+            targets, targets_ann = self._get_targets(table.columns, target)
 
             # set categories
-            for target_ in targets_ann:
-                _, category = categories.find(target_)
-                target_dtype = table.dtype(target_)
-                if target_dtype in [int, float, pd.api.types.CategoricalDtype()]:
-                    # 'int' can be categorical, but we don't know this unless user gives information.
-                    labels = set(table.features(target_, unique=True))
-                    if category is None:
-                        categories.add(target_, target_dtype, labels)
-                    else:  # update labels if they are different.
-                        category.labels.union(labels)
-                elif target_dtype is str:
-                    if category is None:
-                        categories.add(target_, target_dtype)
-                else:
-                    raise TypeError(
-                        f"Unsupported type '{target_dtype}' for target column '{target_}'."
-                    )
+            self._update_categories(categories, table, targets_ann)
 
             # load annotations
             subset = osp.splitext(osp.basename(path))[0]
-            row: TableRow
             table.select(targets)
-            for row in table:  # type: TableRow
-                id = f"{row.index}@{subset}"
-                ann = [Tabular(values=row.data(targets_ann))] if targets_ann else None
-                item = DatasetItem(
-                    id=id,
-                    subset=subset,
-                    media=row,
-                    annotations=ann,
-                )
-                items.append(item)
+            items.extend(self._make_items(table, subset, targets_ann))
 
         return items, {AnnotationType.tabular: categories}
 
+    def _scan(
+        self,
+        paths: List[str],
+        target: Optional[Dict[str, List[str]]] = None,
+        dtype: Optional[Dict[str, Type[TableDtype]]] = None,
+    ) -> Tuple[List[_TabularSource], Dict[AnnotationType, Categories]]:
+        """
+        Infer the column types and compute the categories of tabular files,
+        which are read on each iteration in the stream mode.
+        """
+        sources: List[_TabularSource] = []
+        categories: TabularCategories = TabularCategories()
+
+        for path in paths:
+            sep = sniff_csv_sep(path)
+
+            # The types are inferred on the whole file to be the same in all the chunks
+            dtypes = infer_csv_dtypes(
+                path,
+                dtype=dtype,
+                sample_size=None,
+                string_storage=self._string_storage,
+                sep=sep,
+                index_col=False,
+            )
+            targets, targets_ann = self._get_targets(list(dtypes), target)
+
+            length = 0
+            if targets_ann:
+                table = Table.from_csv(path, dtype=dtypes, sep=sep, usecols=targets_ann)
+                self._update_categories(categories, table, targets_ann)
+                length = table.shape[0]
+            else:
+                for chunk in read_csv_chunks(path, sep=sep, index_col=False, usecols=[0]):
+                    length += len(chunk)
+
+            subset = osp.splitext(osp.basename(path))[0]
+            sources.append(_TabularSource(path, subset, sep, dtypes, targets, targets_ann, length))
+
+        return sources, {AnnotationType.tabular: categories}
+
     def categories(self):
         return self._categories
 
+    def __len__(self) -> int:
+        if self._stream:
+            return sum(source.length for source in self._sources)
+        return super().__len__()
+
     def __iter__(self):
-        yield from self._items
+        if not self._stream:
+            yield from self._items
+            return
+
+        for source in self._sources:
+            start = 0
+            for chunk in read_csv_chunks(
+                source.path,
+                sep=source.sep,
+                dtype=source.dtypes,
+                index_col=False,
+                usecols=source.targets,
+            ):
+                table = Table.from_dataframe(chunk[source.targets])
+                yield from self._make_items(table, source.subset, source.targets_ann, start)
+                start += len(chunk)
+
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
 
 
 def string_to_dict(input_string):
@@ -200,6 +303,12 @@ class TabularDataImporter(Importer):
             help="Type information for a column. (ex. 'date:str,x:int') (default:None) "
             "This can be used when automatic type inferencing is failed",
         )
+        parser.add_argument(
+            "--string-storage",
+            choices=["python", "pyarrow"],
+            help="Storage of text columns. If not specified, "
+            "text values are kept as Python objects (default: %(default)s)",
+        )
         return parser
 
     @classmethod
@@ -217,6 +326,10 @@ class TabularDataImporter(Importer):
     def get_file_extensions(cls) -> List[str]:
         return list({f".{ext}" for ext in TABULAR_EXTENSIONS})
 
+    @property
+    def can_stream(self) -> bool:
+        return True
+
 
 class TabularDataExporter(Exporter):
     """
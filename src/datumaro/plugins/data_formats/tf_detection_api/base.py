@@ -2,41 +2,82 @@
 #
 # SPDX-License-Identifier: MIT
 
+import functools
 import os
 import os.path as osp
 import re
 from collections import OrderedDict
-from typing import List, Optional
-
-import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple, Type
 
 from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories, Mask
 from datumaro.components.dataset_base import DatasetItem, SubsetBase
-from datumaro.components.importer import ImportContext, Importer
-from datumaro.components.lazy_plugin import extra_deps
+from datumaro.components.importer import ImportContext, Importer, read_item_files
 from datumaro.components.media import Image
+from datumaro.components.merge.extractor_merger import ExtractorMerger
 from datumaro.components.task import TaskAnnotationMapping
 from datumaro.util.image import decode_image, lazy_image
-from datumaro.util.tf_util import has_feature
-from datumaro.util.tf_util import import_tf as _import_tf
+from datumaro.util.tfrecord import TfrecordReader, parse_example, read_file_range
 
 from .format import DetectionApiPath, TfrecordImporterType
 
-tf = _import_tf()
-
 
 def clamp(value, _min, _max):
     return max(min(_max, value), _min)
 
 
-@extra_deps("tensorflow")
+def find_shards(path: str) -> List[str]:
+    """
+    Returns the paths to all the shards of the file, if the file is a shard,
+    or the file path otherwise.
+    """
+
+    dirname, filename = osp.split(path)
+    stem, ext = osp.splitext(filename)
+    match = DetectionApiPath.SHARD_NAME_PATTERN.fullmatch(stem)
+    if not match:
+        return [path]
+
+    name, shard_count = match.group("name"), match.group("count")
+    return [
+        osp.join(dirname, DetectionApiPath.SHARD_NAME_FORMAT % (name, idx, int(shard_count)) + ext)
+        for idx in range(int(shard_count))
+    ]
+
+
+def get_subset_name(path: str) -> str:
+    """Returns the subset name of the file, or of the shard"""
+
+    stem = osp.splitext(osp.basename(path))[0]
+    match = DetectionApiPath.SHARD_NAME_PATTERN.fullmatch(stem)
+    return match.group("name") if match else stem
+
+
+def read_first_example(path: str) -> Optional[Dict[str, list]]:
+    """Returns the features of the first record in the file, or None, if the file is empty"""
+
+    for data in TfrecordReader(path):
+        return parse_example(data, lazy_keys={"image/encoded"})
+    return None
+
+
 class TfDetectionApiBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the shards of the subset.
+            If num_workers = 0, the shards are read sequentially.
+        stream: If True, the records are read on each iteration, instead of
+            keeping the items in memory. The labels are collected by
+            a preliminary pass over the records.
+    """
+
     def __init__(
         self,
         path: str,
         *,
         tfrecord_importer_type: TfrecordImporterType = TfrecordImporterType.default,
         subset: Optional[str] = None,
+        num_workers: int = 0,
+        stream: bool = False,
         ctx: Optional[ImportContext] = None,
     ):
         assert osp.isfile(path), path
@@ -47,35 +88,31 @@ class TfDetectionApiBase(SubsetBase):
             images_dir = osp.join(root_dir, DetectionApiPath.IMAGES_DIR)
             if not osp.isdir(images_dir):
                 images_dir = ""
+        self._images_dir = images_dir
 
         if not subset:
-            subset = osp.splitext(osp.basename(path))[0]
+            subset = get_subset_name(path)
         super().__init__(subset=subset, ctx=ctx)
 
-        self._features = {
-            "image/filename": tf.io.FixedLenFeature([], tf.string),
-            "image/source_id": tf.io.FixedLenFeature([], tf.string),
-            "image/height": tf.io.FixedLenFeature([], tf.int64),
-            "image/width": tf.io.FixedLenFeature([], tf.int64),
-            "image/encoded": tf.io.FixedLenFeature([], tf.string),
-            "image/format": tf.io.FixedLenFeature([], tf.string),
-            # use varlen to avoid errors when this field is missing
-            "image/key/sha256": tf.io.VarLenFeature(tf.string),
-            # Object boxes and classes.
-            "image/object/bbox/xmin": tf.io.VarLenFeature(tf.float32),
-            "image/object/bbox/xmax": tf.io.VarLenFeature(tf.float32),
-            "image/object/bbox/ymin": tf.io.VarLenFeature(tf.float32),
-            "image/object/bbox/ymax": tf.io.VarLenFeature(tf.float32),
-            "image/object/class/label": tf.io.VarLenFeature(tf.int64),
-            "image/object/class/text": tf.io.VarLenFeature(tf.string),
-            "image/object/mask": tf.io.VarLenFeature(tf.string),
-        }
-        if tfrecord_importer_type == TfrecordImporterType.roboflow:
-            del self._features["image/source_id"]
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+        self._stream = stream
 
-        items, labels = self._parse_tfrecord_file(path, self._subset, images_dir)
+        # The source id is not written in some datasets
+        self._has_source_id = tfrecord_importer_type != TfrecordImporterType.roboflow
+
+        self._shards = find_shards(path)
+        labels = self._load_labelmap(path)
+
+        if stream:
+            self._length = self._scan_records(labels)
+        else:
+            self._items = self._load_items(labels)
+        self._labels = labels
         self._categories = self._load_categories(labels)
-        self._items = items
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
     @staticmethod
@@ -104,109 +141,181 @@ class TfDetectionApiBase(SubsetBase):
 
         return labelmap
 
-    def _parse_tfrecord_file(self, filepath, subset, images_dir):
-        dataset = tf.data.TFRecordDataset(filepath)
-
-        files = os.listdir(osp.dirname(filepath))
-        for filename in files:
+    def _load_labelmap(self, path):
+        labelmap_path = None
+        for filename in os.listdir(osp.dirname(path)):
             if DetectionApiPath.LABELMAP_FILE in filename:
-                labelmap_path = osp.join(osp.dirname(filepath), filename)
+                labelmap_path = osp.join(osp.dirname(path), filename)
                 break
 
         dataset_labels = OrderedDict()
-        if osp.exists(labelmap_path):
+        if labelmap_path and osp.exists(labelmap_path):
             with open(labelmap_path, "r", encoding="utf-8") as f:
                 labelmap_text = f.read()
             dataset_labels.update(
                 {label: id - 1 for label, id in self._parse_labelmap(labelmap_text).items()}
             )
+        return dataset_labels
+
+    @staticmethod
+    def _read_shard(path: str) -> List[Tuple[int, Dict[str, list]]]:
+        return list(TfDetectionApiBase._iter_shard(path))
 
-        dataset_items = []
-
-        for record in dataset:
-            parsed_record = tf.io.parse_single_example(record, self._features)
-            frame_id = parsed_record.get("image/source_id", None)
-            frame_id = frame_id.numpy().decode("utf-8") if frame_id else frame_id
-            frame_filename = parsed_record.get("image/filename", None).numpy().decode("utf-8")
-            frame_height = tf.cast(parsed_record.get("image/height", 0), tf.int64).numpy().item()
-            frame_width = tf.cast(parsed_record.get("image/width", 0), tf.int64).numpy().item()
-            frame_image = parsed_record["image/encoded"].numpy()
-            xmins = tf.sparse.to_dense(parsed_record["image/object/bbox/xmin"]).numpy()
-            ymins = tf.sparse.to_dense(parsed_record["image/object/bbox/ymin"]).numpy()
-            xmaxs = tf.sparse.to_dense(parsed_record["image/object/bbox/xmax"]).numpy()
-            ymaxs = tf.sparse.to_dense(parsed_record["image/object/bbox/ymax"]).numpy()
-            label_ids = tf.sparse.to_dense(parsed_record["image/object/class/label"]).numpy()
-            labels = tf.sparse.to_dense(
-                parsed_record["image/object/class/text"], default_value=b""
-            ).numpy()
-            masks = tf.sparse.to_dense(
-                parsed_record["image/object/mask"], default_value=b""
-            ).numpy()
-
-            for label, label_id in zip(labels, label_ids):
-                label = label.decode("utf-8")
-                if not label:
-                    continue
-                if label_id <= 0:
-                    continue
-                if label in dataset_labels:
-                    continue
-                dataset_labels[label] = label_id - 1
-
-            item_id = osp.splitext(frame_filename)[0]
-
-            annotations = []
-            for shape_id, shape in enumerate(np.dstack((labels, xmins, ymins, xmaxs, ymaxs))[0]):
-                label = shape[0].decode("utf-8")
-
-                mask = None
-                if len(masks) != 0:
-                    mask = masks[shape_id]
-
-                if mask is not None:
-                    if isinstance(mask, bytes):
-                        mask = lazy_image(mask, decode_image)
-                    annotations.append(Mask(image=mask, label=dataset_labels.get(label)))
-                else:
-                    x = clamp(shape[1] * frame_width, 0, frame_width)
-                    y = clamp(shape[2] * frame_height, 0, frame_height)
-                    w = clamp(shape[3] * frame_width, 0, frame_width) - x
-                    h = clamp(shape[4] * frame_height, 0, frame_height) - y
-                    annotations.append(Bbox(x, y, w, h, label=dataset_labels.get(label)))
-
-            image_size = None
-            if frame_height and frame_width:
-                image_size = (frame_height, frame_width)
-
-            image = None
-            if frame_image:
-                if isinstance(frame_image, np.ndarray):
-                    image = Image.from_numpy(data=frame_image, size=image_size)
-                else:
-                    image = Image.from_bytes(data=frame_image, size=image_size)
-            elif frame_filename:
-                image = Image.from_file(path=osp.join(images_dir, frame_filename), size=image_size)
-
-            for ann in annotations:
-                self._ann_types.add(ann.type)
-
-            dataset_items.append(
-                DatasetItem(
-                    id=item_id,
-                    subset=subset,
-                    media=image,
-                    annotations=annotations,
-                    attributes={"source_id": frame_id},
-                )
+    @staticmethod
+    def _iter_shard(path: str) -> Iterator[Tuple[int, Dict[str, list]]]:
+        # The encoded images are not copied, they are read from the file
+        # only when they are needed
+        for offset, data in TfrecordReader(path).iter_with_offsets():
+            yield offset, parse_example(data, lazy_keys={"image/encoded"})
+
+    @staticmethod
+    def _update_labels(dataset_labels, record):
+        labels = record.get("image/object/class/text", [])
+        label_ids = record.get("image/object/class/label", [])
+        for label, label_id in zip(labels, label_ids):
+            label = label.decode("utf-8")
+            if not label:
+                continue
+            if label_id <= 0:
+                continue
+            if label in dataset_labels:
+                continue
+            dataset_labels[label] = label_id - 1
+
+    def _scan_records(self, dataset_labels) -> int:
+        length = 0
+        for shard in self._shards:
+            for _, record in self._iter_shard(shard):
+                self._update_labels(dataset_labels, record)
+
+                if record.get("image/object/class/text"):
+                    self._ann_types.add(
+                        AnnotationType.mask
+                        if record.get("image/object/mask")
+                        else AnnotationType.bbox
+                    )
+                length += 1
+        return length
+
+    def _load_items(self, dataset_labels) -> List[DatasetItem]:
+        items = []
+        for shard, future in read_item_files(
+            self._read_shard,
+            self._shards,
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset}'",
+            num_workers=self._num_workers,
+        ):
+            for offset, record in future.result():
+                self._update_labels(dataset_labels, record)
+                items.append(self._make_item(shard, offset, record, dataset_labels))
+        return items
+
+    def _make_item(self, shard, offset, record, dataset_labels) -> DatasetItem:
+        def _get_value(key, default=None):
+            values = record.get(key)
+            return values[0] if values else default
+
+        frame_id = None
+        if self._has_source_id:
+            frame_id = _get_value("image/source_id", b"").decode("utf-8")
+        frame_filename = _get_value("image/filename", b"").decode("utf-8")
+        frame_height = _get_value("image/height", 0)
+        frame_width = _get_value("image/width", 0)
+        frame_image = _get_value("image/encoded")
+        xmins = record.get("image/object/bbox/xmin", [])
+        ymins = record.get("image/object/bbox/ymin", [])
+        xmaxs = record.get("image/object/bbox/xmax", [])
+        ymaxs = record.get("image/object/bbox/ymax", [])
+        labels = record.get("image/object/class/text", [])
+        masks = record.get("image/object/mask", [])
+
+        item_id = osp.splitext(frame_filename)[0]
+
+        annotations = []
+        for shape_id, (label, xmin, ymin, xmax, ymax) in enumerate(
+            zip(labels, xmins, ymins, xmaxs, ymaxs)
+        ):
+            label = label.decode("utf-8")
+
+            mask = None
+            if len(masks) != 0:
+                mask = masks[shape_id]
+
+            if mask is not None:
+                mask = lazy_image(mask, decode_image)
+                annotations.append(Mask(image=mask, label=dataset_labels.get(label)))
+            else:
+                x = clamp(xmin * frame_width, 0, frame_width)
+                y = clamp(ymin * frame_height, 0, frame_height)
+                w = clamp(xmax * frame_width, 0, frame_width) - x
+                h = clamp(ymax * frame_height, 0, frame_height) - y
+                annotations.append(Bbox(x, y, w, h, label=dataset_labels.get(label)))
+
+        image_size = None
+        if frame_height and frame_width:
+            image_size = (frame_height, frame_width)
+
+        image = None
+        if frame_image and frame_image[0] < frame_image[1]:
+            start, end = frame_image
+            image = Image.from_bytes(
+                data=functools.partial(read_file_range, shard, offset + start, end - start),
+                size=image_size,
+                ext=DetectionApiPath.FORMAT_IMAGE_EXT.get(
+                    _get_value("image/format", b"").decode("utf-8")
+                ),
             )
+        elif frame_filename:
+            image = Image.from_file(
+                path=osp.join(self._images_dir, frame_filename), size=image_size
+            )
+
+        for ann in annotations:
+            self._ann_types.add(ann.type)
+
+        return DatasetItem(
+            id=item_id,
+            subset=self._subset,
+            media=image,
+            annotations=annotations,
+            attributes={"source_id": frame_id},
+        )
+
+    def __len__(self) -> int:
+        if self._stream:
+            return self._length
+        return super().__len__()
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        if not self._stream:
+            yield from self._items
+            return
+
+        for shard in self._shards:
+            for offset, record in self._iter_shard(shard):
+                yield self._make_item(shard, offset, record, self._labels)
 
-        return dataset_items, dataset_labels
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
 
 
-@extra_deps("tensorflow")
 class TfDetectionApiImporter(Importer):
     _FORMAT_EXT = ".tfrecord"
 
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the shards of a subset. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
+        return parser
+
     @classmethod
     def find_sources(cls, path):
         sources = cls._find_sources_recursive(
@@ -217,25 +326,27 @@ class TfDetectionApiImporter(Importer):
         if len(sources) == 0:
             return []
 
-        desired_feature = {
-            "image/source_id": tf.io.FixedLenFeature([], tf.string),
-        }
-
-        subsets = {}
+        subsets = set()
+        subset_sources = []
         for source in sources:
-            if has_feature(path=source["url"], feature=desired_feature):
-                subset_name = osp.basename(source["url"]).split(".")[-2]
-                subsets[subset_name] = source["url"]
-
-        sources = [
-            {
-                "url": url,
-                "format": "tf_detection_api",
-            }
-            for _, url in subsets.items()
-        ]
-
-        return sources
+            # All the shards of a subset are read by a single source
+            subset_key = (osp.dirname(source["url"]), get_subset_name(source["url"]))
+            if subset_key in subsets:
+                continue
+            subsets.add(subset_key)
+
+            first_example = read_first_example(source["url"])
+            if first_example is not None and "image/source_id" in first_example:
+                subset_sources.append(source)
+
+        return subset_sources
+
+    @property
+    def can_stream(self) -> bool:
+        return True
+
+    def get_extractor_merger(self) -> Optional[Type[ExtractorMerger]]:
+        return ExtractorMerger
 
     @classmethod
     def get_file_extensions(cls) -> List[str]:
@@ -13,18 +13,14 @@ from collections import OrderedDict
 from datumaro.components.annotation import AnnotationType, LabelCategories
 from datumaro.components.errors import DatasetExportError
 from datumaro.components.exporter import Exporter
-from datumaro.components.lazy_plugin import extra_deps
 from datumaro.components.media import Image, ImageFromBytes
+from datumaro.util import tfrecord
 from datumaro.util.annotation_util import find_group_leader, find_instances, max_bbox
 from datumaro.util.image import encode_image
 from datumaro.util.mask_tools import merge_masks
-from datumaro.util.tf_util import import_tf as _import_tf
 
 from .format import DetectionApiPath
 
-tf = _import_tf()
-
-
 # filter out non-ASCII characters, otherwise training will crash
 _printable = set(string.printable)
 
@@ -34,26 +30,25 @@ def _make_printable(s):
 
 
 def int64_feature(value):
-    return tf.train.Feature(int64_list=tf.train.Int64List(value=[value]))
+    return tfrecord.int64_list_feature([value])
 
 
 def int64_list_feature(value):
-    return tf.train.Feature(int64_list=tf.train.Int64List(value=value))
+    return tfrecord.int64_list_feature(value)
 
 
 def bytes_feature(value):
-    return tf.train.Feature(bytes_list=tf.train.BytesList(value=[value]))
+    return tfrecord.bytes_list_feature([value])
 
 
 def bytes_list_feature(value):
-    return tf.train.Feature(bytes_list=tf.train.BytesList(value=value))
+    return tfrecord.bytes_list_feature(value)
 
 
 def float_list_feature(value):
-    return tf.train.Feature(float_list=tf.train.FloatList(value=value))
+    return tfrecord.float_list_feature(value)
 
 
-@extra_deps("tensorflow")
 class TfDetectionApiExporter(Exporter):
     DEFAULT_IMAGE_EXT = DetectionApiPath.DEFAULT_IMAGE_EXT
 
@@ -65,12 +60,24 @@ class TfDetectionApiExporter(Exporter):
             action="store_true",
             help="Include instance masks (default: %(default)s)",
         )
+        parser.add_argument(
+            "--num-shards",
+            type=int,
+            default=1,
+            help="The number of files each subset is split into. "
+            "The shards are named as '<subset>-00000-of-00004.tfrecord' "
+            "(default: %(default)s)",
+        )
         return parser
 
-    def __init__(self, extractor, save_dir, save_masks=False, **kwargs):
+    def __init__(self, extractor, save_dir, save_masks=False, num_shards=1, **kwargs):
         super().__init__(extractor, save_dir, **kwargs)
 
+        if num_shards < 1:
+            raise ValueError(f"num_shards should be a positive integer, but it is {num_shards}.")
+
         self._save_masks = save_masks
+        self._num_shards = num_shards
 
     def _apply_impl(self):
         os.makedirs(self._save_dir, exist_ok=True)
@@ -94,11 +101,26 @@ class TfDetectionApiExporter(Exporter):
                         "item {\n" + ("\tid: %s\n" % (idx)) + ("\tname: '%s'\n" % (label)) + "}\n\n"
                     )
 
-            anno_path = osp.join(self._save_dir, "%s.tfrecord" % (subset_name))
-            with tf.io.TFRecordWriter(anno_path) as writer:
-                for item in subset:
+            if self._num_shards == 1:
+                shard_names = [subset_name]
+            else:
+                shard_names = [
+                    DetectionApiPath.SHARD_NAME_FORMAT % (subset_name, idx, self._num_shards)
+                    for idx in range(self._num_shards)
+                ]
+
+            writers = [
+                tfrecord.TfrecordWriter(osp.join(self._save_dir, "%s.tfrecord" % shard_name))
+                for shard_name in shard_names
+            ]
+            try:
+                # The items are distributed over the shards in the round-robin order
+                for idx, item in enumerate(subset):
                     tf_example = self._make_tf_example(item)
-                    writer.write(tf_example.SerializeToString())
+                    writers[idx % len(writers)].write(tf_example)
+            finally:
+                for writer in writers:
+                    writer.close()
 
     @staticmethod
     def _find_instances(annotations):
@@ -209,9 +231,7 @@ class TfDetectionApiExporter(Exporter):
         instances = [self._find_instance_parts(i, width, height) for i in instances]
         features.update(self._export_instances(instances, width, height))
 
-        tf_example = tf.train.Example(features=tf.train.Features(feature=features))
-
-        return tf_example
+        return tfrecord.make_example(features)
 
     def _save_image(self, item, path=None):  # pylint: disable=arguments-differ
         src_ext = item.media.ext.lower() if item.media.ext else item.media.ext
@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+import re
 from enum import Enum, auto
 
 
@@ -11,9 +12,14 @@ class DetectionApiPath:
 
     DEFAULT_IMAGE_EXT = ".jpg"
     IMAGE_EXT_FORMAT = {".jpg": "jpeg", ".jpeg": "jpeg", ".png": "png"}
+    FORMAT_IMAGE_EXT = {"jpeg": ".jpg", "png": ".png"}
 
     LABELMAP_FILE = "label_map.pbtxt"
 
+    # The shards of a subset are named as "<subset>-00000-of-00004.tfrecord"
+    SHARD_NAME_FORMAT = "%s-%05d-of-%05d"
+    SHARD_NAME_PATTERN = re.compile(r"(?P<name>.+)-(?P<index>\d{5})-of-(?P<count>\d{5})")
+
 
 class TfrecordImporterType(Enum):
     default = auto()
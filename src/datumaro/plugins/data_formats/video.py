@@ -53,6 +53,8 @@ class VideoFramesImporter(Importer):
     Reads video frames as a dataset.
     """
 
+    MAX_DETECT_CONFIDENCE = FormatDetectionConfidence.LOW
+
     @classmethod
     def build_cmdline_parser(cls, **kwargs):
         parser = super().build_cmdline_parser(**kwargs)
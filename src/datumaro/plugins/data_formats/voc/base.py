@@ -25,7 +25,7 @@ from datumaro.components.errors import (
     MissingFieldError,
     UndeclaredLabelError,
 )
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, read_item_files
 from datumaro.components.media import Image
 from datumaro.components.task import TaskAnnotationMapping, TaskType
 from datumaro.util.image import find_images
@@ -48,6 +48,12 @@ T = TypeVar("T")
 
 
 class VocBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+    """
+
     def __init__(
         self,
         path: str,
@@ -55,6 +61,7 @@ class VocBase(SubsetBase):
         *,
         subset: Optional[str] = None,
         voc_importer_type: VocImporterType = VocImporterType.default,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
         **kwargs,
     ):
@@ -63,6 +70,12 @@ class VocBase(SubsetBase):
 
         super().__init__(subset=subset, ctx=ctx)
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
         if voc_importer_type == VocImporterType.default:
             dataset_dir = osp.dirname(osp.dirname(osp.dirname(path)))
             self._image_dir = osp.join(dataset_dir, VocPath.IMAGES_DIR)
@@ -164,8 +177,12 @@ class VocBase(SubsetBase):
             self._parse_labels() if self._task in [VocTask.voc, VocTask.voc_classification] else {}
         )
 
-        for item_id in self._ctx.progress_reporter.iter(
-            self._items, desc=f"Importing '{self._subset}'"
+        for item_id, future in read_item_files(
+            self._read_ann_file,
+            list(self._items),
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset}'",
+            num_workers=self._num_workers,
         ):
             log.debug("Reading item '%s'" % item_id)
             size = None
@@ -174,12 +191,8 @@ class VocBase(SubsetBase):
                 anns = annotations.get(item_id, [])
                 image = None
 
-                ann_file = osp.join(self._anno_dir, item_id + ".xml")
-                if osp.isfile(ann_file) and self._task not in [
-                    VocTask.voc_classification,
-                    VocTask.voc_segmentation,
-                ]:
-                    root_elem = ElementTree.parse(ann_file).getroot()
+                root_elem = future.result()
+                if root_elem is not None:
                     if root_elem.tag != "annotation":
                         raise MissingFieldError("annotation")
 
@@ -223,6 +236,16 @@ class VocBase(SubsetBase):
 
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
+    def _read_ann_file(self, item_id: str):
+        # Can be called from the reading threads, so it must not modify the object
+        ann_file = osp.join(self._anno_dir, item_id + ".xml")
+        if osp.isfile(ann_file) and self._task not in [
+            VocTask.voc_classification,
+            VocTask.voc_segmentation,
+        ]:
+            return ElementTree.parse(ann_file).getroot()
+        return None
+
     @staticmethod
     def _parse_field(root, xpath: str, cls: Type[T] = str, required: bool = True) -> Optional[T]:
         elem = root.find(xpath)
@@ -31,7 +31,7 @@ from datumaro.components.media import Image
 from datumaro.util import find, str_to_bool
 from datumaro.util.annotation_util import make_label_id_mapping
 from datumaro.util.image import save_image
-from datumaro.util.mask_tools import paint_mask, remap_mask
+from datumaro.util.mask_tools import make_remap_lut, paint_mask, remap_mask
 from datumaro.util.meta_file_util import has_meta_file
 
 from .format import (
@@ -387,10 +387,13 @@ class VocExporter(Exporter):
                     if len(attrs_elem):
                         obj_elem.append(attrs_elem)
 
-                ann_path = osp.join(self._ann_dir, item.id + ".xml")
+            ann_path = osp.join(self._ann_dir, item.id + ".xml")
+            if main_bboxes:
                 os.makedirs(osp.dirname(ann_path), exist_ok=True)
                 with open(ann_path, "w", encoding="utf-8") as f:
                     f.write(ET.tostring(root_elem, encoding="unicode", pretty_print=True))
+            elif self._patch and osp.isfile(ann_path):
+                os.remove(ann_path)
 
             lists.clsdet_list[item.id] = True
 
@@ -682,6 +685,7 @@ class VocExporter(Exporter):
 
         self._label_map = label_map
         self._label_id_mapping = self._make_label_id_map()
+        self._label_id_lut = None
 
     def _is_label(self, s):
         return self._label_map.get(s) is not None
@@ -733,7 +737,9 @@ class VocExporter(Exporter):
         return map_id
 
     def _remap_mask(self, mask):
-        return remap_mask(mask, self._label_id_mapping)
+        if self._label_id_lut is None:
+            self._label_id_lut = make_remap_lut(self._label_id_mapping)
+        return remap_mask(mask, self._label_id_lut)
 
     @classmethod
     def patch(cls, dataset, patch, save_dir, **kwargs):
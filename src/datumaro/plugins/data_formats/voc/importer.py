@@ -24,6 +24,18 @@ class _VocImporter(Importer):
     }
     ANNO_EXT = ".txt"
 
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads reading the annotation files. "
+            "If num_workers = 0, read them sequentially (default: %(default)s).",
+        )
+        return parser
+
     @classmethod
     def detect(cls, context: FormatDetectionContext) -> None:
         # The `voc` format is inherently ambiguous with `voc_classification`,
@@ -0,0 +1,9 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from .base import WebDatasetBase
+from .exporter import WebDatasetExporter
+from .importer import WebDatasetImporter
+
+__all__ = ["WebDatasetBase", "WebDatasetExporter", "WebDatasetImporter"]
@@ -0,0 +1,253 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import logging as log
+import os.path as osp
+import tarfile
+from functools import partial
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from datumaro.components.dataset_base import DatasetItem, SubsetBase
+from datumaro.components.errors import DatasetImportError
+from datumaro.components.importer import ImportContext
+from datumaro.components.media import Image, MediaElement, MediaType
+from datumaro.components.task import TaskAnnotationMapping, TaskType
+from datumaro.plugins.data_formats.datumaro.base import JsonReader, load_annotations
+from datumaro.util import parse_json, parse_json_file
+from datumaro.util.image import IMAGE_EXTENSIONS
+from datumaro.version import __version__
+
+from .format import WEBDATASET_FORMAT_VERSION, WebDatasetPath
+
+__all__ = ["WebDatasetBase"]
+
+MemberData = Union[bytes, Callable[[], bytes]]
+
+
+def _read_member(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def read_shard_meta(path: str, fileobj: Optional[BinaryIO] = None) -> Dict:
+    """
+    Reads the metadata record, which is the first member of each shard.
+    If `fileobj` is given, the shard is read from it instead of `path`.
+    """
+
+    with tarfile.open(path, "r|", fileobj=fileobj) as tar:
+        member = tar.next()
+        if member is None or member.name != WebDatasetPath.META_KEY + WebDatasetPath.ANNOTATION_EXT:
+            raise DatasetImportError(f"'{path}' is not a WebDataset shard of Datumaro format.")
+        return parse_json(tar.extractfile(member).read())
+
+
+class _SampleReader:
+    """Decodes the samples of a shard with the Datumaro item description encoding"""
+
+    def __init__(self, subset: str, ctx: ImportContext) -> None:
+        self._subset = subset
+        self._ctx = ctx
+
+    def parse_sample(self, key: str, members: Dict[str, MemberData]) -> Optional[DatasetItem]:
+        try:
+            data = members[WebDatasetPath.ANNOTATION_EXT]
+            item_desc = parse_json(data() if callable(data) else data)
+            item_id = item_desc["id"]
+
+            media = None
+            image_info = item_desc.get("image") or {}
+            image_ext = next((ext for ext in members if ext.lower() in IMAGE_EXTENSIONS), None)
+            if image_ext:
+                media = Image.from_bytes(
+                    data=members[image_ext], ext=image_ext, size=image_info.get("size")
+                )
+            elif image_info.get("path"):
+                media = Image.from_file(path=image_info["path"], size=image_info.get("size"))
+
+            media_desc = item_desc.get("media")
+            if not media and media_desc and media_desc.get("path"):
+                media = MediaElement(path=media_desc.get("path"))
+        except Exception as e:
+            self._ctx.error_policy.report_item_error(e, item_id=(key, self._subset))
+            return None
+
+        return DatasetItem(
+            id=item_id,
+            subset=self._subset,
+            annotations=load_annotations(
+                item_desc.get("annotations", []), subset=self._subset, ctx=self._ctx
+            ),
+            media=media,
+            attributes=item_desc.get("attr"),
+        )
+
+
+class WebDatasetBase(SubsetBase):
+    """
+    Reads a single tar shard.
+
+    In the stream mode, the shard is read sequentially, one sample at a time.
+    Otherwise, the annotations are loaded at once and the media are read lazily
+    from the member offsets, which are taken from the index file, if available,
+    or from the shard headers.
+    """
+
+    NAME = "webdataset"
+    ALLOWED_VERSIONS = {WEBDATASET_FORMAT_VERSION}
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        subset: Optional[str] = None,
+        stream: bool = False,
+        ctx: Optional[ImportContext] = None,
+    ):
+        assert osp.isfile(path), path
+
+        meta = read_shard_meta(path)
+        dm_version = meta.get("dm_format_version")
+        if dm_version not in self.ALLOWED_VERSIONS:
+            raise DatasetImportError(
+                f"WebDataset format version of the given dataset is {dm_version}, "
+                f"but not supported by this Datumaro version: {__version__}. "
+                f"The allowed WebDataset format versions are {self.ALLOWED_VERSIONS}. "
+                "Please install the latest Datumaro."
+            )
+
+        super().__init__(
+            subset=subset or meta.get("subset"),
+            media_type=MediaType(meta.get("media_type", MediaType.IMAGE)).media,
+            ctx=ctx,
+        )
+
+        self._path = path
+        self._stream = stream
+        self._length = None
+        self._infos = meta.get("infos", {})
+        self._categories = JsonReader._load_categories(meta)
+        self._reader = _SampleReader(self._subset, self._ctx)
+
+        if stream:
+            self._task_type = TaskType.mixed
+        else:
+            self._items = self._load_items()
+
+    @property
+    def is_stream(self) -> bool:
+        return self._stream
+
+    def _load_index(self) -> Optional[List[Dict]]:
+        index_path = osp.splitext(self._path)[0] + WebDatasetPath.INDEX_EXT
+        if not osp.isfile(index_path):
+            return None
+
+        index = parse_json_file(index_path)
+        if index.get("shard_size") != osp.getsize(self._path):
+            log.warning("Index file '%s' is outdated, it is ignored.", index_path)
+            return None
+
+        return index["samples"]
+
+    def _scan_members(self) -> Iterator[Tuple[str, Dict[str, Tuple[int, int]]]]:
+        samples: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        with tarfile.open(self._path, "r:") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                key, ext = WebDatasetPath.split_member_name(member.name)
+                if key == WebDatasetPath.META_KEY:
+                    continue
+                samples.setdefault(key, {})[ext] = (member.offset_data, member.size)
+
+        yield from samples.items()
+
+    def _iter_members(self) -> Iterator[Tuple[str, Dict[str, Tuple[int, int]]]]:
+        index = self._load_index()
+        if index is None:
+            yield from self._scan_members()
+        else:
+            for sample in index:
+                yield sample["key"], sample["members"]
+
+    def _iter_samples(self) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+        with tarfile.open(self._path, "r|") as tar:
+            key, members = None, {}
+            for member in tar:
+                if not member.isfile():
+                    continue
+
+                sample_key, ext = WebDatasetPath.split_member_name(member.name)
+                if sample_key == WebDatasetPath.META_KEY:
+                    continue
+
+                if key is not None and sample_key != key:
+                    yield key, members
+                    members = {}
+                key = sample_key
+                members[ext] = tar.extractfile(member).read()
+
+            if key is not None:
+                yield key, members
+
+    def _load_items(self) -> List[DatasetItem]:
+        pbar = self._ctx.progress_reporter
+
+        items = []
+        ann_types = set()
+        with open(self._path, "rb") as f:
+            for key, members in pbar.iter(self._iter_members(), desc=f"Importing '{self._subset}'"):
+                if WebDatasetPath.ANNOTATION_EXT not in members:
+                    continue
+
+                offset, size = members[WebDatasetPath.ANNOTATION_EXT]
+                f.seek(offset)
+                sample = {
+                    ext: partial(_read_member, self._path, *member)
+                    for ext, member in members.items()
+                }
+                sample[WebDatasetPath.ANNOTATION_EXT] = f.read(size)
+
+                item = self._reader.parse_sample(key, sample)
+                if item is not None:
+                    items.append(item)
+                    for ann in item.annotations:
+                        ann_types.add(ann.type)
+
+        self._task_type = TaskAnnotationMapping().get_task(ann_types)
+
+        return items
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        if not self._stream:
+            yield from self._items
+            return
+
+        pbar = self._ctx.progress_reporter
+        ann_types = set()
+        for key, members in pbar.iter(
+            self._iter_samples(), desc=f"Importing '{self._subset}'", total=len(self)
+        ):
+            if WebDatasetPath.ANNOTATION_EXT not in members:
+                continue
+
+            item = self._reader.parse_sample(key, members)
+            if item is not None:
+                yield item
+                for ann in item.annotations:
+                    ann_types.add(ann.type)
+
+        self._task_type = TaskAnnotationMapping().get_task(ann_types)
+
+    def __len__(self) -> int:
+        if not self._stream:
+            return len(self._items)
+
+        if self._length is None:
+            self._length = sum(
+                WebDatasetPath.ANNOTATION_EXT in members for _, members in self._iter_members()
+            )
+        return self._length
@@ -0,0 +1,259 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import os.path as osp
+import tarfile
+from typing import Dict, List, Optional, Tuple
+
+from datumaro.components.crypter import NULL_CRYPTER
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.errors import MediaTypeError
+from datumaro.components.exporter import ExportContextComponent, Exporter
+from datumaro.components.media import Image
+from datumaro.plugins.data_formats.datumaro.exporter import JsonWriter, _SubsetWriter
+from datumaro.util import dump_json, dump_json_file
+from datumaro.util.image import encode_image
+
+from .format import WEBDATASET_FORMAT_VERSION, WebDatasetPath
+
+__all__ = ["WebDatasetExporter"]
+
+
+def _padded_size(size: int) -> int:
+    blocks, remainder = divmod(size, tarfile.BLOCKSIZE)
+    return (blocks + bool(remainder)) * tarfile.BLOCKSIZE
+
+
+class _ShardWriter:
+    """Writes the samples of a subset into a sequence of size-bounded tar shards"""
+
+    def __init__(
+        self,
+        save_dir: str,
+        subset: str,
+        meta: bytes,
+        max_shard_size: int,
+        max_shard_count: int,
+        save_index: bool,
+    ):
+        self._save_dir = save_dir
+        self._subset = subset
+        self._meta = meta
+        self._max_shard_size = max_shard_size
+        self._max_shard_count = max_shard_count
+        self._save_index = save_index
+
+        self._tar: Optional[tarfile.TarFile] = None
+        self._shard_path: Optional[str] = None
+        self._index: List[Dict] = []
+        self._num_shards = 0
+        self._num_samples = 0
+
+    @staticmethod
+    def _sample_size(members: List[Tuple[str, bytes]]) -> int:
+        return sum(tarfile.BLOCKSIZE + _padded_size(len(data)) for _, data in members)
+
+    def _add_member(self, name: str, data: bytes) -> Tuple[int, int]:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._tar.addfile(info, io.BytesIO(data))
+
+        # Data is the last record written, it is padded to the tar block size
+        return self._tar.offset - _padded_size(info.size), info.size
+
+    def _open_shard(self) -> None:
+        self._close_shard()
+
+        shard_name = WebDatasetPath.SHARD_NAME_FORMAT.format(
+            subset=self._subset, shard=self._num_shards
+        )
+        self._shard_path = osp.join(self._save_dir, shard_name + WebDatasetPath.SHARD_EXT)
+        self._tar = tarfile.open(self._shard_path, "w", format=tarfile.USTAR_FORMAT)
+        self._num_shards += 1
+        self._num_samples = 0
+
+        self._add_member(WebDatasetPath.META_KEY + WebDatasetPath.ANNOTATION_EXT, self._meta)
+
+    def _close_shard(self) -> None:
+        if self._tar is None:
+            return
+
+        self._tar.close()
+        self._tar = None
+
+        if self._save_index:
+            index_path = osp.splitext(self._shard_path)[0] + WebDatasetPath.INDEX_EXT
+            dump_json_file(
+                index_path,
+                {
+                    "dm_format_version": WEBDATASET_FORMAT_VERSION,
+                    "shard_size": osp.getsize(self._shard_path),
+                    "samples": self._index,
+                },
+            )
+        self._index = []
+
+    def add_sample(self, key: str, members: List[Tuple[str, bytes]]) -> None:
+        if (
+            self._tar is None
+            or self._max_shard_count <= self._num_samples
+            or self._max_shard_size < self._tar.offset + self._sample_size(members)
+        ):
+            self._open_shard()
+
+        sample = {"key": key, "members": {}}
+        for ext, data in members:
+            sample["members"][ext] = self._add_member(key + ext, data)
+        self._num_samples += 1
+
+        if self._save_index:
+            self._index.append(sample)
+
+    def close(self) -> None:
+        self._close_shard()
+
+
+class WebDatasetExporter(Exporter):
+    NAME = "webdataset"
+    DEFAULT_IMAGE_EXT = WebDatasetPath.IMAGE_EXT
+
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+
+        parser.add_argument(
+            "--max-shard-size",
+            type=int,
+            default=WebDatasetPath.DEFAULT_MAX_SHARD_SIZE,
+            help="The maximum size of a shard file in bytes. "
+            "A shard is always given at least one sample (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--max-shard-count",
+            type=int,
+            default=WebDatasetPath.DEFAULT_MAX_SHARD_COUNT,
+            help="The maximum number of samples in a shard file (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--no-index",
+            dest="save_index",
+            action="store_false",
+            help="Don't write the member offset index next to each shard. "
+            "Without it, random access requires scanning the shard headers",
+        )
+
+        return parser
+
+    def __init__(
+        self,
+        extractor,
+        save_dir,
+        *,
+        max_shard_size: int = WebDatasetPath.DEFAULT_MAX_SHARD_SIZE,
+        max_shard_count: int = WebDatasetPath.DEFAULT_MAX_SHARD_COUNT,
+        save_index: bool = True,
+        **kwargs,
+    ):
+        super().__init__(extractor, save_dir, **kwargs)
+
+        if max_shard_size <= 0:
+            raise ValueError("max_shard_size should be a positive integer")
+        if max_shard_count <= 0:
+            raise ValueError("max_shard_count should be a positive integer")
+
+        self._max_shard_size = max_shard_size
+        self._max_shard_count = max_shard_count
+        self._save_index = save_index
+
+    def _apply_impl(self):
+        media_type = self._extractor.media_type()
+        if media_type and not issubclass(media_type, Image):
+            raise MediaTypeError("Media type is not an image")
+
+        # The datasets without media are saved as image datasets
+        media_type = media_type or Image
+
+        os.makedirs(self._save_dir, exist_ok=True)
+
+        export_context = ExportContextComponent(
+            save_dir=self._save_dir,
+            save_media=False,
+            images_dir="",
+            pcd_dir="",
+            video_dir="",
+            crypter=NULL_CRYPTER,
+            image_ext=self._image_ext,
+            default_image_ext=self._default_image_ext,
+        )
+
+        pbar = self._ctx.progress_reporter
+        for subset_name, subset in self._extractor.subsets().items():
+            item_writer = _SubsetWriter(
+                context=self, subset=subset_name, ann_file="", export_context=export_context
+            )
+            meta = dump_json(
+                {
+                    "dm_format_version": WEBDATASET_FORMAT_VERSION,
+                    "media_type": media_type._type,
+                    "subset": subset_name,
+                    "infos": self._extractor.infos(),
+                    "categories": JsonWriter.write_categories(self._extractor.categories()),
+                }
+            )
+            shard_writer = _ShardWriter(
+                self._save_dir,
+                subset_name,
+                meta=meta,
+                max_shard_size=self._max_shard_size,
+                max_shard_count=self._max_shard_count,
+                save_index=self._save_index,
+            )
+
+            try:
+                for idx, item in enumerate(pbar.iter(subset, desc=f"Exporting '{subset_name}'")):
+                    try:
+                        members = self._make_sample(item_writer, item)
+                    except Exception as e:
+                        self._ctx.error_policy.report_item_error(e, item_id=(item.id, item.subset))
+                        continue
+
+                    shard_writer.add_sample(WebDatasetPath.KEY_FORMAT.format(idx), members)
+            finally:
+                shard_writer.close()
+
+        if self._save_dataset_meta:
+            self._save_meta_file(self._save_dir)
+
+    def _make_sample(
+        self, item_writer: _SubsetWriter, item: DatasetItem
+    ) -> List[Tuple[str, bytes]]:
+        members = []
+        item_desc = item_writer._gen_item_desc(item)
+
+        if self._save_media and isinstance(item.media, Image) and item.media.has_data:
+            image_ext = self._find_image_ext(item)
+            members.append((image_ext, self._encode_image(item.media_as(Image), image_ext)))
+
+            # The image is stored as a member of the same sample
+            item_desc["image"]["path"] = None
+            if item.media.has_size:
+                item_desc["image"]["size"] = item.media.size
+
+        members.append((WebDatasetPath.ANNOTATION_EXT, dump_json(item_desc)))
+        return members
+
+    @staticmethod
+    def _encode_image(image: Image, ext: str) -> bytes:
+        if image.ext == ext:
+            data = image.bytes
+            if data is not None:
+                return data
+
+        return encode_image(image.data, ext)
+
+    @property
+    def can_stream(self) -> bool:
+        return True
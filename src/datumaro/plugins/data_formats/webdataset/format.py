@@ -0,0 +1,34 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import posixpath
+from typing import Tuple
+
+WEBDATASET_FORMAT_VERSION = "1.0"
+
+
+class WebDatasetPath:
+    SHARD_EXT = ".tar"
+    INDEX_EXT = ".index.json"
+    ANNOTATION_EXT = ".json"
+    IMAGE_EXT = ".jpg"
+
+    # The first member of every shard, so that each shard can be read on its own
+    META_KEY = "__meta__"
+
+    SHARD_NAME_FORMAT = "{subset}-{shard:06d}"
+    KEY_FORMAT = "{:09d}"
+
+    DEFAULT_MAX_SHARD_SIZE = 1 << 30  # 1 GiB
+    DEFAULT_MAX_SHARD_COUNT = 10000
+
+    @staticmethod
+    def split_member_name(name: str) -> Tuple[str, str]:
+        """
+        Splits a tar member name into a sample key and a member extension.
+        As in WebDataset, the key ends at the first dot of the base name.
+        """
+        dirname, basename = posixpath.split(name)
+        key, _, ext = basename.partition(".")
+        return posixpath.join(dirname, key), "." + ext
@@ -0,0 +1,57 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from typing import Dict, List, Optional, Type
+
+from datumaro.components.format_detection import FormatDetectionConfidence, FormatDetectionContext
+from datumaro.components.importer import Importer
+from datumaro.components.merge.extractor_merger import ExtractorMerger
+
+from .base import read_shard_meta
+from .format import WebDatasetPath
+
+__all__ = ["WebDatasetImporter"]
+
+
+class WebDatasetImporter(Importer):
+    NAME = "webdataset"
+
+    @classmethod
+    def detect(
+        cls,
+        context: FormatDetectionContext,
+    ) -> Optional[FormatDetectionConfidence]:
+        shard_file = context.require_file("*" + WebDatasetPath.SHARD_EXT)
+
+        with context.probe_text_file(
+            shard_file,
+            f"must be a tar archive starting with a '{WebDatasetPath.META_KEY}' record",
+            is_binary_file=True,
+        ) as f:
+            read_shard_meta(shard_file, fileobj=f)
+
+    @classmethod
+    def find_sources(cls, path: str) -> List[Dict]:
+        def _filter(path: str) -> bool:
+            try:
+                read_shard_meta(path)
+                return True
+            except Exception:
+                return False
+
+        sources = cls._find_sources_recursive(
+            path, WebDatasetPath.SHARD_EXT, cls.NAME, file_filter=_filter
+        )
+        return sorted(sources, key=lambda source: source["url"])
+
+    @classmethod
+    def get_file_extensions(cls) -> List[str]:
+        return [WebDatasetPath.SHARD_EXT]
+
+    @property
+    def can_stream(self) -> bool:
+        return True
+
+    def get_extractor_merger(self) -> Type[ExtractorMerger]:
+        return ExtractorMerger
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import os.path as osp
 from collections import OrderedDict
-from typing import Dict, Iterator, List, Optional, Type, TypeVar, Union
+from typing import Callable, Dict, Iterator, List, Optional, Type, TypeVar, Union
 
 import yaml
 
@@ -17,8 +17,9 @@ from datumaro.components.errors import (
     InvalidAnnotationError,
     UndeclaredLabelError,
 )
-from datumaro.components.importer import ImportContext
+from datumaro.components.importer import ImportContext, read_item_files
 from datumaro.components.media import Image, ImageFromFile
+from datumaro.components.progress_reporting import ProgressReporter
 from datumaro.components.task import TaskAnnotationMapping, TaskType
 from datumaro.util.image import (
     DEFAULT_IMAGE_META_FILE_NAME,
@@ -57,17 +58,30 @@ class _Subset(DatasetBase):
         items: OrderedDict[str, str],
         categories: CategoriesInfo,
         image_info: ImageMeta,
+        num_workers: int = 0,
+        ctx: Optional[ImportContext] = None,
     ):
-        super().__init__()
+        super().__init__(ctx=ctx)
         self._subset_name = subset_name
         self._path = path
         self._items = items
         self._categories = categories
         self._image_info = image_info
+        self._num_workers = num_workers
 
     def __iter__(self) -> Iterator[DatasetItem]:
-        for item_id in self._items:
-            item = self._get(item_id)
+        yield from self.iter_items(self._ctx.progress_reporter)
+
+    def iter_items(self, progress_reporter: ProgressReporter) -> Iterator[DatasetItem]:
+        for item_id, future in read_item_files(
+            self._load_item,
+            list(self._items),
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset_name}'",
+            num_workers=self._num_workers,
+            progress_reporter=progress_reporter,
+        ):
+            item = self._report_errors(item_id, future.result)
             if item is not None:
                 yield item
 
@@ -78,26 +92,13 @@ class _Subset(DatasetBase):
         return self._parent.categories()
 
     def _get(self, item_id: str) -> Optional[DatasetItem]:
-        item = self._items.get(item_id)
-
-        if not isinstance(item, str):
-            return None
+        return self._report_errors(item_id, lambda: self._load_item(item_id))
 
+    def _report_errors(
+        self, item_id: str, load: Callable[[], Optional[DatasetItem]]
+    ) -> Optional[DatasetItem]:
         try:
-            image_size = self._image_info.get(item_id)
-            image = Image.from_file(path=osp.join(self._path, item), size=image_size)
-
-            anno_path = osp.splitext(image.path)[0] + ".txt"
-            annotations = self._parse_annotations(
-                anno_path,
-                image,
-                label_categories=self._categories[AnnotationType.label],
-            )
-
-            item = DatasetItem(
-                id=item_id, subset=self._subset_name, media=image, annotations=annotations
-            )
-            return item
+            return load()
         except (UndeclaredLabelError, InvalidAnnotationError) as e:
             self._ctx.error_policy.report_annotation_error(e, item_id=(item_id, self._subset_name))
         except Exception as e:
@@ -105,6 +106,27 @@ class _Subset(DatasetBase):
 
         return None
 
+    def _load_item(self, item_id: str) -> Optional[DatasetItem]:
+        # Can be called from the reading threads, so it must not modify the object
+        item = self._items.get(item_id)
+
+        if not isinstance(item, str):
+            return None
+
+        image_size = self._image_info.get(item_id)
+        image = Image.from_file(path=osp.join(self._path, item), size=image_size)
+
+        anno_path = osp.splitext(image.path)[0] + ".txt"
+        annotations = self._parse_annotations(
+            anno_path,
+            image,
+            label_categories=self._categories[AnnotationType.label],
+        )
+
+        return DatasetItem(
+            id=item_id, subset=self._subset_name, media=image, annotations=annotations
+        )
+
     @classmethod
     def _parse_annotations(
         cls,
@@ -170,17 +192,29 @@ class _Subset(DatasetBase):
 
 
 class YoloStrictBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+    """
+
     def __init__(
         self,
         config_path: str,
         image_info: Union[None, str, ImageMeta] = None,
         *,
         subset: Optional[str] = None,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
         **kwargs,
     ) -> None:
         super().__init__(subset=subset, ctx=ctx)
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+
         if not osp.isfile(config_path):
             raise DatasetImportError(f"Can't read dataset descriptor file '{config_path}'")
 
@@ -235,6 +269,8 @@ class YoloStrictBase(SubsetBase):
                 items=items,
                 categories=self._categories,
                 image_info=self._image_info,
+                num_workers=num_workers,
+                ctx=self._ctx,
             )
             self._subsets[subset_name] = subset
 
@@ -287,8 +323,8 @@ class YoloStrictBase(SubsetBase):
     def __iter__(self) -> Iterator[DatasetItem]:
         subsets = self._subsets
         pbars = self._ctx.progress_reporter.split(len(subsets))
-        for pbar, (subset_name, subset) in zip(pbars, subsets.items()):
-            for item in pbar.iter(subset, desc=f"Importing '{subset_name}'"):
+        for pbar, subset in zip(pbars, subsets.values()):
+            for item in subset.iter_items(pbar):
                 yield item
 
                 for ann in item.annotations:
@@ -307,6 +343,12 @@ class YoloStrictBase(SubsetBase):
 
 
 class YoloLooseBase(SubsetBase):
+    """
+    Args:
+        num_workers: The number of threads reading the annotation files.
+            If num_workers = 0, the files are read sequentially.
+    """
+
     META_FILE = YoloLoosePath.NAMES_FILE
 
     def __init__(
@@ -316,10 +358,17 @@ class YoloLooseBase(SubsetBase):
         urls: Optional[List[str]] = None,
         *,
         subset: Optional[str] = None,
+        num_workers: int = 0,
         ctx: Optional[ImportContext] = None,
     ) -> None:
         super().__init__(subset=subset, ctx=ctx)
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
         if not osp.isdir(config_path):
             raise DatasetImportError(f"{config_path} should be a directory.")
 
@@ -350,22 +399,33 @@ class YoloLooseBase(SubsetBase):
         if label_categories is None:
             raise DatasetImportError("label_categories should be not None.")
 
-        pbar = self._ctx.progress_reporter
-        for url in pbar.iter(self._urls, desc=f"Importing '{self._subset}'"):
+        def _load_item(url: str) -> DatasetItem:
+            fname = self._get_fname(url)
+            img = Image.from_file(path=self._img_files[fname])
+            anns = self._parse_annotations(
+                url,
+                img,
+                label_categories=label_categories,
+            )
+            return DatasetItem(id=fname, subset=self._subset, media=img, annotations=anns)
+
+        for url, future in read_item_files(
+            _load_item,
+            self._urls,
+            ctx=self._ctx,
+            desc=f"Importing '{self._subset}'",
+            num_workers=self._num_workers,
+        ):
             try:
-                fname = self._get_fname(url)
-                img = Image.from_file(path=self._img_files[fname])
-                anns = self._parse_annotations(
-                    url,
-                    img,
-                    label_categories=label_categories,
-                )
-                yield DatasetItem(id=fname, subset=self._subset, media=img, annotations=anns)
+                item = future.result()
+                yield item
 
-                for ann in anns:
+                for ann in item.annotations:
                     self._ann_types.add(ann.type)
             except Exception as e:
-                self._ctx.error_policy.report_item_error(e, item_id=(fname, self._subset))
+                self._ctx.error_policy.report_item_error(
+                    e, item_id=(self._get_fname(url), self._subset)
+                )
 
         self._task_type = TaskAnnotationMapping().get_task(self._ann_types)
 
@@ -5,6 +5,7 @@ import logging as log
 import os
 import os.path as osp
 from collections import OrderedDict, defaultdict
+from typing import Dict, Set
 
 import yaml
 
@@ -16,6 +17,7 @@ from datumaro.components.exporter import Exporter
 from datumaro.components.media import Image
 from datumaro.util import str_to_bool
 
+from .base import YoloStrictBase
 from .format import YoloPath
 
 
@@ -70,10 +72,12 @@ class YoloExporter(Exporter):
             f.writelines("%s\n" % l[0] for l in sorted(label_ids.items(), key=lambda x: x[1]))
 
         subset_lists = OrderedDict()
+        removed_subsets = set()
 
         subsets = self._extractor.subsets()
         pbars = self._ctx.progress_reporter.split(len(subsets))
         for (subset_name, subset), pbar in zip(subsets.items(), pbars):
+            orig_subset_name = subset_name
             if not subset_name or subset_name == DEFAULT_SUBSET_NAME:
                 subset_name = YoloPath.DEFAULT_SUBSET_NAME
             elif subset_name in YoloPath.RESERVED_CONFIG_KEYS:
@@ -100,27 +104,82 @@ class YoloExporter(Exporter):
 
             subset_list_name = f"{subset_name}.txt"
             subset_list_path = osp.join(save_dir, subset_list_name)
-            if self._patch and subset_name in self._patch.updated_subsets and not image_paths:
+            if self._patch:
+                image_paths = self._merge_subset_list(
+                    subset_list_path, orig_subset_name, image_paths
+                )
+
+            if self._patch and orig_subset_name in self._patch.updated_subsets and not image_paths:
                 if osp.isfile(subset_list_path):
                     os.remove(subset_list_path)
+                removed_subsets.add(subset_name)
                 continue
 
-            subset_lists[subset_name] = subset_list_name
+            subset_lists[subset_name] = osp.join(self._prefix, subset_list_name).replace("\\", "/")
             with open(subset_list_path, "w", encoding="utf-8") as f:
                 f.writelines("%s\n" % s.replace("\\", "/") for s in image_paths.values())
 
-        with open(osp.join(save_dir, "obj.data"), "w", encoding="utf-8") as f:
+        config_path = osp.join(save_dir, "obj.data")
+        if self._patch and osp.isfile(config_path):
+            subset_lists = self._merge_config_subsets(config_path, subset_lists, removed_subsets)
+
+        with open(config_path, "w", encoding="utf-8") as f:
             f.write(f"classes = {len(label_ids)}\n")
 
-            for subset_name, subset_list_name in subset_lists.items():
-                f.write(
-                    "%s = %s\n"
-                    % (subset_name, osp.join(self._prefix, subset_list_name).replace("\\", "/"))
-                )
+            for subset_name, subset_list_path in subset_lists.items():
+                f.write("%s = %s\n" % (subset_name, subset_list_path))
 
             f.write("names = %s\n" % osp.join(self._prefix, "obj.names"))
             f.write("backup = backup/\n")
 
+    def _merge_subset_list(
+        self, subset_list_path: str, subset_name: str, image_paths: Dict[str, str]
+    ) -> Dict[str, str]:
+        """
+        Updates the existing subset list with the patched items.
+        The unchanged entries keep their positions, the removed ones are dropped.
+        """
+
+        if not osp.isfile(subset_list_path):
+            return image_paths
+
+        merged = OrderedDict()
+        with open(subset_list_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                item_id = YoloStrictBase.name_from_path(line)
+                if item_id in image_paths:
+                    merged[item_id] = image_paths[item_id]
+                elif (item_id, subset_name) not in self._patch.updated_items:
+                    merged[item_id] = line
+
+        for item_id, image_path in image_paths.items():
+            merged.setdefault(item_id, image_path)
+
+        return merged
+
+    @staticmethod
+    def _merge_config_subsets(
+        config_path: str, subset_lists: Dict[str, str], removed_subsets: Set[str]
+    ) -> Dict[str, str]:
+        """
+        Keeps the subset entries of the existing config, which are not affected by the patch
+        """
+
+        merged = OrderedDict()
+        for subset_name, subset_list_path in YoloPath._parse_config(config_path).items():
+            if subset_name in YoloPath.RESERVED_CONFIG_KEYS or subset_name in removed_subsets:
+                continue
+            merged[subset_name] = subset_lists.get(subset_name, subset_list_path.strip())
+
+        for subset_name, subset_list_path in subset_lists.items():
+            merged.setdefault(subset_name, subset_list_path)
+
+        return merged
+
     def _export_media(self, item: DatasetItem, subset_img_dir: str) -> str:
         try:
             if not item.media or not (item.media.has_data or item.media.has_size):
@@ -164,7 +223,7 @@ class YoloExporter(Exporter):
 
     @classmethod
     def patch(cls, dataset, patch, save_dir, **kwargs):
-        conv = cls(dataset, save_dir=save_dir, **kwargs)
+        conv = cls(patch.as_dataset(dataset), save_dir=save_dir, **kwargs)
         conv._patch = patch
         conv.apply()
 
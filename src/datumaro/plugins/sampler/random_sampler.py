@@ -5,11 +5,12 @@
 import argparse
 from collections import defaultdict
 from random import Random
-from typing import List, Mapping, Optional, Tuple
+from typing import FrozenSet, List, Mapping, Optional, Tuple
 
 from datumaro.components.annotation import AnnotationType
 from datumaro.components.cli_plugin import CliPlugin
 from datumaro.components.dataset_base import DatasetItem, IDataset
+from datumaro.components.dataset_item_storage import find_item_index
 from datumaro.components.transformer import Transform
 from datumaro.util import cast
 
@@ -193,13 +194,28 @@ class LabelRandomSampler(Transform, CliPlugin):
             if label_count:
                 new_labels[label.name] = label_count
         self._label_counts = {idx: count for idx, count in enumerate(new_labels.values())}
-        super().__init__(ProjectLabels(extractor, new_labels.keys()))
+        self._project_labels = ProjectLabels(extractor, new_labels.keys())
+        super().__init__(self._project_labels)
+
+        self._source = extractor
 
         self._seed = seed
 
         # for repeated calls
         self._selected_items: List[DatasetItem] = None
 
+    def _find_candidates(self) -> Optional[FrozenSet[Tuple[str, str]]]:
+        index = find_item_index(self._source)
+        if index is None:
+            return None
+
+        selected_labels = self._project_labels.categories()[AnnotationType.label]
+        candidates = frozenset()
+        for label_id, label in enumerate(self._source.categories()[AnnotationType.label]):
+            if label.name in selected_labels:
+                candidates |= index.items_with_label(label_id)
+        return candidates
+
     def __iter__(self):
         if self._selected_items is not None:
             yield from self._selected_items
@@ -216,7 +232,17 @@ class LabelRandomSampler(Transform, CliPlugin):
 
         rng = Random(self._seed)  # nosec B311
 
-        for i, item in enumerate(self._extractor):
+        # If the source items are indexed, only the items with the selected labels
+        # are projected. The other items are only counted.
+        candidates = self._find_candidates()
+        items = self._extractor if candidates is None else self._source
+
+        for i, item in enumerate(items):
+            if candidates is not None:
+                if (item.id, item.subset) not in candidates:
+                    continue
+                item = self._project_labels.transform_item(item)
+
             labels = set(getattr(ann, "label", None) for ann in item.annotations)
             labels.discard(None)
             for label in labels:
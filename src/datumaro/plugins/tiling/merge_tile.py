@@ -2,14 +2,15 @@
 #
 # SPDX-License-Identifier: MIT
 
-import math
 from collections import defaultdict
 from copy import deepcopy
 from typing import Any, Callable, Dict, List, Tuple, Union
 
 import numpy as np
+import shapely
 import shapely.geometry as sg
-import shapely.ops as so
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 from datumaro.components.annotation import (
     Annotation,
@@ -33,9 +34,15 @@ from datumaro.plugins.tiling.util import x1y1x2y2_to_xywh, xywh_to_x1y1x2y2
 AnnotationsForMerge = List[Tuple[Annotation, BboxIntCoords, sg.Polygon]]
 
 
-def _apply_offset(geom: sg.base.BaseGeometry, roi_box: sg.Polygon) -> sg.base.BaseGeometry:
-    offset_x, offset_y = roi_box.bounds[:2]
-    return so.transform(lambda x, y: (x + offset_x, y + offset_y), geom)
+BBOX_DEDUP_IOU_THRESHOLD = 0.5
+"""
+The boxes without ids from different tiles are duplicates,
+if their IoU within the overlap of the tiles is not less than this threshold
+"""
+
+
+def _get_offsets(anns: AnnotationsForMerge) -> np.ndarray:
+    return np.array([roi_int[:2] for _, roi_int, _ in anns], dtype=float)
 
 
 def _merge_mask(
@@ -67,14 +74,12 @@ def _merge_mask(
 def _merge_points(anns: AnnotationsForMerge, *args, **kwargs) -> List[Points]:
     merged_points = []
 
-    for ann, _, roi_box in anns:
-        points = sg.MultiPoint(ann.get_points())
-
-        points = _apply_offset(points, roi_box)
+    for (ann, _, _), offset in zip(anns, _get_offsets(anns)):
+        points = np.reshape(ann.points, (-1, 2)) + offset
 
         merged_points += [
             ann.wrap(
-                points=[v for point in points.geoms for v in (point.x, point.y)],
+                points=points.ravel().tolist(),
                 attributes=deepcopy(ann.attributes),
                 visibility=deepcopy(ann.visibility),
             )
@@ -86,19 +91,29 @@ def _merge_points(anns: AnnotationsForMerge, *args, **kwargs) -> List[Points]:
 def _merge_polygon(anns: AnnotationsForMerge, *args, **kwargs) -> List[Polygon]:
     merged_polygons = []
 
+    rings = shapely.linearrings(
+        np.concatenate(
+            [
+                np.reshape(ann.points, (-1, 2)) + offset
+                for (ann, _, _), offset in zip(anns, _get_offsets(anns))
+            ]
+        ),
+        indices=np.repeat(np.arange(len(anns)), [len(ann.points) // 2 for ann, _, _ in anns]),
+    )
+    polygons = shapely.polygons(rings)
+
     group_by_id = defaultdict(list)
 
-    for ann, _, roi_box in anns:
-        group_by_id[ann.id] += [(ann, roi_box)]
+    for idx, (ann, _, _) in enumerate(anns):
+        group_by_id[ann.id] += [idx]
 
-    for grouped_anns in group_by_id.values():
-        polygon = sg.Polygon()
-        for ann, roi_box in grouped_anns:
-            polygon = polygon.union(_apply_offset(sg.Polygon(ann.get_points()), roi_box))
+    for grouped_ids in group_by_id.values():
+        ann = anns[grouped_ids[-1]][0]
+        polygon = shapely.union_all(polygons[grouped_ids])
 
         merged_polygons += [
             ann.wrap(
-                points=[p for xy in polygon.exterior.coords for p in xy],
+                points=shapely.get_coordinates(polygon.exterior).ravel().tolist(),
                 attributes=deepcopy(ann.attributes),
             )
         ]
@@ -109,14 +124,12 @@ def _merge_polygon(anns: AnnotationsForMerge, *args, **kwargs) -> List[Polygon]:
 def _merge_polyline(anns: AnnotationsForMerge, *args, **kwargs) -> List[PolyLine]:
     merged_polylines = []
 
-    for ann, _, roi_box in anns:
-        lines = sg.LineString(ann.get_points())
-
-        lines = _apply_offset(lines, roi_box)
+    for (ann, _, _), offset in zip(anns, _get_offsets(anns)):
+        points = np.reshape(ann.points, (-1, 2)) + offset
 
         merged_polylines += [
             ann.wrap(
-                points=[v for point in lines.coords for v in (point[0], point[1])],
+                points=points.ravel().tolist(),
                 attributes=deepcopy(ann.attributes),
             )
         ]
@@ -124,27 +137,69 @@ def _merge_polyline(anns: AnnotationsForMerge, *args, **kwargs) -> List[PolyLine
     return merged_polylines
 
 
-def _merge_bbox(anns: AnnotationsForMerge, *args, **kwargs) -> List[Bbox]:
-    merged_bboxes = []
+def _get_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    inter_sizes = np.clip(np.minimum(a[:, 2:], b[:, 2:]) - np.maximum(a[:, :2], b[:, :2]), 0, None)
+    inter_areas = np.prod(inter_sizes, axis=1)
+    union_areas = (
+        np.prod(a[:, 2:] - a[:, :2], axis=1) + np.prod(b[:, 2:] - b[:, :2], axis=1) - inter_areas
+    )
+    return np.divide(inter_areas, union_areas, out=np.zeros(len(a)), where=0 < union_areas)
 
-    group_by_id = defaultdict(list)
-
-    for ann, _, roi_box in anns:
-        group_by_id[ann.id] += [(ann, roi_box)]
-
-    for grouped_anns in group_by_id.values():
-        minx, miny, maxx, maxy = math.inf, math.inf, -math.inf, -math.inf
 
-        for ann, roi_box in grouped_anns:
-            bbox: sg.Polygon = sg.box(*xywh_to_x1y1x2y2(*ann.get_bbox()))
-            bbox = _apply_offset(bbox, roi_box)
-            c_minx, c_miny, c_maxx, c_maxy = bbox.bounds
-            minx = min(minx, c_minx)
-            miny = min(miny, c_miny)
-            maxx = max(maxx, c_maxx)
-            maxy = max(maxy, c_maxy)
+def _merge_bbox(anns: AnnotationsForMerge, *args, **kwargs) -> List[Bbox]:
+    merged_bboxes = []
 
-        x, y, w, h = x1y1x2y2_to_xywh(minx, miny, maxx, maxy)
+    bboxes = np.array([xywh_to_x1y1x2y2(*ann.get_bbox()) for ann, _, _ in anns], dtype=float)
+    bboxes += np.tile(_get_offsets(anns), 2)
+    rois = np.array([xywh_to_x1y1x2y2(*roi_int) for _, roi_int, _ in anns], dtype=float)
+    ids = np.array([ann.id for ann, _, _ in anns])
+    labels = np.array([-1 if ann.label is None else ann.label for ann, _, _ in anns])
+
+    # The boxes with the same id are the parts of an object,
+    # they are linked to an extra node of the id
+    unique_ids, id_nodes = np.unique(ids, return_inverse=True)
+    has_id = ids != 0
+    links = [(np.flatnonzero(has_id), len(anns) + id_nodes[has_id])]
+
+    # The boxes without ids are found in the tile overlaps by the spatial index
+    left, right = shapely.STRtree(shapely.box(*bboxes.T)).query(
+        shapely.box(*bboxes.T), predicate="intersects"
+    )
+    candidates = (
+        (left < right)
+        & (ids[left] == 0)
+        & (ids[right] == 0)
+        & (labels[left] == labels[right])
+        & np.any(rois[left] != rois[right], axis=1)
+    )
+    left, right = left[candidates], right[candidates]
+
+    # The boxes are compared within the overlap of their tiles,
+    # where both of them are visible
+    overlaps = np.concatenate(
+        [np.maximum(rois[left, :2], rois[right, :2]), np.minimum(rois[left, 2:], rois[right, 2:])],
+        axis=1,
+    )
+    lower, upper = np.tile(overlaps[:, :2], 2), np.tile(overlaps[:, 2:], 2)
+    ious = _get_iou(np.clip(bboxes[left], lower, upper), np.clip(bboxes[right], lower, upper))
+    duplicates = BBOX_DEDUP_IOU_THRESHOLD <= ious
+    links.append((left[duplicates], right[duplicates]))
+
+    n_nodes = len(anns) + len(unique_ids)
+    rows = np.concatenate([row for row, _ in links])
+    cols = np.concatenate([col for _, col in links])
+    graph = csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(n_nodes, n_nodes))
+    _, groups = connected_components(graph, directed=False)
+
+    # The groups are ordered by their first boxes
+    order = np.argsort(groups[: len(anns)], kind="stable")
+    group_starts = np.flatnonzero(np.diff(groups[order], prepend=-1))
+    for grouped_ids in sorted(np.split(order, group_starts[1:]), key=lambda ids: ids[0]):
+        ann = anns[grouped_ids[-1]][0]
+
+        x1, y1 = bboxes[grouped_ids, :2].min(axis=0).tolist()
+        x2, y2 = bboxes[grouped_ids, 2:].max(axis=0).tolist()
+        x, y, w, h = x1y1x2y2_to_xywh(x1, y1, x2, y2)
 
         merged_bboxes += [
             ann.wrap(
@@ -203,6 +258,11 @@ class MergeTile(Transform, CliPlugin):
     better to revert TileTransform when you need to merge them. But,
     this will be helpful when you have another transformation between
     Tile and MergeTile. For example, Tile -> (an arbitrary Transform) -> MergeTile.
+
+    The boxes with the same id are merged into one box. The boxes without ids
+    (id = 0), e.g. the ones predicted on the tiles, are deduplicated in the tile
+    overlaps: the boxes of the same label from different tiles are merged,
+    if their IoU within the overlap of the tiles is at least 0.5.
     """
 
     _merge_anns_func_map: Dict[AnnotationType, Callable[..., List[Annotation]]] = {
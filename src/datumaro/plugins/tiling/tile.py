@@ -2,11 +2,13 @@
 #
 # SPDX-License-Identifier: MIT
 
+from collections import defaultdict
 from copy import deepcopy
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
+import shapely
 import shapely.geometry as sg
-import shapely.ops as so
 
 from datumaro.components.annotation import (
     Annotation,
@@ -17,6 +19,7 @@ from datumaro.components.annotation import (
     Points,
     Polygon,
     PolyLine,
+    RleMask,
 )
 from datumaro.components.cli_plugin import CliPlugin
 from datumaro.components.dataset_base import DatasetItem
@@ -30,90 +33,152 @@ from datumaro.plugins.tiling.util import (
     x1y1x2y2_to_xywh,
     xywh_to_x1y1x2y2,
 )
+from datumaro.util.mask_tools import rle_crop
 
+TiledAnnotations = Iterator[Tuple[int, int, Annotation]]
+"""Tuples of (roi index, annotation index, tiled annotation)"""
 
-def _apply_offset(geom: sg.base.BaseGeometry, roi_box: sg.Polygon) -> sg.base.BaseGeometry:
-    offset_x, offset_y = roi_box.bounds[:2]
-    return so.transform(lambda x, y: (x - offset_x, y - offset_y), geom)
 
+def _get_bounds(anns: Sequence[Annotation]) -> np.ndarray:
+    """Returns the x1, y1, x2, y2 bounds of the annotation points, NaN for empty ones"""
 
-def _tile_mask(ann: Mask, roi_int: BboxIntCoords, *args, **kwargs) -> Mask:
-    x, y, w, h = roi_int
-    tiled_mask = ann.image[y : y + h, x : x + w]
-    return ann.wrap(
-        image=tiled_mask,
-        attributes=deepcopy(ann.attributes),
-    )
-
-
-def _tile_points(ann: Points, roi_box: sg.Polygon, *args, **kwargs) -> Optional[Points]:
-    points = sg.MultiPoint(ann.get_points())
+    bounds = np.full((len(anns), 4), np.nan)
+    for idx, ann in enumerate(anns):
+        if ann.points:
+            points = np.reshape(ann.points, (-1, 2))
+            bounds[idx, :2] = points.min(axis=0)
+            bounds[idx, 2:] = points.max(axis=0)
+    return bounds
 
-    if not roi_box.covers(points):
-        return None
 
-    points = _apply_offset(points, roi_box)
+def _get_covered(bounds: np.ndarray, rois: np.ndarray) -> np.ndarray:
+    """
+    Returns a (rois, annotations) mask of the annotations covered by the ROIs.
+    A box covers a shape, if it covers its bounds.
+    """
 
-    return ann.wrap(
-        points=[v for point in points.geoms for v in (point.x, point.y)],
-        attributes=deepcopy(ann.attributes),
-        visibility=deepcopy(ann.visibility),
+    rois = rois[:, None]
+    return np.all(rois[..., :2] <= bounds[..., :2], axis=-1) & np.all(
+        bounds[..., 2:] <= rois[..., 2:], axis=-1
     )
 
 
-def _tile_polygon(
-    ann: Polygon, roi_box: sg.Polygon, threshold_drop_ann: float = 0.8, *args, **kwargs
-) -> Optional[Polygon]:
-    polygon = sg.Polygon(ann.get_points())
-
-    if not roi_box.intersects(polygon):
-        return None
-
-    inter: sg.Polygon = polygon.intersection(roi_box)
-    prop_area = inter.area / polygon.area
+def _get_largest_polygon(geom: shapely.Geometry) -> Optional[sg.Polygon]:
+    if isinstance(geom, sg.Polygon):
+        return geom
+    polygons = [part for part in shapely.get_parts(geom) if isinstance(part, sg.Polygon)]
+    return max(polygons, key=lambda polygon: polygon.area, default=None)
 
-    if prop_area < threshold_drop_ann:
-        return None
 
-    inter = _apply_offset(inter, roi_box)
+def _tile_mask(ann: Mask, roi_int: BboxIntCoords, *args, **kwargs) -> Mask:
+    if isinstance(ann, RleMask):
+        # The mask is cropped without decoding
+        return ann.wrap(
+            rle=rle_crop(ann.rle, roi_int),
+            attributes=deepcopy(ann.attributes),
+        )
 
+    x, y, w, h = roi_int
+    tiled_mask = ann.image[y : y + h, x : x + w]
     return ann.wrap(
-        points=[p for xy in inter.exterior.coords for p in xy], attributes=deepcopy(ann.attributes)
+        image=tiled_mask,
+        attributes=deepcopy(ann.attributes),
     )
 
 
-def _tile_polyline(ann: PolyLine, roi_box: sg.Polygon, *args, **kwargs) -> Optional[PolyLine]:
-    lines = sg.LineString(ann.get_points())
+def _tile_points(anns: Sequence[Points], rois: np.ndarray, *args, **kwargs) -> TiledAnnotations:
+    covered = _get_covered(_get_bounds(anns), rois)
 
-    if not roi_box.covers(lines):
-        return None
+    for roi_idx, ann_idx in zip(*np.nonzero(covered)):
+        ann = anns[ann_idx]
+        points = np.reshape(ann.points, (-1, 2)) - rois[roi_idx, :2]
+        yield roi_idx, ann_idx, ann.wrap(
+            points=points.ravel().tolist(),
+            attributes=deepcopy(ann.attributes),
+            visibility=deepcopy(ann.visibility),
+        )
 
-    lines = _apply_offset(lines, roi_box)
 
-    return ann.wrap(
-        points=[v for point in lines.coords for v in (point[0], point[1])],
-        attributes=deepcopy(ann.attributes),
+def _tile_polygon(
+    anns: Sequence[Polygon],
+    rois: np.ndarray,
+    threshold_drop_ann: float = 0.8,
+    *args,
+    **kwargs,
+) -> TiledAnnotations:
+    rings = shapely.linearrings(
+        np.concatenate([np.reshape(ann.points, (-1, 2)) for ann in anns]),
+        indices=np.repeat(np.arange(len(anns)), [len(ann.points) // 2 for ann in anns]),
+    )
+    polygons = shapely.polygons(rings)
+    areas = shapely.area(polygons)
+    roi_boxes = shapely.box(*rois.T)
+
+    # The intersecting pairs are found by the spatial index and clipped at once
+    roi_ids, ann_ids = shapely.STRtree(polygons).query(roi_boxes, predicate="intersects")
+    inters = shapely.intersection(polygons[ann_ids], roi_boxes[roi_ids])
+    prop_areas = np.divide(
+        shapely.area(inters),
+        areas[ann_ids],
+        out=np.zeros(len(ann_ids)),
+        where=0 < areas[ann_ids],
     )
 
+    for keep in np.nonzero(threshold_drop_ann <= prop_areas)[0]:
+        inter = _get_largest_polygon(inters[keep])
+        if inter is None:
+            continue
 
-def _tile_bbox(
-    ann: Bbox, roi_box: sg.Polygon, threshold_drop_ann: float = 0.8, *args, **kwargs
-) -> Optional[Bbox]:
-    bbox: sg.Polygon = sg.box(*xywh_to_x1y1x2y2(*ann.get_bbox()))
+        roi_idx, ann_idx = roi_ids[keep], ann_ids[keep]
+        ann = anns[ann_idx]
+        points = shapely.get_coordinates(inter.exterior) - rois[roi_idx, :2]
+        yield roi_idx, ann_idx, ann.wrap(
+            points=points.ravel().tolist(), attributes=deepcopy(ann.attributes)
+        )
 
-    if not roi_box.intersects(bbox):
-        return None
 
-    inter: sg.Polygon = bbox.intersection(roi_box)
-    prop_area = inter.area / bbox.area
+def _tile_polyline(anns: Sequence[PolyLine], rois: np.ndarray, *args, **kwargs) -> TiledAnnotations:
+    covered = _get_covered(_get_bounds(anns), rois)
 
-    if prop_area < threshold_drop_ann:
-        return None
+    for roi_idx, ann_idx in zip(*np.nonzero(covered)):
+        ann = anns[ann_idx]
+        points = np.reshape(ann.points, (-1, 2)) - rois[roi_idx, :2]
+        yield roi_idx, ann_idx, ann.wrap(
+            points=points.ravel().tolist(),
+            attributes=deepcopy(ann.attributes),
+        )
 
-    inter = _apply_offset(inter, roi_box)
 
-    x, y, w, h = x1y1x2y2_to_xywh(*inter.bounds)
-    return ann.wrap(x=x, y=y, w=w, h=h, attributes=deepcopy(ann.attributes))
+def _tile_bbox(
+    anns: Sequence[Bbox],
+    rois: np.ndarray,
+    threshold_drop_ann: float = 0.8,
+    *args,
+    **kwargs,
+) -> TiledAnnotations:
+    bboxes = np.array([xywh_to_x1y1x2y2(*ann.get_bbox()) for ann in anns], dtype=float)
+    areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+
+    # The (rois, bboxes) intersections
+    rois = rois[:, None]
+    inters = np.concatenate(
+        [np.maximum(bboxes[:, :2], rois[..., :2]), np.minimum(bboxes[:, 2:], rois[..., 2:])],
+        axis=-1,
+    )
+    inter_sizes = inters[..., 2:] - inters[..., :2]
+    prop_areas = np.divide(
+        np.prod(inter_sizes, axis=-1),
+        areas,
+        out=np.zeros(inter_sizes.shape[:2]),
+        where=0 < areas,
+    )
+    keep = np.all(0 <= inter_sizes, axis=-1) & (threshold_drop_ann <= prop_areas)
+
+    for roi_idx, ann_idx in zip(*np.nonzero(keep)):
+        ann = anns[ann_idx]
+        x1, y1, x2, y2 = (inters[roi_idx, ann_idx] - np.tile(rois[roi_idx, 0, :2], 2)).tolist()
+        x, y, w, h = x1y1x2y2_to_xywh(x1, y1, x2, y2)
+        yield roi_idx, ann_idx, ann.wrap(x=x, y=y, w=w, h=h, attributes=deepcopy(ann.attributes))
 
 
 def _tile_depth_annotation(
@@ -132,6 +197,22 @@ def _tile_not_support(ann: Annotation, *args, **kwargs) -> None:
     raise DatumaroError(f"type(ann)={type(ann)} is not support tiling.")
 
 
+def _tile_each(tile_ann: Callable[..., Optional[Annotation]]) -> Callable[..., TiledAnnotations]:
+    """Makes a function tiling annotations one by one, for the annotations without geometry"""
+
+    def _tile_anns(
+        anns: Sequence[Annotation], rois: np.ndarray, *args, **kwargs
+    ) -> TiledAnnotations:
+        for roi_idx, roi in enumerate(rois):
+            roi_int = x1y1x2y2_to_xywh(*map(int, roi))
+            for ann_idx, ann in enumerate(anns):
+                tiled_ann = tile_ann(ann, roi_int, *args, **kwargs)
+                if tiled_ann is not None:
+                    yield roi_idx, ann_idx, tiled_ann
+
+    return _tile_anns
+
+
 class Tile(Transform, CliPlugin):
     """
     Apply tile tranformation to items in the dataset.
@@ -161,17 +242,19 @@ class Tile(Transform, CliPlugin):
        and Pattern Recognition Workshops. 2019.
     """
 
-    _tile_ann_func_map: Dict[AnnotationType, Callable] = {
-        AnnotationType.label: _tile_by_copy,
-        AnnotationType.mask: _tile_mask,
+    # The annotations of an item are tiled by type: the functions take
+    # all the annotations of a type and all the tiles at once
+    _tile_ann_func_map: Dict[AnnotationType, Callable[..., TiledAnnotations]] = {
+        AnnotationType.label: _tile_each(_tile_by_copy),
+        AnnotationType.mask: _tile_each(_tile_mask),
         AnnotationType.points: _tile_points,
         AnnotationType.polygon: _tile_polygon,
         AnnotationType.polyline: _tile_polyline,
         AnnotationType.bbox: _tile_bbox,
-        AnnotationType.caption: _tile_by_copy,
-        AnnotationType.cuboid_3d: _tile_not_support,
-        AnnotationType.super_resolution_annotation: _tile_not_support,
-        AnnotationType.depth_annotation: _tile_depth_annotation,
+        AnnotationType.caption: _tile_each(_tile_by_copy),
+        AnnotationType.cuboid_3d: _tile_each(_tile_not_support),
+        AnnotationType.super_resolution_annotation: _tile_each(_tile_not_support),
+        AnnotationType.depth_annotation: _tile_each(_tile_depth_annotation),
     }
 
     @classmethod
@@ -233,14 +316,18 @@ class Tile(Transform, CliPlugin):
 
         items: List[DatasetItem] = []
         rois = self._extract_rois(item.media)
-        for idx, roi in enumerate(rois):
+        tiled_anns = self._get_tiled_annotations(item, rois)
+
+        # The tiles share the decoded image
+        tile_images = RoIImage.from_image_rois(item.media, rois)
+        for idx, (roi, tile_image) in enumerate(zip(rois, tile_images)):
             items += [
                 self.wrap_item(
                     item,
                     id=item.id + f"_tile_{idx}",
-                    media=RoIImage.from_image(item.media, roi),
+                    media=tile_image,
                     attributes=self._get_tiled_attributes(item, idx, roi),
-                    annotations=self._get_tiled_annotations(item, roi),
+                    annotations=tiled_anns[idx],
                 )
             ]
 
@@ -276,15 +363,23 @@ class Tile(Transform, CliPlugin):
         attributes["roi"] = roi
         return attributes
 
-    def _get_tiled_annotations(self, item: DatasetItem, roi: BboxIntCoords) -> List[Annotation]:
-        roi_box: sg.Polygon = sg.box(*xywh_to_x1y1x2y2(*roi))
+    def _get_tiled_annotations(
+        self, item: DatasetItem, rois: List[BboxIntCoords]
+    ) -> List[List[Annotation]]:
+        """Returns the tiled annotations for each ROI, in the order of the item annotations"""
 
-        tiled_anns = []
-        for ann in item.annotations:
-            tiled_ann = self._tile_ann_func_map[ann.type](
-                ann, roi_int=roi, roi_box=roi_box, threshold_drop_ann=self._threshold_drop_ann
-            )
-            if tiled_ann is not None:
-                tiled_anns.append(tiled_ann)
+        roi_bounds = np.array([xywh_to_x1y1x2y2(*roi) for roi in rois], dtype=float)
+
+        anns_by_type: Dict[AnnotationType, List[Tuple[int, Annotation]]] = defaultdict(list)
+        for idx, ann in enumerate(item.annotations):
+            anns_by_type[ann.type].append((idx, ann))
+
+        tiled_anns: List[Dict[int, Annotation]] = [{} for _ in rois]
+        for ann_type, indexed_anns in anns_by_type.items():
+            indices, anns = zip(*indexed_anns)
+            for roi_idx, ann_idx, tiled_ann in self._tile_ann_func_map[ann_type](
+                anns, roi_bounds, threshold_drop_ann=self._threshold_drop_ann
+            ):
+                tiled_anns[roi_idx][indices[ann_idx]] = tiled_ann
 
-        return tiled_anns
+        return [[anns[idx] for idx in sorted(anns)] for anns in tiled_anns]
@@ -5,15 +5,20 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import logging as log
+import os
 import os.path as osp
 import random
 import re
+import struct
+import tempfile
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from enum import Enum, auto
-from itertools import chain
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -36,12 +41,19 @@ from datumaro.components.annotation import (
     RleMask,
 )
 from datumaro.components.cli_plugin import CliPlugin
+from datumaro.components.crypter import NULL_CRYPTER
 from datumaro.components.dataset_base import DEFAULT_SUBSET_NAME, DatasetInfo, DatasetItem, IDataset
 from datumaro.components.errors import DatumaroError
-from datumaro.components.media import Image
+from datumaro.components.media import Image, ImageFromFile, PointCloudFromFile
 from datumaro.components.transformer import ItemTransform, Transform
 from datumaro.util import NOTSET, filter_dict, parse_json_file, parse_str_enum_value, take_by
-from datumaro.util.annotation_util import find_group_leader, find_instances
+from datumaro.util.annotation_util import (
+    find_group_leader,
+    find_instances,
+    make_label_id_lut,
+    remap_label_ids,
+)
+from datumaro.util.multi_procs_util import ordered_thread_map
 
 
 class CropCoveredSegments(ItemTransform, CliPlugin):
@@ -86,7 +98,9 @@ class CropCoveredSegments(ItemTransform, CliPlugin):
                     rle = mask_tools.mask_to_rle(s.image)
                 segments.append(rle)
 
-        segments = mask_tools.crop_covered_segments(segments, img_width, img_height)
+        segments = mask_tools.crop_covered_segments(
+            segments, img_width, img_height, return_rles=True
+        )
 
         new_anns = []
         for ann, new_segment in zip(segment_anns, segments):
@@ -102,10 +116,8 @@ class CropCoveredSegments(ItemTransform, CliPlugin):
                     fields["group"] = cls._make_group_id(segment_anns + new_anns, fields["id"])
                 for polygon in new_segment:
                     new_anns.append(Polygon(points=polygon, **fields))
-            else:
-                rle = mask_tools.mask_to_rle(new_segment)
-                rle = mask_utils.frPyObjects(rle, *rle["size"])
-                new_anns.append(RleMask(rle=rle, **fields))
+            elif new_segment:
+                new_anns.append(RleMask(rle=new_segment, **fields))
 
         return new_anns
 
@@ -169,26 +181,21 @@ class MergeInstanceSegments(ItemTransform, CliPlugin):
         leader = find_group_leader(polygons + masks)
         instance = []
 
-        # Build the resulting mask
-        mask = None
+        # Build the resulting mask as the union of the segment RLEs
+        segments = [
+            m.rle if isinstance(m, RleMask) else mask_tools.mask_to_rle(np.asarray(m.image) != 0)
+            for m in masks
+        ]
 
         if include_polygons and polygons:
-            polygons = [p.points for p in polygons]
-            mask = mask_tools.rles_to_mask(polygons, img_width, img_height)
+            segments += mask_utils.frPyObjects([p.points for p in polygons], img_height, img_width)
         else:
             instance += polygons  # keep unused polygons
 
-        if masks:
-            masks = (m.image for m in masks)
-            if mask is not None:
-                masks = chain(masks, [mask])
-            mask = mask_tools.merge_masks(masks)
-
-        if mask is None:
+        if not segments:
             return instance
 
-        mask = mask_tools.mask_to_rle(mask)
-        mask = mask_utils.frPyObjects(mask, *mask["size"])
+        mask = mask_tools.rle_union(segments)
         instance.append(
             RleMask(
                 rle=mask,
@@ -288,11 +295,82 @@ class BoxesToPolygons(ItemTransform, CliPlugin):
 
 
 class MasksToPolygons(ItemTransform, CliPlugin):
-    def transform_item(self, item):
+    """
+    Converts masks to polygons.|n
+    |n
+    The contours are extracted from the bounding boxes of the masks.
+    With the '--tolerance' option, the polygons are simplified with
+    the Douglas-Peucker algorithm. With the '--num-workers' option,
+    the masks of an item are converted in a thread pool.|n
+    |n
+    Examples:|n
+        - Convert masks to polygons, simplified within 1 pixel|n
+
+        .. code-block::
+
+        |s|s%(prog)s --tolerance 1
+    """
+
+    @classmethod
+    def build_cmdline_parser(cls, **kwargs):
+        parser = super().build_cmdline_parser(**kwargs)
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0,
+            help="Maximum distance from the contour points to the simplified polygon, "
+            "in pixels. If 0, the polygons are not simplified (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--area-threshold",
+            type=float,
+            default=1,
+            help="Minimal area of the resulting polygons (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads converting the masks of an item. "
+            "If num_workers = 0, convert them sequentially (default: %(default)s).",
+        )
+        return parser
+
+    def __init__(
+        self,
+        extractor: IDataset,
+        tolerance: float = 0,
+        area_threshold: float = 1,
+        num_workers: int = 0,
+    ):
+        super().__init__(extractor)
+
+        if tolerance < 0:
+            raise ValueError(f"tolerance should be a non negative number, but it is {tolerance}.")
+        self._tolerance = tolerance
+        self._area_threshold = area_threshold
+
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
+    def _convert_mask(self, mask):
+        return self.convert_mask(
+            mask, tolerance=self._tolerance, area_threshold=self._area_threshold
+        )
+
+    def _convert_item(self, item, map_fn=map):
+        masks = [ann for ann in item.annotations if ann.type == AnnotationType.mask]
+        if not masks:
+            return item
+        converted = iter(map_fn(self._convert_mask, masks))
+
         annotations = []
         for ann in item.annotations:
             if ann.type == AnnotationType.mask:
-                polygons = self.convert_mask(ann)
+                polygons = next(converted)
                 if not polygons:
                     log.debug(
                         "[%s]: item %s: "
@@ -305,9 +383,39 @@ class MasksToPolygons(ItemTransform, CliPlugin):
 
         return self.wrap_item(item, annotations=annotations)
 
+    def transform_item(self, item):
+        return self._convert_item(item)
+
+    def __iter__(self):
+        if not self._num_workers:
+            yield from super().__iter__()
+            return
+
+        with ThreadPoolExecutor(max_workers=self._num_workers) as pool:
+            for item in self._extractor:
+                yield self._convert_item(item, pool.map)
+
     @staticmethod
-    def convert_mask(mask):
-        polygons = mask_tools.mask_to_polygons(mask.image)
+    def convert_mask(mask, *, tolerance: float = 0, area_threshold: float = 1):
+        # Only the bounding box of the mask is decoded. The box is padded
+        # to keep the contours off the box borders.
+        if isinstance(mask, RleMask):
+            segment = mask.rle
+            height, width = segment["size"]
+        else:
+            segment = np.asarray(mask.image)
+            height, width = segment.shape[:2]
+
+        polygons = []
+        roi, roi_mask = mask_tools.decode_segment_roi(segment, height, width, padding=1)
+        if roi is not None:
+            x, y = roi[:2]
+            for polygon in mask_tools.mask_to_polygons(
+                roi_mask, area_threshold=area_threshold, tolerance=tolerance
+            ):
+                polygon[0::2] += x
+                polygon[1::2] += y
+                polygons.append(polygon)
 
         return [
             Polygon(
@@ -412,16 +520,42 @@ class ReindexAnnotations(ItemTransform, CliPlugin):
 
 class Sort(Transform, CliPlugin):
     """
-    Sorts dataset items.
+    Sorts dataset items.|n
+    |n
+    By default, all the items are sorted in memory. If the |s|s--max-memory
+    option is set, at most this number of items is kept in memory:
+    the keys are computed in one pass over the dataset, the items are
+    sorted in chunks, the sorted chunks are spilled to temporary files
+    in the datumaro binary representation, and then the chunks are merged.
+    This allows to sort the stream datasets, which don't fit in memory.|n
+    |n
+    The spilled items have the limitations of the datumaro binary format,
+    e.g. the shape coordinates are stored as 32-bit floats. The items,
+    which can't be restored from this representation (e.g. with the media
+    not in files, or with the annotations of other types), are kept in memory.|n
+    |n
+    Examples:|n
+    |s|s- Sort by id converted into integer, keeping at most 10000 items in memory::|n
+    |n
+    |s|s|s|s%(prog)s --key "lambda item: int(item.id)" --max-memory 10000
     """
 
     @classmethod
     def build_cmdline_parser(cls, **kwargs):
         parser = super().build_cmdline_parser(**kwargs)
         parser.add_argument("-k", "--key", type=str, default=None, help="key functions to sort.")
+        parser.add_argument(
+            "--max-memory",
+            type=int,
+            default=None,
+            help="The maximum number of items kept in memory. If set, the items "
+            "are sorted in chunks spilled to temporary files (default: sort in memory)",
+        )
         return parser
 
-    def __init__(self, extractor, key=None):
+    _MAX_MERGE_FAN_IN = 64  # The maximum number of the spilled runs merged at once
+
+    def __init__(self, extractor, key=None, max_memory: Optional[int] = None):
         super().__init__(extractor)
         if key:
             if isinstance(key, str):
@@ -432,10 +566,134 @@ class Sort(Transform, CliPlugin):
             key = lambda item: item.id
         self._key = key
 
+        if max_memory is not None and max_memory <= 0:
+            raise ValueError(f"max_memory should be a positive integer, but it is {max_memory}.")
+        self._max_memory = max_memory
+
     def __iter__(self):
-        items = sorted(list(iter(self._extractor)), key=lambda item: self._key(item))
-        for item in items:
-            yield item
+        if self._max_memory is None:
+            items = sorted(list(iter(self._extractor)), key=lambda item: self._key(item))
+            for item in items:
+                yield item
+            return
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # The items are compared by (key, position), so the sort is stable
+            runs = []
+            chunk = []
+            for position, item in enumerate(self._extractor):
+                chunk.append((self._key(item), position, item))
+                if len(chunk) == self._max_memory:
+                    runs.append(self._spill(chunk, osp.join(temp_dir, f"{len(runs)}.bin")))
+                    chunk = []
+
+            if not runs:
+                chunk.sort(key=itemgetter(0, 1))
+                for _, _, item in chunk:
+                    yield item
+                return
+
+            if chunk:
+                runs.append(self._spill(chunk, osp.join(temp_dir, f"{len(runs)}.bin")))
+
+            # Each run keeps its file open while merged, so the runs are merged
+            # in passes to keep the number of the open files bounded
+            run_count = len(runs)
+            while len(runs) > self._MAX_MERGE_FAN_IN:
+                merged_runs = []
+                for i in range(0, len(runs), self._MAX_MERGE_FAN_IN):
+                    group = runs[i : i + self._MAX_MERGE_FAN_IN]
+                    if len(group) == 1:
+                        merged_runs.append(group[0])
+                        continue
+
+                    merged_runs.append(
+                        self._write_run(
+                            heapq.merge(*group, key=itemgetter(0, 1)),
+                            osp.join(temp_dir, f"{run_count}.bin"),
+                        )
+                    )
+                    run_count += 1
+                runs = merged_runs
+
+            for _, _, item in heapq.merge(*runs, key=itemgetter(0, 1)):
+                yield item
+
+    @staticmethod
+    def _encode_item(item: DatasetItem) -> Optional[bytes]:
+        """Returns the binary representation of the item, if the item can be restored from it"""
+
+        from datumaro.plugins.data_formats.datumaro_binary.mapper import DatasetItemMapper
+
+        # Only the paths of the media files are stored
+        media = item.media
+        if isinstance(media, PointCloudFromFile):
+            if not all(isinstance(image, ImageFromFile) for image in media.extra_images):
+                return None
+        elif media is not None and not isinstance(media, ImageFromFile):
+            return None
+        if not getattr(media, "_crypter", NULL_CRYPTER).is_null_crypter:
+            return None
+
+        # The masks are stored as binary RLEs
+        if any(isinstance(ann, Mask) and not isinstance(ann, RleMask) for ann in item.annotations):
+            return None
+
+        try:
+            return DatasetItemMapper.forward(item)
+        except (NotImplementedError, DatumaroError, TypeError):
+            return None
+
+    @classmethod
+    def _spill(
+        cls, chunk: List[Tuple[Any, int, DatasetItem]], path: str
+    ) -> Iterator[Tuple[Any, int, DatasetItem]]:
+        """
+        Sorts the chunk and writes its items to the file.
+        Returns an iterator, which reads the sorted chunk back.
+        """
+
+        chunk.sort(key=itemgetter(0, 1))
+        run = cls._write_run(chunk, path)
+        chunk.clear()
+        return run
+
+    @classmethod
+    def _write_run(
+        cls, items: Iterable[Tuple[Any, int, DatasetItem]], path: str
+    ) -> Iterator[Tuple[Any, int, DatasetItem]]:
+        """
+        Writes the sorted items to the file.
+        Returns an iterator, which reads the items back.
+        """
+
+        run = []
+        with open(path, "wb") as f:
+            for key, position, item in items:
+                item_bytes = cls._encode_item(item)
+                if item_bytes is not None:
+                    f.write(struct.pack("<I", len(item_bytes)))
+                    f.write(item_bytes)
+                    item = None
+                run.append((key, position, item))
+
+        return cls._read_spilled(run, path)
+
+    @staticmethod
+    def _read_spilled(
+        run: List[Tuple[Any, int, Optional[DatasetItem]]], path: str
+    ) -> Iterator[Tuple[Any, int, DatasetItem]]:
+        from datumaro.plugins.data_formats.datumaro_binary.mapper import DatasetItemMapper
+
+        with open(path, "rb") as f:
+            for key, position, item in run:
+                if item is None:
+                    (size,) = struct.unpack("<I", f.read(4))
+                    item, _ = DatasetItemMapper.backward(f.read(size))
+                yield key, position, item
+
+        # The run is not needed anymore, when it is merged into another one
+        os.remove(path)
 
 
 class MapSubsets(ItemTransform, CliPlugin):
@@ -715,6 +973,7 @@ class RemapLabels(ItemTransform, CliPlugin):
             mapping = dict(mapping)
 
         self._categories = {}
+        self._label_id_lut = make_label_id_lut({})
 
         src_categories = self._extractor.categories()
 
@@ -779,6 +1038,7 @@ class RemapLabels(ItemTransform, CliPlugin):
                     log.debug("#%s '%s' -> <deleted>", src_id, src_label.name)
 
         self._map_id = lambda src_id: id_mapping.get(src_id, None)
+        self._label_id_lut = make_label_id_lut(id_mapping)
 
         for label in dst_label_cat:
             if label.parent not in dst_label_cat:
@@ -789,11 +1049,13 @@ class RemapLabels(ItemTransform, CliPlugin):
         return self._categories
 
     def transform_item(self, item):
+        labels = [getattr(ann, "label", None) for ann in item.annotations]
+        conv_labels = remap_label_ids(self._label_id_lut, labels)
+
         annotations = []
-        for ann in item.annotations:
-            if getattr(ann, "label", None) is not None:
-                conv_label = self._map_id(ann.label)
-                if conv_label is not None:
+        for ann, label, conv_label in zip(item.annotations, labels, conv_labels):
+            if label is not None:
+                if conv_label != -1:
                     annotations.append(ann.wrap(label=conv_label))
             elif self._default_action is self.DefaultAction.keep:
                 annotations.append(ann.wrap())
@@ -960,16 +1222,19 @@ class ProjectLabels(ItemTransform):
             for src_id in range(len(src_label_cat or ()))
         }
         self._map_id = lambda src_id: id_mapping.get(src_id, None)
+        self._label_id_lut = make_label_id_lut(id_mapping)
 
     def categories(self):
         return self._categories
 
     def transform_item(self, item):
+        labels = [getattr(ann, "label", None) for ann in item.annotations]
+        conv_labels = remap_label_ids(self._label_id_lut, labels)
+
         annotations = []
-        for ann in item.annotations:
-            if getattr(ann, "label", None) is not None:
-                conv_label = self._map_id(ann.label)
-                if conv_label is not None:
+        for ann, label, conv_label in zip(item.annotations, labels, conv_labels):
+            if label is not None:
+                if conv_label != -1:
                     annotations.append(ann.wrap(label=conv_label))
             else:
                 annotations.append(ann.wrap())
@@ -1019,6 +1284,13 @@ class ResizeTransform(ItemTransform):
     Resizes images and annotations in the dataset to the specified size.
     Supports upscaling, downscaling and mixed variants.|n
     |n
+    The images are resized lazily, when their data is requested. JPEG images
+    are decoded at a reduced resolution, when they are downscaled 2x or more.
+    Image crops (e.g. produced by the tile transform) are cropped and resized
+    at once. With the '--num-workers' option, the images are resized in
+    a thread pool ahead of the consumer, which is useful for exporting.
+    Such images are kept in memory with the items.|n
+    |n
     Examples:|n
         - Resize all images to 256x256 size|n
 
@@ -1032,28 +1304,32 @@ class ResizeTransform(ItemTransform):
         parser = super().build_cmdline_parser(**kwargs)
         parser.add_argument("-dw", "--width", type=int, help="Destination image width")
         parser.add_argument("-dh", "--height", type=int, help="Destination image height")
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="The number of threads resizing the images ahead of the consumer. "
+            "If num_workers = 0, the images are resized lazily (default: %(default)s).",
+        )
         return parser
 
-    def __init__(self, extractor: IDataset, width: int, height: int) -> None:
+    def __init__(self, extractor: IDataset, width: int, height: int, num_workers: int = 0) -> None:
         super().__init__(extractor)
 
         assert width > 0 and height > 0
         self._width = width
         self._height = height
 
+        if num_workers < 0:
+            raise ValueError(
+                f"num_workers should be a non negative integer, but it is {num_workers}."
+            )
+        self._num_workers = num_workers
+
     @staticmethod
     def _lazy_resize_image(image, new_size):
         def _resize_image():
-            h, w = image.size
-            yscale = new_size[0] / float(h)
-            xscale = new_size[1] / float(w)
-
-            # LANCZOS4 is preferable for upscaling, but it works quite slow
-            method = cv2.INTER_AREA if (xscale * yscale) < 1 else cv2.INTER_CUBIC
-
-            resized_image = cv2.resize(image.data / 255.0, new_size[::-1], interpolation=method)
-            resized_image *= 255.0
-            return resized_image
+            return image.get_resized_data(new_size)
 
         return Image.from_numpy(_resize_image, ext=image.ext, size=new_size)
 
@@ -1072,10 +1348,9 @@ class ResizeTransform(ItemTransform):
     @staticmethod
     def _lazy_resize_rlemask(mask, new_size):
         def _resize_image():
-            # Can use only NEAREST for masks,
-            # because we can't have interpolated values
-            rescaled_mask = cv2.resize(mask.image, new_size[::-1], interpolation=cv2.INTER_NEAREST)
-            return mask_utils.encode(np.asfortranarray(rescaled_mask.astype(np.uint8)))
+            # Can use only NEAREST for masks, because we can't have interpolated values.
+            # The mask is scaled without decoding.
+            return mask_tools.rle_resize(mask.rle, new_size)
 
         return _resize_image
 
@@ -1129,6 +1404,23 @@ class ResizeTransform(ItemTransform):
 
         return self.wrap_item(item, media=resized_image, annotations=resized_annotations)
 
+    def _transform_and_resize_item(self, item: DatasetItem) -> DatasetItem:
+        item = self.transform_item(item)
+        image = item.media
+        if image is None or not image.has_data:
+            return item
+        return self.wrap_item(item, media=Image.from_numpy(image.data, ext=image.ext))
+
+    def __iter__(self):
+        if not self._num_workers:
+            yield from super().__iter__()
+            return
+
+        for _, future in ordered_thread_map(
+            self._transform_and_resize_item, self._extractor, num_workers=self._num_workers
+        ):
+            yield future.result()
+
 
 class RemoveItems(ItemTransform):
     """
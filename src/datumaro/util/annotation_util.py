@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: MIT
 
 from itertools import groupby
-from typing import Callable, Dict, Iterable, NewType, Optional, Sequence, Tuple, Union
+from typing import Callable, Dict, Iterable, List, NewType, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from typing_extensions import Literal
@@ -289,3 +289,30 @@ def make_label_id_mapping(
         return id_mapping.get(src_id, fallback)
 
     return map_id, id_mapping, source_labels, target_labels
+
+
+def make_label_id_lut(id_mapping: Dict[int, Optional[int]]) -> np.ndarray:
+    """
+    Compiles a label id mapping into a lookup table for remap_label_ids().
+    The ids, which are not in the mapping or are mapped to None,
+    are mapped to -1. The last entry of the table is -1 for the ids out of it.
+    """
+
+    lut = np.full(max(id_mapping, default=-1) + 2, -1, dtype=np.int64)
+    for src_id, dst_id in id_mapping.items():
+        if dst_id is not None:
+            lut[src_id] = dst_id
+    return lut
+
+
+def remap_label_ids(lut: np.ndarray, label_ids: Sequence[Optional[int]]) -> List[int]:
+    """
+    Maps label ids with a lookup table from make_label_id_lut() in one call.
+    None and the ids out of the table are mapped to -1.
+    """
+
+    label_ids = np.array(
+        [-1 if label_id is None else label_id for label_id in label_ids], dtype=np.int64
+    )
+    label_ids[(label_ids < 0) | (len(lut) <= label_ids)] = -1
+    return lut[label_ids].tolist()
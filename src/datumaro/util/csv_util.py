@@ -0,0 +1,146 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from __future__ import annotations
+
+import csv
+import logging as log
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    from datumaro.util.import_util import lazy_import
+
+    pd = lazy_import("pandas")
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_SAMPLE_SIZE = 10_000
+
+
+def sniff_csv_sep(path: str, encoding: Optional[str] = None) -> str:
+    """
+    Detects the delimiter of a csv file by its first line,
+    like the "python" engine of pandas does for sep=None.
+    """
+
+    with open(path, "r", encoding=encoding, newline="") as f:
+        line = f.readline()
+
+    try:
+        return csv.Sniffer().sniff(line).delimiter
+    except csv.Error:
+        return ","
+
+
+def _promote_dtypes(a, b):
+    if a == b:
+        return a
+    if a.kind in "iuf" and b.kind in "iuf":
+        return np.promote_types(a, b)
+    return np.dtype(object)
+
+
+def infer_csv_dtypes(
+    path: str,
+    *,
+    dtype: Optional[Dict[str, Any]] = None,
+    sample_size: Optional[int] = DEFAULT_SAMPLE_SIZE,
+    string_storage: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Infers the column types of a csv file.
+
+    Args:
+        path: Path to the csv file
+        dtype: The known column types. They are kept as is.
+        sample_size: The number of rows the types are inferred on.
+            If None, the whole file is read chunk by chunk, and the types of
+            the chunks are promoted to the common ones.
+        string_storage: If specified, the text columns are stored
+            in pandas string arrays with this storage ("python" or "pyarrow"),
+            instead of the arrays of Python objects.
+        chunk_size: The number of rows in a chunk
+        kwargs: Extra arguments for pandas.read_csv()
+
+    Returns:
+        Column name -> type mapping, in the order of the columns
+    """
+
+    if sample_size is not None:
+        dtypes = dict(pd.read_csv(path, nrows=sample_size, dtype=dtype, **kwargs).dtypes)
+    else:
+        dtypes = {}
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=dtype, **kwargs):
+            for column, column_dtype in chunk.dtypes.items():
+                if column in dtypes:
+                    column_dtype = _promote_dtypes(dtypes[column], column_dtype)
+                dtypes[column] = column_dtype
+
+    if string_storage:
+        dtypes = {
+            column: pd.StringDtype(string_storage) if column_dtype == object else column_dtype
+            for column, column_dtype in dtypes.items()
+        }
+    return dtypes
+
+
+def read_csv_chunks(
+    path: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a csv file chunk by chunk.
+
+    Args:
+        path: Path to the csv file
+        chunk_size: The number of rows in a chunk
+        kwargs: Extra arguments for pandas.read_csv()
+    """
+
+    with pd.read_csv(path, chunksize=chunk_size, **kwargs) as reader:
+        yield from reader
+
+
+def read_csv(
+    path: str,
+    *,
+    dtype: Optional[Dict[str, Any]] = None,
+    sample_size: Optional[int] = DEFAULT_SAMPLE_SIZE,
+    string_storage: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Reads a csv file chunk by chunk with the column types inferred on a sample
+    of rows. If the rest of the file doesn't fit the inferred types,
+    the types are inferred on the whole file, and the file is read again.
+
+    Args:
+        path: Path to the csv file
+        dtype: The known column types. They are kept as is.
+        sample_size: The number of rows the types are inferred on
+        string_storage: If specified, the text columns are stored
+            in pandas string arrays with this storage ("python" or "pyarrow").
+        chunk_size: The number of rows in a chunk
+        kwargs: Extra arguments for pandas.read_csv()
+    """
+
+    options = dict(string_storage=string_storage, chunk_size=chunk_size, **kwargs)
+    dtypes = infer_csv_dtypes(path, dtype=dtype, sample_size=sample_size, **options)
+    try:
+        chunks = list(read_csv_chunks(path, dtype=dtypes, chunk_size=chunk_size, **kwargs))
+    except (ValueError, TypeError) as e:
+        log.debug("Can't read '%s' with the types inferred on a sample: %s", path, e)
+        dtypes = infer_csv_dtypes(path, dtype=dtype, sample_size=None, **options)
+        chunks = list(read_csv_chunks(path, dtype=dtypes, chunk_size=chunk_size, **kwargs))
+
+    if not chunks:
+        return pd.read_csv(path, nrows=0, dtype=dtypes, **kwargs)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True, copy=False)
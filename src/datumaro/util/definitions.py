@@ -2,10 +2,12 @@
 #
 # SPDX-License-Identifier: MIT
 
+import hashlib
+import inspect
 import logging as log
 import os
 import os.path as osp
-from typing import Tuple
+from typing import Optional, Tuple
 
 DEFAULT_SUBSET_NAME = "default"
 BboxIntCoords = Tuple[int, int, int, int]  # (x, y, w, h)
@@ -25,3 +27,85 @@ def get_datumaro_cache_dir(
         log.error(f"Cannot create DATUMARO_CACHE_DIR={DATUMARO_CACHE_DIR} since {e}.")
 
     return DATUMARO_CACHE_DIR
+
+
+# The total size of the page map indices in DATUMARO_CACHE_DIR, above which
+# the least recently used indices are removed
+PAGE_MAP_INDEX_MAX_CACHE_SIZE = 1 << 30
+
+
+def is_page_map_index_enabled() -> bool:
+    """Check DATUMARO_PAGE_MAP_INDEX environment variable. The page map index is
+    enabled by default, and it is disabled if the variable is set to "0", "false" or "no"."""
+    return os.getenv("DATUMARO_PAGE_MAP_INDEX", "").strip().lower() not in {"0", "false", "no"}
+
+
+def can_use_page_map_index(page_mapper_impl: type) -> bool:
+    """Check whether the page mapper class of the Rust extension accepts the index path.
+    The extension built from the older sources accepts only the JSON file path,
+    and it should be rebuilt, e.g. with "pip install -e .", to use the index."""
+    try:
+        return "index_path" in inspect.signature(page_mapper_impl).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def get_page_map_index_dir() -> str:
+    """Get the directory of the page map indices in DATUMARO_CACHE_DIR."""
+    return osp.join(get_datumaro_cache_dir(), "page_maps")
+
+
+def get_page_map_index_path(path: str) -> Optional[str]:
+    """Get the path to the page map index of the given JSON file in DATUMARO_CACHE_DIR.
+    The index is keyed by the absolute path of the file. If the index directory
+    cannot be created, return None.
+
+    The existing index is marked as recently used, and the least recently used indices
+    of the other files are removed, when the indices take more than
+    PAGE_MAP_INDEX_MAX_CACHE_SIZE bytes."""
+    index_dir = get_page_map_index_dir()
+
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+    except Exception as e:
+        log.warning(f"Cannot create the page map index directory={index_dir} since {e}.")
+        return None
+
+    key = hashlib.sha1(osp.abspath(path).encode()).hexdigest()
+    index_path = osp.join(index_dir, key + ".pagemap")
+
+    try:
+        if osp.exists(index_path):
+            os.utime(index_path)
+        _evict_page_map_indices(index_dir, keep=index_path)
+    except Exception as e:
+        log.warning(f"Cannot clean up the page map index directory={index_dir} since {e}.")
+
+    return index_path
+
+
+def _evict_page_map_indices(index_dir: str, keep: str) -> None:
+    indices = []
+    total_size = 0
+    with os.scandir(index_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".pagemap") or entry.path == keep:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed concurrently
+                continue
+            indices.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+    if osp.exists(keep):
+        total_size += os.stat(keep).st_size
+
+    for _, size, index_path in sorted(indices):
+        if total_size <= PAGE_MAP_INDEX_MAX_CACHE_SIZE:
+            break
+        try:
+            os.remove(index_path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
@@ -0,0 +1,390 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Cached directory listings for the dataset format detection and the source search.
+
+The format detectors and the importers look for the dataset files with many
+glob patterns over the same directory tree. On the network file systems,
+repeating the directory reads for each of them is slow. A snapshot reads
+each directory under its root path only once, and the glob patterns are
+matched in memory against the cached listings.
+"""
+
+import fnmatch
+import glob
+import io
+import os
+import os.path as osp
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+__all__ = ["FileSystemSnapshot", "fs_snapshot", "get_fs_snapshot", "iglob", "isdir", "isfile"]
+
+
+class _DirEntry(NamedTuple):
+    is_dir: bool
+    is_file: bool
+
+
+class _FileHead(NamedTuple):
+    data: bytes
+    is_complete: bool
+
+
+class _HeadCachedFile(io.RawIOBase):
+    """
+    A read-only file, which takes the data from the cached beginning of the file
+    first, and reads the rest from the file system only if it is requested.
+    """
+
+    def __init__(self, path: str, head: bytes) -> None:
+        super().__init__()
+        self._path = path
+        self._head = head
+        self._pos = 0
+        self._file: Optional[BinaryIO] = None
+
+    def _get_file(self) -> BinaryIO:
+        if self._file is None:
+            self._file = open(self._path, "rb", buffering=0)
+        return self._file
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._pos < len(self._head):
+            n = min(len(b), len(self._head) - self._pos)
+            b[:n] = self._head[self._pos : self._pos + n]
+        else:
+            f = self._get_file()
+            f.seek(self._pos)
+            n = f.readinto(b)
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = os.fstat(self._get_file().fileno()).st_size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+
+class FileSystemSnapshot:
+    """
+    Caches the directory listings under the root path. Each directory is read
+    with a single `os.scandir` call, when it is accessed for the first time.
+    The paths outside of the root are always read from the file system.
+
+    The beginnings of the files can be cached as well, so that they are read
+    only once, when they are probed by several readers. The total size of
+    the cached file data is limited.
+
+    The snapshot doesn't track changes in the file system, so it should be
+    used only for short sessions, in which the directory tree is not modified.
+    """
+
+    # The number of bytes cached from the beginning of a file
+    MAX_CACHED_HEAD_SIZE = 256 * 1024
+
+    # The total number of bytes cached from all the files
+    MAX_CACHE_SIZE = 32 * 1024 * 1024
+
+    def __init__(self, root_path: str) -> None:
+        self._root_path = osp.abspath(root_path)
+        self._dirs: Dict[str, Optional[Dict[str, _DirEntry]]] = {}
+        self._files: Dict[str, Optional[_FileHead]] = {}
+        self._cache_size = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def root_path(self) -> str:
+        return self._root_path
+
+    def covers(self, path: str) -> bool:
+        """Checks that the path is the root path or is located under it"""
+        path = osp.abspath(path)
+        return path == self._root_path or path.startswith(osp.join(self._root_path, ""))
+
+    @staticmethod
+    def _scandir(path: str) -> Optional[Dict[str, _DirEntry]]:
+        try:
+            with os.scandir(path or os.curdir) as it:
+                return {
+                    entry.name: _DirEntry(is_dir=entry.is_dir(), is_file=entry.is_file())
+                    for entry in it
+                }
+        except OSError:
+            return None
+
+    def _listdir(self, path: str) -> Optional[Dict[str, _DirEntry]]:
+        key = osp.abspath(path or os.curdir)
+        if not self.covers(key):
+            return self._scandir(path)
+
+        if key not in self._dirs:
+            with self._key_lock(key):
+                if key not in self._dirs:
+                    self._dirs[key] = self._scandir(path)
+        return self._dirs[key]
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        # Makes the concurrent readers wait for the same directory or file
+        # to be read, instead of reading it again
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _stat(self, path: str) -> Optional[_DirEntry]:
+        parent, name = osp.split(osp.abspath(path))
+        if not name or not self.covers(parent):
+            if not osp.lexists(path):
+                return None
+            return _DirEntry(is_dir=osp.isdir(path), is_file=osp.isfile(path))
+
+        entries = self._listdir(parent)
+        if not entries:
+            return None
+        return entries.get(name)
+
+    def exists(self, path: str) -> bool:
+        return self._stat(path) is not None
+
+    def isdir(self, path: str) -> bool:
+        entry = self._stat(path)
+        return entry is not None and entry.is_dir
+
+    def isfile(self, path: str) -> bool:
+        entry = self._stat(path)
+        return entry is not None and entry.is_file
+
+    def listdir(self, path: str) -> List[str]:
+        entries = self._listdir(path)
+        if entries is None:
+            raise FileNotFoundError(path)
+        return list(entries)
+
+    def open_file(self, path: str) -> BinaryIO:
+        """
+        Opens the file for reading in binary mode. The beginning of the file
+        is read only once for each file and is shared between the readers.
+        The rest of the file, if any, is read from the file system.
+
+        The files outside of the root are always read from the file system.
+        """
+        key = osp.abspath(path)
+        if not self.covers(key):
+            return open(path, "rb")
+
+        if key not in self._files:
+            with self._key_lock(key):
+                if key not in self._files:
+                    self._files[key] = self._read_head(path)
+
+        head = self._files[key]
+        if head is None:
+            return open(path, "rb")
+        if head.is_complete:
+            return io.BytesIO(head.data)
+        return io.BufferedReader(_HeadCachedFile(path, head.data))
+
+    def _read_head(self, path: str) -> Optional[_FileHead]:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head_size = min(size, self.MAX_CACHED_HEAD_SIZE)
+
+            with self._lock:
+                if self.MAX_CACHE_SIZE < self._cache_size + head_size:
+                    return None
+                self._cache_size += head_size
+
+            data = f.read(head_size)
+
+        return _FileHead(data=data, is_complete=len(data) == size)
+
+    def iglob(
+        self, pathname: str, *, root_dir: Optional[str] = None, recursive: bool = False
+    ) -> Iterator[str]:
+        """
+        Same as `glob.iglob`, but the matching is done with the cached listings.
+        """
+        it = self._iglob(pathname, root_dir, recursive, False)
+        if not pathname or recursive and pathname[:2] == "**":
+            # Skip the empty string, which means the current directory
+            it = (path for path in it if path)
+        return it
+
+    def _iglob(
+        self, pathname: str, root_dir: Optional[str], recursive: bool, dironly: bool
+    ) -> Iterator[str]:
+        # Follows the implementation of the glob module
+        dirname, basename = osp.split(pathname)
+        if not glob.has_magic(pathname):
+            if basename:
+                if self.exists(self._join(root_dir, pathname)):
+                    yield pathname
+            elif self.isdir(self._join(root_dir, dirname)):
+                yield pathname
+            return
+
+        if not dirname:
+            if recursive and basename == "**":
+                yield from self._glob2(root_dir, basename, dironly)
+            else:
+                yield from self._glob1(root_dir, basename, dironly)
+            return
+
+        if dirname != pathname and glob.has_magic(dirname):
+            dirs = self._iglob(dirname, root_dir, recursive, True)
+        else:
+            dirs = [dirname]
+
+        if glob.has_magic(basename):
+            if recursive and basename == "**":
+                glob_in_dir = self._glob2
+            else:
+                glob_in_dir = self._glob1
+        else:
+            glob_in_dir = self._glob0
+
+        for dirname in dirs:
+            for name in glob_in_dir(self._join(root_dir, dirname), basename, dironly):
+                yield osp.join(dirname, name)
+
+    @staticmethod
+    def _join(dirname: Optional[str], basename: str) -> str:
+        if not dirname or not basename:
+            return dirname or basename
+        return osp.join(dirname, basename)
+
+    def _iterdir(self, dirname: Optional[str], dironly: bool) -> Iterator[str]:
+        entries = self._listdir(dirname or "")
+        if not entries:
+            return
+        for name, entry in entries.items():
+            if not dironly or entry.is_dir:
+                yield name
+
+    def _glob0(self, dirname: str, basename: str, dironly: bool) -> List[str]:
+        if basename:
+            if self.exists(osp.join(dirname, basename)):
+                return [basename]
+        elif self.isdir(dirname):
+            return [basename]
+        return []
+
+    def _glob1(self, dirname: Optional[str], pattern: str, dironly: bool) -> List[str]:
+        names = self._iterdir(dirname, dironly)
+        if not pattern.startswith("."):
+            names = (name for name in names if not name.startswith("."))
+        return fnmatch.filter(names, pattern)
+
+    def _glob2(self, dirname: Optional[str], pattern: str, dironly: bool) -> Iterator[str]:
+        yield pattern[:0]
+        yield from self._rlistdir(dirname, dironly)
+
+    def _rlistdir(self, dirname: Optional[str], dironly: bool) -> Iterator[str]:
+        for name in self._iterdir(dirname, dironly):
+            if not name.startswith("."):
+                yield name
+                path = self._join(dirname, name)
+                for subname in self._rlistdir(path, dironly):
+                    yield osp.join(name, subname)
+
+
+# The snapshots are activated separately in each thread and each context,
+# so that concurrent sessions don't see the snapshots of each other
+_active_snapshots: ContextVar[Tuple[FileSystemSnapshot, ...]] = ContextVar(
+    "active_fs_snapshots", default=()
+)
+
+
+def get_fs_snapshot(path: str) -> Optional[FileSystemSnapshot]:
+    """Returns the active snapshot, which covers the path, if there is any"""
+    for snapshot in reversed(_active_snapshots.get()):
+        if snapshot.covers(path):
+            return snapshot
+    return None
+
+
+@contextmanager
+def fs_snapshot(path: str) -> Iterator[FileSystemSnapshot]:
+    """
+    Activates a file system snapshot for the path in the context.
+    The functions of this module use the snapshot for the paths under it.
+    If there is an active snapshot covering the path already, it is reused.
+
+    The snapshot is active only in the current thread. The threads started
+    in the context can use it, if they run in a copy of the current context
+    (see `contextvars.copy_context()`).
+    """
+    snapshot = get_fs_snapshot(path)
+    if snapshot is not None:
+        yield snapshot
+        return
+
+    snapshot = FileSystemSnapshot(path)
+    token = _active_snapshots.set(_active_snapshots.get() + (snapshot,))
+    try:
+        yield snapshot
+    finally:
+        _active_snapshots.reset(token)
+
+
+def _get_base_dir(pathname: str) -> str:
+    # The longest path prefix without the glob pattern symbols
+    dirname = osp.dirname(pathname)
+    while glob.has_magic(dirname):
+        dirname = osp.dirname(dirname)
+    return dirname
+
+
+def iglob(pathname: str, *, recursive: bool = False) -> Iterator[str]:
+    """
+    Same as `glob.iglob`, but uses the active file system snapshot, if there is one.
+    """
+    snapshot = get_fs_snapshot(_get_base_dir(pathname))
+    if snapshot is None:
+        return glob.iglob(pathname, recursive=recursive)
+    return snapshot.iglob(pathname, recursive=recursive)
+
+
+def isfile(path: str) -> bool:
+    """Same as `os.path.isfile`, but uses the active file system snapshot, if there is one."""
+    snapshot = get_fs_snapshot(path)
+    if snapshot is None:
+        return osp.isfile(path)
+    return snapshot.isfile(path)
+
+
+def isdir(path: str) -> bool:
+    """Same as `os.path.isdir`, but uses the active file system snapshot, if there is one."""
+    snapshot = get_fs_snapshot(path)
+    if snapshot is None:
+        return osp.isdir(path)
+    return snapshot.isdir(path)
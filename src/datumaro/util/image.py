@@ -6,6 +6,7 @@ from __future__ import annotations
 import os
 import os.path as osp
 import shlex
+import threading
 import weakref
 from contextlib import contextmanager
 from contextvars import ContextVar
@@ -30,18 +31,22 @@ class ImageBackend(Enum):
     PIL = auto()
 
 
-IMAGE_BACKEND: ContextVar[ImageBackend] = ContextVar("IMAGE_BACKEND")
 _image_loading_errors = (FileNotFoundError,)
 try:
     import cv2
 
-    IMAGE_BACKEND.set(ImageBackend.cv2)
+    _DEFAULT_IMAGE_BACKEND = ImageBackend.cv2
 except ModuleNotFoundError:
     import PIL
 
-    IMAGE_BACKEND.set(ImageBackend.PIL)
+    _DEFAULT_IMAGE_BACKEND = ImageBackend.PIL
     _image_loading_errors = (*_image_loading_errors, PIL.UnidentifiedImageError)
 
+# The default value is also visible in the threads, which don't inherit the context
+IMAGE_BACKEND: ContextVar[ImageBackend] = ContextVar(
+    "IMAGE_BACKEND", default=_DEFAULT_IMAGE_BACKEND
+)
+
 from datumaro.util.image_cache import ImageCache
 from datumaro.util.os_util import find_files
 
@@ -301,6 +306,158 @@ def decode_image(image_bytes: bytes, dtype: DTypeLike = np.uint8) -> np.ndarray:
     return image
 
 
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_JPEG_REDUCTION_FACTORS = (8, 4, 2)
+
+
+def _read_jpeg_header(image_bytes: bytes) -> Optional[Tuple[int, int, int]]:
+    """Reads the (height, width, number of color components) from the JPEG frame header"""
+
+    pos = 2
+    while pos + 4 <= len(image_bytes):
+        if image_bytes[pos] != 0xFF:
+            return None
+        marker = image_bytes[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2  # no payload
+        elif marker == 0xDA:
+            return None  # the image data starts before the frame header
+        elif 0xC0 <= marker <= 0xCF and marker not in {0xC4, 0xC8, 0xCC}:
+            header = image_bytes[pos + 5 : pos + 10]
+            if len(header) < 5:
+                return None
+            height = int.from_bytes(header[0:2], "big")
+            width = int.from_bytes(header[2:4], "big")
+            return height, width, header[4]
+        else:
+            pos += 2 + int.from_bytes(image_bytes[pos + 2 : pos + 4], "big")
+    return None
+
+
+def get_jpeg_size(image_bytes: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Reads the (H, W) size of a JPEG image from its header, without decoding the image.
+    Returns None if the bytes are not a JPEG image.
+    """
+
+    if not image_bytes.startswith(_JPEG_MAGIC):
+        return None
+    header = _read_jpeg_header(image_bytes)
+    if not header or not header[0] or not header[1]:
+        return None
+    return header[:2]
+
+
+def get_reduction_factor(image_size: Tuple[int, int], new_size: Tuple[int, int]) -> int:
+    """
+    Returns the largest factor (8, 4 or 2) a JPEG image can be reduced by while decoding,
+    so that it is still not smaller than the new (H, W) size, or 1, if the image is
+    downscaled less than 2x.
+    """
+
+    h, w = image_size
+    new_h, new_w = new_size
+    for factor in _JPEG_REDUCTION_FACTORS:
+        if new_h * factor <= h and new_w * factor <= w:
+            return factor
+    return 1
+
+
+def decode_reduced_image(image_bytes: bytes, factor: int) -> Optional[np.ndarray]:
+    """
+    Decodes a JPEG image at the 1/factor resolution (the size is rounded up).
+    The DCT scaling of the decoder is used, so the full resolution image is not decoded.
+
+    Args:
+        image_bytes: The encoded image
+        factor: The reduction factor, 2, 4 or 8
+
+    Returns:
+        The image in the same format as decode_image() returns, or None,
+        if the image is not a JPEG, or the reduced decoding is not supported
+        by the current image backend.
+    """
+
+    if factor not in _JPEG_REDUCTION_FACTORS or IMAGE_BACKEND.get() != ImageBackend.cv2:
+        return None
+    if not image_bytes.startswith(_JPEG_MAGIC):
+        return None
+
+    color_channel = IMAGE_COLOR_CHANNEL.get()
+    if color_channel == ImageColorChannel.UNCHANGED:
+        header = _read_jpeg_header(image_bytes)
+        if header is None:
+            return None
+        channels = header[2]
+
+        # IMREAD_UNCHANGED keeps the gray images and doesn't apply the EXIF orientation
+        flags = {
+            2: cv2.IMREAD_REDUCED_GRAYSCALE_2 if channels == 1 else cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_GRAYSCALE_4 if channels == 1 else cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_GRAYSCALE_8 if channels == 1 else cv2.IMREAD_REDUCED_COLOR_8,
+        }[factor] | cv2.IMREAD_IGNORE_ORIENTATION
+    else:
+        flags = {
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_COLOR_8,
+        }[factor]
+
+    image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flags)
+    if image is None:
+        return None
+    if color_channel == ImageColorChannel.COLOR_RGB:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return image
+
+
+def resize_image(
+    image: np.ndarray, size: Tuple[int, int], interpolation: Optional[int] = None
+) -> np.ndarray:
+    """
+    Resizes an image to the (H, W) size. The image is resized in its own type,
+    without conversion to floats.
+
+    Args:
+        image: The image in the HWC or HW format
+        size: The new (H, W) size
+        interpolation: An OpenCV interpolation method. By default, INTER_AREA is used
+            for downscaling and INTER_CUBIC - for upscaling.
+
+    Returns:
+        The resized image of the same type and the same number of channels
+    """
+
+    import cv2
+
+    h, w = image.shape[:2]
+    new_h, new_w = size
+    if (h, w) == (new_h, new_w):
+        return image
+
+    if interpolation is None:
+        # LANCZOS4 is preferable for upscaling, but it works quite slow
+        is_downscale = (new_h * new_w) < (h * w)
+        interpolation = cv2.INTER_AREA if is_downscale else cv2.INTER_CUBIC
+
+    dtype = image.dtype
+    if dtype not in {np.uint8, np.uint16, np.int16, np.float32, np.float64}:
+        image = image.astype(np.float32)
+
+    resized_image = cv2.resize(image, (new_w, new_h), interpolation=interpolation)
+    if resized_image.ndim < image.ndim:
+        resized_image = resized_image[..., np.newaxis]  # a single channel is squeezed
+
+    if resized_image.dtype != dtype:
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            resized_image = np.clip(np.rint(resized_image), info.min, info.max)
+        resized_image = resized_image.astype(dtype)
+    return resized_image
+
+
 IMAGE_EXTENSIONS = {
     ".jpg",
     ".jpeg",
@@ -394,6 +551,13 @@ class lazy_image:
                 cache.push(cache_key, image)
         return image
 
+    @property
+    def is_cached(self) -> bool:
+        """Indicates that the image is loaded and kept in the cache"""
+
+        cache = self._get_cache()
+        return cache is not None and cache.get(weakref.ref(self)) is not None
+
     def _get_cache(self) -> Optional[ImageCache]:
         if self._cache is True:
             cache = ImageCache.get_instance()
@@ -404,6 +568,75 @@ class lazy_image:
         return cache
 
 
+class SharedImageLoader:
+    """
+    Loads an image once for several consumers, e.g. for the crops of the image.
+
+    Each consumer gets a reader with make_reader(). The image is loaded, when it is
+    requested by a reader for the first time, and it is kept until each reader has
+    requested it or has been released with release(), then the image is released.
+    Readers can request the image again, but then it is loaded again,
+    if it has been released.
+    """
+
+    def __init__(self, loader: Callable[[], np.ndarray]) -> None:
+        self._loader = loader
+        self._image: Optional[np.ndarray] = None
+        self._refs = 0
+        self._lock = threading.Lock()
+
+    def make_reader(self) -> Callable[[], np.ndarray]:
+        with self._lock:
+            self._refs += 1
+        return _SharedImageReader(self)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._image is not None
+
+    def _get(self, release: bool) -> np.ndarray:
+        with self._lock:
+            image = self._image
+            if image is None:
+                image = self._loader()
+
+            if release:
+                self._refs -= 1
+            self._image = image if 0 < self._refs else None
+            return image
+
+    def _release(self) -> None:
+        with self._lock:
+            self._refs -= 1
+            if self._refs <= 0:
+                self._image = None
+
+
+class _SharedImageReader:
+    def __init__(self, loader: SharedImageLoader) -> None:
+        self._loader = loader
+        self._is_released = False
+
+    def __call__(self) -> np.ndarray:
+        release = not self._is_released
+        self._is_released = True
+        return self._loader._get(release)
+
+    def release(self) -> None:
+        """Gives up the reference to the image without loading it"""
+        if not self._is_released:
+            self._is_released = True
+            self._loader._release()
+
+    @property
+    def is_cached(self) -> bool:
+        return self._loader.is_loaded
+
+    def __deepcopy__(self, memo) -> _SharedImageReader:
+        # The copies of a media object are the same consumer
+        return self
+
+
 ImageMeta = Dict[str, Tuple[int, int]]
 """filename -> height, width"""
 
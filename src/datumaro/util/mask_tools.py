@@ -2,13 +2,15 @@
 #
 # SPDX-License-Identifier: MIT
 import logging as log
-from functools import partial
+from functools import lru_cache, partial
 from itertools import chain
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import cv2
 import numpy as np
 from pycocotools import mask as pycocotools_mask
 
+from datumaro import _capi
 from datumaro._capi import encode
 from datumaro.util.image import lazy_image, load_image
 
@@ -90,38 +92,82 @@ def unpaint_mask(painted_mask, inverse_colormap=None, default_id=None):
     return unpainted_mask
 
 
+def make_palette(colormap=None) -> np.ndarray:
+    """
+    Compiles a colormap into a lookup table for paint_mask().
+    The palettes of the colormap dicts are cached, so they are built once.
+
+    colormap: index -> (R, G, B)
+
+    Returns: (256, 3) BGR palette
+    """
+
+    if colormap is None:
+        return _default_palette
+    if isinstance(colormap, np.ndarray):
+        return colormap
+    if callable(colormap):
+        return _make_palette(colormap)
+    return _make_cached_palette(tuple((c, tuple(color)) for c, color in colormap.items()))
+
+
+def _make_palette(map_fn) -> np.ndarray:
+    palette = np.array([map_fn(c)[::-1] for c in range(256)], dtype=int).astype(np.uint8)
+    palette.flags.writeable = False
+    return palette
+
+
+@lru_cache(maxsize=16)
+def _make_cached_palette(colormap: Tuple[Tuple[int, Tuple[int, int, int]], ...]) -> np.ndarray:
+    colormap = dict(colormap)
+    return _make_palette(lambda c: colormap.get(c, (-1, -1, -1)))
+
+
 def paint_mask(mask, colormap=None):
     """
     Applies colormap to index mask
 
     mask: HW(C) [0; max_index] mask
 
-    colormap: index -> (R, G, B)
+    colormap: index -> (R, G, B), or a palette from make_palette()
     """
     check_is_mask(mask)
 
-    if colormap is None:
-        colormap = _default_colormap
-    if callable(colormap):
-        map_fn = colormap
-    else:
-        map_fn = lambda c: colormap.get(c, (-1, -1, -1))
-    palette = np.array([map_fn(c)[::-1] for c in range(256)], dtype=np.uint8)
+    palette = make_palette(colormap)
 
-    mask = mask.astype(np.uint8)
-    painted_mask = palette[mask].reshape((*mask.shape[:2], 3))
+    mask = mask.astype(np.uint8, copy=False)
+    painted_mask = np.take(palette, mask.reshape(mask.shape[:2]), axis=0)
     return painted_mask
 
 
+_default_palette = _make_palette(lambda c: _default_colormap.get(c, (-1, -1, -1)))
+
+
+def make_remap_lut(map_fn) -> np.ndarray:
+    """
+    Compiles a mask value mapping into a lookup table for remap_mask()
+
+    map_fn: old value -> new value, for the values in [0; 255]
+    """
+
+    return np.array([map_fn(c) for c in range(256)], dtype=np.uint8)
+
+
 def remap_mask(mask, map_fn):
     """
     Changes mask elements from one colormap to another
 
     # mask: HW(C) [0; max_index] mask
+    # map_fn: old value -> new value, or a lookup table from make_remap_lut()
     """
     check_is_mask(mask)
 
-    return np.array([map_fn(c) for c in range(256)], dtype=np.uint8)[mask]
+    if not isinstance(map_fn, np.ndarray):
+        map_fn = make_remap_lut(map_fn)
+
+    if mask.dtype == np.uint8 and mask.ndim == 2 and map_fn.dtype == np.uint8:
+        return cv2.LUT(mask, map_fn)
+    return np.take(map_fn, mask)
 
 
 def make_index_mask(
@@ -242,27 +288,47 @@ def mask_to_rle_py(binary_mask):
     return {"counts": counts, "size": list(binary_mask.shape)}
 
 
-def extract_contours(mask):
+def is_compressed_rle(obj) -> bool:
+    """Checks if the object is a compressed RLE (in COCO format)"""
+    return isinstance(obj, dict) and isinstance(obj.get("counts"), (str, bytes))
+
+
+def merge_rles(rles: List[Dict]) -> Dict:
+    """
+    Joins binary masks of the same size, given as compressed RLEs (in COCO format),
+    without decoding them.
+    """
+    if len(rles) == 1:
+        return rles[0]
+    return rle_union(rles)
+
+
+def extract_contours(mask, tolerance=0):
     """
     Convert an instance mask to polygons
 
     Args:
         mask: a 2d binary mask
         tolerance: maximum distance from original points of
-            a polygon to the approximated ones
-        area_threshold: minimal area of generated polygons
+            a polygon to the approximated ones. If 0, the contours
+            are not simplified.
 
     Returns:
         A list of polygons like [[x1,y1, x2,y2 ...], [...]]
     """
-    import cv2
 
     contours, _ = cv2.findContours(
-        mask.astype(np.uint8), mode=cv2.RETR_EXTERNAL, method=cv2.CHAIN_APPROX_TC89_KCOS
+        mask.astype(np.uint8, copy=False),
+        mode=cv2.RETR_EXTERNAL,
+        method=cv2.CHAIN_APPROX_TC89_KCOS,
     )
 
     results = []
     for contour in contours:
+        if 0 < tolerance:
+            # Douglas-Peucker simplification
+            contour = cv2.approxPolyDP(contour, tolerance, closed=True)
+
         if len(contour) <= 2:
             continue
 
@@ -275,29 +341,57 @@ def extract_contours(mask):
     return results
 
 
-def mask_to_polygons(mask, area_threshold=1):
+def polygon_area(points) -> float:
+    """
+    Computes the area of a polygon with the shoelace formula.
+
+    Args:
+        points: polygon points like [x1,y1, x2,y2 ...]
+
+    Returns:
+        The area of the polygon
+    """
+
+    points = np.asarray(points, dtype=float)
+    x = points[0::2]
+    y = points[1::2]
+    return 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+
+def mask_to_polygons(mask, area_threshold=1, tolerance=0):
     """
     Convert an instance mask to polygons
 
     Args:
         mask: a 2d binary mask
         tolerance: maximum distance from original points of
-            a polygon to the approximated ones
+            a polygon to the approximated ones. If 0, the contours
+            are not simplified.
         area_threshold: minimal area of generated polygons
 
     Returns:
         A list of polygons like [[x1,y1, x2,y2 ...], [...]]
     """
 
-    contours = extract_contours(mask)
+    mask = np.asarray(mask).astype(np.uint8, copy=False)
+
+    # The contours are searched only in the bounding box of the mask.
+    # The box is padded to keep the contours off the box borders.
+    x, y, w, h = cv2.boundingRect(mask)
+    if not w or not h:
+        return []
+    x0, y0 = max(x - 1, 0), max(y - 1, 0)
+    x1, y1 = min(x + w + 1, mask.shape[1]), min(y + h + 1, mask.shape[0])
 
     polygons = []
-    for contour in contours:
+    for contour in extract_contours(mask[y0:y1, x0:x1], tolerance=tolerance):
         # Check if the polygon is big enough
-        rle = pycocotools_mask.frPyObjects([contour], mask.shape[0], mask.shape[1])
-        area = sum(pycocotools_mask.area(rle))
-        if area_threshold <= area:
-            polygons.append(contour)
+        if polygon_area(contour) < area_threshold:
+            continue
+
+        contour[0::2] += x0
+        contour[1::2] += y0
+        polygons.append(contour)
     return polygons
 
 
@@ -332,6 +426,7 @@ def crop_covered_segments(
     ratio_tolerance=0.001,
     area_threshold=1,
     return_masks=False,
+    return_rles=False,
 ):
     """
     Find all segments occluded by others and crop them to the visible part only.
@@ -347,6 +442,9 @@ def crop_covered_segments(
             when an object is (almost) fully covered by another one and we
             don't want make a "hole" in the background object
         area_threshold: minimal area of included segments
+        return_masks: if True, all the segments are returned as masks
+        return_rles: if True, the masks are returned as compressed RLEs,
+            and they are computed without decoding
 
     Returns:
         A list of input segments' parts (in the same order as input):
@@ -356,15 +454,19 @@ def crop_covered_segments(
             [
                 [[x1,y1, x2,y2 ...], ...], # input segment #0 parts
                 mask1, # input segment #1 mask (if source segment is mask)
+                # or its RLE (if return_rles is True)
                 [], # when source segment is too small
                 ...
             ]
     """
     segments = [[s] for s in segments]
-    input_rles = [pycocotools_mask.frPyObjects(s, height, width) for s in segments]
+    input_rles = [
+        s if is_compressed_rle(s[0]) else pycocotools_mask.frPyObjects(s, height, width)
+        for s in segments
+    ]
 
     for i, rle_bottom in enumerate(input_rles):
-        area_bottom = sum(pycocotools_mask.area(rle_bottom))
+        area_bottom = rle_area(rle_bottom[0])
         if area_bottom < area_threshold:
             segments[i] = [] if not return_masks else None
             continue
@@ -377,7 +479,7 @@ def crop_covered_segments(
             if iou <= iou_threshold:
                 continue
 
-            area_top = sum(pycocotools_mask.area(rle_top))
+            area_top = rle_area(rle_top[0])
             area_ratio = area_top / area_bottom
 
             # If a segment is fully inside another one, skip this segment
@@ -392,23 +494,41 @@ def crop_covered_segments(
 
             rles_top += rle_top
 
-        if not rles_top and not isinstance(segments[i][0], dict) and not return_masks:
+        is_mask = return_masks or isinstance(segments[i][0], dict)
+        if not rles_top and not is_mask:
             continue
 
-        rle_bottom = rle_bottom[0]
-        bottom_mask = pycocotools_mask.decode(rle_bottom).astype(np.uint8)
-
-        if rles_top:
-            rle_top = pycocotools_mask.merge(rles_top)
-            top_mask = pycocotools_mask.decode(rle_top).astype(np.uint8)
-
-            bottom_mask -= top_mask
-            bottom_mask[bottom_mask != 1] = 0
+        if is_mask and return_rles:
+            rle_bottom = rle_bottom[0]
+            if rles_top:
+                rle_bottom = rle_subtract(rle_bottom, rle_union(rles_top))
+            segments[i] = rle_bottom
+            continue
 
-        if not return_masks and not isinstance(segments[i][0], dict):
-            segments[i] = mask_to_polygons(bottom_mask, area_threshold=area_threshold)
+        # Only the bounding box of the bottom segment can change. The box is padded
+        # to keep the contours off the box borders.
+        rle_bottom = rle_bottom[0]
+        roi, bottom_mask = decode_segment_roi(rle_bottom, height, width, padding=1)
+
+        if roi is not None and rles_top:
+            rle_top = rle_union(rles_top)
+            bottom_mask = bottom_mask & ~decode_rle_roi(rle_top, roi)
+
+        if not is_mask:
+            polygons = []
+            if roi is not None:
+                x, y = roi[:2]
+                for polygon in mask_to_polygons(bottom_mask, area_threshold=area_threshold):
+                    polygon[0::2] += x
+                    polygon[1::2] += y
+                    polygons.append(polygon)
+            segments[i] = polygons
         else:
-            segments[i] = bottom_mask
+            mask = np.zeros((height, width), dtype=np.uint8)
+            if roi is not None:
+                x, y, w, h = roi
+                mask[y : y + h, x : x + w] = bottom_mask
+            segments[i] = mask
 
     return segments
 
@@ -439,13 +559,167 @@ def find_mask_bbox(mask) -> Tuple[int, int, int, int]:
     return (x0, y0, x1 - x0, y1 - y0)
 
 
+def rle_counts(rle: Dict) -> np.ndarray:
+    """
+    Returns the run lengths of an RLE (in COCO format), compressed or not.
+    The runs are given in the column-major order, and they start from a run of zeros.
+    """
+    counts = rle["counts"]
+    if not isinstance(counts, (str, bytes)):
+        return np.asarray(counts, dtype=np.int64)
+    if isinstance(counts, str):
+        counts = counts.encode()
+
+    # Each value is encoded by 5-bit chunks with the continuation flag (0x20),
+    # the last chunk has the sign flag (0x10)
+    chars = np.frombuffer(counts, dtype=np.uint8).astype(np.int64) - 48
+    (ends,) = np.nonzero((chars & 0x20) == 0)
+    if not len(ends):
+        return np.zeros(0, dtype=np.int64)
+    chars = chars[: ends[-1] + 1]
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shifts = 5 * (np.arange(len(chars)) - np.repeat(starts, ends - starts + 1))
+    values = np.add.reduceat((chars & 0x1F) << shifts, starts)
+    is_negative = (chars[ends] & 0x10) != 0
+    values[is_negative] -= 1 << (shifts[ends][is_negative] + 5)
+
+    # The values after the 3rd one are stored as differences with the previous run of the kind
+    values[1::2] = np.cumsum(values[1::2])
+    values[2::2] = np.cumsum(values[2::2])
+    return values
+
+
+def decode_rle_roi(rle: Dict, roi: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Decodes a part of an RLE (in COCO format) mask without decoding the whole mask.
+
+    Args:
+        rle: An RLE mask, compressed or not
+        roi: The part of the mask to decode as (x, y, w, h)
+
+    Returns:
+        A binary mask of the ROI size
+    """
+    x, y, w, h = roi
+    height = rle["size"][0]
+
+    counts = rle_counts(rle)
+    ends = np.cumsum(counts)
+    starts = (ends - counts)[1::2]
+    ends = ends[1::2]
+
+    # The ROI columns make a contiguous range in the column-major order
+    begin, end = x * height, (x + w) * height
+    in_roi = (begin < ends) & (starts < end)
+    starts = np.clip(starts[in_roi], begin, end) - begin
+    ends = np.clip(ends[in_roi], begin, end) - begin
+
+    edges = np.zeros(end - begin + 1, dtype=np.int32)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, ends, -1)
+    columns = np.cumsum(edges[:-1]).astype(bool).reshape(w, height)
+    return columns[:, y : y + h].T
+
+
+def decode_segment_roi(
+    segment, height: int, width: int, padding: int = 0
+) -> Tuple[Optional[Tuple[int, int, int, int]], Optional[np.ndarray]]:
+    """
+    Finds the bounding box of a segment and decodes the segment in it.
+    Only the bounding box part of an RLE or a polygon is decoded.
+
+    Args:
+        segment: A binary mask (np.ndarray), an RLE (in COCO format)
+            or a polygon (a list like [x1, y1, x2, y2, ...])
+        height: The image height
+        width: The image width
+        padding: The number of pixels added around the bounding box (within the image)
+
+    Returns:
+        (x, y, w, h) of the ROI and a binary mask of the ROI size,
+        or (None, None) for an empty segment
+    """
+
+    if isinstance(segment, np.ndarray):
+        cols = np.any(segment, axis=0)
+        rows = np.any(segment, axis=1)
+        if not cols.any():
+            return None, None
+        x0, x1 = np.nonzero(cols)[0][[0, -1]]
+        y0, y1 = np.nonzero(rows)[0][[0, -1]]
+        x1 += 1
+        y1 += 1
+    elif isinstance(segment, dict):
+        if not is_compressed_rle(segment):
+            segment = pycocotools_mask.frPyObjects(segment, height, width)
+        x0, y0, w, h = pycocotools_mask.toBbox(segment).astype(int)
+        if not w or not h:
+            return None, None
+        x1, y1 = x0 + w, y0 + h
+    else:
+        points = np.asarray(segment, dtype=float)
+        if len(points) < 6:
+            return None, None
+        x0, x1 = int(np.floor(points[0::2].min())), int(np.ceil(points[0::2].max())) + 1
+        y0, y1 = int(np.floor(points[1::2].min())), int(np.ceil(points[1::2].max())) + 1
+
+    x0, y0 = max(0, int(x0) - padding), max(0, int(y0) - padding)
+    x1, y1 = min(width, int(x1) + padding), min(height, int(y1) + padding)
+    if x1 <= x0 or y1 <= y0:
+        return None, None
+    roi = (x0, y0, x1 - x0, y1 - y0)
+
+    if isinstance(segment, np.ndarray):
+        roi_mask = segment[y0:y1, x0:x1]
+    elif isinstance(segment, dict):
+        roi_mask = decode_rle_roi(segment, roi)
+    else:
+        # Rasterized in the same way as the whole image polygons, but in the ROI
+        points = points.copy()
+        points[0::2] -= x0
+        points[1::2] -= y0
+        rle = pycocotools_mask.frPyObjects([points.tolist()], y1 - y0, x1 - x0)[0]
+        roi_mask = pycocotools_mask.decode(rle)
+    return roi, roi_mask.astype(bool, copy=False)
+
+
+def paint_segments(canvas: np.ndarray, segments) -> np.ndarray:
+    """
+    Paints segments on a mask in place. Only the bounding box part of
+    an RLE or a polygon is decoded and painted.
+
+    Args:
+        canvas: A 2d mask to paint on
+        segments: An iterable of (segment, value) pairs. A segment can be a binary mask
+            (np.ndarray), an RLE (in COCO format) or a polygon (a list like [x1, y1, x2, y2, ...]).
+            The later segments are painted over the earlier ones.
+
+    Returns:
+        The canvas
+    """
+
+    for segment, value in segments:
+        if isinstance(segment, np.ndarray):
+            np.copyto(canvas, value, casting="unsafe", where=segment.astype(bool, copy=False))
+            continue
+
+        roi, roi_mask = decode_segment_roi(segment, *canvas.shape[:2])
+        if roi is None:
+            continue
+        x, y, w, h = roi
+        canvas[y : y + h, x : x + w][roi_mask] = value
+    return canvas
+
+
 def merge_masks(masks, start=None):
     """
     Merges masks into one, mask order is responsible for z order.
     To avoid memory explosion on mask materialization, consider passing
     a generator.
 
-    Inputs: a sequence of index masks or (binary mask, index) pairs
+    Inputs: a sequence of index masks or (binary mask, index) pairs.
+    The binary masks can also be given as RLEs (in COCO format), which
+    are painted in their bounding boxes only.
 
     Outputs: an index mask
     """
@@ -457,14 +731,121 @@ def merge_masks(masks, start=None):
     try:
         merged_mask = next(it)
         if isinstance(merged_mask, tuple) and len(merged_mask) == 2:
-            merged_mask = merged_mask[0] * merged_mask[1]
+            segment, index = merged_mask
+            if isinstance(segment, dict):
+                merged_mask = np.zeros(segment["size"], dtype=np.min_scalar_type(index))
+                paint_segments(merged_mask, [(segment, index)])
+            else:
+                merged_mask = segment * index
+        else:
+            merged_mask = merged_mask.copy()  # it's painted in place
     except StopIteration:
         return None
 
     for m in it:
         if isinstance(m, tuple) and len(m) == 2:
-            merged_mask = np.where(m[0], m[1], merged_mask)
+            segment, index = m
+            dtype = np.result_type(merged_mask, index)
+        else:
+            segment, index = m != 0, m
+            dtype = np.result_type(merged_mask, m)
+        if dtype != merged_mask.dtype:
+            merged_mask = merged_mask.astype(dtype)
+
+        if isinstance(index, np.ndarray):
+            np.copyto(merged_mask, index, where=segment)
         else:
-            merged_mask = np.where(m, m, merged_mask)
+            paint_segments(merged_mask, [(segment, index)])
 
     return merged_mask
+
+
+def rle_area(rle: Dict) -> int:
+    """
+    Computes the area of an RLE (in COCO format) mask, compressed or not.
+    """
+    return _capi.area(rle)
+
+
+def rle_bbox(rle: Dict) -> Tuple[int, int, int, int]:
+    """
+    Computes the (x, y, w, h) bounding box of an RLE (in COCO format) mask,
+    compressed or not. The box of an empty mask is (0, 0, 0, 0).
+    """
+    return _capi.bbox(rle)
+
+
+def rle_union(rles: List[Dict]) -> Dict:
+    """
+    Merges RLE (in COCO format) masks of the same size without decoding them.
+
+    Returns:
+        A compressed RLE of the union
+    """
+    return _capi.merge(list(rles))
+
+
+def rle_intersect(rles: List[Dict]) -> Dict:
+    """
+    Intersects RLE (in COCO format) masks of the same size without decoding them.
+
+    Returns:
+        A compressed RLE of the intersection
+    """
+    return _capi.merge(list(rles), intersect=True)
+
+
+def rle_subtract(rle: Dict, other: Dict) -> Dict:
+    """
+    Removes the pixels of the other RLE (in COCO format) mask of the same size
+    from the RLE mask without decoding them.
+
+    Returns:
+        A compressed RLE of the difference
+    """
+    return _capi.subtract(rle, other)
+
+
+def rle_crop(rle: Dict, roi: Tuple[int, int, int, int]) -> Dict:
+    """
+    Crops an RLE (in COCO format) mask without decoding it.
+
+    Args:
+        rle: An RLE mask, compressed or not
+        roi: The part of the mask to keep as (x, y, w, h). It can go out of
+            the mask, the outer parts are filled with zeros.
+
+    Returns:
+        A compressed RLE of the ROI size
+    """
+    x, y, w, h = (int(v) for v in roi)
+    return _capi.crop(rle, x, y, w, h)
+
+
+def rle_translate(rle: Dict, dx: int, dy: int, size: Optional[Tuple[int, int]] = None) -> Dict:
+    """
+    Shifts an RLE (in COCO format) mask without decoding it.
+
+    Args:
+        rle: An RLE mask, compressed or not
+        dx: The horizontal shift
+        dy: The vertical shift
+        size: The (h, w) size of the resulting mask. By default, the size is kept.
+
+    Returns:
+        A compressed RLE
+    """
+    h, w = size or rle["size"]
+    return rle_crop(rle, (-dx, -dy, w, h))
+
+
+def rle_resize(rle: Dict, size: Tuple[int, int]) -> Dict:
+    """
+    Scales an RLE (in COCO format) mask to the (h, w) size without decoding it.
+    The result is the same as of the nearest neighbor interpolation in OpenCV.
+
+    Returns:
+        A compressed RLE
+    """
+    h, w = size
+    return _capi.resize(rle, int(h), int(w))
@@ -3,13 +3,15 @@
 # SPDX-License-Identifier: MIT
 
 import logging as log
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from enum import IntEnum
 from queue import Full, Queue
 from threading import Condition, Thread
-from typing import Any, Generator, Iterator, Optional, TypeVar
+from typing import Any, Callable, Deque, Generator, Iterable, Iterator, Optional, Tuple, TypeVar
 
-__all__ = ["consumer_generator"]
+__all__ = ["consumer_generator", "ordered_thread_map"]
 
 
 class ProducerMessage(IntEnum):
@@ -18,6 +20,7 @@ class ProducerMessage(IntEnum):
 
 
 Item = TypeVar("Item")
+Result = TypeVar("Result")
 
 
 @contextmanager
@@ -90,3 +93,68 @@ def consumer_generator(
         with lock:
             is_terminated = True
         producer.join(timeout=join_timeout)
+
+
+def ordered_thread_map(
+    func: Callable[[Item], Result],
+    inputs: Iterable[Item],
+    num_workers: int = 0,
+    prefetch: Optional[int] = None,
+) -> Iterator[Tuple[Item, Future]]:
+    """Applies the function to the inputs in a thread pool and yields the results in order.
+
+    At most `prefetch` inputs are processed ahead of the consumer, so the memory use
+    is bounded for long input sequences. The results are returned as completed futures,
+    so that the exceptions raised by the function can be handled by the consumer,
+    at the same position in the sequence as without the thread pool.
+
+    Parameters:
+        func: A function to apply to each input. It is called from the worker threads.
+        inputs: An iterable of the function inputs.
+        num_workers: The number of worker threads. If num_workers = 0,
+            the function is called sequentially in the calling thread.
+        prefetch: The maximum number of inputs submitted to the pool ahead of the consumer.
+            If None, it is twice the number of workers.
+
+    Returns:
+        Iterator: (input, future) pairs in the order of inputs
+    """
+    if num_workers < 0:
+        raise ValueError(f"num_workers should be a non negative integer, but it is {num_workers}.")
+
+    if num_workers == 0:
+        for value in inputs:
+            future = Future()
+            try:
+                future.set_result(func(value))
+            except Exception as e:
+                future.set_exception(e)
+            yield value, future
+        return
+
+    if prefetch is None:
+        prefetch = 2 * num_workers
+    prefetch = max(prefetch, 1)
+
+    inputs = iter(inputs)
+    pending: Deque[Tuple[Item, Future]] = deque()
+    executor = ThreadPoolExecutor(max_workers=num_workers)
+    try:
+        for value in inputs:
+            pending.append((value, executor.submit(func, value)))
+            if len(pending) == prefetch:
+                break
+
+        while pending:
+            value, future = pending.popleft()
+            future.exception()  # wait for the completion
+
+            for next_value in inputs:
+                pending.append((next_value, executor.submit(func, next_value)))
+                break
+
+            yield value, future
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
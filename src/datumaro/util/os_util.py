@@ -2,7 +2,6 @@
 #
 # SPDX-License-Identifier: MIT
 
-import glob
 import importlib
 import os
 import os.path as osp
@@ -26,7 +25,7 @@ except (ModuleNotFoundError, ImportError):
     from os import remove as rmfile  # noqa: F401
     from shutil import rmtree as rmtree  # noqa: F401
 
-from . import cast
+from . import cast, fs_snapshot
 from .definitions import DEFAULT_SUBSET_NAME
 
 DEFAULT_MAX_DEPTH = 10
@@ -308,7 +307,7 @@ def extract_subset_name_from_parent(url: str, start: str) -> str:
 
 def get_all_file_extensions(path: str, ignore_dirs: Set[str]) -> List[str]:
     extensions = set()
-    for p in glob.iglob(osp.join(path, "**", "*.*"), recursive=True):
+    for p in fs_snapshot.iglob(osp.join(path, "**", "*.*"), recursive=True):
         if ignore_dirs.isdisjoint(p.split(os.sep)):
             extensions.add(osp.splitext(p)[1])
     return list(extensions)
@@ -0,0 +1,464 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Reading and writing of TFRecord files without TensorFlow.
+
+A TFRecord file is a sequence of records, each of them is stored as:
+
+    uint64 length
+    uint32 masked_crc32c(length)
+    byte   data[length]
+    uint32 masked_crc32c(data)
+
+The records of the TF Object Detection API datasets are serialized
+`tf.train.Example` protobuf messages. They are decoded and encoded here
+with a minimal implementation of the protobuf wire format, which allows
+to leave the large binary values (like the encoded images) in the file
+and to read them only when they are needed.
+"""
+
+import os
+import struct
+from typing import BinaryIO, Container, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from datumaro.components.errors import DatasetImportError
+
+__all__ = [
+    "TfrecordReader",
+    "TfrecordWriter",
+    "bytes_list_feature",
+    "crc32c",
+    "float_list_feature",
+    "int64_list_feature",
+    "make_example",
+    "masked_crc32c",
+    "parse_example",
+    "read_file_range",
+]
+
+_CRC32C_POLY = 0x82F63B78  # Castagnoli, reversed
+_UINT32_MASK = 0xFFFFFFFF
+
+
+def _make_crc32c_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint32)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ (_CRC32C_POLY if crc & 1 else 0)
+        table[i] = crc
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+_CRC32C_TABLE_LIST = _CRC32C_TABLE.tolist()
+
+# The inputs shorter than this are processed byte by byte
+_CRC32C_MIN_VECTORIZED_SIZE = 1024
+_CRC32C_MAX_LANES = 4096
+
+
+def _crc32c_update(crc: int, data: bytes) -> int:
+    table = _CRC32C_TABLE_LIST
+    for b in data:
+        crc = table[(crc ^ b) & 0xFF] ^ (crc >> 8)
+    return crc
+
+
+def _gf2_apply(matrix: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    # Multiplies the 32x32 GF(2) matrix, stored as 32 column bitmasks,
+    # by each of the 32-bit vectors
+    result = np.zeros_like(vectors)
+    for bit in range(32):
+        result ^= matrix[bit] * ((vectors >> np.uint32(bit)) & np.uint32(1))
+    return result
+
+
+def _zeros_operator(size: int) -> np.ndarray:
+    # The linear operator that updates the CRC register with 'size' zero bytes
+    columns = np.array([1 << bit for bit in range(32)], dtype=np.uint32)
+    one_byte = (columns >> np.uint32(8)) ^ _CRC32C_TABLE[columns & np.uint32(0xFF)]
+
+    result = columns
+    power = one_byte
+    while size:
+        if size & 1:
+            result = _gf2_apply(power, result)
+        size >>= 1
+        if size:
+            power = _gf2_apply(power, power)
+    return result
+
+
+def _crc32c_vectorized(data: bytes) -> int:
+    # The CRC register update is linear, so the input is split into
+    # equal chunks, whose registers are computed simultaneously,
+    # and then combined pairwise with the zero-byte shift operators.
+    # The initial register value is equivalent to XORing it into
+    # the first 4 bytes of the input with a zero initial register.
+    buffer = np.frombuffer(data, dtype=np.uint8)
+
+    lanes = 1 << min(int(np.log2(len(buffer) // 256)), int(np.log2(_CRC32C_MAX_LANES)))
+    lane_size = -(-len(buffer) // lanes)
+    padding = lanes * lane_size - len(buffer)
+
+    # The leading zeros don't change a zero register
+    padded = np.zeros(lanes * lane_size, dtype=np.uint8)
+    padded[padding:] = buffer
+    padded[padding : padding + 4] ^= np.frombuffer(struct.pack("<I", _UINT32_MASK), dtype=np.uint8)
+
+    columns = padded.reshape(lanes, lane_size).T.copy()
+    registers = np.zeros(lanes, dtype=np.uint32)
+    shift = np.uint32(8)
+    byte_mask = np.uint32(0xFF)
+    for column in columns:
+        registers = _CRC32C_TABLE[(registers ^ column) & byte_mask] ^ (registers >> shift)
+
+    operator = _zeros_operator(lane_size)
+    while len(registers) > 1:
+        registers = _gf2_apply(operator, registers[0::2]) ^ registers[1::2]
+        operator = _gf2_apply(operator, operator)
+
+    return int(registers[0]) ^ _UINT32_MASK
+
+
+def crc32c(data: bytes) -> int:
+    """Computes the CRC-32C (Castagnoli) checksum of the data"""
+
+    if len(data) < _CRC32C_MIN_VECTORIZED_SIZE:
+        return _crc32c_update(_UINT32_MASK, data) ^ _UINT32_MASK
+    return _crc32c_vectorized(data)
+
+
+def masked_crc32c(data: bytes) -> int:
+    """Computes the CRC-32C checksum in the masked form, which is used in TFRecord files"""
+
+    crc = crc32c(data)
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & _UINT32_MASK
+
+
+_HEADER_SIZE = 12
+_FOOTER_SIZE = 4
+
+
+def read_file_range(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+class TfrecordReader:
+    """
+    Reads the records of a TFRecord file.
+
+    The records can be read sequentially by iterating over the reader, or by their
+    indices. The random access uses the index of the record offsets, which is built
+    on the first use by reading only the record headers.
+    """
+
+    def __init__(self, path: str, *, check_crc: bool = True):
+        self._path = path
+        self._check_crc = check_crc
+        self._index: Optional[List[Tuple[int, int]]] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def index(self) -> List[Tuple[int, int]]:
+        """The offsets and the sizes of the record data in the file"""
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _read_header(self, f: BinaryIO, offset: int) -> int:
+        header = f.read(_HEADER_SIZE)
+        if len(header) != _HEADER_SIZE:
+            raise DatasetImportError(
+                f"The TFRecord file '{self._path}' is truncated at the offset {offset}."
+            )
+
+        size, size_crc = struct.unpack("<QI", header)
+        if self._check_crc and masked_crc32c(header[:8]) != size_crc:
+            raise DatasetImportError(
+                f"The TFRecord file '{self._path}' has a corrupted record "
+                f"at the offset {offset}: the length checksum doesn't match."
+            )
+        return size
+
+    def _build_index(self) -> List[Tuple[int, int]]:
+        index = []
+
+        with open(self._path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+
+            offset = 0
+            while offset < file_size:
+                size = self._read_header(f, offset)
+
+                data_offset = offset + _HEADER_SIZE
+                offset = data_offset + size + _FOOTER_SIZE
+                if file_size < offset:
+                    raise DatasetImportError(
+                        f"The TFRecord file '{self._path}' is truncated "
+                        f"at the offset {data_offset}."
+                    )
+
+                index.append((data_offset, size))
+                f.seek(offset)
+
+        return index
+
+    def _read_data(self, f: BinaryIO, offset: int, size: int) -> bytes:
+        buffer = f.read(size + _FOOTER_SIZE)
+        if len(buffer) != size + _FOOTER_SIZE:
+            raise DatasetImportError(
+                f"The TFRecord file '{self._path}' is truncated at the offset {offset}."
+            )
+
+        data = buffer[:size]
+        if self._check_crc:
+            (data_crc,) = struct.unpack("<I", buffer[size:])
+            if masked_crc32c(data) != data_crc:
+                raise DatasetImportError(
+                    f"The TFRecord file '{self._path}' has a corrupted record "
+                    f"at the offset {offset}: the data checksum doesn't match."
+                )
+        return data
+
+    def read(self, idx: int) -> bytes:
+        """Reads the record data by the record index"""
+
+        offset, size = self.index[idx]
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return self._read_data(f, offset, size)
+
+    def iter_with_offsets(self) -> Iterator[Tuple[int, bytes]]:
+        """Reads the records sequentially. Yields the record data and its offset in the file."""
+
+        with open(self._path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+
+            offset = 0
+            while offset < file_size:
+                size = self._read_header(f, offset)
+                data_offset = offset + _HEADER_SIZE
+                yield data_offset, self._read_data(f, data_offset, size)
+                offset = data_offset + size + _FOOTER_SIZE
+
+    def __iter__(self) -> Iterator[bytes]:
+        for _, data in self.iter_with_offsets():
+            yield data
+
+
+class TfrecordWriter:
+    """Writes the records to a TFRecord file"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+
+    def write(self, data: bytes) -> None:
+        header = struct.pack("<Q", len(data))
+        self._file.write(header)
+        self._file.write(struct.pack("<I", masked_crc32c(header)))
+        self._file.write(data)
+        self._file.write(struct.pack("<I", masked_crc32c(data)))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TfrecordWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_BYTES = 2
+_WIRE_FIXED32 = 5
+
+# The field numbers of the tf.train.Example messages
+_EXAMPLE_FEATURES = 1
+_FEATURES_FEATURE = 1
+_MAP_ENTRY_KEY = 1
+_MAP_ENTRY_VALUE = 2
+_FEATURE_BYTES_LIST = 1
+_FEATURE_FLOAT_LIST = 2
+_FEATURE_INT64_LIST = 3
+_LIST_VALUE = 1
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    # Yields the field number, the wire type and the value bounds.
+    # The varint values are returned instead of the bounds.
+    pos = start
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+
+        if wire_type == _WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+            yield field, wire_type, value, pos
+        elif wire_type == _WIRE_BYTES:
+            size, pos = _read_varint(data, pos)
+            yield field, wire_type, pos, pos + size
+            pos += size
+        elif wire_type == _WIRE_FIXED32:
+            yield field, wire_type, pos, pos + 4
+            pos += 4
+        elif wire_type == _WIRE_FIXED64:
+            yield field, wire_type, pos, pos + 8
+            pos += 8
+        else:
+            raise DatasetImportError(f"Unsupported protobuf wire type {wire_type}.")
+
+    if pos != end:
+        raise DatasetImportError("Failed to parse a tf.train.Example: the message is truncated.")
+
+
+def _to_int64(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _parse_feature(
+    data: bytes, start: int, end: int, lazy: bool
+) -> List[Union[bytes, float, int, Tuple[int, int]]]:
+    values = []
+
+    for kind, _, list_start, list_end in _iter_fields(data, start, end):
+        for field, wire_type, a, b in _iter_fields(data, list_start, list_end):
+            if field != _LIST_VALUE:
+                continue
+
+            if kind == _FEATURE_BYTES_LIST:
+                values.append((a, b) if lazy else data[a:b])
+            elif kind == _FEATURE_FLOAT_LIST:
+                values.extend(np.frombuffer(data[a:b], dtype="<f4").tolist())
+            elif kind == _FEATURE_INT64_LIST:
+                if wire_type == _WIRE_VARINT:
+                    values.append(_to_int64(a))
+                else:
+                    pos = a
+                    while pos < b:
+                        value, pos = _read_varint(data, pos)
+                        values.append(_to_int64(value))
+
+    return values
+
+
+def parse_example(
+    data: bytes, *, lazy_keys: Container[str] = ()
+) -> Dict[str, List[Union[bytes, float, int, Tuple[int, int]]]]:
+    """
+    Decodes a serialized tf.train.Example message.
+
+    Returns the values of each feature as a list. For the features in 'lazy_keys',
+    the bytes values are not copied. The (start, end) positions of the values
+    in the message are returned instead.
+    """
+
+    features = {}
+
+    for field, _, start, end in _iter_fields(data, 0, len(data)):
+        if field != _EXAMPLE_FEATURES:
+            continue
+
+        for field, _, entry_start, entry_end in _iter_fields(data, start, end):
+            if field != _FEATURES_FEATURE:
+                continue
+
+            key = None
+            value_bounds = None
+            for field, _, a, b in _iter_fields(data, entry_start, entry_end):
+                if field == _MAP_ENTRY_KEY:
+                    key = data[a:b].decode("utf-8")
+                elif field == _MAP_ENTRY_VALUE:
+                    value_bounds = (a, b)
+
+            if key is None:
+                continue
+
+            features[key] = (
+                _parse_feature(data, *value_bounds, lazy=key in lazy_keys) if value_bounds else []
+            )
+
+    return features
+
+
+def _encode_varint(value: int) -> bytes:
+    value &= (1 << 64) - 1
+    result = bytearray()
+    while True:
+        b = value & 0x7F
+        value >>= 7
+        if value:
+            result.append(b | 0x80)
+        else:
+            result.append(b)
+            return bytes(result)
+
+
+def _encode_field(field: int, payload: bytes) -> bytes:
+    return _encode_varint((field << 3) | _WIRE_BYTES) + _encode_varint(len(payload)) + payload
+
+
+def bytes_list_feature(values: Iterable[bytes]) -> bytes:
+    """Encodes a tf.train.Feature message with the bytes values"""
+    return _encode_field(
+        _FEATURE_BYTES_LIST, b"".join(_encode_field(_LIST_VALUE, value) for value in values)
+    )
+
+
+def float_list_feature(values: Iterable[float]) -> bytes:
+    """Encodes a tf.train.Feature message with the float values"""
+    packed = np.asarray(list(values), dtype="<f4").tobytes()
+    return _encode_field(_FEATURE_FLOAT_LIST, _encode_field(_LIST_VALUE, packed) if packed else b"")
+
+
+def int64_list_feature(values: Iterable[int]) -> bytes:
+    """Encodes a tf.train.Feature message with the int64 values"""
+    packed = b"".join(_encode_varint(int(value)) for value in values)
+    return _encode_field(_FEATURE_INT64_LIST, _encode_field(_LIST_VALUE, packed) if packed else b"")
+
+
+def make_example(features: Dict[str, bytes]) -> bytes:
+    """
+    Encodes a tf.train.Example message.
+
+    Args:
+        features: The feature names and the encoded tf.train.Feature messages
+    """
+    return _encode_field(
+        _EXAMPLE_FEATURES,
+        b"".join(
+            _encode_field(
+                _FEATURES_FEATURE,
+                _encode_field(_MAP_ENTRY_KEY, key.encode("utf-8"))
+                + _encode_field(_MAP_ENTRY_VALUE, feature),
+            )
+            for key, feature in features.items()
+        ),
+    )
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: MIT
 
 from time import sleep
+from unittest import mock
 
 import pytest
 
@@ -28,6 +29,14 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "new: mark the tests for the new features")
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fxt_page_map_index_dir(tmp_path_factory):
+    # The stream imports of the test datasets should not fill the user cache directory
+    index_dir = str(tmp_path_factory.mktemp("page_maps"))
+    with mock.patch("datumaro.util.definitions.get_page_map_index_dir", return_value=index_dir):
+        yield index_dir
+
+
 @pytest.fixture(scope="function")
 def test_dir():
     with TestDir() as test_dir:
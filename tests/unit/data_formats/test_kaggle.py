@@ -2,13 +2,14 @@
 #
 # SPDX-License-Identifier: MIT
 import os.path as osp
-from typing import Any, Dict
+import warnings
+from typing import Any, Dict, List, Type
 
 import numpy as np
 import pytest
 
 from datumaro.components.annotation import Bbox, Label
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.importer import Importer
 from datumaro.components.media import Image
@@ -18,7 +19,7 @@ from datumaro.plugins.data_formats.kaggle.base import *
 from .base import TestDataFormatBase
 
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import compare_datasets
+from tests.utils.test_utils import check_is_stream, compare_datasets
 
 DUMMY_DATASET_IMAGE_CSV_DIR = get_test_asset_path("kaggle_dataset", "image_csv")
 DUMMY_DATASET_IMAGE_CSV_DET_DIR = get_test_asset_path("kaggle_dataset", "image_csv_det")
@@ -527,3 +528,121 @@ class KaggleImporterTest(TestDataFormatBase):
         )
 
         compare_datasets(helper_tc, fxt_expected_dataset, dataset, require_media=False)
+
+    @pytest.mark.parametrize(
+        ["importer", "ann_file", "columns", "rows"],
+        [
+            (
+                KaggleImageCsvBase,
+                osp.join(DUMMY_DATASET_IMAGE_CSV_DET_DIR, "ann.csv"),
+                {
+                    "media": "image_name",
+                    "label": "label_name",
+                    "bbox": {"x1": "x1", "y1": "y1", "x2": "x2", "y2": "y2"},
+                },
+                [1, 2, 3, 4, 5, 6],
+            ),
+            (
+                KaggleImageCsvBase,
+                osp.join(DUMMY_DATASET_IMAGE_CSV_DET_DIR, "ann.csv"),
+                {
+                    "media": "image_name",
+                    "label": "label_name",
+                    "bbox": {"x1": "x1", "y1": "y1", "x2": "x2", "y2": "y2"},
+                },
+                [1, 4, 2, 3, 5, 6],  # the rows of "1.jpg" and "3.jpg" are scattered
+            ),
+            (
+                KaggleImageTxtBase,
+                osp.join(DUMMY_DATASET_IMAGE_TXT_DET_DIR, "ann.txt"),
+                {"media": 0, "label": 1, "bbox": {"x1": 2, "y1": 3, "x2": 4, "y2": 5}},
+                [0, 3, 1, 2, 4, 5],
+            ),
+        ],
+        ids=["CSV", "CSV_SCATTERED", "TXT_SCATTERED"],
+    )
+    @pytest.mark.parametrize("dataset_cls", [Dataset, StreamDataset])
+    def test_can_import_stream(
+        self,
+        fxt_img_det_dataset: Dataset,
+        importer: Importer,
+        ann_file: str,
+        columns: Dict[str, Any],
+        rows: List[int],
+        dataset_cls: Type[Dataset],
+        test_dir: str,
+        helper_tc,
+    ):
+        with open(ann_file) as f:
+            lines = f.readlines()
+        if ann_file.endswith(".csv"):
+            lines = [lines[0]] + [lines[row] for row in rows]
+        else:
+            lines = [lines[row] for row in rows]
+        ann_file = osp.join(test_dir, osp.basename(ann_file))
+        with open(ann_file, "w") as f:
+            f.writelines(lines)
+
+        stream = dataset_cls is StreamDataset
+        dataset = dataset_cls.import_from(
+            path=osp.join(DUMMY_DATASET_IMAGE_CSV_DET_DIR, "images"),
+            format=importer.NAME,
+            ann_file=ann_file,
+            columns=columns,
+            stream=stream,
+        )
+
+        check_is_stream(dataset, stream)
+        assert len(dataset) == 3
+        compare_datasets(helper_tc, fxt_img_det_dataset, dataset, require_media=False)
+
+    @pytest.mark.parametrize(
+        ["importer", "ann_file", "columns", "missing_row"],
+        [
+            (
+                KaggleImageCsvBase,
+                osp.join(DUMMY_DATASET_IMAGE_CSV_DET_DIR, "ann.csv"),
+                {
+                    "media": "image_name",
+                    "label": "label_name",
+                    "bbox": {"x1": "x1", "y1": "y1", "x2": "x2", "y2": "y2"},
+                },
+                "missing.jpg,dog,0,1,1,2\n",
+            ),
+            (
+                KaggleImageTxtBase,
+                osp.join(DUMMY_DATASET_IMAGE_TXT_DET_DIR, "ann.txt"),
+                {"media": 0, "label": 1, "bbox": {"x1": 2, "y1": 3, "x2": 4, "y2": 5}},
+                "missing.jpg,dog,0,1,1,2\n",
+            ),
+        ],
+        ids=["CSV", "TXT"],
+    )
+    def test_can_warn_about_missing_media_once_in_stream(
+        self,
+        importer: Importer,
+        ann_file: str,
+        columns: Dict[str, Any],
+        missing_row: str,
+        test_dir: str,
+    ):
+        with open(ann_file) as f:
+            lines = f.readlines()
+        ann_file = osp.join(test_dir, osp.basename(ann_file))
+        with open(ann_file, "w") as f:
+            f.writelines(lines + [missing_row])
+
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter("always")
+            dataset = StreamDataset.import_from(
+                path=osp.join(DUMMY_DATASET_IMAGE_CSV_DET_DIR, "images"),
+                format=importer.NAME,
+                ann_file=ann_file,
+                columns=columns,
+                stream=True,
+            )
+            for _ in range(2):
+                assert len(list(dataset)) == 3
+
+        missing_media_warnings = [w for w in caught_warnings if "missing" in str(w.message)]
+        assert len(missing_media_warnings) == 1
@@ -537,6 +537,18 @@ class MapillaryVistasTest(TestDataFormatBase):
                 "mapillary_vistas_panoptic",
                 {"format_version": "v2.0", "keep_original_category_ids": True},
             ),
+            (
+                DATASET_DIR,
+                "fxt_dataset_instances_w_polygon",
+                "mapillary_vistas_instances",
+                {"format_version": "v2.0", "parse_polygon": True, "num_workers": 2},
+            ),
+            (
+                DATASET_DIR,
+                "fxt_dataset_panoptic_w_polygon",
+                "mapillary_vistas_panoptic",
+                {"format_version": "v2.0", "parse_polygon": True, "num_workers": 2},
+            ),
         ],
     )
     def test_can_import(
@@ -0,0 +1,260 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import os.path as osp
+from functools import partial
+
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pytest
+
+from datumaro.components.annotation import (
+    AnnotationType,
+    Bbox,
+    Label,
+    LabelCategories,
+    Points,
+    RleMask,
+)
+from datumaro.components.dataset_base import DatasetBase, DatasetItem
+from datumaro.components.environment import Environment
+from datumaro.components.errors import MediaTypeError
+from datumaro.components.media import Image, PointCloud
+from datumaro.components.project import Dataset
+from datumaro.components.task import TaskType
+from datumaro.plugins.data_formats.parquet import ParquetBase, ParquetExporter, ParquetImporter
+from datumaro.plugins.data_formats.parquet.format import DatumaroParquet
+
+from ...requirements import Requirements, mark_requirement
+from .datumaro.conftest import (
+    fxt_can_save_and_load_image_with_arbitrary_extension,
+    fxt_can_save_and_load_infos,
+    fxt_can_save_dataset_with_cjk_categories,
+    fxt_relative_paths,
+    fxt_test_datumaro_format_dataset,
+)
+
+from tests.utils.test_utils import check_save_and_load, compare_datasets, compare_datasets_strict
+
+
+@pytest.fixture
+def fxt_partitioned_dataset():
+    return Dataset.from_iterable(
+        [
+            DatasetItem(
+                id=f"item_{i}",
+                subset="train" if i % 3 else "val",
+                media=Image.from_numpy(data=np.full((8, 6, 3), i)),
+                annotations=[
+                    Label(i % 2, id=0),
+                    Bbox(0, 1, 2, 3, label=(i + 1) % 2, id=1, attributes={"score": 0.5}),
+                    Points([1, 2, 3, 4], [0, 2], label=i % 2, id=2),
+                ]
+                if i != 9
+                else [],
+            )
+            for i in range(10)
+        ],
+        categories=["a", "b"],
+        task_type=TaskType.mixed,
+    )
+
+
+class ParquetFormatTest:
+    exporter = ParquetExporter
+    importer = ParquetImporter
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "fxt_dataset, compare, require_media",
+        [
+            pytest.param(
+                "fxt_test_datumaro_format_dataset",
+                compare_datasets,
+                True,
+                id="test_can_save_and_load",
+            ),
+            pytest.param(
+                "fxt_relative_paths",
+                compare_datasets,
+                True,
+                id="test_relative_paths",
+            ),
+            pytest.param(
+                "fxt_can_save_dataset_with_cjk_categories",
+                compare_datasets,
+                True,
+                id="test_can_save_dataset_with_cjk_categories",
+            ),
+            pytest.param(
+                "fxt_can_save_and_load_image_with_arbitrary_extension",
+                compare_datasets,
+                True,
+                id="test_can_save_and_load_image_with_arbitrary_extension",
+            ),
+            pytest.param(
+                "fxt_can_save_and_load_infos",
+                compare_datasets_strict,
+                True,
+                id="test_can_save_and_load_infos",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_can_save_and_load(
+        self, fxt_dataset, compare, require_media, stream, test_dir, helper_tc, request
+    ):
+        fxt_dataset = request.getfixturevalue(fxt_dataset)
+        check_save_and_load(
+            helper_tc,
+            fxt_dataset,
+            partial(self.exporter.convert, save_media=True, stream=stream),
+            test_dir,
+            importer=self.importer.NAME,
+            compare=compare,
+            require_media=require_media,
+            move_save_dir=True,
+        )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_partition_by_subset(self, fxt_partitioned_dataset, test_dir):
+        self.exporter.convert(fxt_partitioned_dataset, test_dir, save_media=True, row_group_size=2)
+
+        for dirname in [DatumaroParquet.ITEMS_DIR, DatumaroParquet.ANNOTATIONS_DIR]:
+            assert sorted(os.listdir(osp.join(test_dir, dirname))) == [
+                "subset=train",
+                "subset=val",
+            ]
+
+        # The tables can be queried with the regular parquet tools
+        table = ds.dataset(
+            osp.join(test_dir, DatumaroParquet.ANNOTATIONS_DIR), partitioning="hive"
+        ).to_table(filter=pc.field("type") == "bbox")
+        assert table.num_rows == 9
+        assert set(table.column("label").to_pylist()) == {"a", "b"}
+        assert table.column("area").to_pylist() == [6.0] * 9
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_load_subsets(self, fxt_partitioned_dataset, test_dir, helper_tc):
+        self.exporter.convert(fxt_partitioned_dataset, test_dir, save_media=True)
+
+        dataset = Dataset.import_from(test_dir, self.importer.NAME, subsets=["val"])
+
+        compare_datasets(helper_tc, fxt_partitioned_dataset.get_subset("val").as_dataset(), dataset)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_load_selected_annotation_types(self, fxt_partitioned_dataset, test_dir, helper_tc):
+        self.exporter.convert(fxt_partitioned_dataset, test_dir, save_media=True)
+
+        dataset = Dataset.import_from(test_dir, self.importer.NAME, ann_types=["bbox", "label"])
+
+        expected = Dataset.from_iterable(
+            [
+                item.wrap(
+                    annotations=[
+                        ann for ann in item.annotations if ann.type != AnnotationType.points
+                    ]
+                )
+                for item in fxt_partitioned_dataset
+            ],
+            categories=fxt_partitioned_dataset.categories(),
+            task_type=TaskType.detection,
+        )
+        compare_datasets(helper_tc, expected, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "ann_filter",
+        [
+            pytest.param([("label", "=", "b")], id="dnf"),
+            pytest.param(pc.field("label") == "b", id="expression"),
+        ],
+    )
+    def test_can_filter_annotations(self, fxt_partitioned_dataset, ann_filter, test_dir, helper_tc):
+        self.exporter.convert(fxt_partitioned_dataset, test_dir, save_media=True)
+
+        source = ParquetBase(
+            osp.join(test_dir, DatumaroParquet.META_FILE),
+            ann_filter=ann_filter,
+            drop_empty_items=True,
+        )
+
+        expected = Dataset.from_iterable(
+            [
+                item.wrap(annotations=[ann for ann in item.annotations if ann.label == 1])
+                for item in fxt_partitioned_dataset
+                if item.annotations
+            ],
+            categories=fxt_partitioned_dataset.categories(),
+            task_type=TaskType.mixed,
+        )
+        compare_datasets(helper_tc, expected, Dataset.from_extractors(source))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_reference_media_by_path(self, test_dir, helper_tc):
+        image_path = osp.join(test_dir, "image.png")
+        Image.from_numpy(data=np.ones((4, 3, 3))).save(image_path)
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="a",
+                    media=Image.from_file(path=image_path),
+                    annotations=[
+                        RleMask(
+                            rle={"counts": b"04L0", "size": [4, 3]},
+                            label=0,
+                            id=1,
+                        )
+                    ],
+                )
+            ],
+            categories=["a"],
+            task_type=TaskType.segmentation_instance,
+        )
+        export_dir = osp.join(test_dir, "export")
+        self.exporter.convert(dataset, export_dir, save_media=False)
+
+        parsed = Dataset.import_from(export_dir, self.importer.NAME)
+
+        assert parsed.get("a").media.path == image_path
+        compare_datasets(helper_tc, dataset, parsed, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_detect(self, fxt_partitioned_dataset, test_dir):
+        self.exporter.convert(fxt_partitioned_dataset, test_dir, save_media=True)
+
+        detected_formats = Environment().detect_dataset(test_dir)
+        assert [self.importer.NAME] == detected_formats
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_cannot_save_point_cloud(self, test_dir):
+        dataset = Dataset.from_iterable(
+            [DatasetItem(id="a", media=PointCloud.from_file(path="a.pcd"))],
+            media_type=PointCloud,
+        )
+
+        with pytest.raises(MediaTypeError):
+            self.exporter.convert(dataset, test_dir, save_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_save_dataset_without_media_type(self, test_dir, helper_tc):
+        class SourceWithoutMedia(DatasetBase):
+            def __init__(self):
+                super().__init__(media_type=None)
+
+            def __iter__(self):
+                yield DatasetItem(id="a", annotations=[Label(0)])
+
+            def categories(self):
+                return {AnnotationType.label: LabelCategories.from_iterable(["a"])}
+
+        self.exporter.convert(SourceWithoutMedia(), test_dir)
+
+        expected = Dataset.from_iterable(
+            [DatasetItem(id="a", annotations=[Label(0)])], categories=["a"]
+        )
+        dataset = Dataset.import_from(test_dir, self.importer.NAME)
+        compare_datasets(helper_tc, expected, dataset)
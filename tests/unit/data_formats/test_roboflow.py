@@ -32,14 +32,6 @@ from .base import TestDataFormatBase
 from tests.utils.assets import get_test_asset_path
 from tests.utils.test_utils import compare_datasets
 
-try:
-    import tensorflow as tf
-except ImportError:
-    TF_AVAILABLE = False
-else:
-    TF_AVAILABLE = True
-
-
 DUMMY_DATASET_COCO_DIR = get_test_asset_path("roboflow_dataset", "coco")
 DUMMY_DATASET_VOC_DIR = get_test_asset_path("roboflow_dataset", "voc")
 DUMMY_DATASET_YOLO_DIR = get_test_asset_path("roboflow_dataset", "yolo")
@@ -359,7 +351,6 @@ class RoboflowImporterTest(TestDataFormatBase):
             importer=importer,
         )
 
-    @pytest.mark.skipif(not TF_AVAILABLE, reason="Tensorflow is not installed")
     @pytest.mark.parametrize(
         ["fxt_dataset_dir", "importer"],
         [
@@ -370,7 +361,6 @@ class RoboflowImporterTest(TestDataFormatBase):
         detected_formats = DEFAULT_ENVIRONMENT.detect_dataset(fxt_dataset_dir)
         assert [importer.NAME] == detected_formats
 
-    @pytest.mark.skipif(not TF_AVAILABLE, reason="Tensorflow is not installed")
     @pytest.mark.parametrize(
         ["fxt_dataset_dir", "fxt_expected_dataset", "importer"],
         [
@@ -390,7 +380,6 @@ class RoboflowImporterTest(TestDataFormatBase):
 
         compare_datasets(helper_tc, fxt_expected_dataset, dataset, require_media=False)
 
-    @pytest.mark.skipif(not TF_AVAILABLE, reason="Tensorflow is not installed")
     def test_parse_labelmap_roboflow_tfrecod(self):
         test_text = """
             item {
@@ -3,17 +3,20 @@
 # SPDX-License-Identifier: MIT
 
 import os
+import os.path as osp
+from unittest import mock
 
 import pytest
 
 from datumaro.components.annotation import Bbox, RleMask
-from datumaro.components.dataset import Dataset, DatasetItem
+from datumaro.components.dataset import Dataset, DatasetItem, StreamDataset
 from datumaro.components.media import Image
 from datumaro.components.task import TaskType
 from datumaro.plugins.data_formats.segment_anything import (
     SegmentAnythingExporter,
     SegmentAnythingImporter,
 )
+from datumaro.util import parse_json_file
 
 from ...requirements import Requirements, mark_requirement
 from .base import TestDataFormatBase
@@ -110,3 +113,40 @@ class SegmentAnythingTest(TestDataFormatBase):
     @pytest.fixture
     def fxt_dataset_dir(self) -> str:
         return get_test_asset_path("segment_anything_dataset")
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize("dataset_cls", [Dataset, StreamDataset])
+    def test_can_import(
+        self, fxt_dataset_dir, fxt_expected_dataset, fxt_import_kwargs, dataset_cls, request
+    ):
+        return super().test_can_import(
+            fxt_dataset_dir,
+            fxt_expected_dataset,
+            fxt_import_kwargs,
+            request,
+            dataset_cls=dataset_cls,
+        )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize("fxt_import_kwargs", [{"num_workers": 2}])
+    def test_can_import_with_num_workers(
+        self, fxt_dataset_dir, fxt_expected_dataset, fxt_import_kwargs, request
+    ):
+        return super().test_can_import(
+            fxt_dataset_dir, fxt_expected_dataset, fxt_import_kwargs, request
+        )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_export_rle_masks_without_decoding(self, fxt_expected_dataset, test_dir):
+        dataset = Dataset.from_iterable(
+            [fxt_expected_dataset.get("a")], task_type=TaskType.segmentation_instance
+        )
+
+        with mock.patch.object(RleMask, "_decode", side_effect=AssertionError("decoded")):
+            dataset.export(test_dir, SegmentAnythingExporter.NAME)
+
+        exported = parse_json_file(osp.join(test_dir, "a.json"))
+        assert [{"size": [5, 10], "counts": "`04n0"}] == [
+            ann["segmentation"] for ann in exported["annotations"]
+        ]
+        assert [4] == [ann["area"] for ann in exported["annotations"]]
@@ -257,9 +257,21 @@ class VocFormatImportExportTest(TestDataFormatBase):
             (DUMMY_DATASET_DIR, "fxt_segmentation_dataset", VocSegmentationImporter, {}),
             (DUMMY_DATASET_DIR, "fxt_layout_dataset", VocLayoutImporter, {}),
             (DUMMY_DATASET_DIR, "fxt_action_dataset", VocActionImporter, {}),
+            (
+                DUMMY_DATASET_DIR,
+                "fxt_detection_dataset",
+                VocDetectionImporter,
+                {"num_workers": 2},
+            ),
+            (
+                DUMMY_DATASET_DIR,
+                "fxt_segmentation_dataset",
+                VocSegmentationImporter,
+                {"num_workers": 2},
+            ),
         ],
         indirect=["fxt_expected_dataset"],
-        ids=["cls", "det", "seg", "layout", "action"],
+        ids=["cls", "det", "seg", "layout", "action", "det_num_workers", "seg_num_workers"],
     )
     def test_can_import(
         self,
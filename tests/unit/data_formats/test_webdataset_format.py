@@ -0,0 +1,227 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import os.path as osp
+import tarfile
+from functools import partial
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from datumaro.components.annotation import AnnotationType, Bbox, Label, LabelCategories
+from datumaro.components.dataset import StreamDataset
+from datumaro.components.dataset_base import DatasetBase, DatasetItem
+from datumaro.components.environment import Environment
+from datumaro.components.errors import MediaTypeError
+from datumaro.components.media import Image, PointCloud
+from datumaro.components.project import Dataset
+from datumaro.components.task import TaskType
+from datumaro.plugins.data_formats.webdataset import WebDatasetExporter, WebDatasetImporter
+from datumaro.plugins.data_formats.webdataset.format import WebDatasetPath
+
+from ...requirements import Requirements, mark_requirement
+from .datumaro.conftest import (
+    fxt_can_save_and_load_image_with_arbitrary_extension,
+    fxt_can_save_and_load_infos,
+    fxt_can_save_dataset_with_cjk_categories,
+    fxt_relative_paths,
+    fxt_test_datumaro_format_dataset,
+)
+
+from tests.utils.test_utils import check_save_and_load, compare_datasets, compare_datasets_strict
+
+
+@pytest.fixture
+def fxt_sharded_dataset():
+    return Dataset.from_iterable(
+        [
+            DatasetItem(
+                id=f"item_{i}",
+                subset="train" if i % 3 else "val",
+                media=Image.from_numpy(data=np.full((8, 6, 3), i)),
+                annotations=[Label(i % 2), Bbox(0, 1, 2, 3, label=(i + 1) % 2)],
+            )
+            for i in range(10)
+        ],
+        categories=["a", "b"],
+        task_type=TaskType.detection,
+    )
+
+
+class WebDatasetFormatTest:
+    exporter = WebDatasetExporter
+    importer = WebDatasetImporter
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "fxt_dataset, compare, require_media",
+        [
+            pytest.param(
+                "fxt_test_datumaro_format_dataset",
+                compare_datasets,
+                True,
+                id="test_can_save_and_load",
+            ),
+            pytest.param(
+                "fxt_relative_paths",
+                compare_datasets,
+                True,
+                id="test_relative_paths",
+            ),
+            pytest.param(
+                "fxt_can_save_dataset_with_cjk_categories",
+                compare_datasets,
+                True,
+                id="test_can_save_dataset_with_cjk_categories",
+            ),
+            pytest.param(
+                "fxt_can_save_and_load_image_with_arbitrary_extension",
+                compare_datasets,
+                True,
+                id="test_can_save_and_load_image_with_arbitrary_extension",
+            ),
+            pytest.param(
+                "fxt_can_save_and_load_infos",
+                compare_datasets_strict,
+                True,
+                id="test_can_save_and_load_infos",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_can_save_and_load(
+        self, fxt_dataset, compare, require_media, stream, test_dir, helper_tc, request
+    ):
+        fxt_dataset = request.getfixturevalue(fxt_dataset)
+        check_save_and_load(
+            helper_tc,
+            fxt_dataset,
+            partial(self.exporter.convert, save_media=True),
+            test_dir,
+            importer=self.importer.NAME,
+            compare=compare,
+            require_media=require_media,
+            move_save_dir=True,
+            stream=stream,
+        )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize("stream", [True, False])
+    @pytest.mark.parametrize("save_index", [True, False])
+    def test_can_split_into_shards(
+        self, fxt_sharded_dataset, stream, save_index, test_dir, helper_tc
+    ):
+        self.exporter.convert(
+            fxt_sharded_dataset,
+            test_dir,
+            save_media=True,
+            max_shard_count=2,
+            save_index=save_index,
+            stream=stream,
+        )
+
+        shards = sorted(f for f in os.listdir(test_dir) if f.endswith(WebDatasetPath.SHARD_EXT))
+        assert shards == [
+            "train-000000.tar",
+            "train-000001.tar",
+            "train-000002.tar",
+            "val-000000.tar",
+            "val-000001.tar",
+        ]
+        for shard in shards:
+            index_path = osp.join(test_dir, osp.splitext(shard)[0] + WebDatasetPath.INDEX_EXT)
+            assert osp.isfile(index_path) == save_index
+
+        dataset_cls = StreamDataset if stream else Dataset
+        dataset = dataset_cls.import_from(test_dir, self.importer.NAME)
+
+        compare_datasets(helper_tc, fxt_sharded_dataset, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_shard_size_is_bounded(self, fxt_sharded_dataset, test_dir, helper_tc):
+        max_shard_size = 8 * tarfile.BLOCKSIZE
+        self.exporter.convert(
+            fxt_sharded_dataset, test_dir, save_media=True, max_shard_size=max_shard_size
+        )
+
+        shards = [f for f in os.listdir(test_dir) if f.endswith(WebDatasetPath.SHARD_EXT)]
+        assert 2 < len(shards)
+        for shard in shards:
+            # The end-of-archive padding is not counted
+            with tarfile.open(osp.join(test_dir, shard)) as tar:
+                assert max(m.offset_data + m.size for m in tar) <= max_shard_size
+
+        dataset = Dataset.import_from(test_dir, self.importer.NAME)
+
+        compare_datasets(helper_tc, fxt_sharded_dataset, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_ignore_outdated_index(self, fxt_sharded_dataset, test_dir, helper_tc):
+        self.exporter.convert(fxt_sharded_dataset, test_dir, save_media=True)
+
+        shard_path = osp.join(test_dir, "train-000000.tar")
+        with tarfile.open(shard_path, "a") as tar:
+            tar.add(__file__, arcname="extra.txt")
+
+        dataset = Dataset.import_from(test_dir, self.importer.NAME)
+
+        compare_datasets(helper_tc, fxt_sharded_dataset, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_detect(self, fxt_sharded_dataset, test_dir):
+        self.exporter.convert(fxt_sharded_dataset, test_dir, save_media=True)
+
+        detected_formats = Environment().detect_dataset(test_dir)
+        assert [self.importer.NAME] == detected_formats
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_detect_from_probed_stream(self, fxt_sharded_dataset, test_dir):
+        self.exporter.convert(fxt_sharded_dataset, test_dir, save_media=True)
+
+        with mock.patch.object(tarfile, "open", wraps=tarfile.open) as tar_open:
+            detected_formats = Environment().detect_dataset(test_dir)
+
+        assert [self.importer.NAME] == detected_formats
+        # The shards are not reopened, the metadata is read from the probed file
+        assert tar_open.call_count > 0
+        assert all(call.kwargs.get("fileobj") for call in tar_open.call_args_list)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_cannot_detect_tar_without_meta(self, test_dir):
+        with tarfile.open(osp.join(test_dir, "shard-000000.tar"), "w") as tar:
+            tar.add(__file__, arcname="a.json")
+
+        assert [] == Environment().detect_dataset(test_dir)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_cannot_save_point_cloud(self, test_dir):
+        dataset = Dataset.from_iterable(
+            [DatasetItem(id="a", media=PointCloud.from_file(path="a.pcd"))],
+            media_type=PointCloud,
+        )
+
+        with pytest.raises(MediaTypeError):
+            self.exporter.convert(dataset, test_dir, save_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_save_dataset_without_media_type(self, test_dir, helper_tc):
+        class SourceWithoutMedia(DatasetBase):
+            def __init__(self):
+                super().__init__(media_type=None)
+
+            def __iter__(self):
+                yield DatasetItem(id="a", annotations=[Label(0)])
+
+            def categories(self):
+                return {AnnotationType.label: LabelCategories.from_iterable(["a"])}
+
+        self.exporter.convert(SourceWithoutMedia(), test_dir)
+
+        expected = Dataset.from_iterable(
+            [DatasetItem(id="a", annotations=[Label(0)])], categories=["a"]
+        )
+        dataset = Dataset.import_from(test_dir, self.importer.NAME)
+        compare_datasets(helper_tc, expected, dataset)
@@ -4,8 +4,10 @@
 
 # pylint: disable=signature-differs
 
+import os.path as osp
 from copy import deepcopy
 from typing import Any, Dict, Optional, Type
+from unittest import mock
 
 import numpy as np
 import pytest
@@ -14,9 +16,10 @@ from datumaro.components.annotation import Bbox
 from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.exporter import Exporter
-from datumaro.components.importer import Importer
+from datumaro.components.importer import ImportContext, Importer
 from datumaro.components.media import Image
 from datumaro.components.task import TaskType
+from datumaro.plugins.data_formats.yolo.base import YoloStrictBase
 from datumaro.plugins.data_formats.yolo.exporter import YoloExporter, YoloUltralyticsExporter
 from datumaro.plugins.data_formats.yolo.importer import YoloImporter
 from datumaro.util.definitions import DEFAULT_SUBSET_NAME
@@ -86,9 +89,11 @@ class YoloFormatTest(TestDataFormatBase):
             (STRICT_DIR, "fxt_train_dataset", {}),
             (ANNOTATIONS_DIR, "fxt_default_dataset", {}),
             (LABELS_DIR, "fxt_train_val_dataset", {}),
+            (STRICT_DIR, "fxt_train_dataset", {"num_workers": 2}),
+            (LABELS_DIR, "fxt_train_val_dataset", {"num_workers": 2}),
         ],
         indirect=["fxt_expected_dataset"],
-        ids=["strict", "annotations", "labels"],
+        ids=["strict", "annotations", "labels", "strict_num_workers", "labels_num_workers"],
     )
     def test_can_import(
         self,
@@ -136,3 +141,27 @@ class YoloFormatTest(TestDataFormatBase):
             importer=importer,
             dataset_cls=dataset_cls,
         )
+
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_can_report_progress_per_subset(
+        self, fxt_train_dataset: Dataset, test_dir: str, num_workers: int
+    ):
+        fxt_train_dataset.export(test_dir, YoloExporter.NAME, save_media=True)
+
+        progress_reporter = mock.MagicMock()
+        subset_reporter = mock.MagicMock()
+        subset_reporter.iter.side_effect = lambda iterable, **kwargs: iterable
+        progress_reporter.split.return_value = [subset_reporter]
+
+        extractor = YoloStrictBase(
+            osp.join(test_dir, "obj.data"),
+            subset="train",
+            num_workers=num_workers,
+            ctx=ImportContext(progress_reporter=progress_reporter),
+        )
+
+        assert len(list(extractor)) == 1
+        progress_reporter.split.assert_called_once_with(1)
+        progress_reporter.iter.assert_not_called()
+        subset_reporter.iter.assert_called_once()
+        assert subset_reporter.iter.call_args.kwargs["total"] == 1
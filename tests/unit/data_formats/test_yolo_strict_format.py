@@ -254,6 +254,49 @@ class YoloExportertTest:
         assert actual.is_stream == is_stream
         compare_datasets(helper_tc, expected, actual, require_media=True)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_inplace_save_updates_only_patched_items(self, test_dir, helper_tc):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    1,
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((2, 4, 3))),
+                    annotations=[Bbox(0, 0, 2, 1, label=0)],
+                ),
+                DatasetItem(2, subset="train", media=Image.from_numpy(data=np.ones((3, 2, 3)))),
+                DatasetItem(3, subset="valid", media=Image.from_numpy(data=np.ones((2, 2, 3)))),
+            ],
+            categories=["a", "b"],
+            task_type=TaskType.detection,
+        )
+        dataset.export(test_dir, "yolo", save_media=True)
+        os.unlink(osp.join(test_dir, "obj_train_data", "1.txt"))
+
+        dataset.put(
+            DatasetItem(
+                2,
+                subset="train",
+                media=Image.from_numpy(data=np.ones((3, 2, 3))),
+                annotations=[Bbox(0, 1, 1, 1, label=1)],
+            )
+        )
+        dataset.put(DatasetItem(4, subset="test", media=Image.from_numpy(data=np.ones((2, 2, 3)))))
+        dataset.remove(3, "valid")
+        dataset.save(save_media=True)
+
+        assert {"1.jpg", "2.txt", "2.jpg"} == set(os.listdir(osp.join(test_dir, "obj_train_data")))
+        assert not osp.isfile(osp.join(test_dir, "valid.txt"))
+        with open(osp.join(test_dir, "train.txt"), encoding="utf-8") as f:
+            assert ["data/obj_train_data/1.jpg", "data/obj_train_data/2.jpg"] == [
+                line.strip() for line in f
+            ]
+        with open(osp.join(test_dir, "obj.data"), encoding="utf-8") as f:
+            config = f.read()
+        assert "train = data/train.txt" in config
+        assert "test = data/test.txt" in config
+        assert "valid" not in config
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     @pytest.mark.parametrize("dataset_cls, is_stream", [(Dataset, False), (StreamDataset, True)])
     def test_can_save_and_load_with_meta_file(self, dataset_cls, is_stream, test_dir, helper_tc):
@@ -368,6 +368,48 @@ class CifarImporterTest(TestCase):
 
         compare_datasets(self, expected_dataset, dataset, require_media=True)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_batch_array_without_copying(self):
+        images = np.arange(3 * 3 * 32 * 32, dtype=np.uint8).reshape(3, 3, 32, 32)
+        expected_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="image_%s" % i,
+                    subset="data_batch_1",
+                    media=Image.from_numpy(data=images[i].transpose(1, 2, 0)),
+                    annotations=[Label(i)],
+                )
+                for i in range(3)
+            ],
+            categories=["airplane", "automobile", "bird"],
+            task_type=TaskType.classification,
+        )
+
+        with TestDir() as test_dir:
+            with open(osp.join(test_dir, "batches.meta"), "wb") as f:
+                pickle.dump({"label_names": ["airplane", "automobile", "bird"]}, f)
+            with open(osp.join(test_dir, "data_batch_1"), "wb") as f:
+                pickle.dump(
+                    {
+                        "batch_label": "training batch 1 of 5",
+                        "labels": [0, 1, 2],
+                        "data": images.reshape(3, -1),
+                        "filenames": ["image_0.png", "image_1.png", "image_2.png"],
+                    },
+                    f,
+                )
+
+            dataset = Dataset.import_from(test_dir, "cifar")
+
+            compare_datasets(self, expected_dataset, dataset, require_media=True)
+            # The images are views into the batch array
+            image_0 = dataset.get("image_0", "data_batch_1").media.data
+            image_2 = dataset.get("image_2", "data_batch_1").media.data
+            self.assertEqual(
+                2 * 3 * 32 * 32,
+                image_2.__array_interface__["data"][0] - image_0.__array_interface__["data"][0],
+            )
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_detect_10(self):
         detected_formats = Environment().detect_dataset(DUMMY_10_DATASET_DIR)
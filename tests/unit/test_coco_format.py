@@ -10,9 +10,11 @@ import shutil
 from copy import deepcopy
 from functools import partial
 from io import StringIO
-from unittest import TestCase, skip
+from multiprocessing.pool import Pool
+from unittest import TestCase, mock, skip
 
 import numpy as np
+import pycocotools.mask as mask_utils
 import pytest
 
 from datumaro.components.annotation import (
@@ -26,6 +28,7 @@ from datumaro.components.annotation import (
     Points,
     PointsCategories,
     Polygon,
+    RleMask,
 )
 from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
@@ -41,7 +44,7 @@ from datumaro.components.errors import (
 )
 from datumaro.components.media import Image
 from datumaro.components.task import TaskType
-from datumaro.plugins.data_formats.coco.base import CocoInstancesBase
+from datumaro.plugins.data_formats.coco.base import CocoInstancesBase, _CocoBase
 from datumaro.plugins.data_formats.coco.exporter import (
     CocoCaptionsExporter,
     CocoExporter,
@@ -230,6 +233,86 @@ class CocoImporterTest:
         check_is_stream(dataset, stream)
         compare_datasets(helper_tc, expected, dataset, require_media=True)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "format, merge_instance_polygons",
+        [
+            ("coco_instances", True),
+            ("coco_instances", False),
+            ("coco_person_keypoints", False),
+            ("coco_captions", False),
+        ],
+    )
+    def test_can_import_with_num_workers(
+        self, format, merge_instance_polygons, test_dir, helper_tc
+    ):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=f"item_{i}",
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((10, 10, 3))),
+                    annotations=[
+                        Polygon([j % 5, 0, 5, 0, 5, 5.5], label=j % 2, id=i * 10 + j, group=j)
+                        for j in range(1, 8)
+                    ]
+                    + [
+                        Bbox(1, 1.3, 2, 2.7, label=1, id=i * 10 + 9, group=9),
+                        Points([1, 2, 3.5, 4], [0, 2], label=1, id=i * 10 + 9, group=9),
+                        Caption(f"caption {i}", id=i * 10 + 8, group=8),
+                    ],
+                )
+                for i in range(5)
+            ],
+            categories={
+                AnnotationType.label: LabelCategories.from_iterable(["a", "b"]),
+                AnnotationType.points: PointsCategories.from_iterable(
+                    [(0, ["p1", "p2"], set()), (1, ["p1", "p2"], set())]
+                ),
+            },
+            task_type=TaskType.segmentation_instance,
+        )
+        source_dataset.export(test_dir, format, save_media=True)
+
+        expected = Dataset.import_from(
+            test_dir, format, merge_instance_polygons=merge_instance_polygons
+        )
+        # The pool is used only for the large annotation files
+        with mock.patch.object(_CocoBase, "_MIN_POOL_ANN_COUNT", 0), mock.patch(
+            "datumaro.plugins.data_formats.coco.base.Pool", wraps=Pool
+        ) as pool:
+            dataset = Dataset.import_from(
+                test_dir,
+                format,
+                merge_instance_polygons=merge_instance_polygons,
+                num_workers=2,
+            )
+
+        pool.assert_called_once()
+        assert dataset.task_type() == expected.task_type()
+        compare_datasets(helper_tc, expected, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_small_file_without_pool(self, test_dir, helper_tc):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="a",
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((10, 10, 3))),
+                    annotations=[Bbox(1, 1, 2, 2, label=0, id=1, group=1)],
+                )
+            ],
+            categories=["a"],
+        )
+        source_dataset.export(test_dir, "coco_instances", save_media=True)
+
+        with mock.patch("datumaro.plugins.data_formats.coco.base.Pool") as pool:
+            dataset = Dataset.import_from(test_dir, "coco_instances", num_workers=2)
+
+        pool.assert_not_called()
+        compare_datasets(helper_tc, source_dataset, dataset, require_media=True, ignored_attrs="*")
+
     @skip(
         "COCO format is required to specify the task in annotation file "
         " for resolving ambiguity problem."
@@ -1319,6 +1402,25 @@ class CocoExtractorTests(TestCase):
                     self.assertIsInstance(capture.exception.__cause__, MissingFieldError)
                     self.assertEqual(capture.exception.__cause__.name, field)
 
+    @mark_requirement(Requirements.DATUM_ERROR_REPORTING)
+    def test_can_report_missing_ann_field_with_num_workers(self):
+        with TestDir() as test_dir:
+            ann_path = self._get_dummy_annotation_path(test_dir)
+            anns = deepcopy(self.ANNOTATION_JSON_TEMPLATE)
+            anns["annotations"][0].pop("bbox")
+            dump_json_file(ann_path, anns)
+
+            with self.assertRaises(AnnotationImportError) as capture:
+                try:
+                    with mock.patch.object(_CocoBase, "_MIN_POOL_ANN_COUNT", 0):
+                        Dataset.import_from(ann_path, "coco_instances", num_workers=2)
+                except DatasetImportError as e:
+                    if str(e).startswith("Failed to import dataset"):
+                        raise e.__cause__
+                    raise e
+            self.assertIsInstance(capture.exception.__cause__, MissingFieldError)
+            self.assertEqual(capture.exception.__cause__.name, "bbox")
+
     @mark_requirement(Requirements.DATUM_ERROR_REPORTING)
     def test_can_report_missing_global_field(self):
         for field in ["images", "annotations", "categories"]:
@@ -2168,6 +2270,70 @@ class CocoExporterTest:
             stream=stream,
         )
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_save_rle_masks_without_decoding(self, test_dir, stream: bool):
+        mask = np.zeros((5, 10), dtype=np.uint8)
+        mask[1:4, 2:6] = 1
+        rle = mask_utils.encode(np.asfortranarray(mask))
+        rle["counts"] = rle["counts"].decode()
+
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=1,
+                    media=Image.from_numpy(data=np.ones((5, 10, 3))),
+                    annotations=[
+                        RleMask(rle=rle, label=3, id=4, group=4, attributes={"is_crowd": True}),
+                        Bbox(2, 1, 3, 2, label=3, id=4, group=4, attributes={"is_crowd": True}),
+                    ],
+                    attributes={"id": 1},
+                ),
+            ],
+            categories=[str(i) for i in range(10)],
+            task_type=TaskType.segmentation_instance,
+        )
+
+        with mock.patch.object(RleMask, "_decode", side_effect=AssertionError("decoded")):
+            CocoInstancesExporter.convert(
+                dataset, test_dir, segmentation_mode="mask", stream=stream
+            )
+
+        annotations = parse_json_file(osp.join(test_dir, "annotations", "instances_default.json"))[
+            "annotations"
+        ]
+        assert [rle] == [ann["segmentation"] for ann in annotations]
+        assert [12.0] == [ann["area"] for ann in annotations]
+
+        parsed_dataset = Dataset.import_from(test_dir, "coco_instances")
+        compare_datasets(TestCase(), dataset, parsed_dataset)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_decode_rle_masks_of_other_size(self, test_dir, stream: bool):
+        mask = np.zeros((5, 10), dtype=np.uint8)
+        mask[1:4, 2:6] = 1
+        rle = mask_utils.encode(np.asfortranarray(mask))
+
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=1,
+                    media=Image.from_numpy(data=np.ones((6, 10, 3))),
+                    annotations=[RleMask(rle=rle, label=3, id=4, group=4)],
+                ),
+            ],
+            categories=[str(i) for i in range(10)],
+            task_type=TaskType.segmentation_instance,
+        )
+
+        with mock.patch(
+            "datumaro.util.mask_tools.merge_rles", side_effect=AssertionError("merged")
+        ), mock.patch.object(RleMask, "_decode", wraps=RleMask._decode) as decode:
+            CocoInstancesExporter.convert(
+                dataset, test_dir, segmentation_mode="mask", stream=stream
+            )
+
+        decode.assert_called()
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_convert_masks_to_polygons(self, test_dir, stream: bool):
         source_dataset = Dataset.from_iterable(
@@ -15,7 +15,7 @@ from datumaro.components.annotation import (
     Polygon,
     PolyLine,
 )
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.environment import Environment
 from datumaro.components.media import Image
@@ -27,7 +27,7 @@ from datumaro.plugins.transforms import ProjectLabels
 from ..requirements import Requirements, mark_requirement
 
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import TestDir, check_save_and_load, compare_datasets
+from tests.utils.test_utils import TestDir, check_is_stream, check_save_and_load, compare_datasets
 
 DUMMY_IMAGE_DATASET_DIRS = [
     get_test_asset_path("cvat_dataset", "for_images", export_type)
@@ -157,9 +157,12 @@ class CvatImporterTest(TestCase):
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_load_image(self):
         for expected_dataset, dataset_dir in zip(EXPECTED_IMAGE_DATASETS, DUMMY_IMAGE_DATASET_DIRS):
-            parsed_dataset = Dataset.import_from(dataset_dir, "cvat")
+            for dataset_cls in [Dataset, StreamDataset]:
+                with self.subTest(dataset_dir=dataset_dir, dataset_cls=dataset_cls):
+                    parsed_dataset = dataset_cls.import_from(dataset_dir, "cvat")
+                    check_is_stream(parsed_dataset, dataset_cls is StreamDataset)
 
-            compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
+                    compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
 
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_load_video(self):
@@ -286,9 +289,12 @@ class CvatImporterTest(TestCase):
             task_type=TaskType.segmentation_instance,
         )
 
-        parsed_dataset = Dataset.import_from(DUMMY_VIDEO_DATASET_DIR, "cvat")
+        for dataset_cls in [Dataset, StreamDataset]:
+            with self.subTest(dataset_cls=dataset_cls):
+                parsed_dataset = dataset_cls.import_from(DUMMY_VIDEO_DATASET_DIR, "cvat")
+                check_is_stream(parsed_dataset, dataset_cls is StreamDataset)
 
-        compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
+                compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
 
 
 class CvatExporterTest(TestCase):
@@ -37,6 +37,7 @@ from datumaro.components.environment import Environment
 from datumaro.components.errors import (
     ConflictingCategoriesError,
     DatasetNotFoundError,
+    MediaShapeError,
     MediaTypeError,
     MismatchingAttributesError,
     MismatchingImageInfoError,
@@ -52,6 +53,7 @@ from datumaro.components.filter import (
     XPathAnnotationsFilter,
     XPathDatasetFilter,
 )
+from datumaro.components.filter_compiler import CompiledXPath
 from datumaro.components.importer import FailingImportErrorPolicy, ImportErrorPolicy
 from datumaro.components.launcher import Launcher
 from datumaro.components.media import Image, MediaElement, Video
@@ -1627,6 +1629,127 @@ class DatasetTest(TestCase):
 
         self.assertEqual(1, len(dataset))
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_find_items_in_index(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=0,
+                    subset="train",
+                    annotations=[Label(0, attributes={"x": True}), Bbox(1, 2, 3, 4, label=1)],
+                ),
+                DatasetItem(
+                    id=1, subset="val", annotations=[Label(2, attributes={"x": 1, "y": [2]})]
+                ),
+                DatasetItem(id=2, subset="test", annotations=[Caption("hello")]),
+            ],
+            categories=["a", "b", "c"],
+        )
+
+        index = dataset.index
+
+        self.assertEqual({("0", "train")}, index.items_with_label(1))
+        self.assertEqual(
+            {("0", "train"), ("1", "val")}, index.items_with_ann_type(AnnotationType.label)
+        )
+        self.assertEqual({("2", "test")}, index.items_with_ann_type(AnnotationType.caption))
+        self.assertEqual({("1", "val")}, index.items_with_attribute("x", 1))
+        self.assertEqual({("0", "train")}, index.items_with_attribute("x", True))
+        self.assertEqual(set(), index.items_with_attribute("x", 2))
+        self.assertEqual({("1", "val")}, index.items_with_attribute("y"))
+
+        dataset.put(DatasetItem(id=1, subset="val", annotations=[Label(1)]))
+        dataset.put(DatasetItem(id=3, subset="train", annotations=[Label(1)]))
+        dataset.remove(0, "train")
+
+        self.assertEqual({("1", "val"), ("3", "train")}, dataset.index.items_with_label(1))
+        self.assertEqual(set(), dataset.index.items_with_label(2))
+        self.assertEqual(set(), dataset.index.items_with_attribute("x"))
+
+        dataset.update([DatasetItem(id=2, subset="test", annotations=[Label(2)])])
+
+        self.assertEqual({("2", "test")}, dataset.index.items_with_label(2))
+        self.assertEqual(set(), dataset.index.items_with_ann_type(AnnotationType.caption))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_rebuild_index_after_transform(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=0, annotations=[Label(0)]),
+                DatasetItem(id=1, annotations=[Label(1)]),
+            ],
+            categories=["a", "b"],
+        )
+        self.assertEqual({("0", DEFAULT_SUBSET_NAME)}, dataset.index.items_with_label(0))
+
+        dataset.transform(RemapLabels, mapping={"a": "b"}, default="keep")
+
+        # "a" is removed, so "b" gets the id 0
+        self.assertEqual(
+            {("0", DEFAULT_SUBSET_NAME), ("1", DEFAULT_SUBSET_NAME)},
+            dataset.index.items_with_label(0),
+        )
+        self.assertEqual(set(), dataset.index.items_with_label(1))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_filter_uses_item_index(self):
+        def _make_dataset():
+            return Dataset.from_iterable(
+                [
+                    DatasetItem(id=i, annotations=[Label(i % 3), Bbox(0, 0, 1, 1, label=0)])
+                    for i in range(9)
+                ]
+                + [DatasetItem(id=9, annotations=[Label(0, attributes={"label": "c"})])],
+                categories=["a", "b", "c"],
+            )
+
+        expected_items = [("2", "default"), ("5", "default"), ("8", "default"), ("9", "default")]
+        for expr in ['/item[annotation/label="c"]', "/item[ annotation/label = 'c' ]"]:
+            with self.subTest(expr=expr):
+                dataset = _make_dataset()
+                dataset.init_cache()
+
+                with mock.patch.object(
+                    CompiledXPath, "matches", autospec=True, side_effect=CompiledXPath.matches
+                ) as matches:
+                    dataset.filter(expr)
+                    actual_items = [(item.id, item.subset) for item in dataset]
+
+                self.assertEqual(expected_items, actual_items)
+                self.assertEqual(len(expected_items), matches.call_count)
+
+        dataset = _make_dataset()
+        dataset.init_cache()
+        with mock.patch.object(
+            CompiledXPath,
+            "select_annotations",
+            autospec=True,
+            side_effect=CompiledXPath.select_annotations,
+        ) as select_annotations:
+            dataset.filter('/item/annotation[label="c"]', filter_annotations=True)
+
+            self.assertEqual(10, len(dataset))
+            self.assertEqual(
+                [1, 1, 1, 1],
+                [len(item.annotations) for item in dataset if item.annotations],
+            )
+            self.assertEqual(4, select_annotations.call_count)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_filter_by_type_uses_item_index(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=0, annotations=[Label(0)]),
+                DatasetItem(id=1, annotations=[Bbox(0, 0, 1, 1, label=0)]),
+            ],
+            categories=["a"],
+        )
+        dataset.init_cache()
+
+        dataset.filter('/item/annotation[type="bbox"]', filter_annotations=True, remove_empty=True)
+
+        self.assertEqual([("1", "default")], [(item.id, item.subset) for item in dataset])
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_inplace_save_writes_only_updated_data(self):
         class CustomExporter(Exporter):
@@ -2075,6 +2198,33 @@ class DatasetTest(TestCase):
         self.assertEqual(dataset[4].id, "2")
         self.assertRaises(IndexError, lambda: dataset[len(dataset)])
 
+    def test_can_get_numpy_batch(self):
+        images = np.arange(5 * 4 * 3, dtype=np.uint8).reshape(5, 4, 3)
+        dataset = Dataset.from_iterable(
+            DatasetItem(id, media=Image.from_numpy(data=images[id])) for id in range(5)
+        )
+
+        batch = dataset.as_numpy_batch([3, 0, 3])
+
+        self.assertEqual((3, 4, 3), batch.shape)
+        self.assertEqual(np.uint8, batch.dtype)
+        np.testing.assert_array_equal(images[[3, 0, 3]], batch)
+
+    def test_can_report_numpy_batch_of_different_shapes(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(0, media=Image.from_numpy(data=np.ones((4, 3)))),
+                DatasetItem(1, media=Image.from_numpy(data=np.ones((3, 4)))),
+                DatasetItem(2),
+            ]
+        )
+
+        with self.assertRaises(MediaShapeError):
+            dataset.as_numpy_batch([0, 1])
+
+        with self.assertRaises(MediaTypeError):
+            dataset.as_numpy_batch([2])
+
     def test_index_access_tile(self):
         dataset = Dataset.from_iterable(
             DatasetItem(
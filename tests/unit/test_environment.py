@@ -2,10 +2,19 @@
 #
 # SPDX-License-Identifier: MIT
 
+import os.path as osp
+from unittest import mock
+
+import numpy as np
 import pytest
 
 import datumaro.components.lazy_plugin
+from datumaro.components.dataset import Dataset
+from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.environment import Environment, PluginRegistry
+from datumaro.components.format_detection import FormatDetectionConfidence, RejectionReason
+from datumaro.components.media import Image
+from datumaro.plugins.data_formats.video import VideoFramesImporter
 
 real_find_spec = datumaro.components.lazy_plugin.find_spec
 
@@ -62,7 +71,10 @@ class EnvironmentTest:
         Environment.release_builtin_plugins()
 
     def test_extra_deps_req(self, fxt_tf_failure_env):
-        """Plugins affected by the import failure: `ac` and `tf_detection_api`."""
+        """Plugins affected by the import failure: `ac`.
+
+        `tf_detection_api` reads and writes TFRecord files without TensorFlow.
+        """
 
         env = fxt_tf_failure_env
 
@@ -76,4 +88,30 @@ class EnvironmentTest:
             + sorted(env.validators)
         )
 
-        assert "tf_detection_api" not in loaded_plugin_names
+        assert "ac" not in loaded_plugin_names
+        assert "tf_detection_api" in loaded_plugin_names
+
+    def test_can_skip_importers_with_lower_max_detect_confidence(self, test_dir):
+        Dataset.from_iterable(
+            [DatasetItem(id="a", media=Image.from_numpy(data=np.ones((2, 3, 3))))]
+        ).export(test_dir, "datumaro", save_media=True)
+        with open(osp.join(test_dir, "video.avi"), "wb"):
+            pass
+
+        rejected_formats = {}
+
+        def rejection_callback(format, reason, message):
+            rejected_formats[format] = reason
+
+        with mock.patch.object(
+            VideoFramesImporter, "detect", return_value=FormatDetectionConfidence.LOW
+        ) as detect:
+            detected_formats = Environment().detect_dataset(
+                test_dir, rejection_callback=rejection_callback
+            )
+
+        assert ["datumaro"] == detected_formats
+        # The video can only be detected with the LOW confidence
+        assert FormatDetectionConfidence.LOW == VideoFramesImporter.get_max_detect_confidence()
+        detect.assert_not_called()
+        assert RejectionReason.insufficient_confidence == rejected_formats["video_frames"]
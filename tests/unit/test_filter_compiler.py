@@ -0,0 +1,156 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+from unittest import mock
+
+import numpy as np
+import pytest
+from lxml import etree as ET
+
+from datumaro.components.annotation import (
+    AnnotationType,
+    Bbox,
+    Caption,
+    Ellipse,
+    HashKey,
+    Label,
+    LabelCategories,
+    Mask,
+    Points,
+    Polygon,
+    PolyLine,
+)
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.filter import DatasetItemEncoder
+from datumaro.components.filter_compiler import compile_xpath
+from datumaro.components.media import Image
+
+from ..requirements import Requirements, mark_requirement
+
+CATEGORIES = {AnnotationType.label: LabelCategories.from_iterable(["cat", "dog", "person"])}
+
+ITEMS = [
+    DatasetItem(
+        id="a",
+        subset="train",
+        media=Image.from_numpy(np.zeros((4, 6, 3))),
+        annotations=[
+            Label(0, id=1, attributes={"occluded": False, "score": 0.5}),
+            Bbox(1, 2, 10, 20, label=1, group=1, attributes={"is crowd": True, "3": "1e2"}),
+            Polygon([0, 0, 4, 0, 4, 4], label=2, attributes={"label": "cat"}),
+            Points([1, 2, 3, 4], visibility=[Points.Visibility.visible, Points.Visibility.hidden]),
+        ],
+    ),
+    DatasetItem(
+        id="b",
+        subset="val",
+        media=Image.from_file(path="images/b.jpg", size=(8, 2)),
+        annotations=[
+            PolyLine([1, 2, 9, 9], label=0),
+            Caption("a cat"),
+            Ellipse(1, 2, 3, 4, label=2, attributes={"score": " 7 "}),
+            Mask(np.ones((2, 2)), label=1, attributes={"occluded": True}),
+            HashKey(np.zeros(64, dtype=np.uint8)),
+        ],
+    ),
+    DatasetItem(id="c b", subset="train", annotations=[Bbox(5, 5, 1, 1, label=None)]),
+    DatasetItem(id="5"),
+]
+
+
+class FilterCompilerTest:
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            "/item[id > 0]",
+            "/item[subset='train' or subset = \"val\"]",
+            "/item[image/width < image/height]",
+            "/item[image/path]",
+            "/item[contains(image/path, 'images/')]",
+            "/item[annotation]",
+            "/item[not(annotation)]",
+            "/item[annotation/label = 'cat']",
+            "/item[annotation[label = 'dog' and type = 'bbox']]",
+            "/item[count(annotation) > 2]",
+            "/item[annotation/score > annotation/group]",
+            "/item[annotation/occluded = true()]",
+            "/item[-annotation/x < -0.5]",
+            "/item[. = 'x']",
+            "/item[annotation/label = 'cat'][subset = 'train']",
+            "subset = 'train'",
+            "count(annotation)",
+            "/item/annotation[label = 'cat']",
+            "/item/annotation[(label = 'cat' and area > 99.5) or label != 'person']",
+            "/item/annotation[occluded = 'False']",
+            "/item/annotation[score > 0.4]",
+            "/item/annotation[score = '0.5']",
+            "/item/annotation[_3 > 50]",
+            "/item/annotation[is-crowd]",
+            "/item/annotation[label = '']",
+            "/item/annotation[label_id = 'None']",
+            "/item/annotation[bbox/area > 10]",
+            "/item/annotation[point[x > 2 and visible = 'hidden']]",
+            "/item/annotation[count(point) = 2]",
+            "/item/annotation[starts-with(caption, 'a')]",
+            "/item/annotation[type = 'hash_key']",
+            "/item/annotation[label = /item/annotation/label[. = 'dog']]",
+            "/item[subset = 'train']/annotation[label = 'dog']",
+            "/item/annotation/label",
+        ],
+    )
+    def test_can_evaluate_like_lxml(self, expr):
+        compiled = compile_xpath(expr)
+        xpath = ET.XPath(expr)
+
+        assert compiled is not None
+        for item in ITEMS:
+            encoded = DatasetItemEncoder.encode(item, CATEGORIES)
+            expected = xpath(encoded)
+
+            assert bool(expected) == compiled.matches(item, CATEGORIES), item.id
+
+            if compiled.returns_nodes:
+                encoded_anns = encoded.findall("annotation")
+                expected_anns = [
+                    item.annotations[encoded_anns.index(e)]
+                    for e in expected
+                    if e.tag == "annotation"
+                ]
+                actual_anns = compiled.select_annotations(item, CATEGORIES)
+                assert [id(a) for a in expected_anns] == [id(a) for a in actual_anns], item.id
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            "/item/annotation[w * h > 10]",
+            "/item/annotation[1]",
+            "/item/annotation[label = ../annotation/label]",
+            "//annotation",
+            "/item/annotation/text()",
+            "/item/annotation[@label]",
+        ],
+    )
+    def test_can_reject_unsupported_expressions(self, expr):
+        assert compile_xpath(expr) is None
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_skip_unreferenced_fields(self):
+        item = DatasetItem(
+            id="a",
+            subset="train",
+            media=Image.from_file(path="a.jpg"),
+            annotations=[Polygon([0, 0, 4, 0, 4, 4], label=0)],
+        )
+
+        compiled = compile_xpath("/item[subset = 'train' and annotation/label = 'cat']")
+
+        with mock.patch.object(
+            Image, "size", new_callable=mock.PropertyMock
+        ) as size, mock.patch.object(Polygon, "get_bbox") as get_bbox:
+            assert compiled.matches(item, CATEGORIES)
+
+        size.assert_not_called()
+        get_bbox.assert_not_called()
@@ -2,8 +2,10 @@
 #
 # SPDX-License-Identifier: MIT
 
+import os
 import os.path as osp
-from unittest import TestCase
+import time
+from unittest import TestCase, mock
 
 from datumaro.components.format_detection import (
     DetectedFormat,
@@ -14,6 +16,7 @@ from datumaro.components.format_detection import (
     apply_format_detector,
     detect_dataset_format,
 )
+from datumaro.util.fs_snapshot import FileSystemSnapshot, fs_snapshot
 
 from tests.requirements import Requirements, mark_requirement
 from tests.utils.test_utils import TestDir
@@ -284,6 +287,192 @@ class DetectDatasetFormat(FormatDetectionTest):
 
         self.assertEqual(rejected_formats["fff"][0], RejectionReason.detection_unsupported)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_detectors_share_directory_listings(self):
+        os.makedirs(osp.join(self._dataset_root, "annotations"))
+        with open(osp.join(self._dataset_root, "annotations", "a.json"), "w"):
+            pass
+
+        formats = [
+            ("aaa", lambda context: context.require_file("annotations/*.json") and None),
+            ("bbb", lambda context: context.require_file("**/*.xml")),
+            ("ccc", lambda context: context.require_files("**/*.json") and None),
+        ]
+
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            detected_datasets = detect_dataset_format(formats, self._dataset_root)
+
+        self.assertEqual({d.name for d in detected_datasets}, {"aaa", "ccc"})
+        # The dataset root and the "annotations" directory
+        self.assertEqual(scandir.call_count, 2)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_skip_detectors_with_insufficient_max_confidence(self):
+        applied_formats = set()
+
+        def make_detector(name, confidence):
+            def detect(context):
+                applied_formats.add(name)
+                return confidence
+
+            return detect
+
+        formats = [
+            ("aaa", make_detector("aaa", None)),
+            ("bbb", make_detector("bbb", None), FormatDetectionConfidence.MEDIUM),
+            (
+                "ccc",
+                make_detector("ccc", FormatDetectionConfidence.LOW),
+                FormatDetectionConfidence.LOW,
+            ),
+        ]
+
+        rejected_formats = {}
+
+        def rejection_callback(format, reason, message):
+            rejected_formats[format] = reason
+
+        detected_datasets = detect_dataset_format(
+            formats, self._dataset_root, rejection_callback=rejection_callback, num_workers=0
+        )
+
+        self.assertEqual({d.name for d in detected_datasets}, {"aaa", "bbb"})
+        self.assertEqual(applied_formats, {"aaa", "bbb"})
+        self.assertEqual(rejected_formats, {"ccc": RejectionReason.insufficient_confidence})
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_detect_concurrently(self):
+        formats = [
+            (str(i), lambda context, i=i: FormatDetectionConfidence.LOW if i % 2 else None)
+            for i in range(20)
+        ]
+
+        rejected_formats = []
+
+        def rejection_callback(format, reason, message):
+            rejected_formats.append(format)
+
+        detected_datasets = detect_dataset_format(
+            formats, self._dataset_root, rejection_callback=rejection_callback, num_workers=4
+        )
+
+        self.assertEqual([d.name for d in detected_datasets], [str(i) for i in range(0, 20, 2)])
+        # The rejections are reported in the order of the formats
+        self.assertEqual(rejected_formats, [str(i) for i in range(1, 20, 2)])
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_skipped_detectors_dont_depend_on_scheduling(self):
+        def slow_detector(context):
+            time.sleep(0.1)
+            return FormatDetectionConfidence.MEDIUM
+
+        formats = [
+            ("aaa", slow_detector),
+            (
+                "bbb",
+                lambda context: context.fail("test unmet requirement"),
+                FormatDetectionConfidence.LOW,
+            ),
+            ("ccc", lambda context: None, FormatDetectionConfidence.MEDIUM),
+        ]
+
+        reports = {}
+        for num_workers in [0, None, 4]:
+            rejected_formats = []
+
+            def rejection_callback(format, reason, message):
+                rejected_formats.append((format, reason))
+
+            detected_datasets = detect_dataset_format(
+                formats,
+                self._dataset_root,
+                rejection_callback=rejection_callback,
+                num_workers=num_workers,
+            )
+
+            self.assertEqual([d.name for d in detected_datasets], ["aaa", "ccc"])
+            reports[num_workers] = rejected_formats
+
+        self.assertEqual(reports[0], [("bbb", RejectionReason.insufficient_confidence)])
+        self.assertEqual(reports[None], reports[0])
+        self.assertEqual(reports[4], reports[0])
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_probe_file_beginning_cached(self):
+        lines = [f"line {i}" for i in range(1000)]
+        with open(osp.join(self._dataset_root, "foobar.txt"), "w") as f:
+            f.write("\n".join(lines))
+
+        def detect_first_line(context):
+            with context.probe_text_file("foobar.txt", "must start with line 0") as f:
+                if f.readline() != "line 0\n":
+                    raise Exception
+
+        def detect_all_lines(context):
+            with context.probe_text_file("foobar.txt", "must have all the lines") as f:
+                if f.read().split("\n") != lines:
+                    raise Exception
+
+        def detect_last_bytes(context):
+            with context.probe_text_file("foobar.txt", "must end with 999", True) as f:
+                f.seek(-3, os.SEEK_END)
+                if f.read() != b"999":
+                    raise Exception
+
+        formats = [
+            ("aaa", detect_first_line),
+            ("bbb", detect_all_lines),
+            ("ccc", detect_last_bytes),
+        ]
+
+        with mock.patch.object(FileSystemSnapshot, "MAX_CACHED_HEAD_SIZE", 100), fs_snapshot(
+            self._dataset_root
+        ) as snapshot:
+            detected_datasets = detect_dataset_format(formats, self._dataset_root)
+
+            self.assertEqual(snapshot._cache_size, 100)
+
+        self.assertEqual({d.name for d in detected_datasets}, {"aaa", "bbb", "ccc"})
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_probe_files_over_cache_size(self):
+        for name in ["a.txt", "b.txt"]:
+            with open(osp.join(self._dataset_root, name), "w") as f:
+                f.write("123" * 20)
+
+        def detect(context):
+            for name in ["a.txt", "b.txt"]:
+                with context.probe_text_file(name, "must contain 123") as f:
+                    if f.read() != "123" * 20:
+                        raise Exception
+
+        with mock.patch.object(FileSystemSnapshot, "MAX_CACHE_SIZE", 100), fs_snapshot(
+            self._dataset_root
+        ) as snapshot:
+            detected_datasets = detect_dataset_format([("aaa", detect)], self._dataset_root)
+
+            self.assertEqual(snapshot._cache_size, 60)
+
+        self.assertEqual([d.name for d in detected_datasets], ["aaa"])
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_probe_text_file_is_read_once(self):
+        with open(osp.join(self._dataset_root, "foobar.txt"), "w") as f:
+            f.write("123")
+
+        def detect(context):
+            with context.probe_text_file("foobar.txt", "must start with 123") as f:
+                if f.read(3) != "123":
+                    raise Exception
+
+        formats = [(name, detect) for name in ["aaa", "bbb", "ccc"]]
+
+        with mock.patch("builtins.open", wraps=open) as open_file:
+            detected_datasets = detect_dataset_format(formats, self._dataset_root)
+
+        self.assertEqual(len(detected_datasets), 3)
+        self.assertEqual(open_file.call_count, 1)
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_no_callback(self):
         formats = [
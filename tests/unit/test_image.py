@@ -4,7 +4,7 @@
 
 import os.path as osp
 from itertools import product
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import numpy as np
 import pytest
@@ -145,3 +145,85 @@ class ImageDecodeTest:
                 fxt_img_four_channels[:, :, :3] = to_rgb
 
                 assert np.allclose(fxt_img_four_channels, img_decoded)
+
+
+class ImageResizeTest:
+    @pytest.fixture
+    def fxt_image(self) -> np.ndarray:
+        image = np.zeros((64, 48, 3), dtype=np.uint8)
+        image[8:40, 16:32] = (50, 100, 200)
+        return image
+
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float32, np.int64])
+    @pytest.mark.parametrize("channels", [None, 1, 3, 4])
+    def test_can_resize_image_in_its_type(self, dtype, channels):
+        shape = (8, 6) if channels is None else (8, 6, channels)
+        image = np.full(shape, 100, dtype=dtype)
+
+        for size in [(4, 3), (16, 12)]:
+            resized = image_module.resize_image(image, size)
+
+            assert size + shape[2:] == resized.shape
+            assert dtype == resized.dtype
+            assert np.all(resized == 100)
+
+    def test_can_read_jpeg_size(self, fxt_image):
+        assert (64, 48) == image_module.get_jpeg_size(image_module.encode_image(fxt_image, ".jpg"))
+        assert None is image_module.get_jpeg_size(image_module.encode_image(fxt_image, ".png"))
+
+    @pytest.mark.parametrize("factor", [2, 4, 8])
+    def test_can_decode_reduced_jpeg(self, fxt_image, factor):
+        for image in [fxt_image, fxt_image[:, :, 0]]:
+            image_bytes = image_module.encode_image(image, ".jpg")
+            expected = image_module.resize_image(
+                image_module.decode_image(image_bytes), (64 // factor, 48 // factor)
+            )
+
+            reduced = image_module.decode_reduced_image(image_bytes, factor)
+
+            assert expected.shape == reduced.shape
+            assert np.abs(expected.astype(int) - reduced).mean() < 2
+
+        with image_module.decode_image_context(
+            image_module.ImageBackend.cv2, image_module.ImageColorChannel.COLOR_RGB
+        ):
+            image_bytes = image_module.encode_image(fxt_image[:, :, 0], ".jpg")
+            reduced = image_module.decode_reduced_image(image_bytes, factor)
+            assert (64 // factor, 48 // factor, 3) == reduced.shape
+
+    def test_cant_decode_reduced_image_of_other_format(self, fxt_image):
+        image_bytes = image_module.encode_image(fxt_image, ".png")
+
+        assert None is image_module.decode_reduced_image(image_bytes, 2)
+
+    def test_can_get_reduction_factor(self):
+        assert 8 == image_module.get_reduction_factor((800, 1000), (100, 120))
+        assert 2 == image_module.get_reduction_factor((800, 1000), (300, 500))
+        assert 1 == image_module.get_reduction_factor((800, 1000), (500, 500))
+
+
+class SharedImageLoaderTest:
+    def test_can_share_image_between_readers(self):
+        image = np.zeros((4, 6, 3), dtype=np.uint8)
+        loader = mock.Mock(return_value=image)
+        shared = image_module.SharedImageLoader(loader)
+        readers = [shared.make_reader() for _ in range(3)]
+
+        for reader in readers[:2]:
+            assert reader() is image
+            assert shared.is_loaded
+        assert 1 == loader.call_count
+
+        # A reader is counted once
+        readers[0]()
+        assert shared.is_loaded
+
+        # The image is released, when each reader has requested it
+        assert readers[2]() is image
+        assert not shared.is_loaded
+        assert 1 == loader.call_count
+
+        # Then it is loaded again on request
+        readers[0]()
+        assert 2 == loader.call_count
+        assert not shared.is_loaded
@@ -1,12 +1,19 @@
 import os.path as osp
-from unittest import TestCase
+from multiprocessing.pool import ThreadPool
+from unittest import TestCase, mock
+from zipfile import ZipFile
 
 import numpy as np
 
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.media import Image, save_image
 from datumaro.components.project import Dataset
-from datumaro.plugins.data_formats.image_zip import ImageZipExporter, ImageZipPath
+from datumaro.plugins.data_formats.image_zip import (
+    Compression,
+    ImageZipBase,
+    ImageZipExporter,
+    ImageZipPath,
+)
 
 from ..requirements import Requirements, mark_requirement
 
@@ -71,6 +78,100 @@ class ImageZipExporterTest(TestCase):
         with TestDir() as test_dir:
             self._test_can_save_and_load(source_dataset, test_dir, compression="ZIP_DEFLATED")
 
+    @mark_requirement(Requirements.DATUM_267)
+    def test_can_save_and_load_with_num_workers(self):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=str(i), media=Image.from_numpy(data=np.full((5, 4, 3), i)))
+                for i in range(10)
+            ]
+        )
+
+        for compression in Compression:
+            with self.subTest(compression=compression.name), TestDir() as test_dir:
+                self._test_can_save_and_load(
+                    source_dataset, test_dir, compression=compression.name, num_workers=2
+                )
+
+                with ZipFile(osp.join(test_dir, ImageZipPath.DEFAULT_ARCHIVE_NAME)) as zf:
+                    self.assertIsNone(zf.testzip())
+                    self.assertEqual(
+                        [str(i) + ".jpg" for i in range(10)], [m.filename for m in zf.infolist()]
+                    )
+
+    @mark_requirement(Requirements.DATUM_267)
+    def test_can_save_with_num_workers_without_zipfile_internals(self):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=str(i), media=Image.from_numpy(data=np.full((5, 4, 3), i)))
+                for i in range(10)
+            ]
+        )
+
+        for compression in Compression:
+            with self.subTest(
+                compression=compression.name
+            ), TestDir() as test_dir, mock.patch.object(
+                ImageZipExporter, "_can_append_compressed", return_value=False
+            ), mock.patch.object(
+                ImageZipExporter, "_append_compressed_member", side_effect=AssertionError
+            ):
+                self._test_can_save_and_load(
+                    source_dataset, test_dir, compression=compression.name, num_workers=2
+                )
+
+                with ZipFile(osp.join(test_dir, ImageZipPath.DEFAULT_ARCHIVE_NAME)) as zf:
+                    self.assertIsNone(zf.testzip())
+                    self.assertEqual({compression.value}, {m.compress_type for m in zf.infolist()})
+
+    @mark_requirement(Requirements.DATUM_267)
+    def test_can_close_archive_handles(self):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=str(i), media=Image.from_numpy(data=np.full((5, 4, 3), i)))
+                for i in range(2)
+            ]
+        )
+
+        for compression in [Compression.ZIP_STORED, Compression.ZIP_DEFLATED]:
+            with self.subTest(compression=compression.name), TestDir() as test_dir:
+                ImageZipExporter.convert(source_dataset, test_dir, compression=compression.name)
+                archive_path = osp.join(test_dir, ImageZipPath.DEFAULT_ARCHIVE_NAME)
+
+                with ImageZipBase(archive_path) as base:
+                    for item in base:
+                        item.media.data  # opens the archive handles
+                    self.assertTrue(base._mmap is not None or base._zipfiles)
+
+                self.assertIsNone(base._mmap)
+                self.assertEqual([], base._zipfiles)
+
+                # The archive is reopened on demand
+                compare_datasets(self, source_dataset, Dataset.from_extractors(base))
+                base.close()
+
+    @mark_requirement(Requirements.DATUM_267)
+    def test_can_read_members_concurrently(self):
+        source_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(id=str(i), media=Image.from_numpy(data=np.full((5, 4, 3), i)))
+                for i in range(10)
+            ]
+        )
+
+        for compression in [Compression.ZIP_STORED, Compression.ZIP_DEFLATED]:
+            with self.subTest(compression=compression.name), TestDir() as test_dir:
+                ImageZipExporter.convert(source_dataset, test_dir, compression=compression.name)
+                parsed_dataset = Dataset.import_from(
+                    osp.join(test_dir, ImageZipPath.DEFAULT_ARCHIVE_NAME), "image_zip"
+                )
+
+                with ThreadPool(processes=4) as pool:
+                    images = pool.map(lambda item: item.media.data, parsed_dataset)
+
+                for item, image in zip(source_dataset, images):
+                    self.assertTrue(np.array_equal(item.media.data, image))
+
     @mark_requirement(Requirements.DATUM_267)
     def test_can_save_and_load_with_arbitrary_extensions(self):
         source_dataset = Dataset.from_iterable(
@@ -1,16 +1,19 @@
 import os.path as osp
 from functools import partial
 from typing import Any, Dict, List, Tuple
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import numpy as np
 
+import datumaro.components.media as media_module
+import datumaro.util.image as image_module
 from datumaro.components.media import Image, RoIImage
 from datumaro.util.image import (
     encode_image,
     lazy_image,
     load_image,
     load_image_meta_file,
+    resize_image,
     save_image,
     save_image_meta_file,
 )
@@ -193,6 +196,35 @@ class ImageTest(TestCase):
         image = Image.from_bytes(data=image_bytes)
         self.assertEqual(image.ext, None)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_get_resized_data(self):
+        data = np.zeros((64, 48, 3), dtype=np.uint8)
+        data[8:40, 16:32] = (50, 100, 200)
+
+        with TestDir() as test_dir:
+            for ext, is_reduced in [(".jpg", True), (".png", False)]:
+                path = osp.join(test_dir, "image" + ext)
+                save_image(path, data)
+                with open(path, "rb") as f:
+                    image_bytes = f.read()
+
+                for image in [Image.from_file(path), Image.from_bytes(image_bytes)]:
+                    with self.subTest(ext=ext, image=image.__class__.__name__), mock.patch.object(
+                        media_module,
+                        "decode_reduced_image",
+                        wraps=media_module.decode_reduced_image,
+                    ) as decode_reduced:
+                        expected = resize_image(load_image(path), (16, 12))
+
+                        resized = image.get_resized_data((16, 12))
+
+                        self.assertEqual(expected.shape, resized.shape)
+                        self.assertLess(np.abs(expected.astype(int) - resized).mean(), 2)
+                        self.assertEqual(is_reduced, decode_reduced.called)
+
+        resized = Image.from_numpy(data).get_resized_data((128, 96))
+        self.assertTrue(np.array_equal(resize_image(data, (128, 96)), resized))
+
 
 class RoIImageTest(TestCase):
     def _test_ctors(self, img_ctor, args_list, test_dir, is_bytes=False):
@@ -248,6 +280,88 @@ class RoIImageTest(TestCase):
             _, _, args_list = ImageTest._gen_bytes_image_and_args_list()
             self._test_ctors(Image, args_list, test_dir, True)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_get_resized_data(self):
+        data = np.zeros((64, 48, 3), dtype=np.uint8)
+        data[8:40, 16:32] = (50, 100, 200)
+
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "image.jpg")
+            save_image(path, data)
+
+            for roi in [(8, 16, 32, 32), (3, 5, 32, 32)]:
+                with self.subTest(roi=roi):
+                    roi_image = RoIImage.from_image(Image.from_file(path), roi)
+                    expected = resize_image(roi_image.data, (8, 8))
+
+                    # The image data is not cached yet
+                    roi_image = RoIImage.from_image(Image.from_file(path), roi)
+                    resized = roi_image.get_resized_data((8, 8))
+
+                    self.assertEqual(expected.shape, resized.shape)
+                    self.assertLess(np.abs(expected.astype(int) - resized).mean(), 4)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_share_decoded_image_between_rois(self):
+        data = np.arange(8 * 6 * 3, dtype=np.uint8).reshape((8, 6, 3))
+        rois = [(0, 0, 3, 4), (3, 0, 3, 4), (0, 4, 6, 4)]
+
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "image.png")
+            save_image(path, data)
+
+            for image, target in [
+                (Image.from_file(path), (image_module, "load_image")),
+                (Image.from_bytes(encode_image(data, ".png")), (media_module, "decode_image")),
+                (Image.from_numpy(mock.Mock(return_value=data)), None),
+            ]:
+                with self.subTest(image=type(image).__name__):
+                    if target:
+                        loader = mock.patch.object(*target, wraps=getattr(*target))
+                    else:
+                        loader = mock.patch.object(image, "_data", wraps=image._data)
+
+                    with loader as load:
+                        roi_images = RoIImage.from_image_rois(image, rois)
+                        roi_data = [roi_image.data for roi_image in roi_images]
+                        self.assertEqual(1, load.call_count)
+
+                        # The decoded image is released after the last crop
+                        roi_images[0].data
+                        self.assertEqual(2, load.call_count)
+
+                    for roi_image_data, (x, y, w, h) in zip(roi_data, rois):
+                        np.testing.assert_array_equal(data[y : y + h, x : x + w], roi_image_data)
+                    # The crops are views of the decoded image
+                    self.assertTrue(all(d.base is roi_data[0].base for d in roi_data))
+                    self.assertIsNotNone(roi_data[0].base)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_release_shared_image_after_reduced_decoding(self):
+        data = np.zeros((64, 48, 3), dtype=np.uint8)
+        rois = [(0, 0, 48, 32), (0, 32, 48, 32)]
+
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "image.jpg")
+            save_image(path, data)
+
+            with mock.patch.object(image_module, "load_image", wraps=load_image) as load:
+                roi_images = RoIImage.from_image_rois(Image.from_file(path), rois)
+
+                # The first crop is decoded at a reduced resolution
+                self.assertEqual((4, 6), roi_images[0].get_resized_data((4, 6)).shape[:2])
+                self.assertEqual(0, load.call_count)
+
+                # The full resolution image is released after the last consumer
+                roi_images[1].data
+                self.assertEqual(1, load.call_count)
+                roi_images[1].data
+                self.assertEqual(2, load.call_count)
+
+                # The crop, decoded at a reduced resolution, can still get the full data
+                roi_images[0].data
+                self.assertEqual(3, load.call_count)
+
 
 class ImageMetaTest(TestCase):
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
@@ -1,3 +1,4 @@
+import os
 import os.path as osp
 from collections import OrderedDict
 from functools import partial
@@ -203,6 +204,17 @@ class KittiImportTest(TestCase):
 
         compare_datasets(self, source_dataset, parsed_dataset)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_with_num_workers(self):
+        for task in ["kitti_segmentation", "kitti_detection"]:
+            with self.subTest(task=task):
+                path = osp.join(DUMMY_DATASET_DIR, task)
+                expected = Dataset.import_from(path, "kitti")
+
+                parsed = Dataset.import_from(path, "kitti", num_workers=2)
+
+                compare_datasets(self, expected, parsed, require_media=True)
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_detect_kitti(self):
         matrix = [
@@ -374,6 +386,71 @@ class KittiExporterTest(TestCase):
                 test_dir,
             )
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_inplace_save_writes_only_updated_data(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="1",
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((1, 5, 3))),
+                    annotations=[
+                        Bbox(0, 0, 2, 1, label=0),
+                        Mask(image=np.array([[0, 0, 0, 1, 0]]), label=0, id=0),
+                    ],
+                ),
+                DatasetItem(
+                    id="2",
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((1, 5, 3))),
+                    annotations=[
+                        Bbox(0, 0, 2, 1, label=1),
+                        Mask(image=np.array([[0, 1, 1, 0, 0]]), label=1, id=0),
+                    ],
+                ),
+                DatasetItem(
+                    id="3",
+                    subset="val",
+                    media=Image.from_numpy(data=np.ones((1, 5, 3))),
+                    annotations=[Bbox(0, 0, 2, 1, label=1)],
+                ),
+            ],
+            categories=["a", "b"],
+            task_type=TaskType.segmentation_instance,
+        )
+
+        with TestDir() as test_dir:
+            dataset.export(test_dir, "kitti", save_media=True)
+            os.unlink(osp.join(test_dir, "train", KittiPath.LABELS_DIR, "1.txt"))
+
+            dataset.put(
+                DatasetItem(
+                    id="2",
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((1, 5, 3))),
+                    annotations=[Bbox(1, 0, 2, 1, label=0)],
+                )
+            )
+            dataset.remove("3", "val")
+            dataset.save(save_media=True)
+
+            self.assertEqual(
+                {"2.txt"}, set(os.listdir(osp.join(test_dir, "train", KittiPath.LABELS_DIR)))
+            )
+            self.assertEqual(
+                {"1.png"}, set(os.listdir(osp.join(test_dir, "train", KittiPath.SEMANTIC_DIR)))
+            )
+            self.assertEqual(
+                {"1.png", "2.png"},
+                set(os.listdir(osp.join(test_dir, "train", KittiPath.IMAGES_DIR))),
+            )
+            self.assertEqual(
+                set(), set(os.listdir(osp.join(test_dir, "val", KittiPath.LABELS_DIR)))
+            )
+            self.assertEqual(
+                set(), set(os.listdir(osp.join(test_dir, "val", KittiPath.IMAGES_DIR)))
+            )
+
     @mark_requirement(Requirements.DATUM_280)
     def test_can_save_kitti_segm_unpainted(self):
         class TestExtractor(TestExtractorBase):
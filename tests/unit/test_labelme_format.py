@@ -6,7 +6,7 @@ from unittest import TestCase
 import numpy as np
 
 from datumaro.components.annotation import Bbox, Mask, Polygon
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.environment import Environment
 from datumaro.components.media import Image
@@ -16,7 +16,7 @@ from datumaro.plugins.data_formats.labelme import LabelMeExporter, LabelMeImport
 from ..requirements import Requirements, mark_requirement
 
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import TestDir, check_save_and_load, compare_datasets
+from tests.utils.test_utils import TestDir, check_is_stream, check_save_and_load, compare_datasets
 
 
 class LabelMeExporterTest(TestCase):
@@ -337,6 +337,58 @@ class LabelMeExporterTest(TestCase):
             )
             self.assertTrue(osp.isfile(osp.join(test_dir, "dataset_meta.json")))
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_inplace_save_writes_only_updated_data(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="1",
+                    subset="a",
+                    media=Image.from_numpy(data=np.ones((2, 3, 3))),
+                    annotations=[Bbox(0, 0, 1, 1, label=0)],
+                ),
+                DatasetItem(
+                    id="2",
+                    subset="a",
+                    media=Image.from_numpy(data=np.ones((2, 3, 3))),
+                    annotations=[
+                        Mask(np.array([[0, 1, 1], [0, 0, 0]]), label=0),
+                        Mask(np.array([[0, 0, 0], [1, 1, 0]]), label=1),
+                    ],
+                ),
+                DatasetItem(
+                    id="3",
+                    subset="b",
+                    media=Image.from_numpy(data=np.ones((2, 3, 3))),
+                    annotations=[Mask(np.array([[1, 0, 0], [0, 0, 0]]), label=1)],
+                ),
+            ],
+            categories=["label1", "label2"],
+            task_type=TaskType.segmentation_instance,
+        )
+
+        with TestDir() as test_dir:
+            dataset.export(test_dir, "label_me", save_media=True)
+            os.unlink(osp.join(test_dir, "Annotations", "a", "1.xml"))
+
+            dataset.put(
+                DatasetItem(
+                    id="2",
+                    subset="a",
+                    media=Image.from_numpy(data=np.ones((2, 3, 3))),
+                    annotations=[Mask(np.array([[1, 1, 1], [0, 0, 0]]), label=1)],
+                )
+            )
+            dataset.remove("3", "b")
+            dataset.save(save_media=True)
+
+            self.assertEqual({"2.xml"}, set(os.listdir(osp.join(test_dir, "Annotations", "a"))))
+            self.assertEqual(set(), set(os.listdir(osp.join(test_dir, "Annotations", "b"))))
+            self.assertEqual({"2_mask_0.png"}, set(os.listdir(osp.join(test_dir, "Masks", "a"))))
+            self.assertEqual(set(), set(os.listdir(osp.join(test_dir, "Masks", "b"))))
+            self.assertEqual({"1.jpg", "2.jpg"}, set(os.listdir(osp.join(test_dir, "Images", "a"))))
+            self.assertEqual(set(), set(os.listdir(osp.join(test_dir, "Images", "b"))))
+
 
 DUMMY_DATASET_DIR = get_test_asset_path("labelme_dataset")
 
@@ -447,8 +499,20 @@ class LabelMeImporterTest(TestCase):
             task_type=TaskType.segmentation_instance,
         )
 
-        parsed = Dataset.import_from(DUMMY_DATASET_DIR, "label_me")
-        compare_datasets(self, expected=target_dataset, actual=parsed)
+        for dataset_cls in [Dataset, StreamDataset]:
+            with self.subTest(dataset_cls=dataset_cls):
+                parsed = dataset_cls.import_from(DUMMY_DATASET_DIR, "label_me")
+                check_is_stream(parsed, dataset_cls is StreamDataset)
+
+                compare_datasets(self, expected=target_dataset, actual=parsed)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_with_num_workers(self):
+        expected = Dataset.import_from(DUMMY_DATASET_DIR, "label_me")
+
+        parsed = Dataset.import_from(DUMMY_DATASET_DIR, "label_me", num_workers=2)
+
+        compare_datasets(self, expected, parsed, require_media=True)
 
     @mark_requirement(Requirements.DATUM_BUG_289)
     def test_can_convert(self):
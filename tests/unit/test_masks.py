@@ -2,12 +2,15 @@
 #
 # SPDX-License-Identifier: MIT
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
+import cv2
 import numpy as np
+import pytest
+from pycocotools import mask as pycocotools_mask
 
 import datumaro.util.mask_tools as mask_tools
-from datumaro.components.annotation import CompiledMask
+from datumaro.components.annotation import CompiledMask, Mask, RleMask
 
 from ..requirements import Requirements, mark_requirement
 
@@ -33,6 +36,45 @@ class PolygonConversionsTest(TestCase):
 
         self.assertEqual(len(expected), len(computed))
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_compute_polygon_area(self):
+        self.assertEqual(12, mask_tools.polygon_area([1, 1, 5, 1, 5, 4, 1, 4]))
+        self.assertEqual(12, mask_tools.polygon_area([1, 1, 1, 4, 5, 4, 5, 1, 1, 1]))
+        self.assertEqual(0.5, mask_tools.polygon_area([0, 0, 1, 0, 0, 1]))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_convert_mask_to_polygons_in_mask_bbox(self):
+        mask = np.zeros((20, 30), dtype=np.uint8)
+        mask[5:9, 10:15] = 1
+        mask[12:18, 20:30] = 1
+
+        computed = mask_tools.mask_to_polygons(mask)
+
+        self.assertEqual(
+            sorted(
+                [
+                    [10, 5, 10, 8, 14, 8, 14, 5, 10, 5],
+                    [20, 12, 20, 17, 29, 17, 29, 12, 20, 12],
+                ]
+            ),
+            sorted(p.tolist() for p in computed),
+        )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_simplify_polygons(self):
+        mask = np.zeros((40, 40), dtype=np.uint8)
+        cv2.circle(mask, (20, 20), 15, 1, -1)
+
+        exact = mask_tools.mask_to_polygons(mask)
+        simplified = mask_tools.mask_to_polygons(mask, tolerance=2)
+
+        self.assertEqual(1, len(exact))
+        self.assertEqual(1, len(simplified))
+        self.assertLess(len(simplified[0]), len(exact[0]))
+        self.assertLess(
+            0.8 * mask_tools.polygon_area(exact[0]), mask_tools.polygon_area(simplified[0])
+        )
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_crop_covered_segments(self):
         image_size = [7, 7]
@@ -204,6 +246,37 @@ class ColormapOperationsTest(TestCase):
 
         self.assertTrue(np.array_equal(expected, actual), "%s\nvs.\n%s" % (expected, actual))
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_remap_mask_with_lookup_table(self):
+        remap_fn = lambda c: (c + 1) % 256
+        lut = mask_tools.make_remap_lut(remap_fn)
+        src = np.arange(256, dtype=np.uint8).reshape((16, 16))
+
+        for mask in [src, src[:, :, None], src.astype(np.int32)]:
+            with self.subTest(shape=mask.shape, dtype=mask.dtype):
+                actual = mask_tools.remap_mask(mask, lut)
+
+                self.assertEqual(mask.shape, actual.shape)
+                self.assertTrue(np.array_equal(remap_fn(mask.astype(int)), actual))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_cache_palettes(self):
+        colormap = mask_tools.generate_colormap(3)
+
+        palette = mask_tools.make_palette(colormap)
+
+        self.assertIs(palette, mask_tools.make_palette(dict(colormap)))
+        self.assertIsNot(palette, mask_tools.make_palette({**colormap, 2: (1, 2, 3)}))
+        self.assertEqual((256, 3), palette.shape)
+        self.assertEqual(colormap[1][::-1], tuple(palette[1]))
+
+        mask = np.array([[0, 1, 2]], dtype=np.uint8)
+        self.assertTrue(
+            np.array_equal(
+                mask_tools.paint_mask(mask, colormap), mask_tools.paint_mask(mask, palette)
+            )
+        )
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_merge_masks(self):
         masks = [
@@ -267,3 +340,154 @@ class MaskToolsTest:
                 binary_mask=binary_mask, index=10, ignore_index=65535, dtype=np.uint16
             ),
         )
+
+    @pytest.mark.parametrize("compressed", [True, False])
+    def test_can_decode_rle_roi(self, compressed):
+        mask = np.zeros((300, 400), dtype=np.uint8)
+        mask[50:250, 100:110] = 1
+        mask[100:120, 5:395] = 1
+        mask[299, 399] = 1
+        rle = mask_tools.mask_to_rle(mask)
+        if compressed:
+            rle = pycocotools_mask.frPyObjects(rle, *rle["size"])
+
+        assert np.sum(mask_tools.rle_counts(rle)) == mask.size
+        for x, y, w, h in [(0, 0, 400, 300), (90, 40, 30, 200), (390, 290, 10, 10), (0, 0, 1, 1)]:
+            roi_mask = mask_tools.decode_rle_roi(rle, (x, y, w, h))
+            assert np.array_equal(mask[y : y + h, x : x + w], roi_mask)
+
+    def test_can_decode_segment_roi(self):
+        polygon = [3, 2, 8, 2, 8, 4, 3, 4]
+        mask = pycocotools_mask.decode(pycocotools_mask.frPyObjects([polygon], 10, 20)[0])
+
+        for segment in [mask.astype(bool), pycocotools_mask.encode(mask), polygon]:
+            roi, roi_mask = mask_tools.decode_segment_roi(segment, 10, 20, padding=1)
+            x, y, w, h = roi
+            assert x <= 3 and y <= 2 and 9 <= x + w and 5 <= y + h
+            assert np.array_equal(mask[y : y + h, x : x + w], roi_mask)
+            assert np.sum(mask) == np.sum(roi_mask)
+
+        assert (None, None) == mask_tools.decode_segment_roi(np.zeros((10, 20)), 10, 20)
+
+    def test_can_paint_segments_in_roi(self):
+        polygon = [0, 0, 4, 0, 4, 4, 0, 4]
+        masks = [np.zeros((10, 20), dtype=np.uint8), np.zeros((10, 20), dtype=np.uint8)]
+        masks[0][2:5, 3:9] = 1
+        masks[1][3:10, 5:15] = 1
+        masks.append(pycocotools_mask.decode(pycocotools_mask.frPyObjects([polygon], 10, 20)[0]))
+        expected = np.zeros((10, 20), dtype=np.uint8)
+        for i, mask in enumerate(masks):
+            expected[mask == 1] = i + 1
+
+        canvas = np.zeros((10, 20), dtype=np.uint8)
+        with mock.patch.object(
+            pycocotools_mask, "decode", side_effect=AssertionError("decoded whole")
+        ):
+            mask_tools.paint_segments(
+                canvas, [(masks[0], 1), (pycocotools_mask.encode(np.asfortranarray(masks[1])), 2)]
+            )
+        mask_tools.paint_segments(canvas, [(polygon, 3)])
+
+        assert np.array_equal(expected, canvas)
+
+    def test_can_merge_rle_masks(self):
+        masks = [np.eye(4, dtype=bool), np.fliplr(np.eye(4, dtype=bool))]
+        rles = [pycocotools_mask.encode(np.asfortranarray(m.astype(np.uint8))) for m in masks]
+
+        expected = mask_tools.merge_masks((m, i + 1) for i, m in enumerate(masks))
+        actual = mask_tools.merge_masks((m, i + 1) for i, m in enumerate(rles))
+
+        assert np.array_equal(expected, actual)
+
+    def test_can_compile_rle_masks(self):
+        masks = [np.eye(4, dtype=bool), np.fliplr(np.eye(4, dtype=bool)), np.eye(4, k=1)]
+        instances = [
+            Mask(masks[0], label=3, z_order=1),
+            RleMask(pycocotools_mask.encode(np.asfortranarray(masks[1].astype(np.uint8))), label=2),
+            RleMask(pycocotools_mask.encode(np.asfortranarray(masks[2].astype(np.uint8))), label=0),
+        ]
+
+        compiled_mask = CompiledMask.from_instance_masks(instances)
+
+        # painted by z_order, label 0 erases the pixels
+        expected_class_mask = np.where(masks[0], 3, np.where(masks[2], 0, np.where(masks[1], 2, 0)))
+        assert np.array_equal(expected_class_mask, compiled_mask.class_mask)
+        assert {1: 2, 3: 3} == compiled_mask.get_instance_labels()
+
+    @pytest.fixture
+    def fxt_rle_masks(self):
+        masks = [np.zeros((10, 20), dtype=np.uint8) for _ in range(3)]
+        masks[0][2:5, 3:9] = 1
+        masks[1][3:10, 5:15] = 1
+        masks[2][0, :] = 1
+        masks[2][:, 19] = 1
+        rles = [pycocotools_mask.encode(np.asfortranarray(m)) for m in masks]
+        return masks, rles
+
+    @staticmethod
+    def _decode(rle):
+        return pycocotools_mask.decode(rle)
+
+    def test_can_get_rle_area_and_bbox(self, fxt_rle_masks):
+        masks, rles = fxt_rle_masks
+
+        for mask, rle in zip(masks, rles):
+            assert np.sum(mask) == mask_tools.rle_area(rle)
+            assert np.sum(mask) == mask_tools.rle_area(mask_tools.mask_to_rle(mask))
+            assert pycocotools_mask.toBbox(rle).tolist() == list(mask_tools.rle_bbox(rle))
+
+        empty_rle = pycocotools_mask.encode(np.zeros((10, 20), dtype=np.uint8, order="F"))
+        assert 0 == mask_tools.rle_area(empty_rle)
+        assert (0, 0, 0, 0) == mask_tools.rle_bbox(empty_rle)
+
+    def test_can_merge_rles(self, fxt_rle_masks):
+        masks, rles = fxt_rle_masks
+
+        union = mask_tools.rle_union(rles)
+        intersection = mask_tools.rle_intersect(rles[:2])
+        difference = mask_tools.rle_subtract(rles[1], rles[0])
+
+        assert pycocotools_mask.merge(rles) == union
+        assert np.array_equal(masks[0] & masks[1], self._decode(intersection))
+        assert np.array_equal(masks[1] & ~masks[0], self._decode(difference))
+
+    def test_cant_merge_rles_of_different_sizes(self, fxt_rle_masks):
+        _, rles = fxt_rle_masks
+        other_rle = pycocotools_mask.encode(np.zeros((20, 10), dtype=np.uint8, order="F"))
+
+        with pytest.raises(ValueError):
+            mask_tools.rle_union([rles[0], other_rle])
+
+    @pytest.mark.parametrize("roi", [(2, 1, 10, 6), (-3, -2, 30, 5), (18, 8, 5, 5), (25, 0, 2, 2)])
+    def test_can_crop_rle(self, fxt_rle_masks, roi):
+        masks, rles = fxt_rle_masks
+        x, y, w, h = roi
+
+        for mask, rle in zip(masks, rles):
+            padded_mask = np.zeros((50, 60), dtype=np.uint8)
+            padded_mask[20:30, 20:40] = mask
+            expected = padded_mask[20 + y : 20 + y + h, 20 + x : 20 + x + w]
+
+            cropped = mask_tools.rle_crop(rle, roi)
+
+            assert [h, w] == cropped["size"]
+            assert np.array_equal(expected, self._decode(cropped))
+
+    def test_can_translate_rle(self, fxt_rle_masks):
+        masks, rles = fxt_rle_masks
+
+        translated = mask_tools.rle_translate(rles[0], 2, -1)
+
+        assert np.array_equal(np.roll(masks[0], (-1, 2), axis=(0, 1)), self._decode(translated))
+
+    @pytest.mark.parametrize("size", [(10, 20), (5, 7), (23, 61), (1, 1)])
+    def test_can_resize_rle(self, fxt_rle_masks, size):
+        import cv2
+
+        masks, rles = fxt_rle_masks
+
+        for mask, rle in zip(masks, rles):
+            expected = cv2.resize(mask, size[::-1], interpolation=cv2.INTER_NEAREST)
+            resized = mask_tools.rle_resize(rle, size)
+
+            assert pycocotools_mask.encode(np.asfortranarray(expected)) == resized
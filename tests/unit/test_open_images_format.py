@@ -10,7 +10,7 @@ from unittest.case import TestCase
 import numpy as np
 
 from datumaro.components.annotation import AnnotationType, Bbox, Label, LabelCategories, Mask
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.environment import Environment
 from datumaro.components.media import Image
@@ -19,7 +19,7 @@ from datumaro.plugins.data_formats.open_images import OpenImagesExporter, OpenIm
 
 from tests.requirements import Requirements, mark_requirement
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import TestDir, compare_datasets
+from tests.utils.test_utils import TestDir, check_is_stream, compare_datasets
 
 
 class OpenImagesFormatTest(TestCase):
@@ -134,9 +134,12 @@ class OpenImagesFormatTest(TestCase):
         with TestDir() as test_dir:
             OpenImagesExporter.convert(source_dataset, test_dir, save_media=True)
 
-            parsed_dataset = Dataset.import_from(test_dir, "open_images")
+            for dataset_cls in [Dataset, StreamDataset]:
+                with self.subTest(dataset_cls=dataset_cls):
+                    parsed_dataset = dataset_cls.import_from(test_dir, "open_images")
+                    check_is_stream(parsed_dataset, dataset_cls is StreamDataset)
 
-            compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
+                    compare_datasets(self, expected_dataset, parsed_dataset, require_media=True)
 
     @mark_requirement(Requirements.DATUM_274)
     def test_can_save_and_load_with_no_subsets(self):
@@ -400,9 +403,12 @@ class OpenImagesImporterTest(TestCase):
             task_type=TaskType.segmentation_instance,
         )
 
-        dataset = Dataset.import_from(DUMMY_DATASET_DIR_V6, "open_images")
+        for dataset_cls in [Dataset, StreamDataset]:
+            with self.subTest(dataset_cls=dataset_cls):
+                dataset = dataset_cls.import_from(DUMMY_DATASET_DIR_V6, "open_images")
+                check_is_stream(dataset, dataset_cls is StreamDataset)
 
-        compare_datasets(self, expected_dataset, dataset, require_media=True)
+                compare_datasets(self, expected_dataset, dataset, require_media=True)
 
     @mark_requirement(Requirements.DATUM_274)
     def test_can_import_v5(self):
@@ -422,9 +428,12 @@ class OpenImagesImporterTest(TestCase):
             task_type=TaskType.unlabeled,
         )
 
-        dataset = Dataset.import_from(DUMMY_DATASET_DIR_V5, "open_images")
+        for dataset_cls in [Dataset, StreamDataset]:
+            with self.subTest(dataset_cls=dataset_cls):
+                dataset = dataset_cls.import_from(DUMMY_DATASET_DIR_V5, "open_images")
+                check_is_stream(dataset, dataset_cls is StreamDataset)
 
-        compare_datasets(self, expected_dataset, dataset, require_media=True)
+                compare_datasets(self, expected_dataset, dataset, require_media=True)
 
     @mark_requirement(Requirements.DATUM_274)
     def test_can_import_without_image_ids_file(self):
@@ -498,6 +507,32 @@ class OpenImagesImporterTest(TestCase):
             shutil.copytree(DUMMY_DATASET_DIR_V6, dataset_path)
             os.remove(osp.join(dataset_path, "annotations", "image_ids_and_rotation.csv"))
 
+            for dataset_cls in [Dataset, StreamDataset]:
+                with self.subTest(dataset_cls=dataset_cls):
+                    dataset = dataset_cls.import_from(dataset_path, "open_images")
+                    check_is_stream(dataset, dataset_cls is StreamDataset)
+
+                    compare_datasets(self, expected_dataset, dataset, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_rows_with_extra_fields(self):
+        expected_dataset = Dataset.import_from(DUMMY_DATASET_DIR_V6, "open_images")
+
+        with TestDir() as test_dir:
+            dataset_path = osp.join(test_dir, "dataset")
+            shutil.copytree(DUMMY_DATASET_DIR_V6, dataset_path)
+
+            # Such rows are rejected by the fast reader, so the file
+            # has to be parsed row by row
+            labels_path = osp.join(
+                dataset_path, "annotations", "oidv6-train-annotations-human-imagelabels.csv"
+            )
+            with open(labels_path, "a", encoding="utf-8") as f:
+                f.write("a,verification,/m/1,1,extra\n")
+            expected_dataset.get("a", "train").annotations.append(
+                Label(label=1, attributes={"score": 1})
+            )
+
             dataset = Dataset.import_from(dataset_path, "open_images")
 
             compare_datasets(self, expected_dataset, dataset, require_media=True)
@@ -0,0 +1,177 @@
+# Copyright (C) 2024 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import os.path as osp
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from datumaro.components.annotation import AnnotationType, Bbox
+from datumaro.components.dataset import Dataset, StreamDataset
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.media import Image
+from datumaro.plugins.data_formats.coco.page_mapper import COCOPageMapper
+from datumaro.plugins.data_formats.datumaro.page_mapper import DatumPageMapper
+from datumaro.rust_api import CocoPageMapper as CocoPageMapperImpl
+from datumaro.rust_api import DatumPageMapper as DatumPageMapperImpl
+from datumaro.util.definitions import can_use_page_map_index, get_page_map_index_path
+
+from ..requirements import Requirements, mark_requirement
+
+from tests.utils.test_utils import compare_datasets
+
+COCO_JSON_PATH = osp.join("annotations", "instances_train.json")
+DATUMARO_JSON_PATH = osp.join("annotations", "train.json")
+
+FORMATS = [
+    pytest.param("coco_instances", COCO_JSON_PATH, id="coco"),
+    pytest.param("datumaro", DATUMARO_JSON_PATH, id="datumaro"),
+]
+
+
+@pytest.fixture
+def fxt_dataset():
+    return Dataset.from_iterable(
+        [
+            DatasetItem(
+                id=f"item_{i}",
+                subset="train",
+                media=Image.from_numpy(data=np.zeros((4, 6, 3))),
+                annotations=[Bbox(0, 1, 2, 3, label=i % 2, id=i + 1, group=i + 1)],
+            )
+            for i in range(3)
+        ],
+        categories=["aaa", "bbb"],
+    )
+
+
+@pytest.fixture
+def fxt_index_dir(test_dir):
+    index_dir = osp.join(test_dir, "page_maps")
+    with mock.patch("datumaro.util.definitions.get_page_map_index_dir", return_value=index_dir):
+        yield index_dir
+
+
+requires_index_support = pytest.mark.skipif(
+    not all(can_use_page_map_index(impl) for impl in [CocoPageMapperImpl, DatumPageMapperImpl]),
+    reason="The Rust extension is built without the page map index support. "
+    "Rebuild it with 'pip install -e .'",
+)
+
+
+def _index_stat(json_path: str):
+    stat = os.stat(get_page_map_index_path(json_path))
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class PageMapIndexTest:
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @requires_index_support
+    @pytest.mark.parametrize(
+        "page_mapper_cls, fmt, json_path",
+        [
+            (COCOPageMapper, "coco_instances", COCO_JSON_PATH),
+            (DatumPageMapper, "datumaro", DATUMARO_JSON_PATH),
+        ],
+    )
+    def test_index_is_enabled_by_default(
+        self, page_mapper_cls, fmt, json_path, fxt_dataset, fxt_index_dir, test_dir, monkeypatch
+    ):
+        monkeypatch.delenv("DATUMARO_PAGE_MAP_INDEX", raising=False)
+        dataset_dir = osp.join(test_dir, "dataset")
+        fxt_dataset.export(dataset_dir, fmt)
+        json_path = osp.join(dataset_dir, json_path)
+
+        page_mapper_cls(json_path)
+
+        assert osp.isfile(get_page_map_index_path(json_path))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "page_mapper_cls, fmt, json_path",
+        [
+            (COCOPageMapper, "coco_instances", COCO_JSON_PATH),
+            (DatumPageMapper, "datumaro", DATUMARO_JSON_PATH),
+        ],
+    )
+    def test_can_disable_index(
+        self, page_mapper_cls, fmt, json_path, fxt_dataset, fxt_index_dir, test_dir, monkeypatch
+    ):
+        monkeypatch.setenv("DATUMARO_PAGE_MAP_INDEX", "0")
+        dataset_dir = osp.join(test_dir, "dataset")
+        fxt_dataset.export(dataset_dir, fmt)
+
+        page_mapper_cls(osp.join(dataset_dir, json_path))
+
+        assert not osp.exists(fxt_index_dir)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @requires_index_support
+    @pytest.mark.parametrize("fmt, json_path", FORMATS)
+    def test_can_reuse_index(self, fmt, json_path, fxt_dataset, fxt_index_dir, test_dir, helper_tc):
+        dataset_dir = osp.join(test_dir, "dataset")
+        fxt_dataset.export(dataset_dir, fmt)
+        json_path = osp.join(dataset_dir, json_path)
+
+        first = StreamDataset.import_from(dataset_dir, fmt)
+        index_stat = _index_stat(json_path)
+        second = StreamDataset.import_from(dataset_dir, fmt)
+
+        assert _index_stat(json_path) == index_stat
+        compare_datasets(helper_tc, fxt_dataset, first, ignored_attrs="*")
+        compare_datasets(helper_tc, fxt_dataset, second, ignored_attrs="*")
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @requires_index_support
+    @pytest.mark.parametrize("fmt, json_path", FORMATS)
+    @pytest.mark.parametrize("change", ["size", "mtime", "head"])
+    def test_can_rebuild_outdated_index(
+        self, fmt, json_path, change, fxt_dataset, fxt_index_dir, test_dir
+    ):
+        dataset_dir = osp.join(test_dir, "dataset")
+        fxt_dataset.export(dataset_dir, fmt)
+        json_path = osp.join(dataset_dir, json_path)
+
+        StreamDataset.import_from(dataset_dir, fmt)
+        index_stat = _index_stat(json_path)
+
+        file_stat = os.stat(json_path)
+        if change == "size":
+            with open(json_path, "a") as f:
+                f.write("\n")
+        elif change == "mtime":
+            os.utime(json_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+        elif change == "head":
+            # Same size and modification time, but different contents
+            with open(json_path, "rb") as f:
+                data = f.read()
+            with open(json_path, "wb") as f:
+                f.write(data.replace(b'"aaa"', b'"ccc"'))
+            os.utime(json_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+        dataset = StreamDataset.import_from(dataset_dir, fmt)
+
+        assert _index_stat(json_path) != index_stat
+        expected_labels = ["ccc" if change == "head" else "aaa", "bbb"]
+        assert [
+            label.name for label in dataset.categories()[AnnotationType.label]
+        ] == expected_labels
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_evict_least_recently_used_indices(self, fxt_index_dir):
+        os.makedirs(fxt_index_dir)
+        index_paths = [get_page_map_index_path(f"{i}.json") for i in range(4)]
+        for i, index_path in enumerate(index_paths):
+            with open(index_path, "wb") as f:
+                f.write(b"\0" * 100)
+            os.utime(index_path, (i, i))
+
+        # The index of the requested file is kept and becomes the most recently used
+        with mock.patch("datumaro.util.definitions.PAGE_MAP_INDEX_MAX_CACHE_SIZE", 250):
+            assert get_page_map_index_path("1.json") == index_paths[1]
+
+        assert [False, True, False, True] == [osp.exists(p) for p in index_paths]
+        assert os.stat(index_paths[3]).st_mtime < os.stat(index_paths[1]).st_mtime
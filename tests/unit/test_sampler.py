@@ -1193,6 +1193,30 @@ class TestLabelRandomSampler(TestCase):
             },
         )
 
+    def test_can_sample_indexed_items(self):
+        def _make_dataset():
+            return Dataset.from_iterable(
+                [
+                    DatasetItem(i, subset=s, annotations=[Label(l) for l in labels])
+                    for i, (s, labels) in enumerate(
+                        product(["a", "b"], [[], [0], [1], [2], [0, 2], [1, 2], [0, 1]] * 3)
+                    )
+                ],
+                categories=["a", "b", "c"],
+            )
+
+        expected = LabelRandomSampler(_make_dataset(), count=2, label_counts={"c": 0}, seed=12)
+
+        source = _make_dataset()
+        source.init_cache()
+        actual = source.transform(LabelRandomSampler, count=2, label_counts={"c": 0}, seed=12)
+
+        self.assertEqual(
+            [(item.id, item.subset, item.annotations) for item in expected],
+            [(item.id, item.subset, item.annotations) for item in actual],
+        )
+        self.assertEqual(expected.categories(), actual.categories())
+
     def test_can_change_output_labels(self):
         expected = Dataset.from_iterable([], categories=["a"])
 
@@ -7,13 +7,13 @@ from unittest import TestCase
 import pytest
 
 from datumaro.components.annotation import AnnotationType, TabularCategories
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.environment import Environment
 from datumaro.plugins.data_formats.tabular import *
 
 from tests.requirements import Requirements, mark_requirement
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import TestDir, compare_datasets
+from tests.utils.test_utils import TestDir, check_is_stream, compare_datasets
 
 
 @pytest.fixture()
@@ -174,3 +174,49 @@ class TabularImporterTest:
     )
     def test_string_to_dict(self, input_string, expected_result):
         assert string_to_dict(input_string) == expected_result
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize("dataset_cls", [Dataset, StreamDataset])
+    def test_can_import_tabular_stream(self, fxt_tabular_root, fxt_buddy, dataset_cls) -> None:
+        path = osp.join(fxt_tabular_root, "adopt-a-buddy")
+        target = {"input": "length(m)", "output": ["breed_category", "pet_category"]}
+        dataset = dataset_cls.import_from(path, "tabular", target=target)
+
+        check_is_stream(dataset, dataset_cls is StreamDataset)
+        compare_datasets(TestCase(), fxt_buddy, dataset)
+        for item_a, item_b in zip(fxt_buddy, dataset):
+            assert item_a.id == item_b.id
+            assert item_a.media.data() == item_b.media.data()
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_import_tabular_with_pyarrow_strings(self, fxt_tabular_root) -> None:
+        path = osp.join(fxt_tabular_root, "adopt-a-buddy", "train.csv")
+        expected = Table.from_csv(path)
+        table = Table.from_csv(path, string_storage="pyarrow")
+
+        assert isinstance(table.data.dtypes["color_type"], pd.StringDtype)
+        assert table.dtype("color_type") == expected.dtype("color_type")
+        assert table[0].data(["color_type"]) == expected[0].data(["color_type"])
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_read_table_not_matching_sample_types(self) -> None:
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "a.csv")
+            with open(path, "w") as f:
+                f.write("a;b;c\n1;2;x\n3;4;y\n5;;z\n6.5;7;8\n")
+
+            table = Table.from_csv(path, sample_size=2, chunk_size=2)
+
+            assert table.shape == (4, 3)
+            assert [table.dtype(c) for c in table.columns] == [float, float, str]
+            assert table[3].data() == {"a": 6.5, "b": 7.0, "c": "8"}
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_table_row_refers_to_table(self, fxt_tabular_root) -> None:
+        table = Table.from_csv(osp.join(fxt_tabular_root, "electricity.csv"))
+        row = table[1]
+
+        assert row.data() == table.data.iloc[1].to_dict()
+        assert row.data(["day", "class"]) == {"day": 4, "class": "DOWN"}
+        assert type(row.data()["day"]) is int
+        assert row.from_self(index=2).table is table
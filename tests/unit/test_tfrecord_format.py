@@ -1,50 +1,31 @@
 import os
 import os.path as osp
 from functools import partial
-from unittest import TestCase, skipIf
+from unittest import TestCase
 
 import numpy as np
 
 from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories, Mask
-from datumaro.components.dataset import Dataset
+from datumaro.components.dataset import Dataset, StreamDataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.environment import Environment
+from datumaro.components.errors import DatasetImportError
 from datumaro.components.media import Image
 from datumaro.components.task import TaskType
+from datumaro.plugins.data_formats.tf_detection_api.base import (
+    TfDetectionApiBase,
+    TfDetectionApiImporter,
+)
+from datumaro.plugins.data_formats.tf_detection_api.exporter import TfDetectionApiExporter
+from datumaro.util import tfrecord
 from datumaro.util.image import encode_image
-from datumaro.util.tf_util import check_import
 
 from ..requirements import Requirements, mark_requirement
 
 from tests.utils.assets import get_test_asset_path
-from tests.utils.test_utils import TestDir, check_save_and_load, compare_datasets
+from tests.utils.test_utils import TestDir, check_is_stream, check_save_and_load, compare_datasets
 
-try:
-    from datumaro.plugins.data_formats.tf_detection_api.base import (
-        TfDetectionApiBase,
-        TfDetectionApiImporter,
-    )
-    from datumaro.plugins.data_formats.tf_detection_api.exporter import TfDetectionApiExporter
 
-    import_failed = False
-except ImportError:
-    import_failed = True
-
-    import importlib
-
-    module_found = importlib.util.find_spec("tensorflow") is not None
-
-    @skipIf(not module_found, "Tensorflow package is not found")
-    class TfImportTest(TestCase):
-        @mark_requirement(Requirements.DATUM_GENERAL_REQ)
-        def test_raises_when_crashes_on_import(self):
-            # Should fire if import can't be done for any reason except
-            # module unavailability and import crash
-            with self.assertRaisesRegex(ImportError, "Test process exit code"):
-                check_import()
-
-
-@skipIf(import_failed, "Failed to import tensorflow")
 class TfrecordExporterTest(TestCase):
     def _test_save_and_load(
         self, source_dataset, converter, test_dir, target_dataset=None, importer_args=None, **kwargs
@@ -266,6 +247,46 @@ class TfrecordExporterTest(TestCase):
                 require_media=True,
             )
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_save_and_load_shards(self):
+        test_dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=i,
+                    subset="train",
+                    media=Image.from_numpy(data=np.ones((4, 6, 3)) * i),
+                    annotations=[Bbox(0, 1, 2, 2, label=i % 2)],
+                    attributes={"source_id": str(i)},
+                )
+                for i in range(5)
+            ],
+            categories=["a", "b"],
+            task_type=TaskType.detection,
+        )
+
+        with TestDir() as test_dir:
+            test_dataset.export(test_dir, "tf_detection_api", save_media=True, num_shards=3)
+
+            self.assertEqual(
+                [
+                    "label_map.pbtxt",
+                    "train-00000-of-00003.tfrecord",
+                    "train-00001-of-00003.tfrecord",
+                    "train-00002-of-00003.tfrecord",
+                ],
+                sorted(os.listdir(test_dir)),
+            )
+
+            for dataset_cls in [Dataset, StreamDataset]:
+                for num_workers in [0, 2]:
+                    with self.subTest(dataset_cls=dataset_cls, num_workers=num_workers):
+                        dataset = dataset_cls.import_from(
+                            test_dir, "tf_detection_api", num_workers=num_workers
+                        )
+
+                        check_is_stream(dataset, dataset_cls is StreamDataset)
+                        compare_datasets(self, test_dataset, dataset, require_media=True)
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_inplace_save_writes_only_updated_data(self):
         with TestDir() as path:
@@ -322,7 +343,6 @@ class TfrecordExporterTest(TestCase):
 DUMMY_DATASET_DIR = get_test_asset_path("tf_detection_api_dataset")
 
 
-@skipIf(import_failed, "Failed to import tensorflow")
 class TfrecordImporterTest(TestCase):
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_detect(self):
@@ -368,6 +388,71 @@ class TfrecordImporterTest(TestCase):
             task_type=TaskType.detection,
         )
 
-        dataset = Dataset.import_from(DUMMY_DATASET_DIR, "tf_detection_api")
+        for dataset_cls in [Dataset, StreamDataset]:
+            for num_workers in [0, 2]:
+                with self.subTest(dataset_cls=dataset_cls, num_workers=num_workers):
+                    dataset = dataset_cls.import_from(
+                        DUMMY_DATASET_DIR, "tf_detection_api", num_workers=num_workers
+                    )
+
+                    check_is_stream(dataset, dataset_cls is StreamDataset)
+                    compare_datasets(self, target_dataset, dataset, require_media=True)
+
+
+class TfrecordUtilTest(TestCase):
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_crc32c(self):
+        self.assertEqual(0xE3069283, tfrecord.crc32c(b"123456789"))
+        self.assertEqual(0, tfrecord.crc32c(b""))
+
+        # The long inputs are processed in a different way
+        data = bytes(range(256)) * 17
+        expected = 0xFFFFFFFF
+        for byte in data:
+            expected ^= byte
+            for _ in range(8):
+                expected = (expected >> 1) ^ (0x82F63B78 if expected & 1 else 0)
+        self.assertEqual(expected ^ 0xFFFFFFFF, tfrecord.crc32c(data))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_write_and_read_examples(self):
+        example = tfrecord.make_example(
+            {
+                "a": tfrecord.bytes_list_feature([b"x", b""]),
+                "b": tfrecord.int64_list_feature([0, -1, 2**40]),
+                "c": tfrecord.float_list_feature([0.5, -2.0]),
+            }
+        )
+
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "test.tfrecord")
+            with tfrecord.TfrecordWriter(path) as writer:
+                writer.write(example)
+                writer.write(b"")
+
+            reader = tfrecord.TfrecordReader(path)
+            self.assertEqual(2, len(reader))
+            self.assertEqual([example, b""], list(reader))
+
+            parsed = tfrecord.parse_example(reader.read(0), lazy_keys={"a"})
+            self.assertEqual([0, -1, 2**40], parsed["b"])
+            self.assertEqual([0.5, -2.0], parsed["c"])
+
+            data_offset, _ = reader.index[0]
+            (start, end), (empty_start, empty_end) = parsed["a"]
+            self.assertEqual(b"x", tfrecord.read_file_range(path, data_offset + start, end - start))
+            self.assertEqual(empty_start, empty_end)
+
+    @mark_requirement(Requirements.DATUM_ERROR_REPORTING)
+    def test_can_report_corrupted_record(self):
+        with TestDir() as test_dir:
+            path = osp.join(test_dir, "test.tfrecord")
+            with tfrecord.TfrecordWriter(path) as writer:
+                writer.write(b"data")
+
+            with open(path, "r+b") as f:
+                f.seek(-5, os.SEEK_END)
+                f.write(b"D")
 
-        compare_datasets(self, target_dataset, dataset, require_media=True)
+            with self.assertRaises(DatasetImportError):
+                list(tfrecord.TfrecordReader(path))
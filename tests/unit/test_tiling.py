@@ -3,11 +3,12 @@ from __future__ import annotations
 from collections import defaultdict
 from copy import deepcopy
 from typing import Dict, List
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import numpy as np
 import shapely.geometry as sg
 
+import datumaro.util.mask_tools as mask_tools
 from datumaro.components.annotation import (
     AnnotationType,
     Bbox,
@@ -19,6 +20,7 @@ from datumaro.components.annotation import (
     Points,
     Polygon,
     PolyLine,
+    RleMask,
     SuperResolutionAnnotation,
 )
 from datumaro.components.dataset import Dataset
@@ -492,6 +494,60 @@ class TileTest(_TestBase, TestCase):
             for ann in item.annotations:
                 assert ann.image.astype(np.int32).sum() == n_pixels
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_rle_mask(self):
+        n_pixels = min(self.tile_height, self.tile_width)
+        source = Dataset.from_iterable(
+            [
+                item.wrap(
+                    annotations=[
+                        RleMask(mask_tools.mask_to_rle(ann.image), **self.default_shape_attrs)
+                        for ann in item.annotations
+                    ]
+                )
+                for item in self.source_dataset_mask
+            ]
+        )
+
+        transformed = source.transform(
+            Tile,
+            grid_size=(self.n_tiles, self.n_tiles),
+            overlap=(0.0, 0.0),
+            threshold_drop_ann=0.5,
+        )
+
+        self._test_common(transformed, self.default_shape_attrs, AnnotationType.mask)
+
+        # The masks are cropped without decoding
+        for item in transformed:
+            for ann in item.annotations:
+                assert isinstance(ann, RleMask)
+                assert list(item.media.size) == ann.rle["size"]
+                assert ann.get_area() == n_pixels
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_tiles_share_decoded_image(self):
+        image = np.arange(self.height * self.width * 3, dtype=np.uint8).reshape(
+            (self.height, self.width, 3)
+        )
+        load = mock.Mock(return_value=image)
+        source = Dataset.from_iterable(
+            [DatasetItem(id=0, media=Image.from_numpy(data=load, size=image.shape[:2]))]
+        )
+
+        transformed = source.transform(
+            Tile,
+            grid_size=(self.n_tiles, self.n_tiles),
+            overlap=(0.0, 0.0),
+            threshold_drop_ann=0.5,
+        )
+        tiles = [item.media.data for item in transformed]
+
+        self.assertEqual(self.n_tiles**2, len(tiles))
+        self.assertEqual(1, load.call_count)
+        for tile in tiles:
+            self.assertTrue(np.shares_memory(image, tile))
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_depth_annotation(self):
         n_pixels = min(self.tile_height, self.tile_width)
@@ -676,3 +732,71 @@ class MergeTileTest(_TestBase, TestCase):
                 .transform("merge_tile")
             )
             compare_datasets(self, transformed, source, require_media=True)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_merge_tiles_of_any_image_type(self):
+        for shape, dtype in [
+            ((self.height, self.width), np.uint8),
+            ((self.height, self.width, 4), np.float32),
+        ]:
+            image = np.arange(np.prod(shape)).astype(dtype).reshape(shape)
+            source = Dataset.from_iterable([DatasetItem(id=0, media=Image.from_numpy(data=image))])
+
+            transformed = source.transform(
+                "tile",
+                grid_size=(self.n_tiles, self.n_tiles),
+                overlap=(0.0, 0.0),
+                threshold_drop_ann=0.5,
+            ).transform("merge_tile")
+
+            merged = next(iter(transformed)).media.data
+            self.assertEqual(dtype, merged.dtype)
+            np.testing.assert_array_equal(image, merged)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_deduplicate_bboxes_without_ids(self):
+        def _tile(idx, roi, annotations):
+            return DatasetItem(
+                id=f"a_tile_{idx}",
+                media=Image.from_numpy(data=np.zeros((roi[3], roi[2], 3))),
+                attributes={"tile_id": "a", "tile_idx": idx, "roi": roi},
+                annotations=annotations,
+            )
+
+        # The tiles overlap in x = [6; 10)
+        source = Dataset.from_iterable(
+            [
+                _tile(
+                    0,
+                    (0, 0, 10, 8),
+                    [
+                        Bbox(4, 1, 6, 2, label=0),  # the same box, cropped by the tiles
+                        Bbox(7, 4, 2, 2, label=0),  # the same box in the overlap
+                        Bbox(7, 4, 2, 2, label=1),  # another label
+                        Bbox(1, 6, 1, 1, label=0),
+                    ],
+                ),
+                _tile(
+                    1,
+                    (6, 0, 10, 8),
+                    [
+                        Bbox(0, 1, 6, 2, label=0),
+                        Bbox(1, 4, 2, 2, label=0),
+                        Bbox(3, 4, 2, 2, label=0),  # touches a box of the other tile
+                    ],
+                ),
+            ]
+        )
+
+        merged = next(iter(source.transform("merge_tile")))
+
+        self.assertEqual(
+            [
+                (0, [4, 1, 8, 2]),
+                (0, [7, 4, 2, 2]),
+                (1, [7, 4, 2, 2]),
+                (0, [1, 6, 1, 1]),
+                (0, [9, 4, 2, 2]),
+            ],
+            [(ann.label, ann.get_bbox()) for ann in merged.annotations],
+        )
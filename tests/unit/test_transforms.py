@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import logging as log
 import random
-from unittest import TestCase
+from unittest import TestCase, mock
 
+import cv2
 import numpy as np
 import pycocotools.mask as mask_utils
 import pytest
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 import datumaro.plugins.transforms as transforms
 import datumaro.util.mask_tools as mask_tools
 from datumaro.components.annotation import (
@@ -71,6 +77,80 @@ class TransformsTest(TestCase):
         actual = transforms.Sort(source, lambda item: int(item.id))
         compare_datasets_strict(self, expected, actual)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_sort_with_max_memory(self):
+        items = [
+            DatasetItem(
+                id=i,
+                subset=("a", "b")[i % 2],
+                media=Image.from_file(path=f"images/{i}.jpg", size=(4, 6)),
+                annotations=[Bbox(1, 2, 3, 4, label=i % 3, attributes={"x": i})],
+                attributes={"y": str(i)},
+            )
+            for i in range(10)
+        ]
+        # These items can't be spilled
+        items[3] = items[3].wrap(media=Image.from_numpy(data=np.zeros((4, 6, 3))))
+        items[5] = items[5].wrap(annotations=[Mask(np.ones((4, 6)), label=0)])
+
+        source = items.copy()
+        random.Random(0).shuffle(source)
+        source = Dataset.from_iterable(source)
+
+        # The sort is stable
+        expected = Dataset.from_iterable(
+            sorted(source, key=lambda item: int(item.id) // 2), media_type=Image
+        )
+
+        for max_memory in [None, 3, 100]:
+            with self.subTest(max_memory=max_memory):
+                actual = transforms.Sort(
+                    source, lambda item: int(item.id) // 2, max_memory=max_memory
+                )
+
+                compare_datasets_strict(self, expected, actual)
+                self.assertEqual(
+                    [("3", np.ndarray), ("5", Mask)],
+                    [
+                        (item.id, type(item.media.data if item.id == "3" else item.annotations[0]))
+                        for item in actual
+                        if item.id in {"3", "5"}
+                    ],
+                )
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_sort_with_max_memory_spills_items(self):
+        source = Dataset.from_iterable([DatasetItem(id=i) for i in range(10, 0, -1)])
+
+        with mock.patch.object(
+            transforms.Sort, "_read_spilled", wraps=transforms.Sort._read_spilled
+        ) as read_spilled:
+            actual = [item.id for item in transforms.Sort(source, max_memory=4)]
+
+        self.assertEqual(sorted(str(i) for i in range(1, 11)), actual)
+        self.assertEqual(3, read_spilled.call_count)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.skipif(resource is None, reason="The open file limit can't be changed")
+    def test_sort_with_max_memory_limits_open_files(self):
+        source = Dataset.from_iterable(
+            [DatasetItem(id=i, annotations=[Bbox(0, 0, 1, 1, label=0)]) for i in range(2000)]
+        )
+        expected = sorted(source, key=lambda item: item.id)
+
+        # 400 runs are merged, which is more than the number of the files allowed
+        soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(soft_limit, 256), hard_limit))
+        try:
+            actual = list(transforms.Sort(source, max_memory=5))
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft_limit, hard_limit))
+
+        self.assertEqual([item.id for item in expected], [item.id for item in actual])
+        self.assertEqual(
+            [item.annotations for item in expected], [item.annotations for item in actual]
+        )
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_mask_to_polygons(self):
         source = Dataset.from_iterable(
@@ -111,6 +191,66 @@ class TransformsTest(TestCase):
         actual = transforms.MasksToPolygons(source)
         compare_datasets(self, expected, actual)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_mask_to_polygons_with_num_workers(self):
+        def _make_mask(x, y, label):
+            image = np.zeros((40, 50), dtype=np.uint8)
+            image[y : y + 5, x : x + 6] = 1
+            return Mask(image, label=label)
+
+        source = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=i,
+                    annotations=[
+                        Label(0),
+                        _make_mask(2, 3, 0),
+                        RleMask(mask_tools.mask_to_rle(_make_mask(20, 10, 1).image), label=1),
+                        Bbox(1, 2, 3, 4, label=0),
+                        _make_mask(30, 30, 1),
+                    ],
+                )
+                for i in range(5)
+            ],
+            categories=["a", "b"],
+        )
+
+        expected = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=i,
+                    annotations=[
+                        Label(0),
+                        Polygon([2, 3, 2, 7, 7, 7, 7, 3, 2, 3], label=0),
+                        Polygon([20, 10, 20, 14, 25, 14, 25, 10, 20, 10], label=1),
+                        Bbox(1, 2, 3, 4, label=0),
+                        Polygon([30, 30, 30, 34, 35, 34, 35, 30, 30, 30], label=1),
+                    ],
+                )
+                for i in range(5)
+            ],
+            categories=["a", "b"],
+        )
+
+        actual = transforms.MasksToPolygons(source, num_workers=2)
+        compare_datasets(self, expected, actual)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_mask_to_polygons_with_tolerance(self):
+        image = np.zeros((60, 60), dtype=np.uint8)
+        cv2.circle(image, (30, 30), 25, 1, -1)
+        source = Dataset.from_iterable([DatasetItem(id=1, annotations=[Mask(image)])])
+
+        exact = transforms.MasksToPolygons(source).get("1").annotations
+        simplified = transforms.MasksToPolygons(source, tolerance=2).get("1").annotations
+
+        self.assertEqual(1, len(exact))
+        self.assertEqual(1, len(simplified))
+        self.assertLess(len(simplified[0].points), len(exact[0].points))
+
+        with self.assertRaises(ValueError):
+            transforms.MasksToPolygons(source, tolerance=-1)
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_mask_to_polygons_small_polygons_message(self):
         source_dataset = Dataset.from_iterable(
@@ -786,6 +926,34 @@ class TransformsTest(TestCase):
 
         compare_datasets(self, expected, actual)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_project_labels_removes_unknown_label_ids(self):
+        source = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=1,
+                    annotations=[
+                        Label(0),
+                        Label(4),  # Must be removed (no such label)
+                        Bbox(1, 2, 3, 4, label=-1),  # Must be removed (no such label)
+                        Bbox(1, 2, 3, 4, label=3),
+                    ],
+                )
+            ],
+            categories=["a", "b", "c", "d"],
+        )
+
+        expected = Dataset.from_iterable(
+            [
+                DatasetItem(id=1, annotations=[Label(1), Bbox(1, 2, 3, 4, label=0)]),
+            ],
+            categories=["d", "a"],
+        )
+
+        actual = transforms.ProjectLabels(source, dst_labels=["d", "a"])
+
+        compare_datasets(self, expected, actual)
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_project_labels_maps_secondary_categories(self):
         source = Dataset.from_iterable(
@@ -1004,6 +1172,62 @@ class TransformsTest(TestCase):
             actual = transforms.ResizeTransform(big_dataset, width=4, height=4)
             compare_datasets(self, small_dataset, actual)
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_resize_in_thread_pool(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=i,
+                    media=Image.from_numpy(data=np.arange(48, dtype=np.uint8).reshape(6, 8) * i),
+                    annotations=[Bbox(1, 1, 2, 2, label=0)],
+                )
+                for i in range(5)
+            ],
+            categories=["a"],
+        )
+
+        expected = Dataset(transforms.ResizeTransform(dataset, width=4, height=3))
+        actual = Dataset(transforms.ResizeTransform(dataset, width=4, height=3, num_workers=2))
+
+        compare_datasets(self, expected, actual)
+        self.assertEqual([(3, 4)] * 5, [item.media.data.shape for item in actual])
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_resize_images_without_data_in_thread_pool(self):
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id="with_data",
+                    media=Image.from_numpy(data=np.ones((6, 8, 3))),
+                    annotations=[Bbox(1, 1, 2, 2, label=0)],
+                ),
+                DatasetItem(
+                    id="without_data",
+                    media=Image.from_file(path="missing.jpg", size=(6, 8)),
+                    annotations=[Bbox(2, 2, 4, 2, label=0)],
+                ),
+            ],
+            categories=["a"],
+        )
+
+        expected = Dataset(transforms.ResizeTransform(dataset, width=4, height=3))
+        actual = Dataset(transforms.ResizeTransform(dataset, width=4, height=3, num_workers=2))
+
+        self.assertEqual([Bbox(1, 1, 2, 1, label=0)], actual.get("without_data").annotations)
+        compare_datasets(self, expected, actual)
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_resize_tiles(self):
+        data = np.zeros((8, 8, 3), dtype=np.uint8)
+        data[:4, 4:] = 255
+        dataset = Dataset.from_iterable([DatasetItem(id=1, media=Image.from_numpy(data=data))])
+
+        actual = dataset.transform("tile", grid_size=(2, 2), overlap=(0, 0), threshold_drop_ann=0)
+        actual = actual.transform("resize", width=2, height=2)
+
+        self.assertEqual([0, 255, 0, 0], [int(item.media.data.mean()) for item in actual])
+        self.assertEqual([(2, 2, 3)] * 4, [item.media.data.shape for item in actual])
+
     @mark_bug(Requirements.DATUM_BUG_606)
     def test_can_keep_image_ext_on_resize(self):
         expected = Image.from_numpy(data=np.ones((8, 4)), ext="jpg")
@@ -1018,6 +1242,53 @@ class TransformsTest(TestCase):
         self.assertEqual(actual.ext, expected.ext)
         self.assertTrue(np.array_equal(actual.data, expected.data))
 
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_rle_masks_are_transformed_without_decoding(self):
+        masks = [np.zeros((6, 8), dtype=np.uint8) for _ in range(2)]
+        masks[0][1:5, 1:6] = 1
+        masks[1][3:6, 4:8] = 1
+        rles = [mask_utils.encode(np.asfortranarray(m)) for m in masks]
+
+        dataset = Dataset.from_iterable(
+            [
+                DatasetItem(
+                    id=1,
+                    media=Image.from_numpy(data=np.zeros((6, 8, 3))),
+                    annotations=[
+                        RleMask(rles[0], z_order=0, group=1),
+                        RleMask(rles[1], z_order=1, group=1),
+                    ],
+                ),
+            ]
+        )
+
+        def _get_masks(transformed):
+            return [
+                mask_utils.decode(ann.rle)
+                for ann in transformed.get(1).annotations
+                if isinstance(ann, RleMask)
+            ]
+
+        with mock.patch.object(RleMask, "_decode", side_effect=AssertionError("decoded")):
+            cropped = Dataset(transforms.CropCoveredSegments(dataset))
+            merged = Dataset(transforms.MergeInstanceSegments(dataset))
+            resized = Dataset(transforms.ResizeTransform(dataset, width=16, height=3))
+            boxes = Dataset(transforms.ShapesToBoxes(dataset))
+
+        expected = [masks[0] & ~masks[1], masks[1]]
+        self.assertTrue(all(map(np.array_equal, expected, _get_masks(cropped))))
+
+        expected = [masks[0] | masks[1]]
+        self.assertTrue(all(map(np.array_equal, expected, _get_masks(merged))))
+
+        expected = [np.repeat(m[::2], 2, axis=1) for m in masks]
+        self.assertTrue(all(map(np.array_equal, expected, _get_masks(resized))))
+
+        self.assertEqual(
+            [Bbox(1, 1, 5, 4, z_order=0, group=1), Bbox(4, 3, 4, 3, z_order=1, group=1)],
+            boxes.get(1).annotations,
+        )
+
     @mark_requirement(Requirements.DATUM_GENERAL_REQ)
     def test_can_remove_items_by_ids(self):
         expected = Dataset.from_iterable([DatasetItem(id="1", subset="train")])
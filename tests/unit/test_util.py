@@ -2,10 +2,14 @@
 #
 # SPDX-License-Identifier: MIT
 
+import glob
 import logging
 import os
 import os.path as osp
 import platform
+import sys
+import threading
+import time
 from contextlib import suppress
 from typing import Iterator
 from unittest import TestCase, mock
@@ -14,7 +18,8 @@ import pytest
 
 from datumaro.util import is_method_redefined
 from datumaro.util.definitions import get_datumaro_cache_dir
-from datumaro.util.multi_procs_util import consumer_generator
+from datumaro.util.fs_snapshot import FileSystemSnapshot, fs_snapshot, get_fs_snapshot
+from datumaro.util.multi_procs_util import consumer_generator, ordered_thread_map
 from datumaro.util.os_util import walk
 from datumaro.util.scope import Scope, on_error_do, on_exit_do, scoped
 
@@ -173,6 +178,89 @@ class TestOsUtils(TestCase):
             )
 
 
+class FileSystemSnapshotTest:
+    @pytest.fixture
+    def fxt_tree(self, test_dir: str) -> str:
+        for path in [
+            "a.txt",
+            ".hidden.txt",
+            "b/c.json",
+            "b/d/e.txt",
+            "b/.f/g.txt",
+            "h[1]/i.txt",
+        ]:
+            path = osp.join(test_dir, path)
+            os.makedirs(osp.dirname(path), exist_ok=True)
+            with open(path, "w"):
+                pass
+        return test_dir
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    @pytest.mark.parametrize(
+        "pattern",
+        ["*", "*/", "**", "**/*", "**/*.txt", "*/*.json", ".*", "b/**", "*/d/*", "h[[]1]/*"],
+    )
+    @pytest.mark.parametrize("recursive", [True, False])
+    def test_can_glob_as_glob_module(self, fxt_tree: str, pattern: str, recursive: bool):
+        snapshot = FileSystemSnapshot(fxt_tree)
+
+        assert sorted(snapshot.iglob(osp.join(fxt_tree, pattern), recursive=recursive)) == sorted(
+            glob.glob(osp.join(fxt_tree, pattern), recursive=recursive)
+        )
+        if sys.version_info >= (3, 10):
+            assert sorted(
+                snapshot.iglob(pattern, root_dir=fxt_tree, recursive=recursive)
+            ) == sorted(glob.glob(pattern, root_dir=fxt_tree, recursive=recursive))
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_reads_each_directory_once(self, fxt_tree: str):
+        snapshot = FileSystemSnapshot(fxt_tree)
+
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            for _ in range(3):
+                list(snapshot.iglob(osp.join(fxt_tree, "**", "*"), recursive=True))
+                assert snapshot.isfile(osp.join(fxt_tree, "b", "c.json"))
+                assert snapshot.isdir(osp.join(fxt_tree, "b", "d"))
+
+        # The root, "b", "b/d" and "h[1]" directories, hidden directories are skipped
+        assert scandir.call_count == 4
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_can_share_active_snapshot(self, fxt_tree: str):
+        assert get_fs_snapshot(fxt_tree) is None
+
+        with fs_snapshot(fxt_tree) as snapshot:
+            assert get_fs_snapshot(osp.join(fxt_tree, "b")) is snapshot
+            assert get_fs_snapshot(osp.dirname(fxt_tree)) is None
+
+            with fs_snapshot(osp.join(fxt_tree, "b")) as nested_snapshot:
+                assert nested_snapshot is snapshot
+
+        assert get_fs_snapshot(fxt_tree) is None
+
+    @mark_requirement(Requirements.DATUM_GENERAL_REQ)
+    def test_active_snapshot_is_not_shared_between_threads(self, fxt_tree: str):
+        snapshot_entered = threading.Event()
+        snapshot_checked = threading.Event()
+
+        def _use_snapshot():
+            with fs_snapshot(fxt_tree):
+                snapshot_entered.set()
+                snapshot_checked.wait(timeout=10)
+
+        thread = threading.Thread(target=_use_snapshot)
+        thread.start()
+        try:
+            assert snapshot_entered.wait(timeout=10)
+            assert get_fs_snapshot(fxt_tree) is None
+
+            with fs_snapshot(fxt_tree) as snapshot:
+                assert get_fs_snapshot(fxt_tree) is snapshot
+        finally:
+            snapshot_checked.set()
+            thread.join()
+
+
 class TestMemberRedefined(TestCase):
     class Base:
         def method(self):
@@ -283,3 +371,40 @@ class MultiProcUtilTest:
                 == record.message
                 for record in caplog.records
             )
+
+    @pytest.mark.parametrize("num_workers", [0, 1, 4])
+    def test_ordered_thread_map_keeps_order(self, num_workers):
+        def _func(value: int) -> int:
+            # The later inputs are completed earlier
+            time.sleep(0.001 * (10 - value % 10))
+            if value % 7 == 3:
+                raise TestException(value)
+            return value * 2
+
+        results = []
+        for value, future in ordered_thread_map(_func, range(50), num_workers=num_workers):
+            if future.exception() is not None:
+                assert isinstance(future.exception(), TestException)
+                results.append(-value)
+            else:
+                results.append(future.result())
+
+        assert results == [-i if i % 7 == 3 else i * 2 for i in range(50)]
+
+    def test_ordered_thread_map_limits_prefetch(self):
+        lock = threading.Lock()
+        submitted = []
+
+        def _func(value: int) -> int:
+            with lock:
+                submitted.append(value)
+            return value
+
+        for value, future in ordered_thread_map(_func, range(20), num_workers=2, prefetch=3):
+            future.result()
+            with lock:
+                assert len(submitted) <= value + 1 + 3
+
+    def test_ordered_thread_map_checks_num_workers(self):
+        with pytest.raises(ValueError, match="non negative integer"):
+            next(ordered_thread_map(lambda v: v, [1], num_workers=-1))